@@ -0,0 +1,11 @@
+"""
+Data Query - Consultas SQL sobre los datos guardados.
+
+Este módulo carga las exportaciones de Financial Wallet y Weather Scraper
+en una base SQLite embebida para consultarlas con SQL.
+"""
+
+from .catalog import DataCatalog
+
+__version__ = "1.0.0"
+__all__ = ["DataCatalog"]
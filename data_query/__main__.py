@@ -0,0 +1,6 @@
+"""Permite ejecutar ``python -m data_query "SELECT ..."``."""
+
+from .catalog import main
+
+
+main()
@@ -0,0 +1,493 @@
+"""
+Catálogo SQL sobre los datos guardados por Financial Wallet y Weather
+Scraper.
+
+Los archivos exportados (CSV de ``FinancialWallet.export_data``, almacenes
+binarios de ``save_store`` y CSV de ``WeatherScraper``) se cargan de forma
+incremental en una base SQLite embebida, en formato largo y con índices,
+para que los filtros, agrupaciones y uniones se ejecuten dentro del motor
+en lugar de cargar archivos completos en pandas.
+
+Tablas y vistas:
+
+    prices         Una fila por (ticker, ts) con open, high, low, close,
+                   adj_close y volume; ts en UTC si la fuente tenía zona
+                   horaria. La clave primaria agrupa las filas por
+                   ticker y fecha, por lo que un filtro por ticker y rango
+                   de fechas lee solo las páginas necesarias.
+    forecasts      Una fila por ciudad, captura y día pronosticado, con los
+                   textos originales de la página.
+    sources        Archivos cargados con su tamaño y fecha de modificación,
+                   para omitir los que no cambiaron.
+    price_returns  Vista con el retorno simple de cada barra por ticker.
+"""
+
+import argparse
+import os
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_DB_PATH = "data/catalog.sqlite"
+
+# Campo de yfinance -> columna de la tabla prices
+PRICE_COLUMNS = {
+    "Open": "open",
+    "High": "high",
+    "Low": "low",
+    "Close": "close",
+    "Adj Close": "adj_close",
+    "Volume": "volume",
+}
+
+# Columnas del CSV de WeatherScraper -> columnas de la tabla forecasts
+FORECAST_COLUMNS = {
+    "Día": "dia",
+    "Fecha": "fecha",
+    "Temperatura": "temperatura",
+    "Viento": "viento",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS prices (
+    ticker    TEXT NOT NULL,
+    ts        TEXT NOT NULL,
+    open      REAL,
+    high      REAL,
+    low       REAL,
+    close     REAL,
+    adj_close REAL,
+    volume    REAL,
+    PRIMARY KEY (ticker, ts)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS prices_ts ON prices (ts);
+
+CREATE TABLE IF NOT EXISTS forecasts (
+    ciudad      TEXT NOT NULL,
+    scraped_at  TEXT NOT NULL,
+    posicion    INTEGER NOT NULL,
+    dia         TEXT,
+    fecha       TEXT,
+    temperatura TEXT,
+    viento      TEXT,
+    PRIMARY KEY (ciudad, scraped_at, posicion)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS forecasts_scraped_at ON forecasts (scraped_at);
+
+CREATE TABLE IF NOT EXISTS sources (
+    path      TEXT PRIMARY KEY,
+    kind      TEXT NOT NULL,
+    mtime     REAL NOT NULL,
+    size      INTEGER NOT NULL,
+    rows      INTEGER NOT NULL,
+    loaded_at TEXT NOT NULL
+);
+
+CREATE VIEW IF NOT EXISTS price_returns AS
+SELECT
+    ticker,
+    ts,
+    close,
+    close / LAG(close) OVER (PARTITION BY ticker ORDER BY ts) - 1.0
+        AS ret
+FROM prices;
+"""
+
+
+def _quote(name):
+    """Cita un nombre como identificador SQL."""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _format_ts(index):
+    """
+    Convierte fechas (o sus textos) a texto ISO ordenable en UTC.
+
+    Las fechas con zona horaria o desfase se convierten a UTC; admite
+    desfases mezclados, como los de un CSV intradía que cruza un cambio de
+    horario. Las fechas sin zona se guardan tal cual.
+    """
+    index = pd.DatetimeIndex(pd.to_datetime(index, utc=True))
+    return index.tz_localize(None).strftime("%Y-%m-%d %H:%M:%S").to_numpy()
+
+
+def _price_rows(data):
+    """
+    Convierte el DataFrame ancho (campo, ticker) en filas largas.
+
+    Las barras donde un ticker no tiene ningún campo se omiten.
+
+    Returns:
+        tuple: (columnas, lista de filas).
+    """
+    if isinstance(data.columns, pd.MultiIndex):
+        fields = [
+            field for field in PRICE_COLUMNS
+            if field in data.columns.get_level_values(0)
+        ]
+        tickers = list(data[fields[0]].columns)
+        blocks = [
+            data[field].reindex(columns=tickers).to_numpy(
+                dtype=np.float64, na_value=np.nan
+            )
+            for field in fields
+        ]
+    else:
+        fields = ["Close"]
+        tickers = list(data.columns)
+        blocks = [data.to_numpy(dtype=np.float64, na_value=np.nan)]
+
+    values = np.stack([block.ravel() for block in blocks], axis=1)
+    stamps = np.repeat(_format_ts(data.index), len(tickers))
+    names = np.tile(np.asarray(tickers, dtype=object), len(data))
+    keep = ~np.isnan(values).all(axis=1)
+
+    columns = ["ticker", "ts"] + [PRICE_COLUMNS[field] for field in fields]
+    rows = zip(
+        names[keep].tolist(),
+        stamps[keep].tolist(),
+        *values[keep].T.tolist(),
+    )
+    return columns, rows
+
+
+class DataCatalog:
+    """
+    Base SQLite con los precios y pronósticos guardados.
+
+    Atributos:
+        db_path (str): Ruta del archivo de la base de datos.
+        connection (sqlite3.Connection): Conexión abierta.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        """
+        Abre (o crea) el catálogo.
+
+        Args:
+            db_path (str): Archivo de la base; ':memory:' para una base
+                temporal en memoria.
+        """
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if db_path != ":memory:" and directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Cierra la conexión con la base."""
+        self.connection.close()
+
+    def _column_list(self, table, columns):
+        """
+        Valida columnas contra el esquema de una tabla y las cita.
+
+        Args:
+            table (str): Tabla del catálogo.
+            columns (iterable): Nombres de columnas.
+
+        Returns:
+            str: Columnas citadas y separadas por comas, para usarlas en
+            una consulta.
+
+        Raises:
+            ValueError: Si alguna columna no existe en la tabla.
+        """
+        known = {
+            row[1] for row in self.connection.execute(
+                f"PRAGMA table_info({_quote(table)})"
+            )
+        }
+        unknown = [column for column in columns if column not in known]
+        if unknown:
+            raise ValueError(
+                f"Columnas inexistentes en {table}: "
+                f"{', '.join(map(str, unknown))}"
+            )
+        return ", ".join(_quote(column) for column in columns)
+
+    def _is_current(self, path):
+        """Indica si el archivo ya se cargó y no cambió desde entonces."""
+        stat = os.stat(path)
+        row = self.connection.execute(
+            "SELECT mtime, size FROM sources WHERE path = ?",
+            (os.path.abspath(path),),
+        ).fetchone()
+        return row is not None and row == (stat.st_mtime, stat.st_size)
+
+    def _record_source(self, path, kind, rows):
+        """Registra un archivo cargado en la tabla sources."""
+        stat = os.stat(path)
+        self.connection.execute(
+            "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                os.path.abspath(path), kind, stat.st_mtime, stat.st_size,
+                rows, datetime.now().isoformat(timespec="seconds"),
+            ),
+        )
+
+    def load_prices(self, data):
+        """
+        Inserta o reemplaza precios desde un DataFrame de la cartera.
+
+        Args:
+            data (pd.DataFrame): Datos con columnas (campo, ticker).
+
+        Returns:
+            int: Filas insertadas o reemplazadas.
+        """
+        columns, rows = _price_rows(data)
+        column_list = self._column_list("prices", columns)
+        placeholders = ", ".join("?" for _ in columns)
+        with self.connection:
+            cursor = self.connection.executemany(
+                f"INSERT OR REPLACE INTO prices ({column_list}) "
+                f"VALUES ({placeholders})",
+                rows,
+            )
+        return cursor.rowcount
+
+    def ingest_prices_csv(self, path, chunksize=100_000, force=False):
+        """
+        Carga un CSV exportado por ``FinancialWallet.export_data``.
+
+        Args:
+            path (str): Archivo CSV con columnas (campo, ticker).
+            chunksize (int): Filas leídas por bloque.
+            force (bool): Carga el archivo aunque no haya cambiado.
+
+        Returns:
+            int: Filas cargadas (0 si el archivo no cambió).
+        """
+        if not force and self._is_current(path):
+            return 0
+        total = 0
+        # Las fechas se interpretan en _format_ts, que admite desfases
+        # horarios mezclados
+        reader = pd.read_csv(
+            path, header=[0, 1], index_col=0, chunksize=chunksize,
+        )
+        for chunk in reader:
+            total += self.load_prices(chunk)
+        with self.connection:
+            self._record_source(path, "prices_csv", total)
+        return total
+
+    def ingest_store(self, path, chunksize=100_000, force=False):
+        """
+        Carga un almacén binario creado con ``save_store``.
+
+        Args:
+            path (str): Directorio del almacén.
+            chunksize (int): Barras cargadas por bloque.
+            force (bool): Carga el almacén aunque no haya cambiado.
+
+        Returns:
+            int: Filas cargadas (0 si el almacén no cambió).
+        """
+        from financial_wallet.store import META_FILE, open_store
+
+        meta_path = os.path.join(path, META_FILE)
+        if not force and self._is_current(meta_path):
+            return 0
+        data = open_store(path).to_dataframe()
+        total = 0
+        for start in range(0, len(data), chunksize):
+            total += self.load_prices(data.iloc[start:start + chunksize])
+        with self.connection:
+            self._record_source(meta_path, "price_store", total)
+        return total
+
+    def ingest_forecast_csv(self, path, ciudad=None, force=False):
+        """
+        Carga un CSV de ``WeatherScraper`` (resultados_<ciudad>.csv).
+
+        Cada archivo se registra como una captura con la fecha de
+        modificación del archivo, de modo que recargar un archivo
+        sobrescrito conserva las capturas anteriores.
+
+        Args:
+            path (str): Archivo CSV con columnas Día, Fecha, Temperatura y
+                Viento.
+            ciudad (str, optional): Ciudad; por defecto, la del nombre del
+                archivo.
+            force (bool): Carga el archivo aunque no haya cambiado.
+
+        Returns:
+            int: Filas cargadas (0 si el archivo no cambió).
+        """
+        if not force and self._is_current(path):
+            return 0
+        if ciudad is None:
+            name = os.path.splitext(os.path.basename(path))[0]
+            if name.startswith("resultados_"):
+                name = name[len("resultados_"):]
+            ciudad = name
+        scraped_at = datetime.fromtimestamp(
+            os.path.getmtime(path)
+        ).isoformat(timespec="seconds")
+
+        df = pd.read_csv(path, encoding="utf-8-sig", dtype=str)
+        df = df.rename(columns=FORECAST_COLUMNS)
+        rows = [
+            (ciudad, scraped_at, position,
+             row.get("dia"), row.get("fecha"),
+             row.get("temperatura"), row.get("viento"))
+            for position, row in enumerate(df.to_dict("records"))
+        ]
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO forecasts VALUES "
+                "(?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._record_source(path, "forecast_csv", len(rows))
+        return len(rows)
+
+    def sync(self, financial_dir="data/financial", weather_dir="data/weather"):
+        """
+        Carga los archivos nuevos o modificados de los directorios de salida.
+
+        Args:
+            financial_dir (str): Directorio de ``FinancialWallet``; se cargan
+                sus CSV y sus almacenes binarios.
+            weather_dir (str): Directorio de ``WeatherScraper``.
+
+        Returns:
+            dict: Filas cargadas por archivo (solo los que cambiaron).
+        """
+        loaded = {}
+        if os.path.isdir(financial_dir):
+            for name in sorted(os.listdir(financial_dir)):
+                path = os.path.join(financial_dir, name)
+                if name.endswith(".csv"):
+                    rows = self.ingest_prices_csv(path)
+                elif os.path.isfile(os.path.join(path, "meta.json")):
+                    rows = self.ingest_store(path)
+                else:
+                    continue
+                if rows:
+                    loaded[path] = rows
+        if os.path.isdir(weather_dir):
+            for name in sorted(os.listdir(weather_dir)):
+                if name.startswith("resultados_") and name.endswith(".csv"):
+                    path = os.path.join(weather_dir, name)
+                    rows = self.ingest_forecast_csv(path)
+                    if rows:
+                        loaded[path] = rows
+        return loaded
+
+    def query(self, sql, params=()):
+        """
+        Ejecuta una consulta y retorna el resultado como DataFrame.
+
+        Args:
+            sql (str): Consulta SQL sobre prices, forecasts, sources o
+                price_returns.
+            params (tuple or dict): Parámetros de la consulta ('?' o
+                ':nombre').
+
+        Returns:
+            pd.DataFrame: Resultado de la consulta.
+        """
+        return pd.read_sql_query(sql, self.connection, params=params)
+
+    def explain(self, sql, params=()):
+        """
+        Muestra el plan de ejecución de una consulta.
+
+        Útil para verificar que un filtro usa los índices en lugar de
+        recorrer la tabla completa.
+
+        Args:
+            sql (str): Consulta SQL.
+            params (tuple or dict): Parámetros de la consulta.
+
+        Returns:
+            list: Pasos del plan como texto.
+        """
+        rows = self.connection.execute(
+            f"EXPLAIN QUERY PLAN {sql}", params
+        ).fetchall()
+        return [row[-1] for row in rows]
+
+    def prices(self, tickers=None, start=None, end=None,
+               columns=("close",)):
+        """
+        Consulta precios en formato ancho (fechas x tickers).
+
+        Args:
+            tickers (list, optional): Tickers a incluir; por defecto, todos.
+            start (str, optional): Fecha inicial 'YYYY-MM-DD' (incluida).
+            end (str, optional): Fecha final 'YYYY-MM-DD' (excluida).
+            columns (tuple): Columnas de prices a retornar.
+
+        Returns:
+            pd.DataFrame: Con una sola columna, fechas x tickers; con
+            varias, columnas (columna, ticker).
+
+        Raises:
+            ValueError: Si alguna columna no existe en prices.
+        """
+        columns = list(columns)
+        column_list = self._column_list("prices", columns)
+        conditions, params = [], []
+        if tickers:
+            conditions.append(
+                f"ticker IN ({', '.join('?' for _ in tickers)})"
+            )
+            params.extend(tickers)
+        if start:
+            conditions.append("ts >= ?")
+            params.append(start)
+        if end:
+            conditions.append("ts < ?")
+            params.append(end)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        long = self.query(
+            f"SELECT ticker, ts, {column_list} FROM prices {where}",
+            tuple(params),
+        )
+        long["ts"] = pd.to_datetime(long["ts"])
+        wide = long.pivot(index="ts", columns="ticker", values=columns)
+        wide.index.name = "Date"
+        if len(columns) == 1:
+            return wide[columns[0]]
+        return wide
+
+
+def main():
+    """Sincroniza el catálogo y ejecuta una consulta desde la terminal."""
+    parser = argparse.ArgumentParser(
+        description="Consultas SQL sobre los datos guardados."
+    )
+    parser.add_argument("sql", nargs="?", help="Consulta a ejecutar.")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    parser.add_argument("--financial-dir", default="data/financial")
+    parser.add_argument("--weather-dir", default="data/weather")
+    args = parser.parse_args()
+
+    with DataCatalog(args.db) as catalog:
+        loaded = catalog.sync(args.financial_dir, args.weather_dir)
+        for path, rows in loaded.items():
+            print(f"Cargado {path}: {rows} filas")
+        if args.sql:
+            print(catalog.query(args.sql).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Pruebas del catálogo SQL (data_query.catalog)."""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_query.catalog import DataCatalog
+from financial_wallet.store import write_store
+from financial_wallet.synthetic import synthetic_ohlcv
+
+
+@pytest.fixture
+def catalog():
+    with DataCatalog(":memory:") as catalog:
+        catalog.load_prices(synthetic_ohlcv(3, 10))
+        yield catalog
+
+
+def test_prices_returns_requested_columns(catalog):
+    wide = catalog.prices(["T0000", "T0001"], columns=("close", "volume"))
+    assert wide.shape == (10, 4)
+    assert set(wide.columns.get_level_values(0)) == {"close", "volume"}
+
+
+@pytest.mark.parametrize("column", [
+    "close FROM prices; DROP TABLE prices; --",
+    'close", "ticker',
+    "price",
+])
+def test_prices_rejects_unknown_columns(catalog, column):
+    with pytest.raises(ValueError, match="Columnas inexistentes"):
+        catalog.prices(columns=(column,))
+    assert catalog.query("SELECT COUNT(*) AS n FROM prices")["n"][0] == 30
+
+
+def _forecast_csv(path):
+    pd.DataFrame({
+        "Día": ["Hoy", "Mañana"],
+        "Fecha": ["18 Ene", "19 Ene"],
+        "Temperatura": ["20° / 10°", "22° / 11°"],
+        "Viento": ["NO 10 km/h", "S 5 km/h"],
+    }).to_csv(path, index=False, encoding="utf-8-sig")
+
+
+@pytest.fixture
+def output_dirs(tmp_path):
+    financial = tmp_path / "financial"
+    weather = tmp_path / "weather"
+    financial.mkdir()
+    weather.mkdir()
+    synthetic_ohlcv(2, 5).to_csv(financial / "datos.csv")
+    write_store(synthetic_ohlcv(3, 4, seed=1), str(financial / "almacen"))
+    _forecast_csv(weather / "resultados_madrid.csv")
+    (weather / "otro.csv").write_text("no es un pronóstico\n")
+    return str(financial), str(weather)
+
+
+def test_sync_loads_every_output_once(output_dirs):
+    financial, weather = output_dirs
+    with DataCatalog(":memory:") as catalog:
+        loaded = catalog.sync(financial, weather)
+
+        assert loaded == {
+            os.path.join(financial, "almacen"): 12,
+            os.path.join(financial, "datos.csv"): 10,
+            os.path.join(weather, "resultados_madrid.csv"): 2,
+        }
+        assert catalog.sync(financial, weather) == {}
+        kinds = catalog.query(
+            "SELECT kind, rows FROM sources ORDER BY kind"
+        )
+        assert kinds.values.tolist() == [
+            ["forecast_csv", 2], ["price_store", 12], ["prices_csv", 10],
+        ]
+
+
+def test_ingest_store_matches_dataframe(tmp_path):
+    data = synthetic_ohlcv(3, 4, seed=1)
+    path = str(tmp_path / "almacen")
+    write_store(data, path)
+    with DataCatalog(":memory:") as catalog:
+        assert catalog.ingest_store(path, chunksize=3) == 12
+        assert catalog.ingest_store(path) == 0
+
+        close = catalog.prices()
+        np.testing.assert_allclose(
+            close.to_numpy(), data["Close"].to_numpy()
+        )
+        assert list(close.index) == list(data.index)
+
+
+def test_ingest_forecast_csv(tmp_path):
+    path = tmp_path / "resultados_san_jose.csv"
+    _forecast_csv(path)
+    with DataCatalog(":memory:") as catalog:
+        assert catalog.ingest_forecast_csv(str(path)) == 2
+
+        rows = catalog.query(
+            "SELECT ciudad, posicion, dia, fecha, temperatura, viento "
+            "FROM forecasts ORDER BY posicion"
+        )
+        assert rows.values.tolist() == [
+            ["san_jose", 0, "Hoy", "18 Ene", "20° / 10°", "NO 10 km/h"],
+            ["san_jose", 1, "Mañana", "19 Ene", "22° / 11°", "S 5 km/h"],
+        ]
+
+
+def test_ingest_prices_csv_across_dst(tmp_path):
+    data = synthetic_ohlcv(2, 100, interval="1h")
+    data.index = pd.date_range(
+        "2024-03-08 09:00", periods=100, freq="h", tz="America/New_York",
+        name="Date",
+    )
+    path = tmp_path / "intradia.csv"
+    data.to_csv(path)
+    assert "-05:00" in path.read_text() and "-04:00" in path.read_text()
+
+    with DataCatalog(":memory:") as catalog:
+        assert catalog.ingest_prices_csv(str(path), chunksize=30) == 200
+
+        close = catalog.prices()
+        expected = data.index.tz_convert("UTC").tz_localize(None)
+        assert list(close.index) == list(expected)
+        np.testing.assert_allclose(
+            close.to_numpy(), data["Close"].to_numpy()
+        )
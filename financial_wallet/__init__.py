@@ -6,6 +6,52 @@ históricos de acciones usando yfinance.
 """
 
 from .wallet import FinancialWallet
+from .alerts import AlertEngine, JsonLinesSink, Rule
+from .chunked import (
+    ChunkedAnalysis,
+    analyze_chunks,
+    analyze_csv,
+    iter_csv_chunks,
+)
+from .indicators import StreamingIndicators, compute_indicators
+from .live import FakeQuoteFeed, LiveWatcher, QuoteFeed, YFinanceFeed
+from .pairs import screen_pairs
+from .profiling import Profiler
+from .quality import align_calendar, assess_quality, prepare_data
+from .relative import benchmark_metrics, rolling_benchmark_metrics
+from .resample import infer_periods_per_year, resample_ohlcv
+from .store import PriceStore, csv_to_store, open_store, write_store
+from .service import AnalyticsService, ResultCache
 
 __version__ = "1.0.0"
-__all__ = ["FinancialWallet"]
+__all__ = [
+    "FinancialWallet",
+    "StreamingIndicators",
+    "compute_indicators",
+    "benchmark_metrics",
+    "rolling_benchmark_metrics",
+    "infer_periods_per_year",
+    "resample_ohlcv",
+    "ChunkedAnalysis",
+    "analyze_chunks",
+    "analyze_csv",
+    "iter_csv_chunks",
+    "PriceStore",
+    "csv_to_store",
+    "open_store",
+    "write_store",
+    "AnalyticsService",
+    "ResultCache",
+    "FakeQuoteFeed",
+    "LiveWatcher",
+    "QuoteFeed",
+    "YFinanceFeed",
+    "AlertEngine",
+    "JsonLinesSink",
+    "Rule",
+    "screen_pairs",
+    "Profiler",
+    "align_calendar",
+    "assess_quality",
+    "prepare_data",
+]
@@ -0,0 +1,81 @@
+"""
+Utilidades internas para trabajar con el DataFrame de precios de la cartera.
+
+``yf.download`` devuelve un DataFrame con columnas de dos niveles
+(campo, ticker), por ejemplo ``("Close", "AAPL")``. Estas funciones extraen
+un campo como matriz 2-D (barras x tickers) para los cálculos vectorizados.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+PRICE_FIELDS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+
+
+def field_frame(data, field):
+    """
+    Obtiene un campo del DataFrame de precios con un ticker por columna.
+
+    Args:
+        data (pd.DataFrame): Datos con columnas (campo, ticker) o columnas
+            simples de tickers.
+        field (str): Campo a extraer, por ejemplo 'Close'.
+
+    Returns:
+        pd.DataFrame: Campo solicitado con índice temporal y tickers
+        como columnas.
+
+    Raises:
+        KeyError: Si el campo no existe en los datos.
+    """
+    if isinstance(data.columns, pd.MultiIndex):
+        frame = data[field]
+    else:
+        frame = data
+    if isinstance(frame, pd.Series):
+        frame = frame.to_frame()
+    return frame
+
+
+def field_matrix(data, field, dtype=np.float64):
+    """
+    Obtiene un campo como matriz numpy junto con su índice y tickers.
+
+    Args:
+        data (pd.DataFrame): Datos de precios de la cartera.
+        field (str): Campo a extraer, por ejemplo 'Close'.
+        dtype: Tipo numérico de la matriz resultante.
+
+    Returns:
+        tuple: (valores, índice, tickers), donde valores es un arreglo
+        de forma (barras, tickers).
+    """
+    frame = field_frame(data, field)
+    values = frame.to_numpy(dtype=dtype, na_value=np.nan)
+    return values, frame.index, list(frame.columns)
+
+
+def parse_timestamps(values):
+    """
+    Convierte las fechas leídas de un CSV exportado en un índice temporal.
+
+    Las barras intradía de yfinance se exportan con su desfase horario, que
+    cambia con el horario de verano (-05:00 / -04:00 en Nueva York); esas
+    marcas se convierten a UTC. Las fechas sin desfase quedan sin zona.
+
+    Args:
+        values (array-like): Textos de fecha.
+
+    Returns:
+        pd.DatetimeIndex: Índice en UTC si las fechas tenían desfase, o sin
+        zona en caso contrario.
+    """
+    try:
+        index = pd.DatetimeIndex(pd.to_datetime(values))
+    except ValueError:
+        # Desfases mezclados (cambio de horario dentro del bloque)
+        return pd.DatetimeIndex(pd.to_datetime(values, utc=True))
+    if index.tz is not None:
+        index = index.tz_convert("UTC")
+    return index
@@ -0,0 +1,411 @@
+"""
+Motor de alertas por umbrales evaluado sobre todo el universo de tickers.
+
+Las reglas se declaran como texto o como :class:`Rule` y se compilan en
+funciones vectorizadas sobre la matriz de precios (barras x tickers). En
+cada barra, :class:`AlertEngine` evalúa todas las reglas para todos los
+tickers en una sola pasada, reutilizando los cálculos compartidos
+(retornos, volatilidad, medias móviles), y emite un evento solo cuando la
+condición pasa de falsa a verdadera para un par (regla, ticker).
+
+Sintaxis de las reglas en texto:
+
+    return < -0.05              Retorno de la última barra
+    volatility(20) > 0.4        Volatilidad anualizada de las últimas 20 barras
+    price >= 150                Precio de cierre
+    volume > 1e6                Volumen de la última barra
+    drawdown(252) < -0.2        Caída desde el máximo de las últimas 252 barras
+    price crosses_above sma(200)
+    price crosses_below sma(50)
+"""
+
+import json
+import operator
+import re
+
+import numpy as np
+import pandas as pd
+
+from ._frames import field_frame
+from .resample import infer_periods_per_year
+
+
+OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+METRICS = ["return", "volatility", "price", "volume", "drawdown"]
+CROSSES = ["crosses_above", "crosses_below"]
+
+# Ventana por defecto de las métricas que la necesitan
+DEFAULT_WINDOWS = {"volatility": 20, "drawdown": 252}
+
+_VALUE_RULE = re.compile(
+    r"^\s*(?P<metric>\w+)\s*(?:\(\s*(?P<window>\d+)\s*\))?\s*"
+    r"(?P<op><=|>=|<|>)\s*(?P<threshold>[-+0-9.eE]+)\s*$"
+)
+_CROSS_RULE = re.compile(
+    r"^\s*price\s+(?P<op>crosses_above|crosses_below)\s+"
+    r"sma\s*\(\s*(?P<window>\d+)\s*\)\s*$"
+)
+
+
+class Rule:
+    """
+    Regla de alerta sobre una métrica de cada ticker.
+
+    Atributos:
+        name (str): Nombre de la regla, usado en los eventos.
+        metric (str): Métrica evaluada ('return', 'volatility', 'price',
+            'volume', 'drawdown' o 'sma' para los cruces).
+        op (str): Comparación ('<', '<=', '>', '>=', 'crosses_above' o
+            'crosses_below').
+        threshold (float or None): Umbral de comparación.
+        window (int or None): Ventana de la métrica en barras.
+    """
+
+    def __init__(self, name, metric, op, threshold=None, window=None):
+        """
+        Inicializa y valida la regla.
+
+        Raises:
+            ValueError: Si la métrica, el operador o la ventana no son válidos.
+        """
+        if op in CROSSES:
+            if metric != "sma" or not window:
+                raise ValueError(
+                    f"La regla {name}: los cruces requieren 'sma' con ventana."
+                )
+        elif op not in OPERATORS:
+            raise ValueError(f"La regla {name}: operador inválido '{op}'.")
+        elif metric not in METRICS:
+            raise ValueError(f"La regla {name}: métrica inválida '{metric}'.")
+        elif threshold is None:
+            raise ValueError(f"La regla {name}: falta el umbral.")
+
+        self.name = name
+        self.metric = metric
+        self.op = op
+        self.threshold = None if threshold is None else float(threshold)
+        self.window = window or DEFAULT_WINDOWS.get(metric)
+
+    @classmethod
+    def parse(cls, text, name=None):
+        """
+        Crea una regla a partir de su expresión en texto.
+
+        Args:
+            text (str): Expresión, por ejemplo 'return < -0.05'.
+            name (str, optional): Nombre de la regla; por defecto, el texto.
+
+        Returns:
+            Rule: Regla validada.
+
+        Raises:
+            ValueError: Si la expresión no se puede interpretar.
+        """
+        name = name or text.strip()
+        match = _CROSS_RULE.match(text)
+        if match:
+            return cls(name, "sma", match["op"], window=int(match["window"]))
+        match = _VALUE_RULE.match(text)
+        if match:
+            window = int(match["window"]) if match["window"] else None
+            return cls(
+                name, match["metric"], match["op"],
+                threshold=float(match["threshold"]), window=window,
+            )
+        raise ValueError(f"No se pudo interpretar la regla: '{text}'.")
+
+    def lookback(self):
+        """Barras de historia necesarias para evaluar la regla."""
+        if self.op in CROSSES:
+            return self.window + 1
+        if self.metric == "volatility":
+            return self.window + 1
+        if self.metric == "drawdown":
+            return self.window
+        return 2 if self.metric == "return" else 1
+
+    def __repr__(self):
+        return (
+            f"Rule(name={self.name!r}, metric={self.metric!r}, "
+            f"op={self.op!r}, threshold={self.threshold}, "
+            f"window={self.window})"
+        )
+
+
+class _BarContext:
+    """
+    Métricas de la última barra calculadas una sola vez por evaluación.
+
+    Las reglas que comparten métrica y ventana reutilizan el mismo cálculo.
+    """
+
+    def __init__(self, close, volume, periods_per_year):
+        self.close = close
+        self.volume = volume
+        self.periods_per_year = periods_per_year
+        self._cache = {}
+
+    def _cached(self, key, func):
+        if key not in self._cache:
+            self._cache[key] = func()
+        return self._cache[key]
+
+    def value(self, metric, window):
+        """Valor de la métrica en la última barra para cada ticker."""
+        return self._cached((metric, window), {
+            "return": self._return,
+            "volatility": lambda: self._volatility(window),
+            "price": lambda: self.close[-1],
+            "volume": self._volume,
+            "drawdown": lambda: self._drawdown(window),
+        }[metric])
+
+    def sma(self, window, offset=0):
+        """Media móvil simple que termina ``offset`` barras antes del final."""
+        def compute():
+            end = self.close.shape[0] - offset
+            block = self.close[max(end - window, 0):end]
+            if block.shape[0] < window:
+                return np.full(self.close.shape[1], np.nan)
+            with np.errstate(invalid="ignore"):
+                return block.mean(axis=0)
+        return self._cached(("sma", window, offset), compute)
+
+    def _return(self):
+        if self.close.shape[0] < 2:
+            return np.full(self.close.shape[1], np.nan)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.close[-1] / self.close[-2] - 1.0
+
+    def _volatility(self, window):
+        block = self.close[-(window + 1):]
+        if block.shape[0] < window + 1:
+            return np.full(self.close.shape[1], np.nan)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            returns = block[1:] / block[:-1] - 1.0
+        # Como pandas: se omiten los retornos faltantes y con menos de dos
+        # observaciones el resultado es NaN
+        count = np.count_nonzero(~np.isnan(returns), axis=0)
+        std = np.full(returns.shape[1], np.nan)
+        enough = count >= 2
+        if enough.any():
+            std[enough] = np.nanstd(returns[:, enough], axis=0, ddof=1)
+        return std * np.sqrt(self.periods_per_year)
+
+    def _volume(self):
+        if self.volume is None:
+            return np.full(self.close.shape[1], np.nan)
+        return self.volume[-1]
+
+    def _drawdown(self, window):
+        block = self.close[-window:]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return block[-1] / np.fmax.reduce(block, axis=0) - 1.0
+
+
+def _compile(rule):
+    """Convierte una regla en una función vectorizada sobre el contexto."""
+    if rule.op in CROSSES:
+        above = rule.op == "crosses_above"
+
+        def evaluate_cross(ctx):
+            now_diff = ctx.close[-1] - ctx.sma(rule.window)
+            prev_diff = ctx.close[-2] - ctx.sma(rule.window, offset=1) \
+                if ctx.close.shape[0] >= 2 else np.full_like(now_diff, np.nan)
+            with np.errstate(invalid="ignore"):
+                if above:
+                    hit = (prev_diff <= 0) & (now_diff > 0)
+                else:
+                    hit = (prev_diff >= 0) & (now_diff < 0)
+            return hit, ctx.close[-1]
+        return evaluate_cross
+
+    compare = OPERATORS[rule.op]
+
+    def evaluate_threshold(ctx):
+        value = ctx.value(rule.metric, rule.window)
+        with np.errstate(invalid="ignore"):
+            return compare(value, rule.threshold), value
+    return evaluate_threshold
+
+
+class JsonLinesSink:
+    """Escribe cada evento de alerta como una línea JSON en un archivo."""
+
+    def __init__(self, file_path):
+        """
+        Args:
+            file_path (str): Archivo donde se agregan los eventos.
+        """
+        self.file_path = file_path
+
+    def __call__(self, events):
+        with open(self.file_path, "a", encoding="utf-8") as f:
+            for event in events:
+                f.write(json.dumps(event, default=str) + "\n")
+
+
+class AlertEngine:
+    """
+    Evalúa reglas de alerta para todos los tickers en cada barra.
+
+    Atributos:
+        rules (list): Reglas compiladas, en orden de declaración.
+        active (np.ndarray): Estado (reglas x tickers) de la última
+            evaluación, usado para emitir solo los cambios a verdadero.
+    """
+
+    def __init__(self, rules, sinks=None, periods_per_year=None):
+        """
+        Inicializa el motor.
+
+        Args:
+            rules (list): Reglas como :class:`Rule` o como texto.
+            sinks (list, optional): Funciones que reciben la lista de
+                eventos nuevos, por ejemplo :class:`JsonLinesSink`.
+            periods_per_year (float, optional): Períodos por año para
+                anualizar la volatilidad; por defecto se infiere de los datos.
+        """
+        self.rules = [
+            rule if isinstance(rule, Rule) else Rule.parse(rule)
+            for rule in rules
+        ]
+        self.sinks = list(sinks or [])
+        self.periods_per_year = periods_per_year
+        self.active = None
+        self._compiled = [_compile(rule) for rule in self.rules]
+        self._tickers = None
+
+    @property
+    def lookback(self):
+        """Barras de historia necesarias para evaluar todas las reglas."""
+        return max((rule.lookback() for rule in self.rules), default=1) + 1
+
+    def evaluate(self, close, tickers, timestamp=None, volume=None,
+                 periods_per_year=None):
+        """
+        Evalúa todas las reglas sobre la última barra de la matriz.
+
+        Args:
+            close (np.ndarray): Cierres recientes (barras x tickers); basta
+                con las últimas ``lookback`` barras.
+            tickers (list): Tickers en el orden de las columnas.
+            timestamp (optional): Marca de tiempo de la última barra.
+            volume (np.ndarray, optional): Volúmenes (barras x tickers).
+            periods_per_year (float, optional): Períodos por año.
+
+        Returns:
+            list: Eventos nuevos, cada uno un dict con 'timestamp', 'rule',
+            'ticker' y 'value'. Si la misma barra se evalúa varias veces
+            (por ejemplo, una barra en formación), solo se emiten las
+            condiciones que no estaban activas.
+        """
+        tickers = list(tickers)
+        if self._tickers != tickers:
+            self._tickers = tickers
+            self.active = np.zeros((len(self.rules), len(tickers)), dtype=bool)
+        periods = periods_per_year or self.periods_per_year or 252.0
+        ctx = _BarContext(
+            np.asarray(close, dtype=np.float64),
+            None if volume is None else np.asarray(volume, dtype=np.float64),
+            periods,
+        )
+        hits = np.zeros_like(self.active)
+        values = np.full(self.active.shape, np.nan)
+        for i, evaluate in enumerate(self._compiled):
+            hit, value = evaluate(ctx)
+            hits[i] = hit
+            values[i] = value
+
+        rising = hits & ~self.active
+        self.active = hits
+        rule_idx, tick_idx = np.nonzero(rising)
+        events = [
+            {
+                "timestamp": timestamp,
+                "rule": self.rules[r].name,
+                "ticker": tickers[t],
+                "value": float(values[r, t]),
+            }
+            for r, t in zip(rule_idx, tick_idx)
+        ]
+        if events:
+            for sink in self.sinks:
+                sink(events)
+        return events
+
+    def evaluate_data(self, data, periods_per_year=None):
+        """
+        Evalúa las reglas sobre la última barra de un DataFrame de precios.
+
+        Args:
+            data (pd.DataFrame): Datos con columnas (campo, ticker).
+            periods_per_year (float, optional): Barras por año; por
+                defecto, las del motor o las inferidas del índice.
+
+        Returns:
+            list: Eventos nuevos.
+        """
+        tail = data.iloc[-self.lookback:]
+        close = field_frame(tail, "Close")
+        volume = None
+        if isinstance(data.columns, pd.MultiIndex) \
+                and "Volume" in data.columns.get_level_values(0):
+            volume = field_frame(tail, "Volume") \
+                .reindex(columns=close.columns).to_numpy(dtype=np.float64)
+        periods = periods_per_year or self.periods_per_year \
+            or infer_periods_per_year(data.index)
+        return self.evaluate(
+            close.to_numpy(dtype=np.float64, na_value=np.nan),
+            close.columns,
+            timestamp=tail.index[-1],
+            volume=volume,
+            periods_per_year=periods,
+        )
+
+    def scan(self, data):
+        """
+        Recorre la historia barra a barra y retorna todos los eventos.
+
+        Útil para revisar cuándo se habrían disparado las reglas.
+
+        Args:
+            data (pd.DataFrame): Datos con columnas (campo, ticker).
+
+        Returns:
+            pd.DataFrame: Eventos con columnas timestamp, rule, ticker, value.
+        """
+        periods = self.periods_per_year or infer_periods_per_year(data.index)
+        events = []
+        for end in range(1, len(data) + 1):
+            events.extend(self.evaluate_data(data.iloc[:end], periods))
+        return pd.DataFrame(
+            events, columns=["timestamp", "rule", "ticker", "value"]
+        )
+
+    def as_callback(self):
+        """
+        Retorna un callback para ``LiveWatcher.register``.
+
+        Cada barra nueva o corregida de la actualización se evalúa en
+        orden, como en :meth:`scan`, de modo que una consulta que trae
+        varias barras no omite los cruces intermedios.
+
+        Returns:
+            callable: Función que evalúa las reglas en cada actualización y
+            retorna los eventos nuevos.
+        """
+        def callback(wallet, _, bars):
+            data = wallet.data
+            first = len(data) - len(bars)
+            events = []
+            for end in range(max(first, 0) + 1, len(data) + 1):
+                events.extend(self.evaluate_data(data.iloc[:end]))
+            return events
+        return callback
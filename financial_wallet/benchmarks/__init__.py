@@ -0,0 +1,7 @@
+"""
+Benchmarks de rendimiento de Financial Wallet.
+
+Cada módulo se ejecuta de forma independiente, por ejemplo:
+
+    python -m financial_wallet.benchmarks.store_load
+"""
@@ -0,0 +1,115 @@
+"""
+Perfil por método de una cartera sintética.
+
+Activa ``FinancialWallet.enable_profiling`` sobre una cartera con datos de
+``financial_wallet.synthetic`` (sin acceso a la red) y ejecuta el flujo
+habitual: descarga, retornos, volatilidad, gráfico y exportación. Muestra
+la tabla resumen por método y, para los métodos indicados en
+``--profile``, las funciones más costosas según cProfile.
+
+Uso:
+    python -m financial_wallet.benchmarks.profile --tickers 500 --bars 2520
+    python -m financial_wallet.benchmarks.profile --profile export_data --json perfil.json
+"""
+
+import argparse
+import contextlib
+import io
+import tempfile
+from unittest import mock
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from financial_wallet.synthetic import synthetic_download  # noqa: E402
+from financial_wallet.wallet import FinancialWallet  # noqa: E402
+
+
+def _render_and_close():
+    """Reemplazo de ``plt.show``: dibuja la figura y la cierra."""
+    figure = plt.gcf()
+    figure.canvas.draw()
+    plt.close(figure)
+
+
+def run(n_tickers=100, n_bars=1_260, profile=(), memory=True,
+        missing_rate=0.01):
+    """
+    Ejecuta el flujo de la cartera con la instrumentación activa.
+
+    Args:
+        n_tickers (int): Tickers del universo.
+        n_bars (int): Barras diarias por ticker.
+        profile (tuple): Métodos cuya primera llamada se perfila con
+            cProfile.
+        memory (bool): Mide la memoria máxima de cada llamada.
+        missing_rate (float): Proporción de barras faltantes.
+
+    Returns:
+        Profiler: Registro de las llamadas.
+    """
+    download = synthetic_download(n_bars=n_bars, missing_rate=missing_rate)
+    with tempfile.TemporaryDirectory() as tmp, \
+            mock.patch("financial_wallet.wallet.yf.download", download), \
+            mock.patch("financial_wallet.wallet.plt.show", _render_and_close), \
+            mock.patch("builtins.input", side_effect=["1", "profile"]), \
+            contextlib.redirect_stdout(io.StringIO()):
+        wallet = FinancialWallet(output_dir=tmp)
+        wallet.ticks = [f"T{i:04d}" for i in range(n_tickers)]
+        wallet.start = "2000-01-03"
+        profiler = wallet.enable_profiling(memory=memory)
+        for method in profile:
+            profiler.profile_next(method)
+
+        wallet.download_info()
+        wallet.compute_returns()
+        wallet.compute_volatility()
+        wallet.compute_volatility(window=20)
+        wallet.show_tick(wallet.ticks[0])
+        wallet.export_data()
+        wallet.disable_profiling()
+    return profiler
+
+
+def main():
+    """Ejecuta el perfil desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tickers", type=int, default=100)
+    parser.add_argument("--bars", type=int, default=1_260)
+    parser.add_argument(
+        "--profile", nargs="*", default=[],
+        help="Métodos cuya próxima llamada se perfila con cProfile.",
+    )
+    parser.add_argument("--json", help="Archivo JSON de salida.")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="No mide memoria (menos sobrecosto).")
+    args = parser.parse_args()
+
+    profiler = run(
+        args.tickers, args.bars, args.profile, memory=not args.no_memory
+    )
+
+    print("="*70)
+    print(f"PERFIL DE FINANCIAL WALLET ({args.tickers} tickers, "
+          f"{args.bars} barras)")
+    print("="*70)
+    print(profiler.summary_table())
+    for record in profiler.records:
+        if "profile" in record:
+            print("\n" + "-"*70)
+            print(f"cProfile: {record['method']}")
+            print("-"*70)
+            print(pd.DataFrame(record["profile"]).head(15).to_string(
+                index=False, float_format="{:.4f}".format
+            ))
+    if args.json:
+        profiler.to_json(args.json)
+        print(f"\nRegistros guardados en {args.json}")
+
+
+if __name__ == "__main__":
+    main()
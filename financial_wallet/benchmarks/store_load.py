@@ -0,0 +1,127 @@
+"""
+Benchmark de tiempo de carga: CSV exportado versus almacén binario.
+
+Genera un universo sintético, lo guarda como CSV (igual que
+``export_data``) y como almacén binario, y mide el tiempo de carga en el
+proceso actual y en procesos trabajadores que abren el mismo archivo.
+
+Uso:
+    python -m financial_wallet.benchmarks.store_load --tickers 500 --bars 2520
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from multiprocessing import get_context
+
+import pandas as pd
+
+from financial_wallet.store import open_store, write_store
+from financial_wallet.synthetic import synthetic_ohlcv
+
+
+def _load_csv(path):
+    """Carga el CSV y toca la columna Close para forzar la lectura."""
+    data = pd.read_csv(path, header=[0, 1], index_col=0, parse_dates=True)
+    return float(data["Close"].iloc[-1].sum())
+
+
+def _load_store(path):
+    """Abre el almacén y toca la columna Close de la última barra."""
+    data = open_store(path).to_dataframe()
+    return float(data["Close"].iloc[-1].sum())
+
+
+def _timed(func, path):
+    """Ejecuta func(path) y retorna el tiempo transcurrido en segundos."""
+    start = time.perf_counter()
+    func(path)
+    return time.perf_counter() - start
+
+
+def _measure(func, path, repeat):
+    """Mejor tiempo de ``repeat`` ejecuciones en el proceso actual."""
+    return min(_timed(func, path) for _ in range(repeat))
+
+
+def _measure_workers(func, path, workers):
+    """Tiempo total para que ``workers`` procesos carguen los datos."""
+    ctx = get_context("spawn")
+    with ctx.Pool(workers) as pool:
+        pool.map(abs, range(workers))  # Arranque de los procesos
+        start = time.perf_counter()
+        pool.starmap(_timed, [(func, path)] * workers)
+        return time.perf_counter() - start
+
+
+def run(n_tickers=500, n_bars=2520, repeat=3, workers=4):
+    """
+    Ejecuta el benchmark y retorna los tiempos medidos.
+
+    Args:
+        n_tickers (int): Número de tickers sintéticos.
+        n_bars (int): Número de barras por ticker.
+        repeat (int): Repeticiones en el proceso actual.
+        workers (int): Procesos trabajadores (0 para omitir).
+
+    Returns:
+        dict: Tiempos en segundos y tamaños en bytes.
+    """
+    data = synthetic_ohlcv(n_tickers, n_bars)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "prices.csv")
+        store_path = os.path.join(tmp, "store")
+        data.to_csv(csv_path)
+        write_store(data, store_path)
+
+        results = {
+            "tickers": n_tickers,
+            "bars": n_bars,
+            "csv_bytes": os.path.getsize(csv_path),
+            "store_bytes": sum(
+                os.path.getsize(os.path.join(store_path, name))
+                for name in os.listdir(store_path)
+            ),
+            "csv_load_s": _measure(_load_csv, csv_path, repeat),
+            "store_load_s": _measure(_load_store, store_path, repeat),
+        }
+        if workers:
+            results["workers"] = workers
+            results["csv_workers_s"] = _measure_workers(
+                _load_csv, csv_path, workers
+            )
+            results["store_workers_s"] = _measure_workers(
+                _load_store, store_path, workers
+            )
+    return results
+
+
+def main():
+    """Ejecuta el benchmark desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--bars", type=int, default=2520)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    results = run(args.tickers, args.bars, args.repeat, args.workers)
+
+    print("="*70)
+    print(f"CARGA DE {results['tickers']} TICKERS x {results['bars']} BARRAS")
+    print("="*70)
+    print(f"Tamaño CSV:      {results['csv_bytes'] / 1e6:>10.1f} MB")
+    print(f"Tamaño almacén:  {results['store_bytes'] / 1e6:>10.1f} MB")
+    print(f"Carga CSV:       {results['csv_load_s']:>10.3f} s")
+    print(f"Carga almacén:   {results['store_load_s']:>10.3f} s")
+    if "workers" in results:
+        print(f"CSV ({results['workers']} procesos):     "
+              f"{results['csv_workers_s']:>8.3f} s")
+        print(f"Almacén ({results['workers']} procesos): "
+              f"{results['store_workers_s']:>8.3f} s")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+Suite de benchmarks de Financial Wallet con datos sintéticos.
+
+Mide tiempo y memoria máxima de las operaciones principales de la cartera
+(descarga, retornos, volatilidad, correlación, exportación y gráficos) para
+universos de distinto tamaño, sin acceso a la red: ``yf.download`` se
+reemplaza por el generador de ``financial_wallet.synthetic``.
+
+Cada ejecución agrega sus resultados a un archivo JSON Lines junto con la
+versión, el commit y las versiones de las librerías, y muestra la variación
+frente a la ejecución anterior para detectar regresiones.
+
+Uso:
+    python -m financial_wallet.benchmarks.suite --sizes 10 100 1000 5000
+    python -m financial_wallet.benchmarks.suite --cases returns correlation
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from unittest import mock
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import financial_wallet  # noqa: E402
+from financial_wallet.synthetic import synthetic_download  # noqa: E402
+from financial_wallet.wallet import FinancialWallet  # noqa: E402
+
+
+DEFAULT_SIZES = (10, 100, 1_000, 5_000)
+DEFAULT_OUTPUT = "data/benchmarks/financial_wallet.jsonl"
+
+
+def _render_and_close():
+    """Reemplazo de ``plt.show``: dibuja la figura y la cierra."""
+    figure = plt.gcf()
+    figure.canvas.draw()
+    plt.close(figure)
+
+
+def _case_download(wallet):
+    """
+    Armado y validación del DataFrame de la cartera en ``download_info``.
+
+    ``yf.download`` retorna datos generados de antemano (ver :func:`run`),
+    de modo que solo se mide el trabajo de la cartera.
+    """
+    wallet.download_info()
+
+
+def _case_returns(wallet):
+    """Retornos por barra de todos los tickers."""
+    wallet.compute_returns()
+
+
+def _case_volatility(wallet):
+    """Volatilidad anualizada de todos los tickers."""
+    wallet.compute_volatility()
+
+
+def _case_correlation(wallet):
+    """Matriz de correlación de retornos."""
+    wallet.compute_returns().corr()
+
+
+def _case_export(wallet):
+    """Exportación a CSV respondiendo las preguntas de ``export_data``."""
+    with mock.patch("builtins.input", side_effect=["1", "benchmark"]):
+        wallet.export_data()
+
+
+def _case_plotting(wallet):
+    """Serie de un ticker y dispersión de un par, dibujadas sin ventana."""
+    with mock.patch("financial_wallet.wallet.plt.show", _render_and_close):
+        wallet.show_tick(wallet.ticks[0])
+        wallet._plot_pair(wallet.ticks[0], wallet.ticks[-1])
+
+
+CASES = {
+    "download": _case_download,
+    "returns": _case_returns,
+    "volatility": _case_volatility,
+    "correlation": _case_correlation,
+    "export": _case_export,
+    "plotting": _case_plotting,
+}
+
+
+def _environment():
+    """Versión, commit y librerías, para comparar ejecuciones."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "version": financial_wallet.__version__,
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+    }
+
+
+def _make_wallet(n_tickers, output_dir):
+    """Crea una cartera con ``yf.download`` sintético ya descargada."""
+    wallet = FinancialWallet(output_dir=output_dir)
+    wallet.ticks = [f"T{i:04d}" for i in range(n_tickers)]
+    wallet.start = "2000-01-03"
+    wallet.end = "2030-01-01"
+    with contextlib.redirect_stdout(io.StringIO()):
+        wallet.download_info()
+    return wallet
+
+
+def _measure(func, wallet, repeat):
+    """
+    Mide el mejor tiempo de ``repeat`` ejecuciones y la memoria máxima.
+
+    La memoria se mide en una ejecución aparte con ``tracemalloc`` (que
+    también registra las asignaciones de numpy) para no afectar el tiempo.
+    """
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(wallet)
+            timings.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            func(wallet)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return min(timings), peak
+
+
+def run(sizes=DEFAULT_SIZES, n_bars=1_260, cases=None, repeat=3,
+        missing_rate=0.01):
+    """
+    Ejecuta la suite y retorna un registro por caso y tamaño.
+
+    Args:
+        sizes (tuple): Números de tickers a medir.
+        n_bars (int): Barras diarias por ticker.
+        cases (list, optional): Casos a ejecutar; por defecto, todos.
+        repeat (int): Repeticiones por caso (se informa el mejor tiempo).
+        missing_rate (float): Proporción de barras faltantes.
+
+    Returns:
+        list: Diccionarios con case, tickers, bars, time_s y peak_mb.
+    """
+    cases = cases or list(CASES)
+    download = synthetic_download(n_bars=n_bars, missing_rate=missing_rate)
+    records = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_tickers in sizes:
+            with mock.patch("financial_wallet.wallet.yf.download", download):
+                wallet = _make_wallet(n_tickers, tmp)
+            # Los casos reciben los datos ya generados: generarlos no forma
+            # parte de lo medido
+            raw = wallet.data
+            with mock.patch(
+                "financial_wallet.wallet.yf.download", return_value=raw
+            ):
+                for case in cases:
+                    elapsed, peak = _measure(CASES[case], wallet, repeat)
+                    records.append({
+                        "case": case,
+                        "tickers": n_tickers,
+                        "bars": n_bars,
+                        "time_s": elapsed,
+                        "peak_mb": peak / 1e6,
+                    })
+                    print(
+                        f"  {case:<12} {n_tickers:>6} tickers "
+                        f"{elapsed:>9.4f} s {peak / 1e6:>9.1f} MB"
+                    )
+            del wallet
+    return records
+
+
+def load_results(path):
+    """Lee los registros guardados en un archivo JSON Lines."""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def save_results(records, path):
+    """Agrega los registros de una ejecución al archivo JSON Lines."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    stamp = datetime.now().isoformat(timespec="seconds")
+    environment = _environment()
+    with open(path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps({"timestamp": stamp, **environment, **record}))
+            f.write("\n")
+
+
+def compare(records, previous):
+    """
+    Compara una ejecución con la última medición previa de cada caso.
+
+    Args:
+        records (list): Registros de la ejecución actual.
+        previous (list): Registros guardados anteriormente.
+
+    Returns:
+        pd.DataFrame: Tiempo y memoria actuales, anteriores y su variación.
+    """
+    current = pd.DataFrame(records)
+    keys = ["case", "tickers", "bars"]
+    if not previous:
+        return current.set_index(keys)
+    last = pd.DataFrame(previous).groupby(keys)[["time_s", "peak_mb"]].last()
+    table = current.set_index(keys).join(last, rsuffix="_prev")
+    table["time_change"] = table["time_s"] / table["time_s_prev"] - 1
+    table["memory_change"] = table["peak_mb"] / table["peak_mb_prev"] - 1
+    return table
+
+
+def main():
+    """Ejecuta la suite desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES)
+    )
+    parser.add_argument("--bars", type=int, default=1_260)
+    parser.add_argument("--cases", nargs="+", choices=list(CASES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--missing-rate", type=float, default=0.01)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument(
+        "--no-save", action="store_true",
+        help="No guarda los resultados en el archivo de historial.",
+    )
+    args = parser.parse_args()
+
+    print("="*70)
+    print(f"BENCHMARKS DE FINANCIAL WALLET ({args.bars} barras por ticker)")
+    print("="*70)
+    records = run(
+        args.sizes, args.bars, args.cases, args.repeat, args.missing_rate
+    )
+    previous = load_results(args.output)
+    table = compare(records, previous)
+
+    print("="*70)
+    with pd.option_context("display.float_format", "{:.4f}".format):
+        print(table.to_string())
+    print("="*70)
+    if not args.no_save:
+        save_results(records, args.output)
+        print(f"Resultados agregados a {args.output}")
+
+
+if __name__ == "__main__":
+    main()
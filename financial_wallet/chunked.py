@@ -0,0 +1,482 @@
+"""
+Análisis por bloques para historias de precios que no caben en memoria.
+
+Los datos almacenados se leen por bloques de tiempo (filas) o de tickers
+(columnas) y cada estadística se acumula en agregados parciales que pueden
+combinarse entre sí. El resultado es el mismo que se obtendría cargando
+todo el DataFrame y usando ``pct_change``, ``std`` y ``corr`` de pandas,
+pero la memoria usada depende del tamaño del bloque y no del archivo.
+
+Agregados disponibles:
+    - :class:`ReturnMoments`: conteo, media y suma de cuadrados de los
+      retornos (fórmula de combinación de Chan et al.).
+    - :class:`CorrelationAccumulator`: sumas cruzadas por pares de tickers
+      para la matriz de correlación con observaciones completas por pares.
+    - :class:`DrawdownTracker`: máximo histórico, mínimo y caída máxima.
+"""
+
+import csv
+
+import numpy as np
+import pandas as pd
+
+from ._frames import parse_timestamps
+from .resample import TRADING_DAYS, infer_periods_per_year
+
+
+class ReturnMoments:
+    """
+    Media y varianza de los retornos por ticker, combinables entre bloques.
+
+    Atributos:
+        count (np.ndarray): Retornos válidos por ticker.
+        mean (np.ndarray): Media de los retornos por ticker.
+        m2 (np.ndarray): Suma de cuadrados de las desviaciones a la media.
+    """
+
+    def __init__(self, n_tickers):
+        self.count = np.zeros(n_tickers)
+        self.mean = np.zeros(n_tickers)
+        self.m2 = np.zeros(n_tickers)
+
+    def update(self, returns):
+        """
+        Agrega un bloque de retornos de forma (barras, tickers).
+
+        Args:
+            returns (np.ndarray): Retornos del bloque, NaN si faltan.
+        """
+        part = ReturnMoments(returns.shape[1])
+        valid = ~np.isnan(returns)
+        part.count = valid.sum(axis=0).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            part.mean = np.where(
+                part.count > 0, np.nansum(returns, axis=0) / part.count, 0.0
+            )
+        part.m2 = np.nansum((returns - part.mean) ** 2, axis=0)
+        self.merge(part)
+
+    def merge(self, other):
+        """
+        Combina con los momentos de otro bloque del mismo universo.
+
+        Args:
+            other (ReturnMoments): Agregado parcial a incorporar.
+        """
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(total > 0, other.count / total, 0.0)
+            cross = np.where(total > 0, self.count * other.count / total, 0.0)
+        self.mean = self.mean + delta * weight
+        self.m2 = self.m2 + other.m2 + delta * delta * cross
+        self.count = total
+
+    def std(self):
+        """Desviación estándar muestral (ddof=1) por ticker."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(
+                self.count > 1, np.sqrt(self.m2 / (self.count - 1)), np.nan
+            )
+
+
+class CorrelationAccumulator:
+    """
+    Sumas cruzadas por pares de tickers para la matriz de correlación.
+
+    Para cada par (i, j) se acumulan solo las barras donde ambos tienen
+    retorno, igual que ``DataFrame.corr``. La memoria es O(tickers²).
+    """
+
+    def __init__(self, n_tickers):
+        shape = (n_tickers, n_tickers)
+        self.n = np.zeros(shape)
+        self.sx = np.zeros(shape)
+        self.sxx = np.zeros(shape)
+        self.sxy = np.zeros(shape)
+
+    def update(self, returns):
+        """
+        Agrega un bloque de retornos de forma (barras, tickers).
+
+        Args:
+            returns (np.ndarray): Retornos del bloque, NaN si faltan.
+        """
+        valid = (~np.isnan(returns)).astype(np.float64)
+        x = np.where(valid > 0, returns, 0.0)
+        self.n += valid.T @ valid
+        self.sx += x.T @ valid
+        self.sxx += (x * x).T @ valid
+        self.sxy += x.T @ x
+
+    def merge(self, other):
+        """
+        Combina con las sumas de otro bloque del mismo universo.
+
+        Args:
+            other (CorrelationAccumulator): Agregado parcial a incorporar.
+        """
+        self.n += other.n
+        self.sx += other.sx
+        self.sxx += other.sxx
+        self.sxy += other.sxy
+
+    def correlation(self):
+        """Matriz de correlación de Pearson por pares completos."""
+        sy, syy = self.sx.T, self.sxx.T
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = self.n * self.sxy - self.sx * sy
+            var_x = self.n * self.sxx - self.sx * self.sx
+            var_y = self.n * syy - sy * sy
+            corr = cov / np.sqrt(var_x * var_y)
+        return np.where(self.n > 1, np.clip(corr, -1.0, 1.0), np.nan)
+
+
+class DrawdownTracker:
+    """
+    Caída máxima desde el máximo histórico, combinable entre bloques.
+
+    Los bloques deben combinarse en orden temporal: la caída de un bloque
+    posterior se mide también contra el máximo de los anteriores.
+
+    Atributos:
+        peak (np.ndarray): Máximo histórico del precio por ticker.
+        trough (np.ndarray): Mínimo del precio por ticker.
+        max_drawdown (np.ndarray): Caída máxima (valor negativo o cero).
+        current_drawdown (np.ndarray): Caída de la última barra válida.
+    """
+
+    def __init__(self, n_tickers):
+        self.peak = np.full(n_tickers, np.nan)
+        self.trough = np.full(n_tickers, np.nan)
+        self.max_drawdown = np.full(n_tickers, np.nan)
+        self.current_drawdown = np.full(n_tickers, np.nan)
+
+    def update(self, prices):
+        """
+        Agrega un bloque de precios posterior a los ya procesados.
+
+        Args:
+            prices (np.ndarray): Precios de forma (barras, tickers).
+        """
+        if prices.shape[0] == 0:
+            return
+        running = np.fmax.accumulate(
+            np.vstack([self.peak[np.newaxis, :], prices]), axis=0
+        )[1:]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            drawdown = prices / running - 1.0
+
+        valid = ~np.isnan(prices)
+        has_data = valid.any(axis=0)
+        chunk_dd = np.min(np.where(valid, drawdown, np.inf), axis=0)
+        chunk_low = np.min(np.where(valid, prices, np.inf), axis=0)
+        last = prices.shape[0] - 1 - np.argmax(valid[::-1], axis=0)
+        last_dd = drawdown[last, np.arange(prices.shape[1])]
+
+        self.max_drawdown = np.where(
+            has_data, np.fmin(self.max_drawdown, chunk_dd), self.max_drawdown
+        )
+        self.trough = np.where(
+            has_data, np.fmin(self.trough, chunk_low), self.trough
+        )
+        self.current_drawdown = np.where(
+            has_data, last_dd, self.current_drawdown
+        )
+        self.peak = running[-1]
+
+    def merge(self, later):
+        """
+        Combina con el agregado de un bloque temporal posterior.
+
+        Args:
+            later (DrawdownTracker): Agregado del bloque siguiente.
+        """
+        combined_peak = np.fmax(self.peak, later.peak)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            # Mínimo posterior medido contra el máximo de los anteriores
+            cross = later.trough / self.peak - 1.0
+            # La caída actual del bloque posterior se recalcula contra el
+            # máximo combinado, que puede ser mayor que el suyo.
+            last_price = (later.current_drawdown + 1.0) * later.peak
+            rebased = last_price / combined_peak - 1.0
+
+        self.max_drawdown = np.fmin(
+            np.fmin(self.max_drawdown, later.max_drawdown), cross
+        )
+        self.current_drawdown = np.where(
+            np.isnan(later.current_drawdown), self.current_drawdown, rebased
+        )
+        self.peak = combined_peak
+        self.trough = np.fmin(self.trough, later.trough)
+
+
+class ChunkedAnalysis:
+    """
+    Análisis incremental de precios de cierre leídos por bloques de tiempo.
+
+    Calcula retornos entre bloques consecutivos conservando la última fila
+    del bloque anterior, de modo que el resultado coincide con el cálculo
+    sobre el DataFrame completo.
+
+    Atributos:
+        tickers (list): Tickers en el orden de las columnas.
+        n_bars (int): Barras procesadas.
+    """
+
+    _INDEX_SAMPLE = 10_000
+
+    def __init__(self, tickers, correlation=True):
+        """
+        Inicializa los agregados.
+
+        Args:
+            tickers (list): Tickers del universo analizado.
+            correlation (bool): Si se acumula la matriz de correlación
+                (memoria O(tickers²)).
+        """
+        self.tickers = list(tickers)
+        self.n_bars = 0
+        n = len(self.tickers)
+        self.moments = ReturnMoments(n)
+        self.correlation = CorrelationAccumulator(n) if correlation else None
+        self.drawdown = DrawdownTracker(n)
+        self._first_row = None
+        self._last_row = None
+        self._index_sample = []
+
+    def update(self, prices):
+        """
+        Procesa el siguiente bloque temporal de precios de cierre.
+
+        Args:
+            prices (pd.DataFrame): Precios (fechas x tickers) con las
+                columnas en el orden de ``tickers``.
+        """
+        values = prices.to_numpy(dtype=np.float64, na_value=np.nan)
+        if values.shape[0] == 0:
+            return
+
+        if self._last_row is None:
+            self._first_row = values[0].copy()
+            previous = values[:-1]
+            current = values[1:]
+        else:
+            previous = np.vstack([self._last_row[np.newaxis, :], values[:-1]])
+            current = values
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            returns = current / previous - 1.0
+        self.moments.update(returns)
+        if self.correlation is not None:
+            self.correlation.update(returns)
+        self.drawdown.update(values)
+
+        self._last_row = values[-1].copy()
+        self.n_bars += values.shape[0]
+        if len(self._index_sample) < self._INDEX_SAMPLE:
+            self._index_sample.extend(
+                prices.index[:self._INDEX_SAMPLE - len(self._index_sample)]
+            )
+
+    def merge(self, later):
+        """
+        Combina con el análisis del bloque temporal inmediatamente posterior.
+
+        Permite procesar segmentos de tiempo en paralelo y unirlos en orden.
+        El retorno en la frontera entre ambos segmentos se agrega aquí.
+
+        Args:
+            later (ChunkedAnalysis): Análisis del segmento siguiente.
+        """
+        if later._first_row is None:
+            return
+        if self._last_row is not None:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                boundary = (later._first_row / self._last_row - 1.0)
+            boundary = boundary[np.newaxis, :]
+            self.moments.update(boundary)
+            if self.correlation is not None:
+                self.correlation.update(boundary)
+        else:
+            self._first_row = later._first_row
+
+        self.moments.merge(later.moments)
+        if self.correlation is not None and later.correlation is not None:
+            self.correlation.merge(later.correlation)
+        self.drawdown.merge(later.drawdown)
+        self._last_row = later._last_row
+        self.n_bars += later.n_bars
+        room = self._INDEX_SAMPLE - len(self._index_sample)
+        self._index_sample.extend(later._index_sample[:max(room, 0)])
+
+    def periods_per_year(self):
+        """Períodos por año inferidos de las primeras barras procesadas."""
+        if len(self._index_sample) < 2:
+            return float(TRADING_DAYS)
+        return infer_periods_per_year(pd.DatetimeIndex(self._index_sample))
+
+    def results(self, periods_per_year=None):
+        """
+        Obtiene los resultados finales del análisis.
+
+        Args:
+            periods_per_year (float, optional): Períodos por año para
+                anualizar. Por defecto se infiere de las barras.
+
+        Returns:
+            dict: 'summary' (DataFrame por ticker con observaciones, retorno
+            medio, volatilidad anualizada, caída máxima y caída actual) y
+            'correlation' (DataFrame tickers x tickers, o None).
+        """
+        periods = periods_per_year or self.periods_per_year()
+        summary = pd.DataFrame(
+            {
+                "observations": self.moments.count.astype(np.int64),
+                "mean_return": np.where(
+                    self.moments.count > 0, self.moments.mean, np.nan
+                ),
+                "volatility": self.moments.std() * np.sqrt(periods),
+                "max_drawdown": self.drawdown.max_drawdown,
+                "current_drawdown": self.drawdown.current_drawdown,
+            },
+            index=pd.Index(self.tickers, name="Ticker"),
+        )
+        correlation = None
+        if self.correlation is not None:
+            correlation = pd.DataFrame(
+                self.correlation.correlation(),
+                index=self.tickers,
+                columns=self.tickers,
+            )
+        return {"summary": summary, "correlation": correlation}
+
+
+def _csv_layout(path):
+    """Lee el encabezado de un CSV exportado y retorna (columnas, filas)."""
+    header = pd.read_csv(path, header=[0, 1], index_col=0, nrows=0)
+    skip = 2
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = csv.reader(f)
+        next(rows)
+        next(rows)
+        third = next(rows, [])
+    # pandas escribe una fila extra con el nombre del índice
+    if third and not any(third[1:]):
+        skip = 3
+    return header.columns, skip
+
+
+def iter_csv_chunks(path, field="Close", chunksize=100_000, tickers=None):
+    """
+    Lee un campo de un CSV exportado por bloques de filas.
+
+    Solo se leen las columnas del campo (y tickers) solicitados, por lo que
+    la memoria depende de ``chunksize`` y de los tickers elegidos.
+
+    Args:
+        path (str): Archivo generado por ``FinancialWallet.export_data``.
+        field (str): Campo a leer, por ejemplo 'Close'.
+        chunksize (int): Filas por bloque.
+        tickers (list, optional): Subconjunto de tickers a leer.
+
+    Yields:
+        pd.DataFrame: Bloque de precios (fechas x tickers); las fechas con
+        desfase horario se expresan en UTC (ver ``parse_timestamps``).
+
+    Raises:
+        KeyError: Si el campo o algún ticker no existe en el archivo.
+    """
+    columns, skip = _csv_layout(path)
+    positions = [
+        i for i, (name, tick) in enumerate(columns)
+        if name == field and (tickers is None or tick in tickers)
+    ]
+    if not positions:
+        raise KeyError(f"El campo {field} no está en {path}.")
+    names = [columns[i][1] for i in positions]
+    if tickers is not None:
+        missing = set(tickers) - set(names)
+        if missing:
+            raise KeyError(f"Tickers no encontrados en {path}: {missing}")
+
+    reader = pd.read_csv(
+        path,
+        header=None,
+        skiprows=skip,
+        index_col=0,
+        usecols=[0] + [i + 1 for i in positions],
+        chunksize=chunksize,
+    )
+    for chunk in reader:
+        chunk.columns = names
+        chunk.index = parse_timestamps(chunk.index).rename("Date")
+        if tickers is not None:
+            chunk = chunk[list(tickers)]
+        yield chunk
+
+
+def analyze_chunks(chunks, tickers=None, correlation=True,
+                   periods_per_year=None):
+    """
+    Analiza una secuencia de bloques temporales de precios de cierre.
+
+    Args:
+        chunks (iterable): Bloques (fechas x tickers) en orden temporal.
+        tickers (list, optional): Tickers esperados; por defecto, los del
+            primer bloque.
+        correlation (bool): Si se calcula la matriz de correlación.
+        periods_per_year (float, optional): Períodos por año para anualizar.
+
+    Returns:
+        dict: Resultados de :meth:`ChunkedAnalysis.results`.
+    """
+    analysis = None
+    for chunk in chunks:
+        if analysis is None:
+            tickers = list(chunk.columns) if tickers is None else tickers
+            analysis = ChunkedAnalysis(tickers, correlation=correlation)
+        analysis.update(chunk[tickers])
+    if analysis is None:
+        analysis = ChunkedAnalysis(tickers or [], correlation=correlation)
+    return analysis.results(periods_per_year)
+
+
+def analyze_csv(path, chunksize=100_000, ticker_chunk=None,
+                periods_per_year=None):
+    """
+    Analiza un CSV exportado sin cargarlo completo en memoria.
+
+    Con ``ticker_chunk`` el archivo se recorre una vez por grupo de tickers,
+    lo que limita además el ancho de cada bloque. En ese modo no se calcula
+    la matriz de correlación, que necesita todos los tickers a la vez.
+
+    Args:
+        path (str): Archivo generado por ``FinancialWallet.export_data``.
+        chunksize (int): Filas por bloque.
+        ticker_chunk (int, optional): Tickers por grupo.
+        periods_per_year (float, optional): Períodos por año para anualizar.
+
+    Returns:
+        dict: 'summary' (DataFrame por ticker) y 'correlation'
+        (DataFrame o None).
+    """
+    if ticker_chunk is None:
+        return analyze_chunks(
+            iter_csv_chunks(path, chunksize=chunksize),
+            periods_per_year=periods_per_year,
+        )
+
+    columns, _ = _csv_layout(path)
+    tickers = [tick for name, tick in columns if name == "Close"]
+    summaries = []
+    for start in range(0, len(tickers), ticker_chunk):
+        group = tickers[start:start + ticker_chunk]
+        part = analyze_chunks(
+            iter_csv_chunks(path, chunksize=chunksize, tickers=group),
+            tickers=group,
+            correlation=False,
+            periods_per_year=periods_per_year,
+        )
+        summaries.append(part["summary"])
+    return {"summary": pd.concat(summaries), "correlation": None}
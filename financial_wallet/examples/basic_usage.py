@@ -196,6 +196,33 @@ def ejemplo_exportacion():
     print(f"\nDatos exportados a: {file_path}")
 
 
+def ejemplo_sin_conexion():
+    """
+    Ejemplo con datos sintéticos, sin acceso a la red.
+
+    Útil para probar la cartera o medir su rendimiento con universos
+    grandes sin depender de Yahoo Finance.
+    """
+    print("\n" + "="*70)
+    print("EJEMPLO 6: DATOS SINTÉTICOS SIN CONEXIÓN")
+    print("="*70)
+
+    from financial_wallet.synthetic import synthetic_ohlcv
+
+    wallet = FinancialWallet()
+    wallet.data = synthetic_ohlcv(
+        n_tickers=500, n_bars=1260, missing_rate=0.01
+    )
+    wallet.ticks = list(wallet.data["Close"].columns)
+
+    print(f"\nTickers sintéticos: {len(wallet.ticks)}")
+    print(f"Forma del DataFrame: {wallet.data.shape}")
+
+    volatility = wallet.compute_volatility().sort_values()
+    print("\nTickers con mayor volatilidad anualizada:")
+    print(volatility.tail(5).to_string(float_format="{:.2%}".format))
+
+
 def main():
     """
     Función principal que ejecuta todos los ejemplos.
@@ -224,6 +251,9 @@ def main():
     # Ejemplo 5: Exportación de datos
     # ejemplo_exportacion()
 
+    # Ejemplo 6: Datos sintéticos sin conexión
+    # ejemplo_sin_conexion()
+
     print("\n" + "="*70)
     print("EJEMPLOS COMPLETADOS")
     print("="*70)
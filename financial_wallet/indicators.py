@@ -0,0 +1,510 @@
+"""
+Indicadores técnicos vectorizados para todos los tickers de la cartera.
+
+Los cálculos operan sobre matrices 2-D de forma (barras, tickers), de modo
+que cada indicador se evalúa para todo el universo en una sola pasada.
+Además, :class:`StreamingIndicators` mantiene el estado de cada indicador
+y lo actualiza con una nueva barra en O(1) por ticker, pensado para
+screeners intradía que reciben datos barra a barra.
+
+Convenciones:
+    - Un valor NaN indica que el ticker no cotizó en esa barra; la salida
+      del indicador en esa barra también es NaN y su estado no cambia.
+    - Las medias de Wilder (RSI, ATR) se inicializan con la media simple
+      de los primeros ``period`` valores, como en la definición original.
+"""
+
+import numpy as np
+import pandas as pd
+
+from ._frames import field_frame, field_matrix
+
+
+def _as_2d(values):
+    """Convierte la entrada en una matriz float64 de forma (barras, tickers)."""
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+    return values
+
+
+class _RollingWindow:
+    """
+    Ventana móvil de tamaño fijo con suma y suma de cuadrados acumuladas.
+
+    Los acumulados se recalculan desde el buffer cada vez que éste da la
+    vuelta, lo que evita la deriva numérica de las restas sucesivas sin
+    perder el costo O(1) amortizado por actualización.
+    """
+
+    def __init__(self, n_tickers, window):
+        self.window = window
+        self.buffer = np.full((window, n_tickers), np.nan)
+        self.pos = 0
+        self.total = np.zeros(n_tickers)
+        self.total_sq = np.zeros(n_tickers)
+        self.count = np.zeros(n_tickers, dtype=np.int64)
+
+    def update(self, x):
+        """Agrega una barra y descarta la más antigua de la ventana."""
+        old = self.buffer[self.pos]
+        old_valid = ~np.isnan(old)
+        old_clean = np.where(old_valid, old, 0.0)
+        valid = ~np.isnan(x)
+        clean = np.where(valid, x, 0.0)
+
+        self.total += clean - old_clean
+        self.total_sq += clean * clean - old_clean * old_clean
+        self.count += valid.astype(np.int64) - old_valid.astype(np.int64)
+        self.buffer[self.pos] = x
+        self.pos = (self.pos + 1) % self.window
+
+        if self.pos == 0:
+            self.total = np.nansum(self.buffer, axis=0)
+            self.total_sq = np.nansum(self.buffer * self.buffer, axis=0)
+
+    def mean(self):
+        """Media de la ventana, NaN mientras la ventana no esté completa."""
+        full = self.count == self.window
+        return np.where(full, self.total / self.window, np.nan)
+
+    def std(self):
+        """Desviación estándar poblacional de la ventana."""
+        full = self.count == self.window
+        mean = self.total / self.window
+        var = np.maximum(self.total_sq / self.window - mean * mean, 0.0)
+        return np.where(full, np.sqrt(var), np.nan)
+
+
+class _Ema:
+    """Media móvil exponencial inicializada con el primer valor válido."""
+
+    def __init__(self, n_tickers, span):
+        self.alpha = 2.0 / (span + 1.0)
+        self.value = np.full(n_tickers, np.nan)
+
+    def update(self, x):
+        """Actualiza la media con una barra y retorna su valor."""
+        valid = ~np.isnan(x)
+        seed = valid & np.isnan(self.value)
+        step = self.value + self.alpha * (x - self.value)
+        self.value = np.where(seed, x, np.where(valid, step, self.value))
+        return np.where(valid, self.value, np.nan)
+
+
+class _WilderAverage:
+    """Media de Wilder (alpha = 1/period) inicializada con media simple."""
+
+    def __init__(self, n_tickers, period):
+        self.period = period
+        self.total = np.zeros(n_tickers)
+        self.count = np.zeros(n_tickers, dtype=np.int64)
+        self.value = np.full(n_tickers, np.nan)
+
+    def update(self, x):
+        """Actualiza la media con una barra y retorna su valor."""
+        valid = ~np.isnan(x)
+        clean = np.where(valid, x, 0.0)
+        warming = valid & (self.count < self.period)
+
+        self.total += np.where(warming, clean, 0.0)
+        self.count += warming.astype(np.int64)
+        seeded = warming & (self.count == self.period)
+        smoothed = self.value + (clean - self.value) / self.period
+        ready = valid & ~warming
+
+        self.value = np.where(
+            seeded,
+            self.total / self.period,
+            np.where(ready, smoothed, self.value),
+        )
+        return np.where(valid, self.value, np.nan)
+
+
+class StreamingIndicators:
+    """
+    Estado incremental de los indicadores técnicos para todo el universo.
+
+    Cada llamada a :meth:`update` recibe una barra (un valor por ticker) y
+    actualiza todos los indicadores en O(1) por ticker, sin volver a
+    recorrer la historia.
+
+    Atributos:
+        tickers (list): Tickers en el orden de las columnas.
+        n_bars (int): Número de barras procesadas.
+    """
+
+    def __init__(self, tickers, sma_window=20, ema_span=20, rsi_period=14,
+                 macd_spans=(12, 26, 9), bollinger_window=20,
+                 bollinger_std=2.0, atr_period=14):
+        """
+        Inicializa el estado de los indicadores.
+
+        Args:
+            tickers (list): Tickers a seguir, en orden de columnas.
+            sma_window (int): Ventana de la media móvil simple.
+            ema_span (int): Período de la media móvil exponencial.
+            rsi_period (int): Período del RSI.
+            macd_spans (tuple): Períodos (rápido, lento, señal) del MACD.
+            bollinger_window (int): Ventana de las bandas de Bollinger.
+            bollinger_std (float): Número de desviaciones de las bandas.
+            atr_period (int): Período del ATR.
+        """
+        self.tickers = list(tickers)
+        self.n_bars = 0
+        n = len(self.tickers)
+        fast, slow, signal = macd_spans
+
+        self._sma = _RollingWindow(n, sma_window)
+        self._ema = _Ema(n, ema_span)
+        self._gain = _WilderAverage(n, rsi_period)
+        self._loss = _WilderAverage(n, rsi_period)
+        self._macd_fast = _Ema(n, fast)
+        self._macd_slow = _Ema(n, slow)
+        self._macd_signal = _Ema(n, signal)
+        self._bollinger = _RollingWindow(n, bollinger_window)
+        self._bollinger_std = bollinger_std
+        self._atr = _WilderAverage(n, atr_period)
+        self._prev_close = np.full(n, np.nan)
+        self._obv = np.zeros(n)
+
+    def update(self, close, high=None, low=None, volume=None):
+        """
+        Actualiza los indicadores con una nueva barra.
+
+        Args:
+            close (array-like): Precio de cierre de cada ticker.
+            high (array-like, optional): Máximo de cada ticker (para ATR).
+            low (array-like, optional): Mínimo de cada ticker (para ATR).
+            volume (array-like, optional): Volumen de cada ticker (para OBV).
+
+        Returns:
+            dict: Nombre del indicador -> arreglo 1-D con un valor por ticker.
+        """
+        close = np.asarray(close, dtype=np.float64)
+        valid = ~np.isnan(close)
+        prev = self._prev_close
+        change = close - prev
+        result = {}
+
+        self._sma.update(close)
+        result["sma"] = self._sma.mean()
+        result["ema"] = self._ema.update(close)
+
+        avg_gain = self._gain.update(np.where(change > 0, change, 0.0 * change))
+        avg_loss = self._loss.update(np.where(change < 0, -change, 0.0 * change))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = avg_gain / avg_loss
+            rsi = np.where(avg_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + rs))
+        result["rsi"] = np.where(np.isnan(avg_gain), np.nan, rsi)
+
+        macd = self._macd_fast.update(close) - self._macd_slow.update(close)
+        signal = self._macd_signal.update(macd)
+        result["macd"] = macd
+        result["macd_signal"] = signal
+        result["macd_hist"] = macd - signal
+
+        self._bollinger.update(close)
+        mid = self._bollinger.mean()
+        width = self._bollinger_std * self._bollinger.std()
+        result["bb_mid"] = mid
+        result["bb_upper"] = mid + width
+        result["bb_lower"] = mid - width
+
+        if high is not None and low is not None:
+            high = np.asarray(high, dtype=np.float64)
+            low = np.asarray(low, dtype=np.float64)
+            true_range = np.fmax(
+                high - low,
+                np.fmax(np.abs(high - prev), np.abs(low - prev)),
+            )
+            true_range = np.where(valid, true_range, np.nan)
+            result["atr"] = self._atr.update(true_range)
+
+        if volume is not None:
+            volume = np.asarray(volume, dtype=np.float64)
+            step = np.sign(np.nan_to_num(change)) * np.nan_to_num(volume)
+            self._obv += np.where(valid, step, 0.0)
+            result["obv"] = np.where(valid, self._obv, np.nan)
+
+        self._prev_close = np.where(valid, close, prev)
+        self.n_bars += 1
+        return result
+
+    def warm_up(self, data):
+        """
+        Alimenta el estado con la historia completa de la cartera.
+
+        Args:
+            data (pd.DataFrame): Datos de precios con columnas (campo, ticker).
+
+        Returns:
+            dict: Valores de los indicadores en la última barra.
+        """
+        close, high, low, volume = _ohlcv_matrices(data, self.tickers)
+        result = {}
+        for i in range(close.shape[0]):
+            result = self.update(
+                close[i],
+                None if high is None else high[i],
+                None if low is None else low[i],
+                None if volume is None else volume[i],
+            )
+        return result
+
+    def snapshot(self, result):
+        """
+        Convierte el resultado de :meth:`update` en un DataFrame.
+
+        Args:
+            result (dict): Salida de :meth:`update`.
+
+        Returns:
+            pd.DataFrame: Un ticker por fila y un indicador por columna.
+        """
+        return pd.DataFrame(result, index=pd.Index(self.tickers, name="Ticker"))
+
+
+def sma(close, window):
+    """
+    Media móvil simple vectorizada mediante sumas acumuladas.
+
+    Args:
+        close (array-like): Precios de forma (barras, tickers).
+        window (int): Tamaño de la ventana.
+
+    Returns:
+        np.ndarray: Media móvil, NaN donde la ventana tiene datos faltantes.
+    """
+    close = _as_2d(close)
+    valid = ~np.isnan(close)
+    zeros = np.zeros((1, close.shape[1]))
+    total = np.vstack([zeros, np.cumsum(np.where(valid, close, 0.0), axis=0)])
+    count = np.vstack([zeros, np.cumsum(valid, axis=0)])
+
+    out = np.full(close.shape, np.nan)
+    if close.shape[0] >= window:
+        window_total = total[window:] - total[:-window]
+        window_count = count[window:] - count[:-window]
+        out[window - 1:] = np.where(
+            window_count == window, window_total / window, np.nan
+        )
+    return out
+
+
+def rolling_std(close, window):
+    """
+    Desviación estándar poblacional móvil mediante sumas acumuladas.
+
+    Args:
+        close (array-like): Precios de forma (barras, tickers).
+        window (int): Tamaño de la ventana.
+
+    Returns:
+        np.ndarray: Desviación estándar móvil.
+    """
+    close = _as_2d(close)
+    mean = sma(close, window)
+    mean_sq = sma(close * close, window)
+    return np.sqrt(np.maximum(mean_sq - mean * mean, 0.0))
+
+
+def _run_recursive(state, values):
+    """Aplica un estado recursivo fila por fila, vectorizado por ticker."""
+    out = np.empty(values.shape)
+    for i in range(values.shape[0]):
+        out[i] = state.update(values[i])
+    return out
+
+
+def ema(close, span):
+    """
+    Media móvil exponencial con alpha = 2 / (span + 1).
+
+    Args:
+        close (array-like): Precios de forma (barras, tickers).
+        span (int): Período de la media.
+
+    Returns:
+        np.ndarray: Media móvil exponencial.
+    """
+    close = _as_2d(close)
+    return _run_recursive(_Ema(close.shape[1], span), close)
+
+
+def _previous_valid(values):
+    """Último valor válido anterior a cada barra (NaN si no existe)."""
+    values = _as_2d(values)
+    prev = pd.DataFrame(values).ffill().shift(1)
+    return prev.to_numpy(dtype=np.float64)
+
+
+def rsi(close, period=14):
+    """
+    Índice de fuerza relativa (RSI) con suavizado de Wilder.
+
+    Args:
+        close (array-like): Precios de forma (barras, tickers).
+        period (int): Período del RSI.
+
+    Returns:
+        np.ndarray: RSI entre 0 y 100.
+    """
+    close = _as_2d(close)
+    change = close - _previous_valid(close)
+    n = close.shape[1]
+    avg_gain = _run_recursive(
+        _WilderAverage(n, period), np.where(change > 0, change, 0.0 * change)
+    )
+    avg_loss = _run_recursive(
+        _WilderAverage(n, period), np.where(change < 0, -change, 0.0 * change)
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = np.where(
+            avg_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        )
+    return np.where(np.isnan(avg_gain), np.nan, out)
+
+
+def macd(close, fast=12, slow=26, signal=9):
+    """
+    MACD: diferencia entre medias exponenciales rápida y lenta.
+
+    Args:
+        close (array-like): Precios de forma (barras, tickers).
+        fast (int): Período de la media rápida.
+        slow (int): Período de la media lenta.
+        signal (int): Período de la línea de señal.
+
+    Returns:
+        tuple: (macd, señal, histograma).
+    """
+    close = _as_2d(close)
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def bollinger(close, window=20, num_std=2.0):
+    """
+    Bandas de Bollinger sobre la media móvil simple.
+
+    Args:
+        close (array-like): Precios de forma (barras, tickers).
+        window (int): Ventana de la media y la desviación.
+        num_std (float): Número de desviaciones de las bandas.
+
+    Returns:
+        tuple: (media, banda superior, banda inferior).
+    """
+    close = _as_2d(close)
+    mid = sma(close, window)
+    width = num_std * rolling_std(close, window)
+    return mid, mid + width, mid - width
+
+
+def atr(high, low, close, period=14):
+    """
+    Rango verdadero promedio (ATR) con suavizado de Wilder.
+
+    Args:
+        high (array-like): Máximos de forma (barras, tickers).
+        low (array-like): Mínimos de forma (barras, tickers).
+        close (array-like): Cierres de forma (barras, tickers).
+        period (int): Período del ATR.
+
+    Returns:
+        np.ndarray: ATR de cada ticker.
+    """
+    high, low, close = _as_2d(high), _as_2d(low), _as_2d(close)
+    prev = _previous_valid(close)
+    true_range = np.fmax(
+        high - low, np.fmax(np.abs(high - prev), np.abs(low - prev))
+    )
+    true_range = np.where(np.isnan(close), np.nan, true_range)
+    return _run_recursive(_WilderAverage(close.shape[1], period), true_range)
+
+
+def obv(close, volume):
+    """
+    Volumen en balance (OBV) acumulado por ticker.
+
+    Args:
+        close (array-like): Cierres de forma (barras, tickers).
+        volume (array-like): Volúmenes de forma (barras, tickers).
+
+    Returns:
+        np.ndarray: OBV de cada ticker.
+    """
+    close, volume = _as_2d(close), _as_2d(volume)
+    valid = ~np.isnan(close)
+    change = close - _previous_valid(close)
+    step = np.sign(np.nan_to_num(change)) * np.nan_to_num(volume)
+    out = np.cumsum(np.where(valid, step, 0.0), axis=0)
+    return np.where(valid, out, np.nan)
+
+
+def _ohlcv_matrices(data, tickers=None):
+    """Extrae Close, High, Low y Volume como matrices (None si no existen)."""
+    close, _, columns = field_matrix(data, "Close")
+    order = None
+    if tickers is not None and list(tickers) != columns:
+        order = [columns.index(tick) for tick in tickers]
+        close = close[:, order]
+
+    matrices = [close]
+    fields = data.columns.get_level_values(0) \
+        if isinstance(data.columns, pd.MultiIndex) else []
+    for field in ("High", "Low", "Volume"):
+        if field in fields:
+            values = field_matrix(data, field)[0]
+            matrices.append(values if order is None else values[:, order])
+        else:
+            matrices.append(None)
+    return tuple(matrices)
+
+
+def compute_indicators(data, sma_window=20, ema_span=20, rsi_period=14,
+                       macd_spans=(12, 26, 9), bollinger_window=20,
+                       bollinger_std=2.0, atr_period=14):
+    """
+    Calcula todos los indicadores para todos los tickers de una vez.
+
+    Args:
+        data (pd.DataFrame): Datos de precios con columnas (campo, ticker),
+            como los que devuelve ``yf.download``.
+        sma_window (int): Ventana de la media móvil simple.
+        ema_span (int): Período de la media móvil exponencial.
+        rsi_period (int): Período del RSI.
+        macd_spans (tuple): Períodos (rápido, lento, señal) del MACD.
+        bollinger_window (int): Ventana de las bandas de Bollinger.
+        bollinger_std (float): Número de desviaciones de las bandas.
+        atr_period (int): Período del ATR.
+
+    Returns:
+        dict: Nombre del indicador -> DataFrame (barras x tickers).
+    """
+    frame = field_frame(data, "Close")
+    index, tickers = frame.index, list(frame.columns)
+    close, high, low, volume = _ohlcv_matrices(data)
+
+    result = {
+        "sma": sma(close, sma_window),
+        "ema": ema(close, ema_span),
+        "rsi": rsi(close, rsi_period),
+    }
+    result["macd"], result["macd_signal"], result["macd_hist"] = macd(
+        close, *macd_spans
+    )
+    result["bb_mid"], result["bb_upper"], result["bb_lower"] = bollinger(
+        close, bollinger_window, bollinger_std
+    )
+    if high is not None and low is not None:
+        result["atr"] = atr(high, low, close, atr_period)
+    if volume is not None:
+        result["obv"] = obv(close, volume)
+
+    return {
+        name: pd.DataFrame(values, index=index, columns=tickers)
+        for name, values in result.items()
+    }
@@ -0,0 +1,471 @@
+"""
+Seguimiento en vivo de cotizaciones con actualización incremental.
+
+:class:`LiveWatcher` consulta periódicamente un proveedor de cotizaciones
+solo por las barras más recientes, las agrega a los datos en memoria de la
+cartera (y opcionalmente al almacén binario) sin reconstruir el DataFrame,
+y llama a los callbacks registrados con los tickers que cambiaron.
+
+Las consultas se hacen con asyncio, en lotes de tickers y con un límite de
+solicitudes concurrentes, de modo que un solo proceso puede seguir miles
+de tickers. :class:`FakeQuoteFeed` genera barras localmente para probar el
+flujo sin conexión.
+"""
+
+import abc
+import asyncio
+import inspect
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from ._frames import field_frame
+from .resample import to_pandas_freq
+
+
+def _as_tz(stamp, tz):
+    """
+    Expresa una marca de tiempo en la zona horaria ``tz``.
+
+    Una marca sin zona se interpreta como hora local de ``tz``; con
+    ``tz=None`` se conserva la hora local sin zona.
+    """
+    stamp = pd.Timestamp(stamp)
+    if stamp.tz is None:
+        return stamp if tz is None else stamp.tz_localize(tz)
+    return stamp.tz_localize(None) if tz is None else stamp.tz_convert(tz)
+
+
+def _utc_ns(index, tz):
+    """
+    Convierte un índice temporal a datetime64[ns] en UTC sin zona.
+
+    Los índices sin zona se interpretan en ``tz``; si ``tz`` es None, los
+    índices con zona se reducen a su hora local.
+    """
+    index = pd.DatetimeIndex(index)
+    if index.tz is None and tz is not None:
+        index = index.tz_localize(tz)
+    elif index.tz is not None and tz is None:
+        index = index.tz_localize(None)
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return index.as_unit("ns").to_numpy()
+
+
+class QuoteFeed(abc.ABC):
+    """
+    Interfaz de un proveedor de cotizaciones.
+
+    Las subclases implementan :meth:`fetch`, que retorna las barras con
+    marca de tiempo mayor o igual a ``since`` (incluida la última barra,
+    que puede seguir en formación).
+    """
+
+    @abc.abstractmethod
+    async def fetch(self, tickers, since):
+        """
+        Obtiene las barras recientes de un lote de tickers.
+
+        Args:
+            tickers (list): Tickers del lote.
+            since (pd.Timestamp or None): Marca de tiempo de la última
+                barra conocida.
+
+        Returns:
+            pd.DataFrame: Barras con columnas (campo, ticker).
+        """
+
+
+class YFinanceFeed(QuoteFeed):
+    """Proveedor basado en ``yf.download``, ejecutado en un hilo aparte."""
+
+    def __init__(self, interval="1m", period="1d"):
+        """
+        Inicializa el proveedor.
+
+        Args:
+            interval (str): Intervalo de las barras.
+            period (str): Período a consultar cuando no hay barras previas.
+        """
+        self.interval = interval
+        self.period = period
+
+    async def fetch(self, tickers, since):
+        """Descarga las barras desde ``since`` con yfinance."""
+        kwargs = {"interval": self.interval, "progress": False}
+        if since is None:
+            kwargs["period"] = self.period
+        else:
+            kwargs["start"] = since
+        data = await asyncio.to_thread(yf.download, tickers, **kwargs)
+        if since is not None and not data.empty:
+            data = data[data.index >= _as_tz(since, data.index.tz)]
+        return data
+
+
+class FakeQuoteFeed(QuoteFeed):
+    """
+    Proveedor local de barras sintéticas para pruebas sin conexión.
+
+    Cuando una consulta pide barras desde el reloj actual, el reloj avanza
+    ``bars_per_poll`` barras; la respuesta incluye la última barra conocida
+    (con precio actualizado, como una barra en formación) más las nuevas.
+
+    Atributos:
+        calls (int): Número de consultas recibidas.
+    """
+
+    def __init__(self, tickers, start="2024-01-02 09:30", interval="1m",
+                 bars_per_poll=1, latency=0.0, quiet=(), seed=0, tz=None):
+        """
+        Inicializa el proveedor.
+
+        Args:
+            tickers (list): Tickers que el proveedor conoce.
+            start (str): Marca de tiempo de la primera barra.
+            interval (str): Intervalo de las barras.
+            bars_per_poll (int): Barras nuevas por consulta.
+            latency (float): Demora simulada de cada consulta, en segundos.
+            quiet (iterable): Tickers que nunca reciben barras nuevas.
+            seed (int): Semilla del generador aleatorio.
+            tz (str, optional): Zona horaria de las marcas de tiempo, como
+                las barras intradía de yfinance.
+        """
+        self.tickers = list(tickers)
+        self.step = pd.Timedelta(to_pandas_freq(interval))
+        self.now = pd.Timestamp(start, tz=tz)
+        self.bars_per_poll = bars_per_poll
+        self.latency = latency
+        self.quiet = set(quiet)
+        self.calls = 0
+        self._rng = np.random.default_rng(seed)
+        self._price = dict(zip(self.tickers, 100.0 + np.arange(len(tickers))))
+
+    def advance(self):
+        """Avanza el reloj del proveedor y actualiza los precios."""
+        self.now += self.step * self.bars_per_poll
+        for tick in self.tickers:
+            if tick not in self.quiet:
+                self._price[tick] *= float(np.exp(self._rng.normal(0, 0.001)))
+
+    async def fetch(self, tickers, since):
+        """Retorna barras sintéticas desde ``since`` hasta el reloj actual."""
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if since is not None:
+            since = _as_tz(since, self.now.tz)
+            if since >= self.now:
+                self.advance()
+        first = self.now if since is None else since
+        index = pd.date_range(first, self.now, freq=self.step, name="Date")
+        blocks = {}
+        for field in ("Open", "High", "Low", "Close", "Volume"):
+            values = np.full((len(index), len(tickers)), np.nan)
+            for j, tick in enumerate(tickers):
+                if tick in self.quiet:
+                    continue
+                price = self._price[tick]
+                values[:, j] = 1_000.0 if field == "Volume" else price
+            blocks[field] = pd.DataFrame(values, index=index, columns=tickers)
+        return pd.concat(blocks, axis=1, names=["Price", "Ticker"])
+
+
+class _BarBuffer:
+    """
+    Bloque de barras con capacidad reservada para agregar filas en su lugar.
+
+    Todos los campos viven en una sola matriz (capacidad, campos x tickers),
+    de modo que el DataFrame expuesto es una vista sin copia de las filas
+    usadas y agregar barras no reconstruye los datos existentes. Las marcas
+    de tiempo se guardan en UTC sin zona y la zona horaria de los datos se
+    vuelve a aplicar en :meth:`frame`.
+    """
+
+    def __init__(self, data, capacity=None):
+        if isinstance(data.columns, pd.MultiIndex):
+            fields = list(dict.fromkeys(data.columns.get_level_values(0)))
+            tickers = list(field_frame(data, fields[0]).columns)
+        else:
+            fields, tickers = ["Close"], list(data.columns)
+            data = pd.concat({"Close": data}, axis=1)
+        self.tickers = tickers
+        self.columns = pd.MultiIndex.from_product(
+            [fields, tickers], names=["Price", "Ticker"]
+        )
+        self.tz = pd.DatetimeIndex(data.index).tz
+        self.length = len(data)
+        capacity = capacity or max(2 * self.length, 1024)
+        self.values = np.full((capacity, len(self.columns)), np.nan)
+        self.values[:self.length] = data.reindex(columns=self.columns) \
+            .to_numpy(dtype=np.float64, na_value=np.nan)
+        self.index = np.zeros(capacity, dtype="datetime64[ns]")
+        self.index[:self.length] = _utc_ns(data.index, self.tz)
+
+    def _localize(self, stamps):
+        """Índice con la zona horaria de los datos."""
+        index = pd.DatetimeIndex(stamps, name="Date")
+        if self.tz is not None:
+            index = index.tz_localize("UTC").tz_convert(self.tz)
+        return index
+
+    @property
+    def last_timestamp(self):
+        """Marca de tiempo de la última barra, o None si está vacío."""
+        if self.length == 0:
+            return None
+        return self._localize(self.index[self.length - 1:self.length])[0]
+
+    def frame(self):
+        """DataFrame (valores sin copia) de las barras usadas."""
+        return pd.DataFrame(
+            self.values[:self.length],
+            index=self._localize(self.index[:self.length]),
+            columns=self.columns,
+            copy=False,
+        )
+
+    def _reserve(self, rows):
+        """Duplica la capacidad si no caben ``rows`` barras más."""
+        needed = self.length + rows
+        if needed <= len(self.values):
+            return
+        capacity = max(2 * len(self.values), needed)
+        values = np.full((capacity, self.values.shape[1]), np.nan)
+        values[:self.length] = self.values[:self.length]
+        index = np.zeros(capacity, dtype="datetime64[ns]")
+        index[:self.length] = self.index[:self.length]
+        self.values, self.index = values, index
+
+    def upsert(self, bars):
+        """
+        Incorpora barras nuevas o actualiza barras existentes.
+
+        En las barras con marca de tiempo ya conocida (la última, que puede
+        seguir en formación, o anteriores que un lote no recibió por un
+        error) solo se reemplazan los valores no nulos recibidos. Las barras
+        anteriores a la última que no están en el bloque se ignoran.
+
+        Args:
+            bars (pd.DataFrame): Barras con columnas (campo, ticker).
+
+        Returns:
+            tuple: (tickers que cambiaron, (posiciones, filas) de las barras
+            actualizadas, (marcas de tiempo nuevas, filas nuevas)).
+        """
+        if self.length == 0 and self.tz is None:
+            self.tz = pd.DatetimeIndex(bars.index).tz
+        bars = bars.reindex(columns=self.columns)
+        stamps = _utc_ns(bars.index, self.tz)
+        incoming = bars.to_numpy(dtype=np.float64, na_value=np.nan)
+
+        changed = np.zeros(len(self.columns), dtype=bool)
+        positions = np.empty(0, dtype=np.intp)
+        if self.length:
+            known = self.index[:self.length]
+            older = stamps <= known[-1]
+            found = np.searchsorted(known, stamps[older])
+            matches = known[found] == stamps[older]
+            for position, row in zip(found[matches], incoming[older][matches]):
+                current = self.values[position]
+                present = ~np.isnan(row)
+                changed |= present & (row != current)
+                current[present] = row[present]
+            positions = np.unique(found[matches])
+            newer = ~older
+        else:
+            newer = np.ones(len(stamps), dtype=bool)
+        updated = (positions, self.values[positions].copy())
+
+        new_stamps = stamps[newer]
+        new_rows = incoming[newer]
+        if len(new_stamps):
+            order = np.argsort(new_stamps, kind="stable")
+            new_stamps, new_rows = new_stamps[order], new_rows[order]
+            self._reserve(len(new_stamps))
+            end = self.length + len(new_stamps)
+            self.values[self.length:end] = new_rows
+            self.index[self.length:end] = new_stamps
+            self.length = end
+            changed |= ~np.isnan(new_rows).all(axis=0)
+
+        per_ticker = changed.reshape(-1, len(self.tickers)).any(axis=0)
+        tickers = [t for t, c in zip(self.tickers, per_ticker) if c]
+        return tickers, updated, (new_stamps, new_rows)
+
+
+class LiveWatcher:
+    """
+    Consulta periódica de barras nuevas para todos los tickers de una cartera.
+
+    Atributos:
+        wallet (FinancialWallet): Cartera cuyos datos se actualizan.
+        feed (QuoteFeed): Proveedor de cotizaciones.
+        poll_interval (float): Segundos entre consultas.
+        max_concurrency (int): Solicitudes simultáneas máximas.
+        batch_size (int): Tickers por solicitud.
+        store (PriceStore or None): Almacén abierto en modo 'r+' donde
+            también se agregan las barras.
+        polls (int): Consultas completadas.
+    """
+
+    def __init__(self, wallet, feed, poll_interval=60.0, max_concurrency=8,
+                 batch_size=50, store=None):
+        """
+        Inicializa el seguimiento.
+
+        Args:
+            wallet (FinancialWallet): Cartera con los tickers a seguir. Si
+                ya tiene datos, las barras nuevas se agregan a continuación.
+            feed (QuoteFeed): Proveedor de cotizaciones.
+            poll_interval (float): Segundos entre consultas.
+            max_concurrency (int): Solicitudes simultáneas máximas.
+            batch_size (int): Tickers por solicitud.
+            store (PriceStore, optional): Almacén en modo 'r+' con las
+                mismas columnas que los datos.
+
+        Raises:
+            ValueError: Si el almacén tiene columnas que no están en los
+                datos de la cartera.
+        """
+        self.wallet = wallet
+        self.feed = feed
+        self.poll_interval = poll_interval
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+        self.store = store
+        self.polls = 0
+        self._callbacks = []
+        self._running = False
+        self._since = {}
+
+        data = wallet.data
+        if data is None or data.empty:
+            columns = pd.MultiIndex.from_product(
+                [["Open", "High", "Low", "Close", "Volume"], wallet.ticks],
+                names=["Price", "Ticker"],
+            )
+            data = pd.DataFrame(
+                columns=columns, index=pd.DatetimeIndex([], name="Date"),
+                dtype=np.float64,
+            )
+        self._buffer = _BarBuffer(data)
+        self.wallet.data = self._buffer.frame()
+        self._store_order = None
+        if store is not None:
+            self._store_order = self._buffer.columns.get_indexer(store.columns)
+            missing = store.columns[self._store_order < 0]
+            if len(missing):
+                raise ValueError(
+                    "El almacén tiene columnas que no están en los datos: "
+                    f"{', '.join(map(str, missing[:5]))}"
+                )
+
+    def register(self, callback):
+        """
+        Registra una función a llamar cuando cambian tickers.
+
+        El callback recibe ``(wallet, tickers_cambiados, barras_nuevas)`` y
+        puede ser una función normal o una corrutina.
+
+        Args:
+            callback (callable): Función a registrar.
+        """
+        self._callbacks.append(callback)
+
+    async def _fetch_batch(self, semaphore, tickers, since):
+        """Consulta un lote respetando el límite de concurrencia."""
+        async with semaphore:
+            try:
+                return await self.feed.fetch(tickers, since)
+            except Exception as e:
+                print(f"Error al consultar {', '.join(tickers[:3])}...: {e}")
+                return None
+
+    async def poll_once(self):
+        """
+        Realiza una consulta de todos los tickers y actualiza los datos.
+
+        Cada lote pide las barras desde la última que recibió: si una
+        consulta falla, la siguiente vuelve a pedir las barras perdidas.
+
+        Returns:
+            list: Tickers cuyos datos cambiaron.
+        """
+        tickers = self._buffer.tickers
+        previous_last = self._buffer.last_timestamp
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        batches = [
+            tuple(tickers[i:i + self.batch_size])
+            for i in range(0, len(tickers), self.batch_size)
+        ]
+        frames = await asyncio.gather(*(
+            self._fetch_batch(
+                semaphore, list(batch), self._since.get(batch, previous_last)
+            )
+            for batch in batches
+        ))
+        received = [b for b, f in zip(batches, frames) if f is not None]
+        frames = [f for f in frames if f is not None and not f.empty]
+        self.polls += 1
+
+        changed, updated, new_stamps = [], None, ()
+        previous_length = self._buffer.length
+        if frames:
+            bars = pd.concat(frames, axis=1, sort=True)
+            changed, updated, (new_stamps, new_rows) = \
+                self._buffer.upsert(bars)
+        for batch in batches:
+            self._since.setdefault(batch, previous_last)
+        for batch in received:
+            self._since[batch] = self._buffer.last_timestamp
+        if not changed:
+            return []
+
+        self.wallet.data = self._buffer.frame()
+        if self.store is not None:
+            self._write_store(updated, new_stamps, new_rows, previous_length)
+
+        positions = updated[0]
+        start = min(positions.min(), previous_length) if len(positions) \
+            else previous_length
+        new_bars = self.wallet.data.iloc[start:]
+        for callback in self._callbacks:
+            result = callback(self.wallet, changed, new_bars)
+            if inspect.isawaitable(result):
+                await result
+        return changed
+
+    def _write_store(self, updated, new_stamps, new_rows, previous_length):
+        """Replica en el almacén las barras actualizadas y nuevas."""
+        order = self._store_order
+        positions, rows = updated
+        if len(positions) and previous_length == self.store.length:
+            self.store.overwrite_rows(positions, rows[:, order])
+        if len(new_stamps):
+            self.store.append(new_stamps, new_rows[:, order])
+
+    async def run(self, iterations=None):
+        """
+        Consulta periódicamente hasta llamar a :meth:`stop`.
+
+        Args:
+            iterations (int, optional): Número máximo de consultas.
+        """
+        self._running = True
+        count = 0
+        while self._running and (iterations is None or count < iterations):
+            started = asyncio.get_running_loop().time()
+            await self.poll_once()
+            count += 1
+            if iterations is not None and count >= iterations:
+                break
+            elapsed = asyncio.get_running_loop().time() - started
+            await asyncio.sleep(max(self.poll_interval - elapsed, 0.0))
+        self._running = False
+
+    def stop(self):
+        """Detiene el ciclo de :meth:`run` después de la consulta en curso."""
+        self._running = False
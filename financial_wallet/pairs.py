@@ -0,0 +1,250 @@
+"""
+Screening de pares: correlación, ratio de cobertura, z-score del spread y
+prueba de cointegración para todos los pares de tickers.
+
+El proceso tiene dos etapas:
+
+    1. Poda barata: la matriz de correlación de retornos se calcula para
+       todo el universo con un producto de matrices, y solo pasan a la
+       etapa siguiente los pares con correlación absoluta suficiente.
+    2. Pruebas costosas: para cada par restante se estima el ratio de
+       cobertura por mínimos cuadrados sobre los log-precios y se aplica la
+       prueba de Engle-Granger (ADF sobre el spread). Los pares se reparten
+       en lotes entre un pool de procesos.
+
+Los valores críticos de la prueba son los asintóticos de MacKinnon para
+dos variables con constante; con pocas observaciones son aproximados.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from ._frames import field_matrix
+from .chunked import CorrelationAccumulator
+
+
+# Valores críticos asintóticos de Engle-Granger (2 variables, con constante)
+CRITICAL_VALUES = {"1%": -3.90, "5%": -3.34, "10%": -3.04}
+
+COLUMNS = [
+    "ticker_a",
+    "ticker_b",
+    "correlation",
+    "hedge_ratio",
+    "intercept",
+    "spread_zscore",
+    "half_life",
+    "adf_stat",
+    "cointegrated",
+    "observations",
+]
+
+# Precios logarítmicos compartidos con los procesos trabajadores
+_LOG_PRICES = None
+
+
+def _init_worker(log_prices):
+    """Guarda los log-precios en el proceso trabajador, una sola vez."""
+    global _LOG_PRICES
+    _LOG_PRICES = log_prices
+
+
+def adf_statistic(series, lags=1):
+    """
+    Estadístico t de Dickey-Fuller aumentado, sin constante ni tendencia.
+
+    Se usa sobre el spread de una regresión con constante, cuyo promedio
+    ya es cero.
+
+    Args:
+        series (np.ndarray): Serie sin valores faltantes.
+        lags (int): Diferencias rezagadas incluidas en la regresión.
+
+    Returns:
+        tuple: (estadístico t, coeficiente de s_{t-1}) o (nan, nan) si no
+        hay observaciones suficientes.
+    """
+    diff = np.diff(series)
+    n = len(diff) - lags
+    if n <= lags + 2:
+        return np.nan, np.nan
+    columns = [series[lags:-1]]
+    for k in range(1, lags + 1):
+        columns.append(diff[lags - k:-k])
+    x = np.column_stack(columns)
+    y = diff[lags:]
+    xtx = x.T @ x
+    try:
+        xtx_inv = np.linalg.inv(xtx)
+    except np.linalg.LinAlgError:
+        return np.nan, np.nan
+    coef = xtx_inv @ (x.T @ y)
+    resid = y - x @ coef
+    sigma2 = resid @ resid / (n - x.shape[1])
+    se = np.sqrt(sigma2 * xtx_inv[0, 0])
+    if se == 0:
+        return np.nan, np.nan
+    return coef[0] / se, coef[0]
+
+
+def cointegration_level(stat):
+    """
+    Nivel de significancia más exigente que supera el estadístico ADF.
+
+    Args:
+        stat (float): Estadístico de la prueba.
+
+    Returns:
+        str: '1%', '5%', '10%' o '' si no es significativo.
+    """
+    for level, critical in CRITICAL_VALUES.items():
+        if stat < critical:
+            return level
+    return ""
+
+
+def screen_pair(log_a, log_b, lags=1, min_observations=60):
+    """
+    Calcula las estadísticas de un par sobre sus log-precios.
+
+    Args:
+        log_a (np.ndarray): Log-precios del primer ticker (variable y).
+        log_b (np.ndarray): Log-precios del segundo ticker (variable x).
+        lags (int): Rezagos de la prueba ADF.
+        min_observations (int): Barras comunes mínimas.
+
+    Returns:
+        dict: hedge_ratio, intercept, spread_zscore, half_life, adf_stat,
+        cointegrated y observations.
+    """
+    valid = ~np.isnan(log_a) & ~np.isnan(log_b)
+    y, x = log_a[valid], log_b[valid]
+    n = len(y)
+    result = {
+        "hedge_ratio": np.nan,
+        "intercept": np.nan,
+        "spread_zscore": np.nan,
+        "half_life": np.nan,
+        "adf_stat": np.nan,
+        "cointegrated": "",
+        "observations": n,
+    }
+    if n < min_observations:
+        return result
+
+    x_mean, y_mean = x.mean(), y.mean()
+    var_x = ((x - x_mean) ** 2).sum()
+    if var_x == 0:
+        return result
+    beta = ((x - x_mean) * (y - y_mean)).sum() / var_x
+    alpha = y_mean - beta * x_mean
+    spread = y - alpha - beta * x
+    std = spread.std(ddof=1)
+
+    stat, gamma = adf_statistic(spread, lags)
+    result.update({
+        "hedge_ratio": beta,
+        "intercept": alpha,
+        "spread_zscore": spread[-1] / std if std > 0 else np.nan,
+        "half_life": -np.log(2) / gamma if gamma < 0 else np.nan,
+        "adf_stat": stat,
+        "cointegrated": cointegration_level(stat),
+    })
+    return result
+
+
+def _screen_batch(args):
+    """Procesa un lote de pares con los log-precios del trabajador."""
+    pairs, lags, min_observations = args
+    return [
+        screen_pair(_LOG_PRICES[:, i], _LOG_PRICES[:, j], lags,
+                    min_observations)
+        for i, j in pairs
+    ]
+
+
+def candidate_pairs(correlation, min_correlation=0.5, max_per_ticker=None):
+    """
+    Selecciona los pares que vale la pena probar según su correlación.
+
+    Args:
+        correlation (np.ndarray): Matriz de correlación de retornos.
+        min_correlation (float): Correlación absoluta mínima.
+        max_per_ticker (int, optional): Máximo de pares por ticker (los más
+            correlacionados), para acotar universos muy grandes.
+
+    Returns:
+        np.ndarray: Pares (i, j) con i < j, de forma (pares, 2).
+    """
+    strength = np.abs(np.nan_to_num(correlation, nan=0.0))
+    keep = np.triu(strength >= min_correlation, k=1)
+    if max_per_ticker is not None:
+        ranked = np.argsort(-strength, axis=1)[:, :max_per_ticker + 1]
+        top = np.zeros_like(keep)
+        rows = np.repeat(np.arange(len(strength)), ranked.shape[1])
+        top[rows, ranked.ravel()] = True
+        keep &= top | top.T
+    return np.argwhere(keep)
+
+
+def screen_pairs(data, min_correlation=0.5, max_per_ticker=None, lags=1,
+                 min_observations=60, max_workers=None, batch_size=2_000):
+    """
+    Ejecuta el screening de pares sobre todos los tickers.
+
+    Args:
+        data (pd.DataFrame): Datos de precios con columnas (campo, ticker).
+        min_correlation (float): Correlación absoluta mínima de retornos
+            para pasar a las pruebas costosas.
+        max_per_ticker (int, optional): Máximo de pares por ticker.
+        lags (int): Rezagos de la prueba ADF.
+        min_observations (int): Barras comunes mínimas por par.
+        max_workers (int, optional): Procesos del pool; 1 ejecuta en el
+            proceso actual. Por defecto, los núcleos disponibles.
+        batch_size (int): Pares por tarea enviada al pool.
+
+    Returns:
+        pd.DataFrame: Un par por fila, ordenado de más a menos cointegrado
+        (estadístico ADF ascendente).
+    """
+    close, _, tickers = field_matrix(data, "Close")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_prices = np.log(np.where(close > 0, close, np.nan))
+        returns = close[1:] / close[:-1] - 1.0
+
+    accumulator = CorrelationAccumulator(len(tickers))
+    accumulator.update(returns)
+    correlation = accumulator.correlation()
+    pairs = candidate_pairs(correlation, min_correlation, max_per_ticker)
+    if len(pairs) == 0:
+        return pd.DataFrame(columns=COLUMNS)
+
+    batches = [
+        (pairs[start:start + batch_size], lags, min_observations)
+        for start in range(0, len(pairs), batch_size)
+    ]
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(batches) == 1:
+        _init_worker(log_prices)
+        stats = [row for batch in batches for row in _screen_batch(batch)]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(log_prices,),
+        ) as executor:
+            stats = [
+                row
+                for rows in executor.map(_screen_batch, batches)
+                for row in rows
+            ]
+
+    table = pd.DataFrame(stats)
+    table.insert(0, "ticker_a", [tickers[i] for i in pairs[:, 0]])
+    table.insert(1, "ticker_b", [tickers[j] for j in pairs[:, 1]])
+    table.insert(2, "correlation", correlation[pairs[:, 0], pairs[:, 1]])
+    table = table.sort_values("adf_stat", na_position="last")
+    return table[COLUMNS].reset_index(drop=True)
@@ -0,0 +1,146 @@
+"""
+Reducción de puntos antes de graficar series largas.
+
+Con datos intradía o historias de décadas, una serie puede tener millones
+de puntos, muchos más de los que caben en el ancho de un gráfico. Estas
+funciones eligen un subconjunto de puntos que conserva la forma visual:
+
+    minmax   Divide la serie en bloques y conserva el mínimo y el máximo
+             de cada uno; los extremos (picos y caídas) nunca se pierden.
+    lttb     Largest-Triangle-Three-Buckets: en cada bloque conserva el
+             punto que forma el triángulo de mayor área con sus vecinos.
+
+El costo de dibujar queda acotado por ``max_points`` sin importar el largo
+de la historia.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+METHODS = ("minmax", "lttb")
+DEFAULT_MAX_POINTS = 2_000
+
+
+def _numeric_axis(index):
+    """Convierte el índice (fechas o números) a float para las áreas."""
+    if isinstance(index, pd.DatetimeIndex):
+        return index.asi8.astype(np.float64)
+    return np.asarray(index, dtype=np.float64)
+
+
+def minmax_indices(y, max_points=DEFAULT_MAX_POINTS):
+    """
+    Posiciones del mínimo y máximo de cada bloque de la serie.
+
+    Args:
+        y (np.ndarray): Valores de la serie (puede contener NaN).
+        max_points (int): Máximo de posiciones a retornar.
+
+    Returns:
+        np.ndarray: Posiciones ordenadas, incluyendo la primera y la última.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+
+    n_buckets = max(max_points // 2 - 1, 1)
+    size = -(-n // n_buckets)
+    n_buckets = -(-n // size)
+    blocks = np.full(n_buckets * size, np.nan)
+    blocks[:n] = y
+    blocks = blocks.reshape(n_buckets, size)
+
+    missing = np.isnan(blocks)
+    low = np.where(missing, np.inf, blocks).argmin(axis=1)
+    high = np.where(missing, -np.inf, blocks).argmax(axis=1)
+    valid = ~missing.all(axis=1)
+    offsets = np.arange(n_buckets) * size
+    return np.unique(np.concatenate([
+        [0, n - 1],
+        (offsets + low)[valid],
+        (offsets + high)[valid],
+    ]))
+
+
+def lttb_indices(x, y, max_points=DEFAULT_MAX_POINTS):
+    """
+    Posiciones elegidas por Largest-Triangle-Three-Buckets.
+
+    Los valores faltantes se omiten antes de elegir los puntos.
+
+    Args:
+        x (np.ndarray): Eje horizontal numérico, creciente.
+        y (np.ndarray): Valores de la serie.
+        max_points (int): Puntos a conservar (al menos 3).
+
+    Returns:
+        np.ndarray: Posiciones ordenadas sobre la serie original.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    positions = np.flatnonzero(~np.isnan(y))
+    n = len(positions)
+    if n <= max_points or max_points < 3:
+        return positions
+    x = np.asarray(x, dtype=np.float64)[positions]
+    y = y[positions]
+
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x = x[end:edges[i + 2]].mean()
+            next_y = y[end:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        area = np.abs(
+            (x[a] - next_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (next_y - y[a])
+        )
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return positions[selected]
+
+
+def downsample(data, max_points=DEFAULT_MAX_POINTS, method="minmax"):
+    """
+    Reduce una serie o un DataFrame a un presupuesto de puntos.
+
+    En un DataFrame el presupuesto se reparte entre las columnas y se
+    conservan las filas elegidas para cualquiera de ellas, de modo que los
+    extremos de todas las series siguen presentes (útil para los gráficos
+    de dispersión entre dos tickers).
+
+    Args:
+        data (pd.Series or pd.DataFrame): Datos indexados por fecha.
+        max_points (int or None): Máximo de puntos; None desactiva la
+            reducción.
+        method (str): 'minmax' o 'lttb'.
+
+    Returns:
+        pd.Series or pd.DataFrame: Las filas elegidas, en orden.
+
+    Raises:
+        ValueError: Si el método no es válido.
+    """
+    if method not in METHODS:
+        raise ValueError(
+            f"Método de reducción inválido: {method}. "
+            f"Usa uno de {', '.join(METHODS)}."
+        )
+    if max_points is None or len(data) <= max_points:
+        return data
+
+    frame = data.to_frame() if isinstance(data, pd.Series) else data
+    budget = max(max_points // frame.shape[1], 3)
+    x = _numeric_axis(frame.index) if method == "lttb" else None
+    keep = np.unique(np.concatenate([
+        minmax_indices(values, budget) if method == "minmax"
+        else lttb_indices(x, values, budget)
+        for values in frame.to_numpy(dtype=np.float64, na_value=np.nan).T
+    ]))
+    return data.iloc[keep]
@@ -0,0 +1,398 @@
+"""
+Instrumentación opcional de los métodos de FinancialWallet.
+
+``Profiler`` envuelve los métodos públicos de una cartera (solo de esa
+instancia, sin modificar la clase) y registra por cada llamada el tiempo
+de pared, el tiempo de CPU, la memoria máxima asignada durante la llamada
+(con ``tracemalloc``, que también registra las asignaciones de numpy) y el
+tamaño de los datos de entrada y del resultado. Con :meth:`profile_next`
+la próxima llamada se ejecuta además bajo ``cProfile``.
+
+Los registros se exportan como JSON o como una tabla resumen por método,
+para ubicar los puntos calientes cuando crecen el universo o el historial.
+
+Uso:
+    wallet = FinancialWallet()
+    profiler = wallet.enable_profiling()
+    profiler.profile_next("compute_volatility")
+    ...
+    print(profiler.summary_table())
+    profiler.to_json("data/financial/profile.json")
+
+    python -m financial_wallet.benchmarks.profile --tickers 500 --bars 2520
+"""
+
+import contextlib
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+
+def data_size(value):
+    """
+    Describe el tamaño de un objeto de datos.
+
+    Los bytes se calculan con el tamaño de cada tipo de columna, sin
+    recorrer los valores, para que medir no cueste más que el método
+    medido en universos de miles de columnas.
+
+    Args:
+        value: DataFrame, Series, array de numpy u otro objeto.
+
+    Returns:
+        dict: rows, columns y bytes (valores e índice, sin contar el
+        contenido de las cadenas de texto); vacío si el objeto no es
+        tabular.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        dtypes = value.dtypes if isinstance(value, pd.DataFrame) \
+            else [value.dtype]
+        row_bytes = sum(getattr(dtype, "itemsize", 8) for dtype in dtypes)
+        return {
+            "rows": value.shape[0],
+            "columns": len(dtypes),
+            "bytes": int(value.shape[0] * row_bytes + value.index.nbytes),
+        }
+    if isinstance(value, np.ndarray):
+        return {
+            "rows": value.shape[0] if value.ndim else 1,
+            "columns": value.shape[1] if value.ndim > 1 else 1,
+            "bytes": int(value.nbytes),
+        }
+    return {}
+
+
+def public_methods(obj):
+    """
+    Nombres de los métodos públicos de un objeto.
+
+    Args:
+        obj: Instancia a inspeccionar.
+
+    Returns:
+        list: Métodos definidos en la clase que no empiezan con '_'
+        (sin propiedades ni atributos).
+    """
+    names = []
+    for name in dir(type(obj)):
+        if name.startswith("_"):
+            continue
+        attribute = getattr(type(obj), name)
+        if callable(attribute) and not isinstance(attribute, type):
+            names.append(name)
+    return names
+
+
+class Profiler:
+    """
+    Registro de tiempo, CPU, memoria y tamaño de datos por llamada.
+
+    Las llamadas anidadas (por ejemplo ``compute_volatility`` que llama a
+    ``compute_returns``) se registran por separado, con su profundidad; la
+    memoria máxima de la llamada externa incluye la de las internas. La
+    memoria se mide con ``tracemalloc``, que es global al proceso, así que
+    los valores son exactos cuando la cartera se usa desde un solo hilo.
+
+    Atributos:
+        records (list): Un diccionario por llamada terminada.
+        memory (bool): Si mide la memoria máxima (agrega sobrecosto).
+        top (int): Funciones que se guardan de cada perfil de cProfile.
+        last_stats (pstats.Stats): Estadísticas del último perfil, o None.
+    """
+
+    def __init__(self, memory=True, top=25):
+        """
+        Crea el registro.
+
+        Args:
+            memory (bool): Mide la memoria máxima con ``tracemalloc``.
+            top (int): Funciones a conservar de cada perfil de cProfile
+                (ordenadas por tiempo acumulado).
+        """
+        self.memory = memory
+        self.top = top
+        self.records = []
+        self.last_stats = None
+        self._pending_profiles = []
+        self._instrumented = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._started_tracing = False
+
+    def instrument(self, wallet, methods=None):
+        """
+        Envuelve los métodos públicos de una cartera.
+
+        Args:
+            wallet (FinancialWallet): Cartera a instrumentar.
+            methods (list, optional): Métodos a envolver; por defecto,
+                todos los públicos.
+
+        Returns:
+            FinancialWallet: La misma cartera.
+
+        Raises:
+            ValueError: Si algún método no existe.
+        """
+        names = list(methods) if methods else public_methods(wallet)
+        for name in names:
+            original = getattr(type(wallet), name, None)
+            if original is None or not callable(original):
+                raise ValueError(f"La cartera no tiene el método {name}.")
+            if name in vars(wallet):
+                continue
+            wrapper = self.wrap(getattr(wallet, name), name, wallet)
+            setattr(wallet, name, wrapper)
+            self._instrumented.setdefault(id(wallet), []).append(name)
+        return wallet
+
+    def restore(self, wallet):
+        """Quita la instrumentación de una cartera."""
+        for name in self._instrumented.pop(id(wallet), []):
+            vars(wallet).pop(name, None)
+
+    def wrap(self, func, name=None, wallet=None):
+        """
+        Envuelve una función para registrar cada llamada.
+
+        Args:
+            func (callable): Función o método enlazado.
+            name (str, optional): Nombre en los registros; por defecto, el
+                de la función.
+            wallet (FinancialWallet, optional): Cartera cuyos datos
+                (``wallet.data``) se registran como entrada.
+
+        Returns:
+            callable: Función envuelta.
+        """
+        name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.measure(name, wallet) as record:
+                result = func(*args, **kwargs)
+                record["result"] = data_size(result)
+                return result
+
+        return wrapper
+
+    def profile_next(self, method=None):
+        """
+        Ejecuta la próxima llamada bajo cProfile.
+
+        Args:
+            method (str, optional): Método cuya próxima llamada se
+                perfila; por defecto, la próxima llamada de nivel
+                superior de cualquier método.
+        """
+        with self._lock:
+            self._pending_profiles.append(method)
+
+    def _take_profile(self, name, depth):
+        """Indica si esta llamada debe perfilarse y consume el pedido."""
+        with self._lock:
+            for i, method in enumerate(self._pending_profiles):
+                if method == name or (method is None and depth == 0):
+                    del self._pending_profiles[i]
+                    return True
+        return False
+
+    def _stack(self):
+        """Pila de llamadas en curso del hilo actual."""
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextlib.contextmanager
+    def measure(self, name, wallet=None):
+        """
+        Mide un bloque de código como si fuera una llamada.
+
+        Sirve para separar etapas dentro de un método (por ejemplo, la
+        descarga y el armado del DataFrame).
+
+        Args:
+            name (str): Nombre del bloque en los registros.
+            wallet (FinancialWallet, optional): Cartera cuyos datos se
+                registran como entrada.
+
+        Yields:
+            dict: Registro de la llamada; se le pueden agregar claves
+            (``result`` con :func:`data_size`, por ejemplo).
+        """
+        stack = self._stack()
+        depth = len(stack)
+        record = {
+            "method": name,
+            "depth": depth,
+            "started": datetime.now().isoformat(timespec="milliseconds"),
+        }
+        if wallet is not None:
+            record["input"] = data_size(getattr(wallet, "data", None))
+
+        frame = {"peak": 0}
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                # El pico acumulado hasta aquí pertenece a la llamada externa
+                stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+            tracemalloc.reset_peak()
+            frame["base"] = current
+        stack.append(frame)
+
+        profiler = None
+        # cProfile no admite perfiles anidados: dentro de una llamada ya
+        # perfilada, el pedido queda pendiente
+        nested = any(f.get("profiling") for f in stack)
+        if not nested and self._take_profile(name, depth):
+            profiler = cProfile.Profile()
+            frame["profiling"] = True
+
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            if profiler is not None:
+                profiler.enable()
+            try:
+                yield record
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+        except BaseException as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record["wall_s"] = time.perf_counter() - wall
+            record["cpu_s"] = time.process_time() - cpu
+            stack.pop()
+            if self.memory:
+                _, peak = tracemalloc.get_traced_memory()
+                peak = max(peak, frame["peak"])
+                record["peak_bytes"] = max(0, peak - frame["base"])
+                if stack:
+                    stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+                elif self._started_tracing:
+                    tracemalloc.stop()
+                    self._started_tracing = False
+            if profiler is not None:
+                record["profile"] = self._profile_rows(profiler)
+            with self._lock:
+                self.records.append(record)
+
+    def _profile_rows(self, profiler):
+        """Convierte un perfil de cProfile en filas serializables."""
+        stats = pstats.Stats(profiler, stream=io.StringIO())
+        stats.sort_stats("cumulative")
+        self.last_stats = stats
+        rows = []
+        for func in stats.fcn_list[:self.top]:
+            calls, _, own, cumulative, _ = stats.stats[func]
+            filename, line, function = func
+            rows.append({
+                "function": f"{os.path.basename(filename)}:{line}({function})",
+                "calls": calls,
+                "own_s": own,
+                "cumulative_s": cumulative,
+            })
+        return rows
+
+    def reset(self):
+        """Descarta los registros y los perfiles pendientes."""
+        with self._lock:
+            self.records = []
+            self._pending_profiles = []
+            self.last_stats = None
+
+    def to_frame(self):
+        """
+        Registros como DataFrame, con los tamaños en columnas planas.
+
+        Returns:
+            pd.DataFrame: Una fila por llamada (sin los perfiles).
+        """
+        rows = []
+        for record in self.records:
+            row = {k: v for k, v in record.items()
+                   if k not in ("input", "result", "profile")}
+            for prefix in ("input", "result"):
+                for key, value in record.get(prefix, {}).items():
+                    row[f"{prefix}_{key}"] = value
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    def summary(self):
+        """
+        Resumen por método, ordenado por tiempo total.
+
+        Returns:
+            pd.DataFrame: calls, wall_total_s, wall_mean_s, wall_max_s,
+            cpu_total_s, peak_mb (máximo) e input_rows y result_rows de la
+            última llamada, por método.
+        """
+        frame = self.to_frame()
+        if frame.empty:
+            return frame
+        aggregations = {
+            "calls": ("wall_s", "size"),
+            "wall_total_s": ("wall_s", "sum"),
+            "wall_mean_s": ("wall_s", "mean"),
+            "wall_max_s": ("wall_s", "max"),
+            "cpu_total_s": ("cpu_s", "sum"),
+        }
+        if "peak_bytes" in frame:
+            aggregations["peak_mb"] = ("peak_bytes", "max")
+        for column in ("input_rows", "input_columns", "result_rows"):
+            if column in frame:
+                aggregations[column] = (column, "last")
+        table = frame.groupby("method").agg(**aggregations)
+        if "peak_mb" in table:
+            table["peak_mb"] = table["peak_mb"] / 1e6
+        return table.sort_values("wall_total_s", ascending=False)
+
+    def summary_table(self):
+        """Resumen por método como texto, para mostrar en consola."""
+        table = self.summary()
+        if table.empty:
+            return "Sin llamadas registradas."
+        with pd.option_context("display.float_format", "{:.4f}".format,
+                               "display.width", 140):
+            return table.to_string()
+
+    def to_json(self, file_path=None):
+        """
+        Exporta los registros (con los perfiles de cProfile) como JSON.
+
+        Args:
+            file_path (str, optional): Archivo de destino; si es None,
+                solo retorna el texto.
+
+        Returns:
+            str: Documento JSON con 'records' y 'summary'.
+        """
+        summary = self.summary()
+        document = {
+            "records": self.records,
+            "summary": json.loads(summary.to_json(orient="index"))
+            if not summary.empty else {},
+        }
+        text = json.dumps(document, indent=2, default=str)
+        if file_path:
+            directory = os.path.dirname(file_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return text
@@ -0,0 +1,275 @@
+"""
+Control de calidad y alineación de calendario de los datos descargados.
+
+Cuando la cartera mezcla bolsas o índices (``^DJI``, ``^IXIC``) con
+acciones, ``yf.download`` une los calendarios de todos los tickers y deja
+NaN en los días que no comparten. Este módulo revisa una sola vez, sobre
+matrices (barras x tickers), los problemas típicos de los datos:
+
+    huecos       Barras sin precio dentro del período de cotización.
+    sin cambio   Precios repetidos durante muchas barras seguidas.
+    atípicos     Retornos extremos según un z-score robusto (mediana/MAD).
+    OHLC         Barras donde High/Low no contienen a Open/Close.
+
+y alinea todos los tickers a un calendario común con una política de
+relleno configurable, para que los análisis posteriores no repitan su
+propio manejo de NaN.
+"""
+
+import numpy as np
+import pandas as pd
+
+from ._frames import field_frame, field_matrix
+
+
+CALENDARS = ("union", "intersection")
+FILL_POLICIES = ("ffill", "none")
+
+# Factor que convierte la MAD en una desviación estándar (normal)
+MAD_SCALE = 1.4826
+
+
+def _active_span(valid):
+    """Máscara de las barras entre el primer y el último precio válido."""
+    n = len(valid)
+    has_data = valid.any(axis=0)
+    first = valid.argmax(axis=0)
+    last = n - 1 - valid[::-1].argmax(axis=0)
+    rows = np.arange(n)[:, None]
+    return (rows >= first) & (rows <= last) & has_data
+
+
+def _run_lengths(mask):
+    """Largo de la racha de valores verdaderos que termina en cada barra."""
+    counts = np.cumsum(mask, axis=0)
+    resets = np.maximum.accumulate(np.where(mask, 0, counts), axis=0)
+    return counts - resets
+
+
+def _log_returns(close):
+    """Log-retornos contra el último precio válido anterior."""
+    previous = pd.DataFrame(close).ffill().shift(1).to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.log(close / previous)
+
+
+def quality_masks(data, stale_run=5, outlier_z=8.0):
+    """
+    Calcula las máscaras de problemas de calidad (barras x tickers).
+
+    Args:
+        data (pd.DataFrame): Datos con columnas (campo, ticker).
+        stale_run (int): Barras seguidas con el mismo precio para
+            considerar el precio como sin cambio.
+        outlier_z (float): Umbral del z-score robusto de los retornos.
+
+    Returns:
+        dict: 'active', 'missing', 'stale', 'outlier', 'spike',
+        'nonpositive', 'ohlc' y 'zero_volume' como matrices booleanas,
+        junto con 'index' y 'tickers'.
+    """
+    close, index, tickers = field_matrix(data, "Close")
+    valid = ~np.isnan(close)
+    active = _active_span(valid)
+
+    unchanged = np.zeros_like(valid)
+    unchanged[1:] = close[1:] == close[:-1]
+    stale = _run_lengths(unchanged) >= stale_run - 1
+
+    returns = _log_returns(close)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        median = np.nanmedian(returns, axis=0)
+        mad = np.nanmedian(np.abs(returns - median), axis=0) * MAD_SCALE
+        z = np.abs(returns - median) / mad
+    outlier = np.nan_to_num(z, nan=0.0, posinf=0.0) > outlier_z
+    # Un pico aislado es un retorno extremo revertido en la barra siguiente;
+    # un solo retorno extremo puede ser un salto real (noticia, split).
+    spike = np.zeros_like(outlier)
+    spike[:-1] = outlier[:-1] & outlier[1:] & (
+        np.sign(returns[:-1]) != np.sign(returns[1:])
+    )
+
+    fields = set(data.columns.get_level_values(0)) \
+        if isinstance(data.columns, pd.MultiIndex) else {"Close"}
+    ohlc = np.zeros_like(valid)
+    if {"Open", "High", "Low"} <= fields:
+        open_ = field_frame(data, "Open").reindex(columns=tickers).to_numpy(
+            dtype=np.float64, na_value=np.nan)
+        high = field_frame(data, "High").reindex(columns=tickers).to_numpy(
+            dtype=np.float64, na_value=np.nan)
+        low = field_frame(data, "Low").reindex(columns=tickers).to_numpy(
+            dtype=np.float64, na_value=np.nan)
+        with np.errstate(invalid="ignore"):
+            ohlc = (high < np.fmax(open_, close)) \
+                | (low > np.fmin(open_, close))
+    zero_volume = np.zeros_like(valid)
+    if "Volume" in fields:
+        volume = field_frame(data, "Volume").reindex(columns=tickers)
+        zero_volume = valid & (volume.to_numpy(
+            dtype=np.float64, na_value=np.nan) == 0)
+
+    with np.errstate(invalid="ignore"):
+        nonpositive = close <= 0
+    return {
+        "index": index,
+        "tickers": tickers,
+        "active": active,
+        "missing": active & ~valid,
+        "stale": stale & valid,
+        "outlier": outlier,
+        "spike": spike,
+        "nonpositive": nonpositive,
+        "ohlc": ohlc,
+        "zero_volume": zero_volume,
+    }
+
+
+def assess_quality(data, stale_run=5, outlier_z=8.0, masks=None):
+    """
+    Resume la calidad de los datos por ticker.
+
+    Args:
+        data (pd.DataFrame): Datos con columnas (campo, ticker).
+        stale_run (int): Barras seguidas sin cambio para marcar un precio.
+        outlier_z (float): Umbral del z-score robusto de los retornos.
+        masks (dict, optional): Resultado previo de :func:`quality_masks`.
+
+    Returns:
+        pd.DataFrame: Una fila por ticker con first_valid, last_valid,
+        observations, missing, missing_pct, max_gap, stale_bars, outliers,
+        spikes, nonpositive, ohlc_errors y zero_volume.
+    """
+    if masks is None:
+        masks = quality_masks(data, stale_run, outlier_z)
+    index = masks["index"]
+    active = masks["active"]
+    missing = masks["missing"]
+    span = active.sum(axis=0)
+    has_data = span > 0
+    first = np.where(has_data, active.argmax(axis=0), 0)
+    last = np.where(has_data, len(index) - 1 - active[::-1].argmax(axis=0), 0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        missing_pct = missing.sum(axis=0) / span
+    report = pd.DataFrame(
+        {
+            "first_valid": index[first].where(has_data),
+            "last_valid": index[last].where(has_data),
+            "observations": span - missing.sum(axis=0),
+            "missing": missing.sum(axis=0),
+            "missing_pct": missing_pct,
+            "max_gap": _run_lengths(missing).max(axis=0, initial=0),
+            "stale_bars": masks["stale"].sum(axis=0),
+            "outliers": masks["outlier"].sum(axis=0),
+            "spikes": masks["spike"].sum(axis=0),
+            "nonpositive": masks["nonpositive"].sum(axis=0),
+            "ohlc_errors": masks["ohlc"].sum(axis=0),
+            "zero_volume": masks["zero_volume"].sum(axis=0),
+        },
+        index=pd.Index(masks["tickers"], name="Ticker"),
+    )
+    return report
+
+
+def align_calendar(data, calendar="union", fill="ffill", limit=None,
+                   mask=None):
+    """
+    Alinea todos los tickers a un calendario común.
+
+    Args:
+        data (pd.DataFrame): Datos con columnas (campo, ticker).
+        calendar (str): 'union' (todas las barras), 'intersection' (solo
+            barras donde todos cotizan) o un ticker cuyo calendario se
+            usa como referencia, por ejemplo '^GSPC'.
+        fill (str): 'ffill' repite el último cierre en las barras sin
+            precio (barra plana con volumen 0) o 'none' para dejar NaN.
+        limit (int, optional): Máximo de barras seguidas a rellenar.
+        mask (np.ndarray, optional): Barras (barras x tickers) a descartar
+            antes de rellenar, por ejemplo los retornos atípicos.
+
+    Returns:
+        pd.DataFrame: Datos alineados. Nunca se rellena antes del primer
+        precio ni después del último precio de cada ticker.
+
+    Raises:
+        ValueError: Si el calendario o la política de relleno no son
+            válidos.
+    """
+    close, _, tickers = field_matrix(data, "Close")
+    if mask is not None:
+        close = np.where(mask, np.nan, close)
+    valid = ~np.isnan(close)
+
+    if calendar == "union":
+        rows = np.ones(len(close), dtype=bool)
+    elif calendar == "intersection":
+        rows = valid.all(axis=1)
+    elif calendar in tickers:
+        rows = valid[:, tickers.index(calendar)]
+    else:
+        raise ValueError(
+            f"Calendario inválido: {calendar}. Usa uno de "
+            f"{', '.join(CALENDARS)} o uno de los tickers descargados."
+        )
+    if fill not in FILL_POLICIES:
+        raise ValueError(
+            f"Política de relleno inválida: {fill}. "
+            f"Usa uno de {', '.join(FILL_POLICIES)}."
+        )
+
+    multi = isinstance(data.columns, pd.MultiIndex)
+    fields = list(dict.fromkeys(data.columns.get_level_values(0))) \
+        if multi else ["Close"]
+    frames = {field: field_frame(data, field) for field in fields}
+    if mask is not None:
+        for field, frame in frames.items():
+            if field != "Volume":
+                frames[field] = frame.mask(mask)
+
+    if fill == "ffill":
+        active = pd.DataFrame(
+            _active_span(valid), index=data.index, columns=tickers
+        )
+        gaps = active & frames["Close"].isna()
+        filled_close = frames["Close"].ffill(limit=limit).where(active)
+        for field, frame in frames.items():
+            if field == "Close":
+                frames[field] = filled_close
+            elif field == "Volume":
+                frames[field] = frame.mask(gaps & filled_close.notna(), 0)
+            else:
+                frames[field] = frame.mask(gaps, filled_close)
+
+    if not multi:
+        return frames["Close"].loc[rows]
+    aligned = pd.concat(frames, axis=1, names=data.columns.names)
+    return aligned.loc[rows]
+
+
+def prepare_data(data, calendar="union", fill="ffill", limit=None,
+                 mask_outliers=False, stale_run=5, outlier_z=8.0):
+    """
+    Ejecuta el control de calidad y la alineación en un solo paso.
+
+    Args:
+        data (pd.DataFrame): Datos con columnas (campo, ticker).
+        calendar (str): Calendario destino, ver :func:`align_calendar`.
+        fill (str): Política de relleno, ver :func:`align_calendar`.
+        limit (int, optional): Máximo de barras seguidas a rellenar.
+        mask_outliers (bool): Si es True, los picos aislados (un retorno
+            extremo revertido en la barra siguiente) se descartan antes de
+            rellenar.
+        stale_run (int): Barras seguidas sin cambio para marcar un precio.
+        outlier_z (float): Umbral del z-score robusto de los retornos.
+
+    Returns:
+        tuple: (datos alineados, reporte de calidad por ticker). El
+        reporte describe los datos antes de alinearlos.
+    """
+    masks = quality_masks(data, stale_run, outlier_z)
+    report = assess_quality(data, masks=masks)
+    aligned = align_calendar(
+        data, calendar, fill, limit,
+        mask=masks["spike"] if mask_outliers else None,
+    )
+    return aligned, report
@@ -0,0 +1,160 @@
+"""
+Métricas relativas a un índice de referencia (benchmark).
+
+Calcula beta, alfa, correlación, tracking error y ratio de información de
+todos los tickers frente a un índice en una sola pasada vectorizada. Las
+regresiones se resuelven en forma cerrada a partir de sumas (de x, y, x², y²
+y xy), de modo que las versiones móviles se obtienen con sumas acumuladas
+en lugar de reajustar cada ventana.
+
+Las barras donde falta el ticker o el índice se excluyen del cálculo de
+ese ticker (observaciones completas por pares).
+"""
+
+import numpy as np
+import pandas as pd
+
+
+METRICS = [
+    "beta",
+    "alpha",
+    "correlation",
+    "tracking_error",
+    "information_ratio",
+]
+
+
+def _pair_sums(returns, benchmark):
+    """Sumas por barra de x, y, x², y² y xy con máscara de pares válidos."""
+    x = np.asarray(benchmark, dtype=np.float64)[:, np.newaxis]
+    y = np.asarray(returns, dtype=np.float64)
+    valid = ~np.isnan(y) & ~np.isnan(x)
+    x = np.where(valid, x, 0.0)
+    y = np.where(valid, y, 0.0)
+    return {
+        "n": valid.astype(np.float64),
+        "x": x,
+        "y": y,
+        "xx": x * x,
+        "yy": y * y,
+        "xy": x * y,
+    }
+
+
+def _metrics_from_sums(s, periods_per_year):
+    """Métricas de regresión a partir de sumas agregadas por ticker."""
+    n = s["n"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_x = s["x"] / n
+        mean_y = s["y"] / n
+        # Las covarianzas se calculan con ddof=1; el factor se cancela en
+        # beta y en la correlación, pero no en el tracking error.
+        cov_xy = (s["xy"] - n * mean_x * mean_y) / (n - 1)
+        var_x = (s["xx"] - n * mean_x * mean_x) / (n - 1)
+        var_y = (s["yy"] - n * mean_y * mean_y) / (n - 1)
+        var_x = np.maximum(var_x, 0.0)
+        var_y = np.maximum(var_y, 0.0)
+
+        beta = cov_xy / var_x
+        alpha = (mean_y - beta * mean_x) * periods_per_year
+        correlation = cov_xy / np.sqrt(var_x * var_y)
+
+        var_active = np.maximum(var_y + var_x - 2.0 * cov_xy, 0.0)
+        tracking_error = np.sqrt(var_active * periods_per_year)
+        information_ratio = (mean_y - mean_x) * periods_per_year / tracking_error
+
+    valid = n >= 2
+    return {
+        "beta": np.where(valid, beta, np.nan),
+        "alpha": np.where(valid, alpha, np.nan),
+        "correlation": np.where(valid, correlation, np.nan),
+        "tracking_error": np.where(valid, tracking_error, np.nan),
+        "information_ratio": np.where(valid, information_ratio, np.nan),
+    }
+
+
+def _excess(returns, benchmark, risk_free, periods_per_year):
+    """Resta la tasa libre de riesgo por período a ambas series."""
+    rf = risk_free / periods_per_year
+    return returns - rf, benchmark - rf
+
+
+def benchmark_metrics(returns, benchmark, periods_per_year=252,
+                      risk_free=0.0):
+    """
+    Calcula las métricas de todos los tickers frente a un índice.
+
+    Args:
+        returns (pd.DataFrame): Retornos por período (fechas x tickers).
+        benchmark (pd.Series): Retornos del índice con el mismo índice
+            temporal que ``returns``.
+        periods_per_year (float): Períodos por año para anualizar.
+        risk_free (float): Tasa libre de riesgo anual.
+
+    Returns:
+        pd.DataFrame: Una fila por ticker y una columna por métrica
+        (beta, alpha, correlation, tracking_error, information_ratio).
+        Alfa y tracking error están anualizados.
+    """
+    benchmark = benchmark.reindex(returns.index)
+    y, x = _excess(
+        returns.to_numpy(dtype=np.float64, na_value=np.nan),
+        benchmark.to_numpy(dtype=np.float64, na_value=np.nan),
+        risk_free,
+        periods_per_year,
+    )
+    sums = {
+        key: values.sum(axis=0) for key, values in _pair_sums(y, x).items()
+    }
+    metrics = _metrics_from_sums(sums, periods_per_year)
+    return pd.DataFrame(metrics, index=returns.columns)[METRICS]
+
+
+def rolling_benchmark_metrics(returns, benchmark, window,
+                              periods_per_year=252, risk_free=0.0,
+                              min_periods=None):
+    """
+    Calcula las métricas móviles frente a un índice con sumas acumuladas.
+
+    Cada ventana se obtiene restando dos sumas acumuladas, por lo que el
+    costo total es O(barras x tickers) independiente del tamaño de ventana.
+
+    Args:
+        returns (pd.DataFrame): Retornos por período (fechas x tickers).
+        benchmark (pd.Series): Retornos del índice.
+        window (int): Tamaño de la ventana en barras.
+        periods_per_year (float): Períodos por año para anualizar.
+        risk_free (float): Tasa libre de riesgo anual.
+        min_periods (int, optional): Observaciones válidas mínimas por
+            ventana. Por defecto, la ventana completa.
+
+    Returns:
+        dict: Nombre de la métrica -> DataFrame (fechas x tickers), NaN
+        donde la ventana no tiene suficientes observaciones.
+    """
+    min_periods = window if min_periods is None else min_periods
+    benchmark = benchmark.reindex(returns.index)
+    y, x = _excess(
+        returns.to_numpy(dtype=np.float64, na_value=np.nan),
+        benchmark.to_numpy(dtype=np.float64, na_value=np.nan),
+        risk_free,
+        periods_per_year,
+    )
+
+    sums = {}
+    for key, values in _pair_sums(y, x).items():
+        total = np.cumsum(values, axis=0)
+        windowed = total.copy()
+        windowed[window:] -= total[:-window]
+        sums[key] = windowed
+
+    metrics = _metrics_from_sums(sums, periods_per_year)
+    enough = sums["n"] >= min_periods
+    return {
+        name: pd.DataFrame(
+            np.where(enough, metrics[name], np.nan),
+            index=returns.index,
+            columns=returns.columns,
+        )
+        for name in METRICS
+    }
@@ -0,0 +1,165 @@
+"""
+Motor de remuestreo OHLCV para barras diarias e intradía.
+
+Agrega las barras de todos los tickers a un intervalo más grueso en una
+sola operación vectorizada por campo (Open = primera, High = máximo,
+Low = mínimo, Close = última, Volume = suma) y permite inferir cuántos
+períodos tiene un año a partir de la frecuencia real de las barras, para
+anualizar estadísticas sin suponer barras diarias.
+"""
+
+import pandas as pd
+
+from ._frames import field_frame
+
+
+# Días hábiles de mercado en un año
+TRADING_DAYS = 252
+
+# Intervalos de yfinance y su equivalente como frecuencia de pandas
+INTERVALS = {
+    "1m": "1min",
+    "2m": "2min",
+    "5m": "5min",
+    "15m": "15min",
+    "30m": "30min",
+    "60m": "60min",
+    "90m": "90min",
+    "1h": "1h",
+    "1d": "1D",
+    "5d": "5D",
+    "1wk": "1W",
+    "1mo": "1MS",
+    "3mo": "3MS",
+}
+
+# Agregación de cada campo OHLCV al pasar a un intervalo más grueso
+AGGREGATIONS = {
+    "Open": "first",
+    "High": "max",
+    "Low": "min",
+    "Close": "last",
+    "Adj Close": "last",
+    "Volume": "sum",
+}
+
+_DAY = pd.Timedelta(days=1)
+
+
+def to_pandas_freq(interval):
+    """
+    Convierte un intervalo de yfinance (por ejemplo '5m') a frecuencia pandas.
+
+    Args:
+        interval (str): Intervalo de yfinance o frecuencia de pandas.
+
+    Returns:
+        str: Frecuencia aceptada por ``DataFrame.resample``.
+    """
+    return INTERVALS.get(interval, interval)
+
+
+def bar_spacing(index):
+    """
+    Estima la separación típica entre barras de un índice temporal.
+
+    Args:
+        index (pd.DatetimeIndex): Índice de las barras.
+
+    Returns:
+        pd.Timedelta or None: Mediana de la separación, o None si hay
+        menos de dos barras.
+    """
+    if len(index) < 2:
+        return None
+    diffs = pd.TimedeltaIndex(index[1:] - index[:-1])
+    diffs = diffs[diffs > pd.Timedelta(0)]
+    if len(diffs) == 0:
+        return None
+    return diffs.median()
+
+
+def infer_periods_per_year(index):
+    """
+    Calcula los períodos por año según la frecuencia real de las barras.
+
+    Para barras intradía se usa la mediana de barras por sesión
+    multiplicada por los días hábiles del año; para barras diarias o más
+    gruesas, la separación típica entre barras.
+
+    Args:
+        index (pd.DatetimeIndex): Índice de las barras.
+
+    Returns:
+        float: Períodos por año (252 para barras diarias).
+    """
+    spacing = bar_spacing(index)
+    if spacing is None:
+        return float(TRADING_DAYS)
+
+    if spacing < _DAY:
+        bars_per_day = pd.Series(index.normalize()).value_counts().median()
+        return float(TRADING_DAYS * bars_per_day)
+
+    days = spacing / _DAY
+    if days <= 1.5:
+        # Barras diarias: los fines de semana no cuentan como períodos
+        return float(TRADING_DAYS)
+    return 365.25 / days
+
+
+def resample_ohlcv(data, interval, dtype=None, **resample_kwargs):
+    """
+    Agrega barras OHLCV de todos los tickers a un intervalo más grueso.
+
+    Cada campo se procesa por separado sobre su bloque (barras x tickers),
+    lo que evita copias del DataFrame completo. Los intervalos sin ninguna
+    barra (noches, fines de semana) se eliminan del resultado.
+
+    Args:
+        data (pd.DataFrame): Datos con columnas (campo, ticker).
+        interval (str): Intervalo destino, en formato yfinance ('5m', '1h',
+            '1d', '1wk') o como frecuencia de pandas.
+        dtype: Tipo numérico opcional del resultado (por ejemplo
+            'float32' para reducir memoria).
+        **resample_kwargs: Argumentos adicionales para
+            ``DataFrame.resample`` (por ejemplo ``offset='30min'``).
+
+    Returns:
+        pd.DataFrame: Barras agregadas con columnas (campo, ticker).
+
+    Raises:
+        ValueError: Si el intervalo destino es más fino que el de origen.
+    """
+    freq = to_pandas_freq(interval)
+    spacing = bar_spacing(data.index)
+    # Duración aproximada del intervalo destino (los meses varían)
+    anchor = pd.Timestamp("2000-01-03")
+    target_span = anchor + pd.tseries.frequencies.to_offset(freq) - anchor
+    if spacing is not None and target_span < spacing:
+        raise ValueError(
+            f"El intervalo {interval} es más fino que el de los datos "
+            f"({spacing}). Solo se puede agregar a intervalos más gruesos."
+        )
+
+    if isinstance(data.columns, pd.MultiIndex):
+        fields = list(dict.fromkeys(data.columns.get_level_values(0)))
+        names = data.columns.names
+    else:
+        fields = ["Close"]
+        names = None
+
+    blocks = {}
+    for field in fields:
+        frame = field_frame(data, field)
+        if dtype is not None:
+            frame = frame.astype(dtype)
+        how = AGGREGATIONS.get(field, "last")
+        grouped = frame.resample(freq, **resample_kwargs)
+        if how == "sum":
+            blocks[field] = grouped.sum(min_count=1)
+        else:
+            blocks[field] = getattr(grouped, how)()
+
+    result = pd.concat(blocks, axis=1, names=names)
+    return result.dropna(how="all")
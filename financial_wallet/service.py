@@ -0,0 +1,431 @@
+"""
+Servicio HTTP local con los análisis de la cartera.
+
+Varios tableros que crean su propia ``FinancialWallet`` descargan y
+calculan los mismos tickers y ventanas una y otra vez. Este servicio
+expone los análisis (precios, retornos, volatilidad y correlación) como
+JSON o Arrow sobre un caché compartido de resultados:
+
+- Cada resultado se guarda con un tiempo de vida (``ttl``); mientras está
+  vigente, las solicitudes se responden sin descargar ni calcular.
+- Las solicitudes idénticas simultáneas se agrupan (*single flight*): la
+  primera calcula y las demás esperan ese mismo resultado, así que N
+  tableros pidiendo lo mismo producen un solo cálculo.
+- Los análisis derivados reutilizan los precios en caché: retornos,
+  volatilidad y correlación de un mismo universo comparten una descarga.
+
+Los tickers se normalizan (mayúsculas, sin repetir, ordenados), de modo
+que ``msft,AAPL`` y ``AAPL,MSFT`` son la misma solicitud.
+
+Uso:
+    python -m financial_wallet.service --port 8765 --ttl 300
+    curl "http://127.0.0.1:8765/volatility?tickers=AAPL,MSFT&start=2024-01-01"
+"""
+
+import argparse
+import io
+import json
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import yfinance as yf
+
+from ._frames import field_frame
+from .resample import INTERVALS
+from .wallet import FinancialWallet
+
+
+ANALYSES = ("prices", "returns", "volatility", "correlation")
+
+
+class _Flight:
+    """Cálculo en curso que esperan las solicitudes agrupadas."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResultCache:
+    """
+    Caché LRU con tiempo de vida y agrupación de cálculos simultáneos.
+
+    Atributos:
+        ttl (float): Segundos que un resultado se considera vigente.
+        max_entries (int): Resultados que se conservan (los menos usados
+            se descartan primero).
+    """
+
+    def __init__(self, ttl=300.0, max_entries=256, clock=time.monotonic):
+        """
+        Crea el caché.
+
+        Args:
+            ttl (float): Tiempo de vida de cada resultado, en segundos.
+            max_entries (int): Máximo de resultados guardados.
+            clock (callable): Reloj en segundos (inyectable en pruebas).
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0, "misses": 0, "coalesced": 0, "errors": 0,
+            "evictions": 0,
+        }
+
+    def get_or_compute(self, key, compute):
+        """
+        Retorna el resultado vigente de ``key`` o lo calcula una sola vez.
+
+        Si otro hilo ya está calculando la misma clave, espera ese
+        resultado en lugar de repetir el cálculo. Los errores no se
+        guardan: se propagan a todos los que esperaban y la siguiente
+        solicitud vuelve a intentar.
+
+        Args:
+            key (hashable): Clave del resultado.
+            compute (callable): Función sin argumentos que lo calcula.
+
+        Returns:
+            object: El resultado (compartido; no debe modificarse).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._clock() < entry[0]:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return entry[1]
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self._counters["misses"] += 1
+            else:
+                self._counters["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+        except BaseException as e:
+            flight.error = e
+            with self._lock:
+                self._counters["errors"] += 1
+            raise
+        else:
+            with self._lock:
+                self._entries[key] = (self._clock() + self.ttl, flight.value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._counters["evictions"] += 1
+            return flight.value
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def clear(self):
+        """Descarta todos los resultados guardados."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Retorna los contadores del caché.
+
+        Returns:
+            dict: hits, misses (cálculos), coalesced (solicitudes que
+            esperaron un cálculo en curso), errors, evictions, entries e
+            in_flight.
+        """
+        with self._lock:
+            return {
+                **self._counters,
+                "entries": len(self._entries),
+                "in_flight": len(self._flights),
+            }
+
+
+def normalize_tickers(tickers):
+    """
+    Normaliza una lista de tickers para usarla como clave.
+
+    Args:
+        tickers (str or list): Tickers separados por comas o una lista.
+
+    Returns:
+        tuple: Tickers en mayúsculas, sin repetir y ordenados.
+
+    Raises:
+        ValueError: Si no queda ningún ticker.
+    """
+    if isinstance(tickers, str):
+        tickers = tickers.split(",")
+    normalized = tuple(sorted(
+        {t.strip().upper() for t in tickers if t.strip()}
+    ))
+    if not normalized:
+        raise ValueError("Indica al menos un ticker.")
+    return normalized
+
+
+class AnalyticsService:
+    """
+    Análisis de la cartera con caché compartido.
+
+    Cada análisis usa los mismos cálculos que ``FinancialWallet``
+    (``compute_returns`` y ``compute_volatility``) sobre precios
+    descargados una sola vez por universo, fechas e intervalo.
+
+    Atributos:
+        cache (ResultCache): Caché de precios y análisis.
+        download (callable): Función con la firma de ``yf.download``.
+        output_dir (str): Directorio de salida de las carteras.
+    """
+
+    def __init__(self, ttl=300.0, max_entries=256, download=None,
+                 output_dir='data/financial'):
+        """
+        Crea el servicio.
+
+        Args:
+            ttl (float): Tiempo de vida de los resultados, en segundos.
+            max_entries (int): Máximo de resultados en caché.
+            download (callable, optional): Reemplazo de ``yf.download``
+                (por ejemplo, ``synthetic_download()`` sin conexión).
+            output_dir (str): Directorio de salida de las carteras.
+        """
+        self.cache = ResultCache(ttl=ttl, max_entries=max_entries)
+        self.download = download or yf.download
+        self.output_dir = output_dir
+
+    def _wallet(self, tickers, start, end, interval):
+        """Cartera con los datos del universo, desde el caché."""
+        key = ("data", tickers, start, end, interval)
+
+        def fetch():
+            data = self.download(
+                list(tickers), start=start, end=end, interval=interval,
+                progress=False,
+            )
+            if data is None or data.empty:
+                raise LookupError(
+                    "No se encontraron datos para los tickers y fechas "
+                    "indicados."
+                )
+            return data
+
+        wallet = FinancialWallet(output_dir=self.output_dir)
+        wallet.ticks = list(tickers)
+        wallet.start, wallet.end, wallet.interval = start, end, interval
+        wallet.data = self.cache.get_or_compute(key, fetch)
+        return wallet
+
+    def analyze(self, analysis, tickers, start=None, end=None, interval="1d",
+                window=None):
+        """
+        Calcula (o toma del caché) un análisis.
+
+        Args:
+            analysis (str): 'prices', 'returns', 'volatility' o
+                'correlation'.
+            tickers (str or list): Tickers.
+            start (str, optional): Fecha de inicio 'YYYY-MM-DD'.
+            end (str, optional): Fecha de fin 'YYYY-MM-DD'.
+            interval (str): Intervalo de las barras.
+            window (int, optional): Ventana de la volatilidad móvil.
+
+        Returns:
+            pd.DataFrame or pd.Series: Resultado (compartido entre
+            solicitudes; no debe modificarse).
+
+        Raises:
+            ValueError: Si los parámetros no son válidos.
+            LookupError: Si no hay datos para la solicitud.
+        """
+        if analysis not in ANALYSES:
+            raise ValueError(f"Análisis desconocido: {analysis}.")
+        if interval not in INTERVALS:
+            raise ValueError(f"Intervalo inválido: {interval}.")
+        if window is not None and window < 2:
+            raise ValueError("window debe ser al menos 2.")
+        tickers = normalize_tickers(tickers)
+        key = (analysis, tickers, start, end, interval, window)
+
+        def compute():
+            wallet = self._wallet(tickers, start, end, interval)
+            if analysis == "prices":
+                return field_frame(wallet.data, "Close")
+            if analysis == "returns":
+                return wallet.compute_returns()
+            if analysis == "volatility":
+                return wallet.compute_volatility(window=window)
+            return wallet.compute_returns().corr()
+
+        return self.cache.get_or_compute(key, compute)
+
+
+def to_json(result):
+    """Serializa un resultado en JSON con orientación 'split'."""
+    if isinstance(result, pd.Series):
+        result = result.to_frame(result.name or "value")
+    return result.to_json(orient="split", date_format="iso", double_precision=10)
+
+
+def to_arrow(result):
+    """
+    Serializa un resultado como stream IPC de Apache Arrow.
+
+    Raises:
+        ImportError: Si pyarrow no está instalado.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError(
+            "El formato Arrow requiere pyarrow: pip install pyarrow"
+        ) from e
+    if isinstance(result, pd.Series):
+        result = result.to_frame(result.name or "value")
+    result = result.copy(deep=False)
+    result.columns = [str(c) for c in result.columns]
+    table = pa.Table.from_pandas(result.reset_index(), preserve_index=False)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Atiende las solicitudes GET del servicio."""
+
+    service = None
+    quiet = False
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def _send(self, status, body, content_type="application/json"):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message):
+        self._send(status, json.dumps({"error": message}, ensure_ascii=False))
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        name = url.path.strip("/")
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+        if name == "health":
+            return self._send(200, '{"status": "ok"}')
+        if name == "stats":
+            return self._send(200, json.dumps(self.service.cache.stats()))
+        if name not in ANALYSES:
+            return self._error(404, f"Ruta desconocida: /{name}")
+
+        output = params.get("format", "json")
+        if output not in ("json", "arrow"):
+            return self._error(400, "format debe ser 'json' o 'arrow'.")
+        try:
+            window = params.get("window")
+            result = self.service.analyze(
+                name,
+                params.get("tickers", ""),
+                start=params.get("start"),
+                end=params.get("end"),
+                interval=params.get("interval", "1d"),
+                window=int(window) if window else None,
+            )
+            if output == "arrow":
+                return self._send(
+                    200, to_arrow(result),
+                    "application/vnd.apache.arrow.stream",
+                )
+            return self._send(200, to_json(result))
+        except ValueError as e:
+            return self._error(400, str(e))
+        except LookupError as e:
+            return self._error(404, str(e))
+        except ImportError as e:
+            return self._error(501, str(e))
+        except Exception as e:
+            return self._error(502, f"Error al calcular {name}: {e}")
+
+
+def make_server(service, host="127.0.0.1", port=8765, quiet=False):
+    """
+    Crea el servidor HTTP (un hilo por solicitud).
+
+    Args:
+        service (AnalyticsService): Servicio a exponer.
+        host (str): Dirección de escucha.
+        port (int): Puerto (0 elige uno libre).
+        quiet (bool): No registra cada solicitud en stderr.
+
+    Returns:
+        ThreadingHTTPServer: Servidor listo para ``serve_forever``.
+    """
+    handler = type("Handler", (_Handler,), {
+        "service": service, "quiet": quiet,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    """Inicia el servicio desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--ttl", type=float, default=300.0,
+                        help="Segundos de vigencia de cada resultado.")
+    parser.add_argument("--max-entries", type=int, default=256)
+    parser.add_argument(
+        "--synthetic", action="store_true",
+        help="Usa datos sintéticos en lugar de yfinance (sin conexión).",
+    )
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args()
+
+    download = None
+    if args.synthetic:
+        from .synthetic import synthetic_download
+        download = synthetic_download(missing_rate=0.01)
+
+    service = AnalyticsService(
+        ttl=args.ttl, max_entries=args.max_entries, download=download
+    )
+    server = make_server(service, args.host, args.port, quiet=args.quiet)
+    print(f"Servicio de análisis en http://{args.host}:{args.port}/")
+    print("Rutas: /prices /returns /volatility /correlation /stats /health")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nDeteniendo servicio...")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
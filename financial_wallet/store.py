@@ -0,0 +1,388 @@
+"""
+Almacén binario de precios para abrir con memory mapping.
+
+Un almacén es un directorio con tres archivos:
+
+    meta.json    Tickers, campos, tipo numérico, zona horaria, barras usadas
+                 y capacidad.
+    index.npy    Marcas de tiempo (int64, nanosegundos en UTC) de cada barra.
+    values.npy   Matriz (capacidad, campos x tickers) con los precios, con
+                 las columnas ordenadas por campo y luego por ticker, igual
+                 que el DataFrame de ``yf.download``.
+
+Los archivos ``.npy`` se abren con ``np.load(mmap_mode='r')``, de modo que
+varios procesos comparten las mismas páginas del sistema operativo en
+modo solo lectura y la apertura es casi instantánea. La matriz reserva
+filas libres (capacidad) para poder agregar barras nuevas sin reescribir
+el archivo completo.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from ._frames import field_frame, parse_timestamps
+
+
+META_FILE = "meta.json"
+INDEX_FILE = "index.npy"
+VALUES_FILE = "values.npy"
+FORMAT_VERSION = 1
+
+
+def _write_meta(path, meta):
+    """Escribe meta.json de forma atómica (archivo temporal y reemplazo)."""
+    tmp_path = os.path.join(path, META_FILE + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_path, os.path.join(path, META_FILE))
+
+
+def _to_ns(index):
+    """Convierte un índice temporal a enteros en nanosegundos."""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return index.as_unit("ns").asi8
+
+
+def _tz_name(index):
+    """Nombre de la zona horaria de un índice temporal, o None."""
+    tz = pd.DatetimeIndex(index).tz
+    return None if tz is None else str(tz)
+
+
+class PriceStore:
+    """
+    Almacén de precios abierto mediante memory mapping.
+
+    Atributos:
+        path (str): Directorio del almacén.
+        tickers (list): Tickers en el orden de las columnas.
+        fields (list): Campos almacenados ('Open', 'Close', ...).
+        interval (str or None): Intervalo de las barras.
+        tz (str or None): Zona horaria de los datos originales; None si el
+            índice no tenía zona.
+        length (int): Barras usadas.
+        capacity (int): Barras reservadas en los archivos.
+    """
+
+    def __init__(self, path, mode="r"):
+        """
+        Abre un almacén existente.
+
+        Args:
+            path (str): Directorio del almacén.
+            mode (str): 'r' para solo lectura o 'r+' para agregar barras.
+
+        Raises:
+            FileNotFoundError: Si el directorio no contiene un almacén.
+            ValueError: Si la versión del formato no es compatible.
+        """
+        self.path = path
+        self.mode = mode
+        with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(
+                f"Versión de almacén no soportada: {meta.get('version')}"
+            )
+        self.tickers = meta["tickers"]
+        self.fields = meta["fields"]
+        self.interval = meta.get("interval")
+        self.tz = meta.get("tz")
+        self.length = meta["length"]
+        self.capacity = meta["capacity"]
+        self._meta = meta
+        self._map()
+
+    def _map(self):
+        """Abre los archivos de datos con memory mapping."""
+        self._index = np.load(
+            os.path.join(self.path, INDEX_FILE), mmap_mode=self.mode
+        )
+        self._values = np.load(
+            os.path.join(self.path, VALUES_FILE), mmap_mode=self.mode
+        )
+
+    @property
+    def columns(self):
+        """Columnas (campo, ticker) de la matriz de valores."""
+        return pd.MultiIndex.from_product(
+            [self.fields, self.tickers], names=["Price", "Ticker"]
+        )
+
+    @property
+    def index(self):
+        """Índice temporal de las barras usadas, en la zona original."""
+        index = pd.DatetimeIndex(
+            self._index[:self.length].astype("datetime64[ns]"), name="Date"
+        )
+        if self.tz is not None:
+            index = index.tz_localize("UTC").tz_convert(self.tz)
+        return index
+
+    @property
+    def values(self):
+        """Vista (sin copia) de la matriz de valores usados."""
+        return self._values[:self.length]
+
+    def field(self, name):
+        """
+        Vista (sin copia) de un campo como matriz (barras, tickers).
+
+        Args:
+            name (str): Campo a obtener, por ejemplo 'Close'.
+
+        Returns:
+            np.ndarray: Matriz mapeada en memoria.
+        """
+        pos = self.fields.index(name)
+        n = len(self.tickers)
+        return self._values[:self.length, pos * n:(pos + 1) * n]
+
+    def to_dataframe(self):
+        """
+        Construye el DataFrame de la cartera sobre la memoria mapeada.
+
+        El DataFrame no copia los datos: sus columnas apuntan directamente
+        a las páginas del archivo, compartidas entre procesos.
+
+        Returns:
+            pd.DataFrame: Datos con columnas (campo, ticker).
+        """
+        return pd.DataFrame(
+            self.values, index=self.index, columns=self.columns, copy=False
+        )
+
+    def iter_chunks(self, field="Close", chunksize=100_000, tickers=None):
+        """
+        Recorre un campo por bloques de filas, compatible con ``chunked``.
+
+        Args:
+            field (str): Campo a recorrer.
+            chunksize (int): Barras por bloque.
+            tickers (list, optional): Subconjunto de tickers.
+
+        Yields:
+            pd.DataFrame: Bloque de precios (fechas x tickers).
+        """
+        values = self.field(field)
+        index = self.index
+        columns = list(self.tickers)
+        if tickers is not None:
+            positions = [columns.index(tick) for tick in tickers]
+            columns = list(tickers)
+        for start in range(0, self.length, chunksize):
+            block = values[start:start + chunksize]
+            if tickers is not None:
+                block = block[:, positions]
+            yield pd.DataFrame(
+                block,
+                index=index[start:start + chunksize],
+                columns=columns,
+                copy=False,
+            )
+
+    def append(self, index, values):
+        """
+        Agrega barras al final del almacén.
+
+        Si no queda capacidad, los archivos se reescriben con el doble de
+        filas reservadas; los procesos que ya los tenían abiertos conservan
+        la versión anterior hasta que vuelvan a abrir el almacén.
+
+        Args:
+            index (array-like): Marcas de tiempo de las barras nuevas.
+            values (np.ndarray): Matriz (barras, campos x tickers) en el
+                orden de ``columns``.
+
+        Raises:
+            ValueError: Si el almacén se abrió en modo solo lectura o las
+                dimensiones no coinciden.
+        """
+        if self.mode != "r+":
+            raise ValueError("El almacén se abrió en modo solo lectura.")
+        values = np.asarray(values, dtype=self._values.dtype)
+        if values.ndim != 2 or values.shape[1] != self._values.shape[1]:
+            raise ValueError(
+                f"Se esperaban {self._values.shape[1]} columnas por barra."
+            )
+        stamps = _to_ns(index)
+        rows = len(stamps)
+        if self.length + rows > self.capacity:
+            self._grow(max(self.capacity * 2, self.length + rows))
+
+        start, end = self.length, self.length + rows
+        self._index[start:end] = stamps
+        self._values[start:end] = values
+        self._index.flush()
+        self._values.flush()
+        self.length = end
+        self._meta["length"] = end
+        _write_meta(self.path, self._meta)
+
+    def overwrite_last(self, values):
+        """
+        Reemplaza la última barra (por ejemplo, una barra aún en formación).
+
+        Args:
+            values (np.ndarray): Fila (campos x tickers) con los valores.
+        """
+        if self.mode != "r+":
+            raise ValueError("El almacén se abrió en modo solo lectura.")
+        self._values[self.length - 1] = values
+        self._values.flush()
+
+    def overwrite_rows(self, positions, values):
+        """
+        Reemplaza barras existentes (por ejemplo, barras recibidas tarde).
+
+        Args:
+            positions (array-like): Posiciones de las barras a reemplazar.
+            values (np.ndarray): Matriz (barras, campos x tickers) en el
+                orden de ``columns``.
+
+        Raises:
+            ValueError: Si el almacén se abrió en modo solo lectura o alguna
+                posición está fuera de las barras usadas.
+        """
+        if self.mode != "r+":
+            raise ValueError("El almacén se abrió en modo solo lectura.")
+        positions = np.asarray(positions, dtype=np.intp)
+        if len(positions) and (
+            positions.min() < 0 or positions.max() >= self.length
+        ):
+            raise ValueError("Posición fuera de las barras del almacén.")
+        self._values[positions] = values
+        self._values.flush()
+
+    def _grow(self, capacity):
+        """Reescribe los archivos con más filas reservadas."""
+        for name, current in (
+            (INDEX_FILE, self._index),
+            (VALUES_FILE, self._values),
+        ):
+            tmp_path = os.path.join(self.path, name + ".tmp")
+            shape = (capacity,) + current.shape[1:]
+            grown = np.lib.format.open_memmap(
+                tmp_path, mode="w+", dtype=current.dtype, shape=shape
+            )
+            grown[:self.length] = current[:self.length]
+            grown.flush()
+            del grown
+            os.replace(tmp_path, os.path.join(self.path, name))
+        self.capacity = capacity
+        self._meta["capacity"] = capacity
+        self._map()
+
+
+def write_store(data, path, dtype=np.float64, interval=None, capacity=None):
+    """
+    Convierte el DataFrame de la cartera en un almacén binario.
+
+    Las marcas de tiempo se guardan en UTC y la zona horaria del índice
+    queda en meta.json, para devolverlas en la misma zona al abrirlo.
+
+    Args:
+        data (pd.DataFrame): Datos con columnas (campo, ticker).
+        path (str): Directorio destino (se crea si no existe).
+        dtype: Tipo numérico de los precios ('float32' reduce a la mitad
+            el tamaño en disco y en memoria).
+        interval (str, optional): Intervalo de las barras, informativo.
+        capacity (int, optional): Barras a reservar; por defecto, las
+            actuales más un 10 % para agregar barras nuevas.
+
+    Returns:
+        PriceStore: El almacén abierto en modo solo lectura.
+    """
+    if isinstance(data.columns, pd.MultiIndex):
+        fields = list(dict.fromkeys(data.columns.get_level_values(0)))
+        tickers = list(field_frame(data, fields[0]).columns)
+    else:
+        fields = ["Close"]
+        tickers = list(data.columns)
+    columns = pd.MultiIndex.from_product([fields, tickers])
+    ordered = data.reindex(columns=columns) \
+        if isinstance(data.columns, pd.MultiIndex) else data
+
+    length = len(data)
+    capacity = capacity or max(length + length // 10, 1)
+    os.makedirs(path, exist_ok=True)
+
+    index_map = np.lib.format.open_memmap(
+        os.path.join(path, INDEX_FILE), mode="w+", dtype=np.int64,
+        shape=(capacity,),
+    )
+    index_map[:length] = _to_ns(data.index)
+    index_map.flush()
+    del index_map
+
+    values_map = np.lib.format.open_memmap(
+        os.path.join(path, VALUES_FILE), mode="w+", dtype=dtype,
+        shape=(capacity, len(fields) * len(tickers)),
+    )
+    values_map[:length] = ordered.to_numpy(dtype=dtype, na_value=np.nan)
+    values_map[length:] = np.nan
+    values_map.flush()
+    del values_map
+
+    _write_meta(path, {
+        "version": FORMAT_VERSION,
+        "tickers": tickers,
+        "fields": fields,
+        "dtype": np.dtype(dtype).name,
+        "interval": interval,
+        "tz": _tz_name(data.index),
+        "length": length,
+        "capacity": capacity,
+    })
+    return PriceStore(path)
+
+
+def csv_to_store(csv_path, path, dtype=np.float64, interval=None,
+                 chunksize=100_000):
+    """
+    Convierte un CSV exportado por ``export_data`` en un almacén binario.
+
+    El archivo se lee por bloques, por lo que la conversión funciona aunque
+    el CSV no quepa en memoria.
+
+    Args:
+        csv_path (str): CSV con columnas (campo, ticker).
+        path (str): Directorio destino del almacén.
+        dtype: Tipo numérico de los precios.
+        interval (str, optional): Intervalo de las barras, informativo.
+        chunksize (int): Filas leídas por bloque.
+
+    Returns:
+        PriceStore: El almacén abierto en modo solo lectura.
+    """
+    reader = pd.read_csv(
+        csv_path, header=[0, 1], index_col=0, chunksize=chunksize,
+    )
+    store = None
+    for chunk in reader:
+        chunk.index = parse_timestamps(chunk.index).rename("Date")
+        if store is None:
+            write_store(chunk, path, dtype=dtype, interval=interval)
+            store = PriceStore(path, mode="r+")
+        else:
+            ordered = chunk.reindex(columns=store.columns)
+            store.append(chunk.index, ordered.to_numpy(na_value=np.nan))
+    return PriceStore(path)
+
+
+def open_store(path):
+    """
+    Abre un almacén en modo solo lectura.
+
+    Args:
+        path (str): Directorio del almacén.
+
+    Returns:
+        PriceStore: Almacén mapeado en memoria.
+    """
+    return PriceStore(path)
@@ -0,0 +1,232 @@
+"""
+Generador de datos OHLCV sintéticos con el formato de ``yf.download``.
+
+Permite probar y medir la cartera sin acceso a la red: los precios siguen
+un movimiento browniano geométrico con deriva y volatilidad propias de
+cada ticker, las barras OHLC son consistentes (High >= Open/Close >= Low)
+y se puede simular una proporción de barras faltantes.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .resample import TRADING_DAYS, infer_periods_per_year, to_pandas_freq
+
+
+# Minutos de una sesión bursátil (09:30 a 16:00)
+SESSION_OPEN = pd.Timedelta(hours=9, minutes=30)
+SESSION_MINUTES = 390
+
+# Campos en el orden en que los entrega yf.download
+FIELDS = ["Close", "High", "Low", "Open", "Volume"]
+
+# Fecha inicial cuando no se indica start ni period (o con period='max')
+DEFAULT_START = "2000-01-03"
+
+# Opciones de yf.download que no cambian los datos generados
+_IGNORED_OPTIONS = {
+    "actions", "auto_adjust", "back_adjust", "group_by", "ignore_tz",
+    "keepna", "multi_level_index", "prepost", "progress", "proxy",
+    "repair", "rounding", "session", "threads", "timeout",
+}
+
+# Unidades de los períodos de yfinance ('5d', '1mo', '2y', ...)
+_PERIOD_UNITS = {"d": "days", "wk": "weeks", "mo": "months", "y": "years"}
+
+
+def _intraday_minutes(interval):
+    """Minutos por barra intradía; None si la barra es diaria o mayor."""
+    if interval[-1] not in "mh":
+        return None
+    step = pd.Timedelta(to_pandas_freq(interval))
+    return int(step / pd.Timedelta(minutes=1))
+
+
+def bars_between(start, end, interval="1d"):
+    """
+    Cuenta las barras de mercado entre dos fechas.
+
+    Args:
+        start (str): Fecha inicial.
+        end (str): Fecha final (incluida).
+        interval (str): Intervalo de yfinance.
+
+    Returns:
+        int: Barras que :func:`synthetic_index` generaría en el rango: días
+        hábiles por barras de la sesión para los intervalos intradía.
+    """
+    minutes = _intraday_minutes(interval)
+    if minutes is not None:
+        days = len(pd.bdate_range(start, end))
+        return days * max(SESSION_MINUTES // minutes, 1)
+    if interval == "1d":
+        return len(pd.bdate_range(start, end))
+    return len(pd.date_range(start, end, freq=to_pandas_freq(interval)))
+
+
+def period_start(period, end):
+    """
+    Calcula la fecha inicial de un período de yfinance.
+
+    Args:
+        period (str): Período como en ``yf.download`` ('5d', '1mo', '1y',
+            'ytd', 'max', ...).
+        end: Fecha final del período.
+
+    Returns:
+        pd.Timestamp: Fecha inicial.
+
+    Raises:
+        ValueError: Si el período no tiene un formato reconocido.
+    """
+    end = pd.Timestamp(end).normalize()
+    if period == "max":
+        return pd.Timestamp(DEFAULT_START)
+    if period == "ytd":
+        return end.replace(month=1, day=1)
+    for suffix, unit in _PERIOD_UNITS.items():
+        amount = period[:-len(suffix)]
+        if period.endswith(suffix) and amount.isdigit():
+            return end - pd.DateOffset(**{unit: int(amount)})
+    raise ValueError(f"Período no reconocido: {period!r}")
+
+
+def synthetic_index(n_bars, interval="1d", start="2000-01-03"):
+    """
+    Genera un índice temporal de barras de mercado.
+
+    Las barras intradía se reparten dentro de la sesión (09:30 a 16:00)
+    de los días hábiles; las diarias usan días hábiles.
+
+    Args:
+        n_bars (int): Número de barras.
+        interval (str): Intervalo de yfinance ('1m', '5m', '1h', '1d',
+            '1wk', ...).
+        start (str): Fecha inicial.
+
+    Returns:
+        pd.DatetimeIndex: Índice con ``n_bars`` marcas de tiempo.
+    """
+    minutes = _intraday_minutes(interval)
+    if minutes is None:
+        if interval == "1d":
+            return pd.bdate_range(start, periods=n_bars, name="Date")
+        return pd.date_range(
+            start, periods=n_bars, freq=to_pandas_freq(interval), name="Date"
+        )
+
+    per_day = max(SESSION_MINUTES // minutes, 1)
+    days = pd.bdate_range(start, periods=-(-n_bars // per_day))
+    offsets = (
+        SESSION_OPEN + pd.to_timedelta(np.arange(per_day) * minutes, "min")
+    ).to_numpy()
+    stamps = (days.to_numpy()[:, None] + offsets[None, :]).ravel()
+    return pd.DatetimeIndex(stamps[:n_bars], name="Datetime")
+
+
+def synthetic_ohlcv(n_tickers=10, n_bars=252, interval="1d",
+                    start="2000-01-03", missing_rate=0.0, seed=0,
+                    dtype=np.float64):
+    """
+    Genera precios OHLCV sintéticos para varios tickers.
+
+    Args:
+        n_tickers (int): Número de tickers ('T0000', 'T0001', ...).
+        n_bars (int): Barras por ticker.
+        interval (str): Intervalo de las barras, ver :func:`synthetic_index`.
+        start (str): Fecha inicial.
+        missing_rate (float): Proporción de barras sin datos por ticker
+            (todos los campos en NaN), entre 0 y 1.
+        seed (int): Semilla del generador aleatorio.
+        dtype: Tipo numérico de los precios.
+
+    Returns:
+        pd.DataFrame: Datos con columnas (campo, ticker), igual que
+        ``yf.download``.
+    """
+    rng = np.random.default_rng(seed)
+    index = synthetic_index(n_bars, interval, start)
+    tickers = [f"T{i:04d}" for i in range(n_tickers)]
+
+    # Parámetros anuales por ticker, escalados a la frecuencia de las barras
+    periods = infer_periods_per_year(index) if n_bars > 1 else TRADING_DAYS
+    drift = rng.normal(0.06, 0.08, n_tickers) / periods
+    vol = rng.uniform(0.15, 0.6, n_tickers) / np.sqrt(periods)
+
+    shocks = rng.standard_normal((n_bars, n_tickers)) * vol + drift
+    start_price = rng.uniform(10, 500, n_tickers)
+    close = start_price * np.exp(np.cumsum(shocks, axis=0))
+    previous = np.vstack([start_price, close[:-1]])
+    open_ = previous * np.exp(rng.standard_normal(close.shape) * vol * 0.2)
+    wick = np.abs(rng.standard_normal((2,) + close.shape)) * vol * 0.5
+    high = np.maximum(open_, close) * np.exp(wick[0])
+    low = np.minimum(open_, close) * np.exp(-wick[1])
+    volume = rng.lognormal(13, 1, close.shape).round()
+
+    blocks = {
+        "Close": close,
+        "High": high,
+        "Low": low,
+        "Open": open_,
+        "Volume": volume,
+    }
+    if missing_rate > 0:
+        missing = rng.random(close.shape) < missing_rate
+        for values in blocks.values():
+            values[missing] = np.nan
+
+    values = np.concatenate(
+        [blocks[field].astype(dtype, copy=False) for field in FIELDS], axis=1
+    )
+    columns = pd.MultiIndex.from_product(
+        [FIELDS, tickers], names=["Price", "Ticker"]
+    )
+    return pd.DataFrame(values, index=index, columns=columns)
+
+
+def synthetic_download(n_bars=None, missing_rate=0.0, seed=0):
+    """
+    Crea un reemplazo de ``yf.download`` que genera datos sintéticos.
+
+    El reemplazo respeta los tickers, las fechas (``start``/``end`` o
+    ``period``) y el intervalo pedidos, para usarlo con
+    ``unittest.mock.patch`` en pruebas y benchmarks sin acceso a la red.
+    Las opciones de ``yf.download`` que no afectan a los datos (por
+    ejemplo, ``progress``) se aceptan y se ignoran; cualquier otro
+    argumento produce ``TypeError``.
+
+    Args:
+        n_bars (int, optional): Barras a generar; por defecto, las barras
+            del intervalo entre ``start`` y ``end`` (ver
+            :func:`bars_between`).
+        missing_rate (float): Proporción de barras faltantes.
+        seed (int): Semilla del generador aleatorio.
+
+    Returns:
+        callable: Función con la firma de ``yf.download``.
+    """
+    def download(tickers, start=None, end=None, interval="1d", period=None,
+                 **kwargs):
+        unknown = sorted(set(kwargs) - _IGNORED_OPTIONS)
+        if unknown:
+            raise TypeError(
+                "Argumentos no admitidos por synthetic_download: "
+                f"{', '.join(unknown)}"
+            )
+        if isinstance(tickers, str):
+            tickers = tickers.replace(",", " ").split()
+        end = end or pd.Timestamp.today()
+        if start is None:
+            start = DEFAULT_START if period is None \
+                else period_start(period, end)
+        bars = n_bars
+        if bars is None:
+            bars = bars_between(start, end, interval)
+        data = synthetic_ohlcv(
+            len(tickers), bars, interval=interval, start=start,
+            missing_rate=missing_rate, seed=seed,
+        )
+        names = dict(zip(data["Close"].columns, tickers))
+        return data.rename(columns=names, level="Ticker")
+
+    return download
@@ -0,0 +1,114 @@
+"""Pruebas del motor de alertas (financial_wallet.alerts)."""
+
+import json
+import warnings
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from financial_wallet import alerts
+from financial_wallet.alerts import AlertEngine, JsonLinesSink, Rule
+
+
+def _prices(n=60, tickers=("A", "B", "C"), seed=0):
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0, 0.02, size=(n, len(tickers)))
+    close = 100 * np.exp(np.cumsum(returns, axis=0))
+    index = pd.bdate_range("2024-01-01", periods=n, name="Date")
+    return pd.DataFrame(close, index=index, columns=list(tickers))
+
+
+def test_volatility_skips_missing_returns_like_pandas():
+    close = _prices()
+    close.iloc[[-5, -12], 0] = np.nan
+    close.iloc[-21:, 2] = np.nan
+    close.iloc[-1, 2] = 100.0
+    ctx = alerts._BarContext(close.to_numpy(), None, 252.0)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        value = ctx.value("volatility", 20)
+
+    expected = (close.iloc[-21:] / close.iloc[-21:].shift(1) - 1).std() \
+        * np.sqrt(252.0)
+    np.testing.assert_allclose(value[:2], expected.to_numpy()[:2])
+    assert np.isnan(value[2])
+
+
+def test_volatility_rule_fires_with_missing_bars():
+    close = _prices()
+    close.iloc[-3, 0] = np.nan
+    engine = AlertEngine(["volatility(20) > 0.01"], periods_per_year=252)
+
+    events = engine.evaluate(close.to_numpy(), close.columns)
+
+    assert {event["ticker"] for event in events} == {"A", "B", "C"}
+
+
+def test_cross_and_threshold_rules_fire_together(tmp_path):
+    close = pd.DataFrame(
+        {"A": [90.0, 90.0, 90.0, 90.0, 105.0], "B": [50.0] * 5},
+        index=pd.bdate_range("2024-01-01", periods=5, name="Date"),
+    )
+    path = tmp_path / "alertas.jsonl"
+    engine = AlertEngine(
+        ["price crosses_above sma(3)", "price > 100"],
+        sinks=[JsonLinesSink(str(path))],
+        periods_per_year=252,
+    )
+
+    events = engine.scan(pd.concat({"Close": close}, axis=1))
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(events) == 2
+    assert {r["rule"] for r in records} == {
+        "price crosses_above sma(3)", "price > 100",
+    }
+    assert {r["ticker"] for r in records} == {"A"}
+    assert all(r["timestamp"].startswith("2024-01-05") for r in records)
+
+
+def _bar_by_bar(rules, data):
+    engine = AlertEngine(rules, periods_per_year=252)
+    events = []
+    for end in range(1, len(data) + 1):
+        events.extend(engine.evaluate_data(data.iloc[:end]))
+    return pd.DataFrame(
+        events, columns=["timestamp", "rule", "ticker", "value"]
+    )
+
+
+RULES = ["return < -0.03", "price crosses_below sma(5)",
+         "volatility(10) > 0.3"]
+
+
+def test_scan_matches_bar_by_bar_evaluation():
+    data = pd.concat({"Close": _prices(n=40)}, axis=1)
+
+    events = AlertEngine(RULES, periods_per_year=252).scan(data)
+
+    assert len(events) > 0
+    pd.testing.assert_frame_equal(events, _bar_by_bar(RULES, data))
+
+
+def test_callback_evaluates_every_new_bar():
+    data = pd.concat({"Close": _prices(n=40)}, axis=1)
+    engine = AlertEngine(RULES, periods_per_year=252)
+    callback = engine.as_callback()
+
+    events = []
+    for end in range(10, 41, 10):
+        wallet = SimpleNamespace(data=data.iloc[:end])
+        bars = data.iloc[end - 10:end]
+        events.extend(callback(wallet, list(data["Close"].columns), bars))
+
+    expected = _bar_by_bar(RULES, data)
+    assert pd.DataFrame(events, columns=expected.columns).equals(expected)
+
+
+@pytest.mark.parametrize("text", ["price == 3", "volatility(x) > 1"])
+def test_invalid_rules_are_rejected(text):
+    with pytest.raises(ValueError):
+        Rule.parse(text)
@@ -0,0 +1,68 @@
+"""Pruebas del análisis por bloques de CSV (financial_wallet.chunked)."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from financial_wallet.chunked import analyze_csv, iter_csv_chunks
+from financial_wallet.store import csv_to_store
+from financial_wallet.synthetic import synthetic_ohlcv
+
+TZ = "America/New_York"
+
+
+@pytest.fixture
+def dst_csv(tmp_path):
+    """CSV de barras horarias de Nueva York que cruza el cambio de horario."""
+    data = synthetic_ohlcv(2, 100, interval="1h")
+    index = pd.date_range("2024-03-08 09:00", periods=100, freq="h", tz=TZ)
+    data.index = index.rename("Date")
+    path = tmp_path / "dst.csv"
+    data.to_csv(path)
+    text = path.read_text()
+    assert "-05:00" in text and "-04:00" in text
+    return str(path), data
+
+
+def test_iter_csv_chunks_parses_mixed_offsets(dst_csv):
+    path, data = dst_csv
+
+    chunks = list(iter_csv_chunks(path, chunksize=30))
+
+    index = pd.DatetimeIndex(np.concatenate([c.index for c in chunks]))
+    assert len(chunks) == 4
+    assert all(str(c.index.tz) == "UTC" for c in chunks)
+    assert list(index) == list(data.index.tz_convert("UTC"))
+    close = pd.concat(chunks)
+    np.testing.assert_allclose(
+        close.to_numpy(), data["Close"][close.columns].to_numpy()
+    )
+
+
+def test_analyze_csv_spans_dst(dst_csv):
+    path, data = dst_csv
+
+    result = analyze_csv(path, chunksize=30)
+
+    assert list(result["summary"].index) == list(data["Close"].columns)
+
+
+def test_csv_to_store_spans_dst(dst_csv, tmp_path):
+    path, data = dst_csv
+
+    store = csv_to_store(path, str(tmp_path / "store"), chunksize=30)
+
+    assert store.length == len(data)
+    assert store.tz == "UTC"
+    assert store.index.equals(data.index.tz_convert("UTC"))
+
+
+def test_naive_dates_stay_naive(tmp_path):
+    data = synthetic_ohlcv(2, 20)
+    path = tmp_path / "daily.csv"
+    data.to_csv(path)
+
+    chunks = list(iter_csv_chunks(str(path), chunksize=7))
+
+    assert all(c.index.tz is None for c in chunks)
+    assert list(pd.concat(chunks).index) == list(data.index)
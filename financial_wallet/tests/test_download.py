@@ -0,0 +1,81 @@
+"""Pruebas de la descarga sintética y del armado de los datos."""
+
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from financial_wallet.benchmarks import suite
+from financial_wallet.synthetic import (
+    bars_between,
+    synthetic_download,
+    synthetic_ohlcv,
+)
+from financial_wallet.wallet import FinancialWallet
+
+
+def test_synthetic_download_sizes_intraday_by_session_bars():
+    download = synthetic_download()
+
+    hourly = download(["A", "B"], start="2024-01-01", end="2024-01-12",
+                      interval="1h")
+    daily = download(["A", "B"], start="2024-01-01", end="2024-01-12")
+
+    assert len(daily) == 10
+    assert len(hourly) == 10 * (390 // 60)
+    assert hourly.index[-1].date() == pd.Timestamp("2024-01-12").date()
+    assert bars_between("2024-01-01", "2024-01-12", "5m") == 10 * 78
+
+
+def test_synthetic_download_honours_period():
+    download = synthetic_download()
+
+    week = download(["A"], period="5d", interval="1h", end="2024-03-15",
+                    progress=False)
+    month = download("A B", period="1mo", end="2024-03-15")
+
+    assert len(week) == 5 * (390 // 60)
+    assert week.index[0].date() == pd.Timestamp("2024-03-11").date()
+    assert len(month) == bars_between("2024-02-15", "2024-03-15")
+    assert list(month["Close"].columns) == ["A", "B"]
+
+
+@pytest.mark.parametrize("kwargs", [{"periods": "5d"}, {"limit": 10}])
+def test_synthetic_download_rejects_unknown_arguments(kwargs):
+    with pytest.raises(TypeError, match="no admitidos"):
+        synthetic_download()(["A"], **kwargs)
+
+
+def test_download_info_sorts_and_reports_missing_tickers(tmp_path, capsys):
+    raw = synthetic_ohlcv(3, 20, seed=1)
+    raw[("Close", "T0002")] = np.nan
+    shuffled = pd.concat([raw.iloc[::-1], raw.iloc[[5]]])
+    wallet = FinancialWallet(output_dir=str(tmp_path))
+    wallet.ticks = ["T0000", "T0001", "T0002"]
+
+    with mock.patch("financial_wallet.wallet.yf.download",
+                    return_value=shuffled):
+        wallet.download_info()
+
+    assert wallet.data.index.is_monotonic_increasing
+    assert not wallet.data.index.has_duplicates
+    assert len(wallet.data) == 20
+    assert "Sin datos para: T0002" in capsys.readouterr().out
+
+
+def test_download_case_excludes_data_generation():
+    generated = []
+    download = synthetic_download(n_bars=30)
+
+    def counting(*args, **kwargs):
+        generated.append(args)
+        return download(*args, **kwargs)
+
+    with mock.patch.object(suite, "synthetic_download",
+                           return_value=counting):
+        records = suite.run(sizes=(4,), n_bars=30, cases=["download"],
+                            repeat=3)
+
+    assert len(generated) == 1
+    assert records[0]["case"] == "download"
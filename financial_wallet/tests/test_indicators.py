@@ -0,0 +1,39 @@
+"""Pruebas de los indicadores técnicos: incremental frente a vectorizado."""
+
+import numpy as np
+import pytest
+
+from financial_wallet.indicators import StreamingIndicators, compute_indicators
+from financial_wallet.synthetic import synthetic_ohlcv
+
+
+@pytest.mark.parametrize("missing_rate", [0.0, 0.05])
+def test_streaming_matches_batch(missing_rate):
+    data = synthetic_ohlcv(5, 120, missing_rate=missing_rate, seed=3)
+    batch = compute_indicators(data)
+    streaming = StreamingIndicators(list(batch["sma"].columns))
+
+    last = streaming.warm_up(data)
+
+    assert set(last) == set(batch)
+    for name, frame in batch.items():
+        np.testing.assert_allclose(
+            last[name], frame.iloc[-1].to_numpy(), rtol=1e-8,
+            equal_nan=True, err_msg=name,
+        )
+
+
+def test_streaming_bar_by_bar_matches_batch_history():
+    data = synthetic_ohlcv(3, 60, seed=4)
+    batch = compute_indicators(data)
+    streaming = StreamingIndicators(list(batch["sma"].columns))
+    close = data["Close"].to_numpy()
+
+    for i in range(len(data)):
+        result = streaming.update(close[i])
+        for name in ("sma", "ema", "rsi", "macd", "bb_upper"):
+            np.testing.assert_allclose(
+                result[name], batch[name].iloc[i].to_numpy(), rtol=1e-8,
+                equal_nan=True, err_msg=f"{name} en la barra {i}",
+            )
+    assert streaming.n_bars == len(data)
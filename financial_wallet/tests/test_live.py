@@ -0,0 +1,138 @@
+"""Pruebas del seguimiento en vivo (financial_wallet.live)."""
+
+import asyncio
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from financial_wallet.live import (
+    FakeQuoteFeed,
+    LiveWatcher,
+    QuoteFeed,
+    YFinanceFeed,
+)
+from financial_wallet.store import PriceStore, write_store
+from financial_wallet.wallet import FinancialWallet
+
+TZ = "America/New_York"
+
+
+class FlakyFeed(FakeQuoteFeed):
+    """Proveedor que falla una vez para los lotes que contienen ``ticker``."""
+
+    def __init__(self, tickers, ticker, **kwargs):
+        super().__init__(tickers, **kwargs)
+        self.ticker = ticker
+        self.failures = 1
+
+    async def fetch(self, tickers, since):
+        if self.ticker in tickers and self.failures and since is not None:
+            self.failures -= 1
+            raise ConnectionError("sin conexión")
+        return await super().fetch(tickers, since)
+
+
+def _wallet(tmp_path, ticks=("A", "B", "C")):
+    wallet = FinancialWallet(output_dir=str(tmp_path))
+    wallet.ticks = list(ticks)
+    return wallet
+
+
+def test_quote_feed_is_abstract():
+    with pytest.raises(TypeError):
+        QuoteFeed()
+
+
+def test_watch_keeps_timezone(tmp_path):
+    wallet = _wallet(tmp_path)
+    feed = FakeQuoteFeed(wallet.ticks, tz=TZ)
+    watcher = wallet.watch(feed=feed, poll_interval=0, batch_size=2)
+
+    asyncio.run(watcher.run(iterations=4))
+
+    index = wallet.data.index
+    assert str(index.tz) == TZ
+    assert len(index) == 4
+    assert index.is_monotonic_increasing
+    assert index[0] == pd.Timestamp("2024-01-02 09:30", tz=TZ)
+    assert not wallet.data.isna().any().any()
+
+
+def test_watch_appends_to_tz_aware_data(tmp_path):
+    wallet = _wallet(tmp_path)
+    index = pd.date_range(
+        "2024-01-02 09:27", periods=3, freq="1min", tz=TZ, name="Date"
+    )
+    columns = pd.MultiIndex.from_product(
+        [["Open", "High", "Low", "Close", "Volume"], wallet.ticks],
+        names=["Price", "Ticker"],
+    )
+    wallet.data = pd.DataFrame(1.0, index=index, columns=columns)
+    feed = FakeQuoteFeed(wallet.ticks, start="2024-01-02 09:29", tz=TZ)
+
+    asyncio.run(wallet.watch(feed=feed, poll_interval=0).run(iterations=1))
+
+    assert str(wallet.data.index.tz) == TZ
+    assert wallet.data.index[-1] == pd.Timestamp("2024-01-02 09:30", tz=TZ)
+    assert len(wallet.data) == 4
+
+
+def test_yfinance_feed_filters_tz_aware_index():
+    index = pd.date_range(
+        "2024-01-02 09:30", periods=5, freq="1min", tz=TZ, name="Date"
+    )
+    data = pd.DataFrame({("Close", "A"): np.arange(5.0)}, index=index)
+    feed = YFinanceFeed()
+    since = pd.Timestamp("2024-01-02 09:32")
+
+    with mock.patch("financial_wallet.live.yf.download", return_value=data):
+        bars = asyncio.run(feed.fetch(["A"], since))
+
+    assert list(bars[("Close", "A")]) == [2.0, 3.0, 4.0]
+
+
+def test_failed_batch_is_refetched(tmp_path):
+    wallet = _wallet(tmp_path)
+    feed = FlakyFeed(wallet.ticks, "C")
+    watcher = LiveWatcher(wallet, feed, poll_interval=0, batch_size=2)
+
+    asyncio.run(watcher.poll_once())
+    asyncio.run(watcher.poll_once())
+    assert wallet.data[("Close", "C")].isna().iloc[-1]
+
+    changed = asyncio.run(watcher.poll_once())
+
+    assert "C" in changed
+    assert len(wallet.data) == 3
+    assert not wallet.data.isna().any().any()
+
+
+def test_store_receives_backfilled_bars(tmp_path):
+    wallet = _wallet(tmp_path)
+    feed = FlakyFeed(wallet.ticks, "C")
+    asyncio.run(LiveWatcher(wallet, feed).poll_once())
+    write_store(wallet.data, str(tmp_path / "store"))
+    store = PriceStore(str(tmp_path / "store"), mode="r+")
+    watcher = LiveWatcher(wallet, feed, batch_size=2, store=store)
+
+    asyncio.run(watcher.poll_once())
+    asyncio.run(watcher.poll_once())
+
+    stored = PriceStore(str(tmp_path / "store")).to_dataframe()
+    assert len(stored) == 3
+    np.testing.assert_allclose(
+        stored.to_numpy(), wallet.data[stored.columns].to_numpy()
+    )
+
+
+def test_store_with_unknown_columns_is_rejected(tmp_path):
+    wallet = _wallet(tmp_path)
+    other = _wallet(tmp_path, ticks=("A", "B", "Z"))
+    asyncio.run(LiveWatcher(other, FakeQuoteFeed(other.ticks)).poll_once())
+    write_store(other.data, str(tmp_path / "store"))
+    store = PriceStore(str(tmp_path / "store"), mode="r+")
+
+    with pytest.raises(ValueError, match="Z"):
+        LiveWatcher(wallet, FakeQuoteFeed(wallet.ticks), store=store)
@@ -0,0 +1,57 @@
+"""Pruebas de la instrumentación de FinancialWallet."""
+
+from unittest import mock
+
+from financial_wallet.synthetic import synthetic_download
+from financial_wallet.wallet import FinancialWallet
+
+
+def _wallet(tmp_path):
+    wallet = FinancialWallet(output_dir=str(tmp_path))
+    wallet.ticks = ["A", "B", "C"]
+    wallet.start = "2024-01-01"
+    wallet.end = "2024-03-01"
+    return wallet
+
+
+def test_download_info_records_stages(tmp_path):
+    wallet = _wallet(tmp_path)
+    profiler = wallet.enable_profiling(memory=False)
+
+    with mock.patch("financial_wallet.wallet.yf.download",
+                    synthetic_download()):
+        wallet.download_info()
+    wallet.compute_returns()
+    wallet.disable_profiling()
+
+    records = {record["method"]: record for record in profiler.records}
+    assert records["download_info"]["depth"] == 0
+    for stage in ("download_info.download", "download_info.assemble"):
+        assert records[stage]["depth"] == 1
+        assert records[stage]["result"]["columns"] == 15
+    assert "compute_returns" in profiler.summary().index
+    assert "download_info" not in vars(wallet)
+
+
+def test_download_info_without_profiler(tmp_path):
+    wallet = _wallet(tmp_path)
+    with mock.patch("financial_wallet.wallet.yf.download",
+                    synthetic_download()):
+        wallet.download_info()
+    assert wallet.profiler is None
+    assert wallet.data.shape[1] == 15
+
+
+def test_profile_next_keeps_rows(tmp_path):
+    wallet = _wallet(tmp_path)
+    profiler = wallet.enable_profiling(memory=False)
+    profiler.profile_next("compute_returns")
+    with mock.patch("financial_wallet.wallet.yf.download",
+                    synthetic_download()):
+        wallet.download_info()
+    wallet.compute_returns()
+
+    profiled = [r for r in profiler.records if "profile" in r]
+    assert [r["method"] for r in profiled] == ["compute_returns"]
+    assert {"function", "calls", "own_s", "cumulative_s"} \
+        <= set(profiled[0]["profile"][0])
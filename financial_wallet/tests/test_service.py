@@ -0,0 +1,114 @@
+"""Pruebas del caché compartido y del servicio de análisis."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from financial_wallet.service import (
+    AnalyticsService,
+    ResultCache,
+    normalize_tickers,
+)
+from financial_wallet.synthetic import synthetic_download
+
+
+def _esperar(condicion, timeout=5.0):
+    limite = time.monotonic() + timeout
+    while not condicion():
+        if time.monotonic() > limite:
+            raise AssertionError("La condición no se cumplió a tiempo.")
+        time.sleep(0.001)
+
+
+def test_concurrent_requests_share_one_computation():
+    cache = ResultCache()
+    liberar = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        liberar.wait(5)
+        return "resultado"
+
+    with ThreadPoolExecutor(8) as pool:
+        futures = [
+            pool.submit(cache.get_or_compute, "k", compute) for _ in range(8)
+        ]
+        _esperar(lambda: cache.stats()["coalesced"] == 7)
+        liberar.set()
+        results = [f.result() for f in futures]
+
+    assert results == ["resultado"] * 8
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert (stats["misses"], stats["in_flight"]) == (1, 0)
+
+
+def test_errors_reach_waiters_and_are_not_cached():
+    cache = ResultCache()
+    liberar = threading.Event()
+
+    def falla():
+        liberar.wait(5)
+        raise LookupError("sin datos")
+
+    with ThreadPoolExecutor(3) as pool:
+        futures = [
+            pool.submit(cache.get_or_compute, "k", falla) for _ in range(3)
+        ]
+        _esperar(lambda: cache.stats()["coalesced"] == 2)
+        liberar.set()
+        for future in futures:
+            with pytest.raises(LookupError):
+                future.result()
+
+    assert cache.get_or_compute("k", lambda: 42) == 42
+    assert cache.stats()["errors"] == 1
+
+
+def test_ttl_and_eviction():
+    ahora = [0.0]
+    cache = ResultCache(ttl=10, max_entries=2, clock=lambda: ahora[0])
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    assert cache.get_or_compute("a", lambda: 99) == 1
+
+    cache.get_or_compute("c", lambda: 3)  # descarta "b", el menos usado
+    assert cache.get_or_compute("b", lambda: 20) == 20
+    assert cache.stats()["evictions"] == 2
+    assert cache.get_or_compute("b", lambda: 99) == 20
+
+    ahora[0] = 11
+    assert cache.get_or_compute("b", lambda: 30) == 30
+
+
+def test_service_downloads_each_universe_once(tmp_path):
+    descargas = []
+    generar = synthetic_download(n_bars=50)
+
+    def download(*args, **kwargs):
+        descargas.append(args)
+        time.sleep(0.05)
+        return generar(*args, **kwargs)
+
+    service = AnalyticsService(download=download, output_dir=str(tmp_path))
+    pedidos = [
+        ("returns", "aapl,MSFT"), ("volatility", ["MSFT", "AAPL"]),
+        ("correlation", "AAPL, msft"), ("returns", "MSFT,AAPL"),
+    ] * 3
+    with ThreadPoolExecutor(len(pedidos)) as pool:
+        resultados = list(pool.map(
+            lambda pedido: service.analyze(*pedido), pedidos
+        ))
+
+    assert len(descargas) == 1
+    assert resultados[0] is resultados[3]
+    assert resultados[2].shape == (2, 2)
+
+
+def test_normalize_tickers():
+    assert normalize_tickers(" msft,AAPL,,msft ") == ("AAPL", "MSFT")
+    with pytest.raises(ValueError):
+        normalize_tickers(" , ")
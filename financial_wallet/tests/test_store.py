@@ -0,0 +1,58 @@
+"""Pruebas del almacén binario (financial_wallet.store)."""
+
+import asyncio
+
+import pandas as pd
+
+from financial_wallet.live import FakeQuoteFeed
+from financial_wallet.store import PriceStore, write_store
+from financial_wallet.synthetic import synthetic_ohlcv
+from financial_wallet.wallet import FinancialWallet
+
+TZ = "America/New_York"
+
+
+def test_round_trip_keeps_timezone(tmp_path):
+    data = synthetic_ohlcv(3, 10, interval="1h")
+    data.index = data.index.tz_localize(TZ)
+
+    store = write_store(data, str(tmp_path / "store"))
+
+    assert store.tz == TZ
+    pd.testing.assert_index_equal(
+        store.index, data.index.rename("Date"), check_exact=True,
+        exact=False,
+    )
+    assert store.to_dataframe().index[0] == data.index[0]
+
+
+def test_round_trip_without_timezone(tmp_path):
+    data = synthetic_ohlcv(3, 10)
+
+    store = write_store(data, str(tmp_path / "store"))
+
+    assert store.tz is None
+    assert store.index.tz is None
+    assert list(store.index) == list(data.index)
+
+
+def test_watch_after_load_store(tmp_path):
+    wallet = FinancialWallet(output_dir=str(tmp_path))
+    wallet.ticks = ["A", "B"]
+    feed = FakeQuoteFeed(wallet.ticks, tz=TZ)
+    asyncio.run(wallet.watch(feed=feed, poll_interval=0).run(iterations=3))
+    wallet.save_store("vivo")
+
+    loaded = FinancialWallet(output_dir=str(tmp_path))
+    loaded.load_store(str(tmp_path / "vivo"))
+    assert loaded.data.index.equals(wallet.data.index)
+
+    watcher = loaded.watch(feed=feed, poll_interval=0, store_name="vivo")
+    changed = asyncio.run(watcher.poll_once())
+
+    assert changed == ["A", "B"]
+    expected = pd.Timestamp("2024-01-02 09:33", tz=TZ)
+    assert loaded.data.index[-1] == expected
+    store = PriceStore(str(tmp_path / "vivo"))
+    assert store.length == 4
+    assert store.index[-1] == expected
@@ -5,12 +5,26 @@ Este módulo proporciona la clase FinancialWallet que permite descargar,
 analizar y visualizar datos históricos de acciones.
 """
 
+import contextlib
 import os
 from datetime import datetime
 import pandas as pd
 import matplotlib.pyplot as plt
 import yfinance as yf
 
+from ._frames import field_frame
+from .alerts import AlertEngine, JsonLinesSink
+from .chunked import analyze_csv
+from .live import LiveWatcher, YFinanceFeed
+from .indicators import StreamingIndicators, compute_indicators
+from .pairs import screen_pairs
+from .plotting import DEFAULT_MAX_POINTS, downsample
+from .profiling import Profiler, data_size, public_methods
+from .quality import prepare_data
+from .relative import benchmark_metrics, rolling_benchmark_metrics
+from .resample import INTERVALS, infer_periods_per_year, resample_ohlcv
+from .store import PriceStore, open_store, write_store
+
 
 class FinancialWallet:
     """
@@ -20,8 +34,17 @@ class FinancialWallet:
         ticks (list): Lista de tickers de acciones a analizar.
         start (str): Fecha de inicio en formato 'YYYY-MM-DD'.
         end (str): Fecha de fin en formato 'YYYY-MM-DD'.
+        interval (str): Intervalo de las barras en formato yfinance
+            ('1m', '5m', '1h', '1d', ...).
         data (pd.DataFrame): Datos descargados de las acciones.
+        quality (pd.DataFrame): Reporte de calidad por ticker generado por
+            ``prepare_data``.
         output_dir (str): Directorio donde se guardarán los archivos.
+        plot_max_points (int or None): Máximo de puntos por serie en los
+            gráficos; None grafica todos los puntos.
+        plot_method (str): Reducción de puntos, 'minmax' o 'lttb'.
+        profiler (Profiler): Instrumentación activa (ver
+            ``enable_profiling``), o None.
     """
 
     def __init__(self, output_dir='data/financial'):
@@ -34,8 +57,13 @@ class FinancialWallet:
         self.ticks = []
         self.start = None
         self.end = None
+        self.interval = '1d'
         self.data = None
+        self.quality = None
         self.output_dir = output_dir
+        self.plot_max_points = DEFAULT_MAX_POINTS
+        self.plot_method = 'minmax'
+        self.profiler = None
         self._ensure_output_dir()
 
     def _ensure_output_dir(self):
@@ -115,11 +143,28 @@ class FinancialWallet:
         """
         Descarga los datos históricos de los tickers seleccionados.
 
-        Utiliza yfinance para obtener los datos entre las fechas especificadas.
+        Utiliza yfinance para obtener los datos entre las fechas especificadas,
+        con barras del intervalo indicado en ``self.interval``. Yahoo Finance
+        solo ofrece barras de 1 minuto para los últimos 7 días y barras
+        intradía de hasta 60 días de antigüedad.
+
+        Con la instrumentación activa (``enable_profiling``), la descarga
+        y el armado de los datos se registran además como etapas
+        separadas: 'download_info.download' y 'download_info.assemble'.
         """
         try:
             print("Descargando datos...")
-            self.data = yf.download(self.ticks, start=self.start, end=self.end)
+            with self._stage("download_info.download") as record:
+                raw = yf.download(
+                    self.ticks,
+                    start=self.start,
+                    end=self.end,
+                    interval=self.interval,
+                )
+                record["result"] = data_size(raw)
+            with self._stage("download_info.assemble") as record:
+                self.data = self._assemble_download(raw)
+                record["result"] = data_size(self.data)
 
             if self.data.empty:
                 print(
@@ -131,6 +176,154 @@ class FinancialWallet:
         except Exception as e:
             print(f"Ocurrió un error al descargar los datos: {e}")
 
+    def _stage(self, name):
+        """Mide una etapa de un método si la instrumentación está activa."""
+        if self.profiler is None:
+            return contextlib.nullcontext({})
+        return self.profiler.measure(name, self)
+
+    def _assemble_download(self, raw):
+        """
+        Ordena las barras descargadas y avisa de los tickers sin datos.
+
+        Args:
+            raw (pd.DataFrame): Resultado de ``yf.download``.
+
+        Returns:
+            pd.DataFrame: Barras en orden cronológico, sin marcas de tiempo
+            repetidas (se conserva la última).
+        """
+        if raw.empty:
+            return raw
+        data = raw
+        if not data.index.is_monotonic_increasing:
+            data = data.sort_index()
+        if data.index.has_duplicates:
+            data = data[~data.index.duplicated(keep="last")]
+        close = field_frame(data, "Close")
+        missing = close.columns[close.isna().all().to_numpy()]
+        if len(missing):
+            print(f"Sin datos para: {', '.join(map(str, missing))}")
+        return data
+
+    def prepare_data(self, calendar="union", fill="ffill", limit=None,
+                     mask_outliers=False):
+        """
+        Revisa la calidad de los datos y alinea los tickers a un calendario.
+
+        Detecta huecos, precios sin cambio, retornos atípicos y barras OHLC
+        inconsistentes, guarda el reporte en ``self.quality`` y reemplaza
+        ``self.data`` por los datos alineados. Conviene llamarlo una vez
+        después de ``download_info`` cuando se mezclan bolsas o índices.
+
+        Args:
+            calendar (str): 'union', 'intersection' o un ticker de
+                referencia (por ejemplo '^GSPC').
+            fill (str): 'ffill' para repetir el último cierre o 'none'.
+            limit (int, optional): Máximo de barras seguidas a rellenar.
+            mask_outliers (bool): Descarta los picos aislados antes de
+                rellenar.
+
+        Returns:
+            pd.DataFrame: Reporte de calidad por ticker, o None si no hay
+            datos o los parámetros no son válidos.
+        """
+        if self.data is None or self.data.empty:
+            print("No hay datos disponibles. Descarga los datos primero.")
+            return None
+
+        try:
+            aligned, report = prepare_data(
+                self.data, calendar=calendar, fill=fill, limit=limit,
+                mask_outliers=mask_outliers,
+            )
+        except ValueError as e:
+            print(f"No se pudieron preparar los datos: {e}")
+            return None
+
+        self.data = aligned
+        self.quality = report
+        flagged = report[
+            (report["missing"] > 0) | (report["stale_bars"] > 0)
+            | (report["outliers"] > 0) | (report["ohlc_errors"] > 0)
+        ]
+        print(
+            f"Datos alineados al calendario '{calendar}': "
+            f"{len(aligned)} barras, {len(flagged)} tickers con observaciones."
+        )
+        if not flagged.empty:
+            print(flagged[
+                ["missing", "max_gap", "stale_bars", "outliers", "ohlc_errors"]
+            ].to_string())
+        return report
+
+    def periods_per_year(self):
+        """
+        Calcula los períodos por año según la frecuencia de los datos.
+
+        Returns:
+            float: 252 para barras diarias; para barras intradía, las barras
+            por sesión multiplicadas por 252.
+        """
+        if self.data is None or self.data.empty:
+            return 252.0
+        return infer_periods_per_year(self.data.index)
+
+    def compute_returns(self):
+        """
+        Calcula los retornos por barra de todos los tickers.
+
+        Returns:
+            pd.DataFrame: Retornos simples (fechas x tickers); NaN donde
+            falta el precio actual o el anterior.
+        """
+        return field_frame(self.data, "Close").pct_change(fill_method=None)
+
+    def compute_volatility(self, window=None):
+        """
+        Calcula la volatilidad anualizada de todos los tickers.
+
+        Args:
+            window (int, optional): Si se indica, calcula la volatilidad
+                móvil sobre ventanas de ese número de barras.
+
+        Returns:
+            pd.Series or pd.DataFrame: Volatilidad por ticker, o volatilidad
+            móvil (fechas x tickers) si se indica ``window``.
+        """
+        returns = self.compute_returns()
+        scale = self.periods_per_year() ** 0.5
+        if window is None:
+            return returns.std() * scale
+        return returns.rolling(window).std() * scale
+
+    def resample(self, interval, dtype=None):
+        """
+        Agrega los datos descargados a un intervalo más grueso.
+
+        Open toma la primera barra, High el máximo, Low el mínimo, Close la
+        última y Volume la suma, para todos los tickers a la vez.
+
+        Args:
+            interval (str): Intervalo destino ('5m', '1h', '1d', '1wk', ...).
+            dtype: Tipo numérico opcional (por ejemplo 'float32').
+        """
+        if self.data is None or self.data.empty:
+            print("No hay datos disponibles. Descarga los datos primero.")
+            return
+
+        try:
+            self.data = resample_ohlcv(self.data, interval, dtype=dtype)
+            # Solo los intervalos de yfinance sirven para volver a descargar
+            if interval in INTERVALS:
+                self.interval = interval
+            print(
+                f"Datos agregados a {interval}: "
+                f"{len(self.data)} barras por ticker."
+            )
+        except ValueError as e:
+            print(f"No se pudo agregar los datos: {e}")
+
     def show_ticks(self):
         """Muestra los tickers seleccionados."""
         print("\nLos tickers seleccionados son:")
@@ -147,11 +340,13 @@ class FinancialWallet:
             print(f"El ticker {tick} no está incluido en la lista actual.")
             return
 
+        series = self._plot_points(self.data["Close"][tick])
+
         plt.figure(figsize=(10, 6))
         plt.title(f'Serie Temporal de Cierre para {tick}')
         plt.xlabel("Fecha")
         plt.ylabel("Precio USD")
-        plt.plot(self.data["Close"][tick], label=tick)
+        plt.plot(series, label=tick)
         plt.legend()
         plt.grid(True, alpha=0.3)
         plt.tight_layout()
@@ -167,12 +362,35 @@ class FinancialWallet:
             print("Se necesitan exactamente 2 tickers para realizar la comparación.")
             return
 
-        tick1, tick2 = self.ticks[0], self.ticks[1]
+        self._plot_pair(self.ticks[0], self.ticks[1])
+
+    def _plot_points(self, data):
+        """
+        Reduce los datos a ``plot_max_points`` puntos antes de graficar.
+
+        Args:
+            data (pd.Series or pd.DataFrame): Series a graficar.
+
+        Returns:
+            pd.Series or pd.DataFrame: Filas elegidas, conservando extremos.
+        """
+        return downsample(data, self.plot_max_points, self.plot_method)
+
+    def _plot_pair(self, tick1, tick2):
+        """
+        Grafica los precios de cierre de un ticker contra los de otro.
+
+        Args:
+            tick1 (str): Ticker del eje horizontal.
+            tick2 (str): Ticker del eje vertical.
+        """
+        pair = self._plot_points(self.data["Close"][[tick1, tick2]])
+
         plt.figure(figsize=(10, 6))
         plt.title(f'{tick1} versus {tick2}: Valor de Cierre')
         plt.xlabel(tick1)
         plt.ylabel(tick2)
-        plt.plot(self.data["Close"][tick1], self.data["Close"][tick2], 'x')
+        plt.plot(pair[tick1], pair[tick2], 'x')
         plt.grid(True, alpha=0.3)
         plt.tight_layout()
         plt.show()
@@ -211,18 +429,7 @@ class FinancialWallet:
                 chosen_tick2 = self.ticks[choice2 - 1]
 
                 # Realizar la comparación
-                plt.figure(figsize=(10, 6))
-                plt.title(f'{chosen_tick1} versus {chosen_tick2}: Valor de Cierre')
-                plt.xlabel(chosen_tick1)
-                plt.ylabel(chosen_tick2)
-                plt.plot(
-                    self.data["Close"][chosen_tick1],
-                    self.data["Close"][chosen_tick2],
-                    'x'
-                )
-                plt.grid(True, alpha=0.3)
-                plt.tight_layout()
-                plt.show()
+                self._plot_pair(chosen_tick1, chosen_tick2)
 
                 # Preguntar si desea comparar otro par
                 again = input(
@@ -254,7 +461,7 @@ class FinancialWallet:
                     continue
 
                 chosen_tick = self.ticks[choice - 1]
-                returns = self.data["Close"][chosen_tick].pct_change().dropna()
+                returns = self.compute_returns()[chosen_tick].dropna()
 
                 plt.figure(figsize=(10, 6))
                 plt.title(f'Histograma de Retornos de {chosen_tick}')
@@ -280,7 +487,7 @@ class FinancialWallet:
         Calcula y muestra la volatilidad anualizada de tickers seleccionados.
 
         La volatilidad se calcula como la desviación estándar de los retornos
-        diarios escalada anualmente.
+        por barra escalada anualmente según la frecuencia real de los datos.
         """
         if self.data is None or self.data.empty:
             print("No hay datos disponibles. Descarga los datos primero.")
@@ -300,8 +507,7 @@ class FinancialWallet:
                     continue
 
                 chosen_tick = self.ticks[choice - 1]
-                returns = self.data["Close"][chosen_tick].pct_change().dropna()
-                volatility = returns.std() * (252 ** 0.5)  # Anualizada
+                volatility = self.compute_volatility()[chosen_tick]
 
                 print(
                     f"\nLa volatilidad anualizada de {chosen_tick} "
@@ -318,6 +524,347 @@ class FinancialWallet:
             except ValueError:
                 print("Entrada inválida. Por favor, selecciona un número de la lista.")
 
+    def indicators(self, **params):
+        """
+        Calcula los indicadores técnicos para todos los tickers de una vez.
+
+        Args:
+            **params: Parámetros de los indicadores (ventanas y períodos),
+                ver :func:`indicators.compute_indicators`.
+
+        Returns:
+            dict: Nombre del indicador -> DataFrame (fechas x tickers),
+            o None si no hay datos.
+        """
+        if self.data is None or self.data.empty:
+            print("No hay datos disponibles. Descarga los datos primero.")
+            return None
+
+        return compute_indicators(self.data, **params)
+
+    def stream_indicators(self, **params):
+        """
+        Crea un estado incremental de indicadores alimentado con los datos.
+
+        El objeto retornado se actualiza barra a barra con ``update`` en
+        O(1) por ticker, sin recalcular la historia.
+
+        Args:
+            **params: Parámetros de los indicadores, ver
+                :class:`indicators.StreamingIndicators`.
+
+        Returns:
+            StreamingIndicators: Estado listo para recibir nuevas barras,
+            o None si no hay datos.
+        """
+        if self.data is None or self.data.empty:
+            print("No hay datos disponibles. Descarga los datos primero.")
+            return None
+
+        tickers = list(field_frame(self.data, "Close").columns)
+        stream = StreamingIndicators(tickers, **params)
+        stream.warm_up(self.data)
+        return stream
+
+    def alert_engine(self, rules, file_path=None, callback=None):
+        """
+        Crea un motor de alertas y lo evalúa sobre la última barra.
+
+        Las reglas se evalúan para todos los tickers a la vez con las mismas
+        definiciones de retorno y volatilidad anualizada que
+        ``compute_returns`` y ``compute_volatility``. Cada evento se emite
+        una sola vez, cuando la condición pasa a cumplirse.
+
+        Args:
+            rules (list): Reglas en texto, por ejemplo
+                ``['return < -0.05', 'price crosses_above sma(200)']``.
+            file_path (str, optional): Archivo JSON Lines donde se agregan
+                los eventos.
+            callback (callable, optional): Función que recibe cada lista de
+                eventos nuevos.
+
+        Returns:
+            AlertEngine: Motor listo para evaluar nuevas barras (por ejemplo
+            con ``watch().register(engine.as_callback())``), o None si no
+            hay datos o alguna regla es inválida.
+        """
+        if self.data is None or self.data.empty:
+            print("No hay datos disponibles. Descarga los datos primero.")
+            return None
+
+        sinks = []
+        if file_path is not None:
+            sinks.append(JsonLinesSink(file_path))
+        if callback is not None:
+            sinks.append(callback)
+
+        try:
+            engine = AlertEngine(
+                rules, sinks=sinks, periods_per_year=self.periods_per_year()
+            )
+        except ValueError as e:
+            print(f"Regla inválida: {e}")
+            return None
+
+        for event in engine.evaluate_data(self.data):
+            print(
+                f"ALERTA [{event['rule']}] {event['ticker']}: "
+                f"{event['value']:.4f}"
+            )
+        return engine
+
+    def benchmark_metrics(self, benchmark="^GSPC", window=None,
+                          risk_free=0.0):
+        """
+        Calcula beta, alfa, correlación, tracking error y ratio de
+        información de cada ticker frente a un índice.
+
+        El índice debe estar incluido en los tickers descargados
+        (por ejemplo ``^GSPC``, ``^DJI`` o ``^IXIC``).
+
+        Args:
+            benchmark (str): Ticker del índice de referencia.
+            window (int, optional): Si se indica, calcula además las
+                métricas móviles con ventanas de ese número de barras.
+            risk_free (float): Tasa libre de riesgo anual.
+
+        Returns:
+            pd.DataFrame or tuple: Métricas por ticker. Si se indica
+            ``window``, retorna (métricas, dict de métricas móviles).
+            None si no hay datos o el índice no está disponible.
+        """
+        if self.data is None or self.data.empty:
+            print("No hay datos disponibles. Descarga los datos primero.")
+            return None
+
+        close = field_frame(self.data, "Close")
+        if benchmark not in close.columns:
+            print(
+                f"El índice {benchmark} no está en los datos descargados. "
+                "Agrégalo a los tickers y descarga nuevamente."
+            )
+            return None
+
+        returns = self.compute_returns()
+        bench_returns = returns[benchmark]
+        returns = returns.drop(columns=benchmark)
+
+        periods = self.periods_per_year()
+        metrics = benchmark_metrics(
+            returns, bench_returns, periods_per_year=periods,
+            risk_free=risk_free
+        )
+        if window is None:
+            return metrics
+
+        rolling = rolling_benchmark_metrics(
+            returns, bench_returns, window, periods_per_year=periods,
+            risk_free=risk_free
+        )
+        return metrics, rolling
+
+    def screen_pairs(self, min_correlation=0.5, max_per_ticker=None,
+                     max_workers=None, top=20):
+        """
+        Evalúa todos los pares de tickers en busca de pares cointegrados.
+
+        Los pares con correlación de retornos menor a ``min_correlation``
+        se descartan antes de las pruebas; el resto se reparte entre un
+        pool de procesos.
+
+        Args:
+            min_correlation (float): Correlación absoluta mínima.
+            max_per_ticker (int, optional): Máximo de pares por ticker.
+            max_workers (int, optional): Procesos a usar; 1 evita el pool.
+            top (int): Pares a mostrar en pantalla.
+
+        Returns:
+            pd.DataFrame: Pares ordenados por el estadístico ADF, o None si
+            no hay datos.
+        """
+        if self.data is None or self.data.empty:
+            print("No hay datos disponibles. Descarga los datos primero.")
+            return None
+
+        table = screen_pairs(
+            self.data,
+            min_correlation=min_correlation,
+            max_per_ticker=max_per_ticker,
+            max_workers=max_workers,
+        )
+        cointegrated = (table["cointegrated"] != "").sum()
+        print(
+            f"{len(table)} pares evaluados, {cointegrated} cointegrados "
+            "al 10 % o menos."
+        )
+        if top and not table.empty:
+            print(table.head(top).to_string(index=False))
+        return table
+
+    def analyze_stored(self, file_path, chunksize=100_000, ticker_chunk=None):
+        """
+        Analiza un archivo exportado por bloques, sin cargarlo en memoria.
+
+        Calcula retornos, volatilidad anualizada, caídas máximas y la matriz
+        de correlación con agregados parciales combinables; el resultado es
+        igual al cálculo sobre el DataFrame completo.
+
+        Args:
+            file_path (str): CSV generado por ``export_data``.
+            chunksize (int): Filas leídas por bloque.
+            ticker_chunk (int, optional): Tickers por grupo. Limita el ancho
+                de cada bloque, pero omite la matriz de correlación.
+
+        Returns:
+            dict: 'summary' (DataFrame por ticker) y 'correlation'
+            (DataFrame o None), o None si el archivo no se puede leer.
+        """
+        try:
+            print(f"Analizando {file_path} por bloques...")
+            results = analyze_csv(
+                file_path, chunksize=chunksize, ticker_chunk=ticker_chunk
+            )
+            print(f"Análisis completado: {len(results['summary'])} tickers.")
+            return results
+        except (OSError, KeyError, ValueError) as e:
+            print(f"No se pudo analizar el archivo: {e}")
+            return None
+
+    def save_store(self, store_name="store", dtype="float64"):
+        """
+        Guarda los datos en un almacén binario para abrir con memory mapping.
+
+        Args:
+            store_name (str): Nombre del directorio dentro de ``output_dir``.
+            dtype (str): Tipo numérico de los precios ('float32' ocupa la
+                mitad).
+
+        Returns:
+            str: Ruta del almacén, o None si no hay datos.
+        """
+        if self.data is None or self.data.empty:
+            print(
+                "No hay datos disponibles para guardar. "
+                "Asegúrate de descargar primero los datos."
+            )
+            return None
+
+        store_path = os.path.join(self.output_dir, store_name)
+        write_store(self.data, store_path, dtype=dtype, interval=self.interval)
+        print(f"Almacén guardado exitosamente en {store_path}.")
+        return store_path
+
+    def load_store(self, store_path):
+        """
+        Abre un almacén binario como datos de la cartera, sin copiarlo.
+
+        ``self.data`` queda respaldado por la memoria mapeada del archivo, de
+        modo que varios procesos que abren el mismo almacén comparten las
+        mismas páginas en modo solo lectura.
+
+        Args:
+            store_path (str): Directorio del almacén.
+        """
+        try:
+            store = open_store(store_path)
+        except (OSError, ValueError) as e:
+            print(f"No se pudo abrir el almacén: {e}")
+            return
+
+        self.data = store.to_dataframe()
+        self.ticks = list(store.tickers)
+        if store.interval:
+            self.interval = store.interval
+        if store.length:
+            self.start = store.index[0].strftime("%Y-%m-%d")
+            self.end = store.index[-1].strftime("%Y-%m-%d")
+        print(
+            f"Almacén abierto: {len(self.ticks)} tickers, "
+            f"{store.length} barras."
+        )
+
+    def watch(self, feed=None, poll_interval=60.0, max_concurrency=8,
+              batch_size=50, store_name=None):
+        """
+        Crea un seguimiento en vivo que agrega las barras nuevas a los datos.
+
+        El seguimiento se ejecuta con asyncio, por ejemplo
+        ``asyncio.run(wallet.watch().run())``. Cada consulta pide solo las
+        barras posteriores a la última conocida, las agrega a ``self.data``
+        sin reconstruir el DataFrame y llama a los callbacks registrados con
+        ``register`` para los tickers que cambiaron.
+
+        Args:
+            feed (QuoteFeed, optional): Proveedor de cotizaciones. Por
+                defecto, yfinance con el intervalo de la cartera.
+            poll_interval (float): Segundos entre consultas.
+            max_concurrency (int): Solicitudes simultáneas máximas.
+            batch_size (int): Tickers por solicitud.
+            store_name (str, optional): Almacén dentro de ``output_dir`` (ver
+                ``save_store``) donde también se agregan las barras.
+
+        Returns:
+            LiveWatcher: Seguimiento listo para ejecutar.
+        """
+        if feed is None:
+            feed = YFinanceFeed(interval=self.interval)
+        store = None
+        if store_name is not None:
+            store = PriceStore(
+                os.path.join(self.output_dir, store_name), mode="r+"
+            )
+        return LiveWatcher(
+            self,
+            feed,
+            poll_interval=poll_interval,
+            max_concurrency=max_concurrency,
+            batch_size=batch_size,
+            store=store,
+        )
+
+    def enable_profiling(self, methods=None, memory=True, profiler=None):
+        """
+        Activa la instrumentación de los métodos públicos de la cartera.
+
+        Cada llamada registra tiempo de pared, tiempo de CPU, memoria
+        máxima y tamaño de los datos de entrada y del resultado. Solo
+        afecta a esta instancia; sin activarla no hay sobrecosto.
+
+        Args:
+            methods (list, optional): Métodos a instrumentar; por defecto,
+                todos los públicos.
+            memory (bool): Mide la memoria máxima con ``tracemalloc``.
+            profiler (Profiler, optional): Registro a usar (por ejemplo,
+                uno compartido entre carteras).
+
+        Returns:
+            Profiler: Registro de las llamadas; ``profile_next`` perfila
+            la próxima llamada con cProfile, y ``summary_table`` y
+            ``to_json`` exportan los resultados.
+        """
+        self.disable_profiling()
+        self.profiler = profiler or Profiler(memory=memory)
+        methods = methods or [
+            name for name in public_methods(self)
+            if name not in ("enable_profiling", "disable_profiling")
+        ]
+        self.profiler.instrument(self, methods)
+        return self.profiler
+
+    def disable_profiling(self):
+        """
+        Quita la instrumentación de la cartera.
+
+        Returns:
+            Profiler: El registro con las llamadas medidas, o None si no
+            estaba activa.
+        """
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.restore(self)
+            self.profiler = None
+        return profiler
+
     def export_data(self):
         """
         Exporta los datos descargados a un archivo CSV.
@@ -6,6 +6,25 @@ del sitio web Meteored usando Selenium.
 """
 
 from .scraper import WeatherScraper
+from .batch import BatchJob
+from .async_scraper import AsyncWeatherScraper
+from .work_queue import QueueWorker, WorkQueue
+from .rate_limit import RateLimiter
+from .cities import CityCatalog
+from .scheduler import RefreshScheduler
+from .providers import HedgedFetcher
+from .results import ForecastTable
 
 __version__ = "1.0.0"
-__all__ = ["WeatherScraper"]
+__all__ = [
+    "WeatherScraper",
+    "BatchJob",
+    "AsyncWeatherScraper",
+    "WorkQueue",
+    "QueueWorker",
+    "RateLimiter",
+    "CityCatalog",
+    "RefreshScheduler",
+    "HedgedFetcher",
+    "ForecastTable",
+]
@@ -0,0 +1,459 @@
+"""
+Análisis vectorizado del historial de pronósticos.
+
+Trabaja sobre el historial que agrega cada captura (``historial.csv``,
+ver ``scraper.registrar_historial``), con muchas ciudades y muchas
+capturas, usando tipos compactos: ciudad, día y dirección del viento como
+categóricas, temperaturas y viento en float32 y el horizonte en int16.
+
+Los textos de la página ("23° / 14°", "15 km/h NE", "18 Ene") se
+interpretan una sola vez por valor distinto (sobre las categorías) y no
+por fila, de modo que millones de filas se procesan en segundos.
+
+- :func:`cargar_historial` lee el historial por bloques y lo compacta.
+- :func:`revisiones` mide cómo cambia el pronóstico de una misma fecha
+  entre capturas.
+- :func:`resumen_ciudades` agrega por ciudad con la última captura de cada
+  fecha.
+- :func:`anomalias` marca valores atípicos por ciudad, revisiones
+  bruscas y errores de datos.
+
+Uso:
+    python -m weather_scraper.analytics --dir data/weather
+"""
+
+import argparse
+import glob
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from . import config
+from .scraper import HISTORY_COLUMNS
+
+
+MESES = {
+    "ene": 1, "feb": 2, "mar": 3, "abr": 4, "may": 5, "jun": 6,
+    "jul": 7, "ago": 8, "sep": 9, "set": 9, "oct": 10, "nov": 11,
+    "dic": 12,
+}
+
+# Textos de la página: "23° / 14°", "15 km/h NE" y "18 Ene"
+PATRON_TEMPERATURA = r"(-?\d+(?:[.,]\d+)?)\s*°?\s*/\s*(-?\d+(?:[.,]\d+)?)"
+PATRON_VIENTO = r"(\d+(?:[.,]\d+)?)\s*km/h\s*([A-Za-z]*)"
+PATRON_FECHA = r"(\d{1,2})\s*([A-Za-zñÑ]{3})"
+
+# Columnas de texto que se leen como categóricas
+_CATEGORICAS = ["ciudad", "dia", "fecha", "temperatura", "viento"]
+
+# Mismas columnas en los CSV de resultados de WeatherScraper
+_COLUMNAS_RESULTADOS = {
+    "Día": "dia", "Fecha": "fecha", "Temperatura": "temperatura",
+    "Viento": "viento",
+}
+
+
+def _por_categoria(serie, funcion):
+    """
+    Aplica ``funcion`` a las categorías de una serie y no a cada fila.
+
+    Args:
+        serie (pd.Series): Serie categórica.
+        funcion (callable): Recibe un Index con las categorías y retorna un
+            DataFrame con una fila por categoría.
+
+    Returns:
+        pd.DataFrame: Resultado expandido a las filas de ``serie`` (NaN
+        donde la serie es nula).
+    """
+    valores = funcion(serie.cat.categories)
+    codigos = serie.cat.codes.to_numpy()
+    resultado = {}
+    for columna in valores.columns:
+        datos = valores[columna].to_numpy()
+        if isinstance(valores[columna].dtype, pd.CategoricalDtype):
+            # Se reindexan los códigos de la categoría resultante
+            internos = valores[columna].cat.codes.to_numpy()
+            resultado[columna] = pd.Categorical.from_codes(
+                np.where(codigos >= 0, internos[codigos.clip(0)], -1),
+                valores[columna].cat.categories,
+            )
+            continue
+        faltante = np.nan if datos.dtype.kind == "f" else 0
+        resultado[columna] = np.where(
+            codigos >= 0, datos[codigos.clip(0)], faltante
+        ).astype(datos.dtype)
+    return pd.DataFrame(resultado, index=serie.index)
+
+
+def parsear_temperatura(textos):
+    """
+    Interpreta textos como "23° / 14°".
+
+    Args:
+        textos (pd.Index): Textos distintos.
+
+    Returns:
+        pd.DataFrame: Columnas t_max y t_min en float32.
+    """
+    partes = pd.Series(textos, dtype=object).str.extract(PATRON_TEMPERATURA)
+    partes = partes.apply(lambda col: col.str.replace(",", ".", regex=False))
+    return pd.DataFrame({
+        "t_max": pd.to_numeric(partes[0]).astype(np.float32).to_numpy(),
+        "t_min": pd.to_numeric(partes[1]).astype(np.float32).to_numpy(),
+    })
+
+
+def parsear_viento(textos):
+    """
+    Interpreta textos como "15 km/h NE".
+
+    Args:
+        textos (pd.Index): Textos distintos.
+
+    Returns:
+        pd.DataFrame: viento_kmh (float32) y viento_dir (categórica).
+    """
+    partes = pd.Series(textos, dtype=object).str.extract(PATRON_VIENTO)
+    velocidad = pd.to_numeric(partes[0].str.replace(",", ".", regex=False))
+    direccion = partes[1].str.upper().replace("", np.nan)
+    return pd.DataFrame({
+        "viento_kmh": velocidad.astype(np.float32).to_numpy(),
+        "viento_dir": pd.Categorical(direccion),
+    })
+
+
+def parsear_fecha(textos):
+    """
+    Interpreta textos como "18 Ene" en día y mes.
+
+    Args:
+        textos (pd.Index): Textos distintos.
+
+    Returns:
+        pd.DataFrame: Columnas dia_mes y mes (int8; 0 si no se reconoce).
+    """
+    partes = pd.Series(textos, dtype=object).str.extract(PATRON_FECHA)
+    dia = pd.to_numeric(partes[0]).fillna(0)
+    mes = partes[1].str.lower().map(MESES).fillna(0)
+    return pd.DataFrame({
+        "dia_mes": dia.astype(np.int8).to_numpy(),
+        "mes": mes.astype(np.int8).to_numpy(),
+    })
+
+
+def _fechas_pronostico(dia_mes, mes, scraped_at):
+    """
+    Fecha pronosticada a partir de día, mes y hora de captura.
+
+    La página no muestra el año: se usa el de la captura, y si la fecha
+    queda más de 31 días antes de la captura se asume el año siguiente
+    (pronósticos de fin de año capturados en diciembre).
+    """
+    capturado = scraped_at.dt.normalize()
+    validas = (dia_mes > 0) & (mes > 0)
+    fechas = pd.to_datetime(
+        pd.DataFrame({
+            "year": capturado.dt.year.to_numpy(),
+            "month": np.where(validas, mes, 1),
+            "day": np.where(validas, dia_mes, 1),
+        }, index=scraped_at.index),
+        errors="coerce",
+    )
+    fechas = fechas.where(validas)
+    anterior = (capturado - fechas) > pd.Timedelta(days=31)
+    fechas = fechas.where(~anterior, fechas + pd.DateOffset(years=1))
+    return fechas
+
+
+def compactar(historial):
+    """
+    Convierte filas del historial en columnas numéricas y categóricas.
+
+    Args:
+        historial (pd.DataFrame): Columnas de ``HISTORY_COLUMNS`` (las de
+            texto pueden ser object o categóricas).
+
+    Returns:
+        pd.DataFrame: ciudad, dia y viento_dir categóricas; scraped_at y
+        fecha datetime64; horizonte (días entre captura y fecha) int16;
+        posicion int8; t_max, t_min y viento_kmh float32.
+    """
+    # Los bloques de read_csv conservan la numeración del archivo
+    historial = historial.reset_index(drop=True)
+    for columna in _CATEGORICAS:
+        if not isinstance(historial[columna].dtype, pd.CategoricalDtype):
+            historial[columna] = historial[columna].astype("category")
+
+    scraped_at = pd.to_datetime(historial["scraped_at"])
+    temperatura = _por_categoria(historial["temperatura"], parsear_temperatura)
+    viento = _por_categoria(historial["viento"], parsear_viento)
+    fecha = _por_categoria(historial["fecha"], parsear_fecha)
+    fechas = _fechas_pronostico(
+        fecha["dia_mes"].to_numpy(), fecha["mes"].to_numpy(), scraped_at
+    )
+    horizonte = (fechas - scraped_at.dt.normalize()).dt.days
+
+    return pd.DataFrame({
+        "ciudad": historial["ciudad"].cat.remove_unused_categories(),
+        "scraped_at": scraped_at,
+        "fecha": fechas,
+        "horizonte": horizonte.fillna(-1).astype(np.int16),
+        "posicion": historial["posicion"].astype(np.int8),
+        "dia": historial["dia"],
+        "t_max": temperatura["t_max"],
+        "t_min": temperatura["t_min"],
+        "viento_kmh": viento["viento_kmh"],
+        "viento_dir": viento["viento_dir"],
+    })
+
+
+def _concatenar(bloques):
+    """Concatena bloques compactos conservando las categóricas."""
+    if not bloques:
+        return pd.DataFrame()
+    resultado = pd.concat(bloques, ignore_index=True)
+    for columna in bloques[0].columns:
+        if isinstance(bloques[0][columna].dtype, pd.CategoricalDtype):
+            resultado[columna] = union_categoricals(
+                [bloque[columna] for bloque in bloques]
+            )
+    return resultado
+
+
+def cargar_historial(output_dir=None, chunksize=500_000,
+                     incluir_resultados=False):
+    """
+    Lee y compacta el historial de capturas.
+
+    El CSV se lee por bloques y cada bloque se compacta antes de leer el
+    siguiente, así que la memoria máxima depende del bloque y no del
+    archivo completo.
+
+    Args:
+        output_dir (str, optional): Directorio de salida del scraper; por
+            defecto, el de config.
+        chunksize (int): Filas por bloque.
+        incluir_resultados (bool): Agrega también los
+            ``resultados_<ciudad>.csv`` como capturas (con la fecha de
+            modificación del archivo), útil si el historial no existía
+            cuando se hicieron.
+
+    Returns:
+        pd.DataFrame: Historial compacto (ver :func:`compactar`), ordenado
+        por ciudad, fecha y captura.
+    """
+    output_dir = output_dir or config.OUTPUT_DIR
+    bloques = []
+    ruta = os.path.join(output_dir, config.HISTORY_FILE or "historial.csv")
+    if os.path.exists(ruta):
+        lector = pd.read_csv(
+            ruta, encoding="utf-8", chunksize=chunksize,
+            dtype={**{c: "category" for c in _CATEGORICAS},
+                   "posicion": np.int16, "scraped_at": str},
+        )
+        bloques.extend(compactar(bloque) for bloque in lector)
+
+    if incluir_resultados:
+        patron = os.path.join(output_dir, "resultados_*.csv")
+        for archivo in sorted(glob.glob(patron)):
+            df = pd.read_csv(archivo, encoding="utf-8-sig", dtype=str)
+            df = df.rename(columns=_COLUMNAS_RESULTADOS)
+            nombre = os.path.basename(archivo)[len("resultados_"):-4]
+            df["ciudad"] = nombre.replace("_", " ").title()
+            df["scraped_at"] = datetime.fromtimestamp(
+                os.path.getmtime(archivo)
+            ).isoformat(timespec="seconds")
+            df["posicion"] = np.arange(len(df))
+            bloques.append(compactar(df[HISTORY_COLUMNS]))
+
+    historial = _concatenar(bloques)
+    if historial.empty:
+        return historial
+    return historial.sort_values(
+        ["ciudad", "fecha", "scraped_at"], kind="stable"
+    ).reset_index(drop=True)
+
+
+def revisiones(historial):
+    """
+    Cambios del pronóstico de cada ciudad y fecha entre capturas.
+
+    Args:
+        historial (pd.DataFrame): Historial compacto.
+
+    Returns:
+        pd.DataFrame: Una fila por ciudad y fecha pronosticada, con
+        capturas, t_max y t_min de la primera y la última captura,
+        revision_max y revision_min (última menos primera), y
+        max_salto (mayor cambio absoluto de t_max entre dos capturas
+        seguidas).
+    """
+    datos = historial.dropna(subset=["fecha"]).sort_values(
+        ["ciudad", "fecha", "scraped_at"], kind="stable"
+    )
+    grupos = datos.groupby(["ciudad", "fecha"], observed=True, sort=False)
+    salto = grupos["t_max"].diff().abs()
+
+    resumen = grupos.agg(
+        capturas=("scraped_at", "size"),
+        primera_captura=("scraped_at", "first"),
+        ultima_captura=("scraped_at", "last"),
+        t_max_inicial=("t_max", "first"),
+        t_max_final=("t_max", "last"),
+        t_min_inicial=("t_min", "first"),
+        t_min_final=("t_min", "last"),
+    )
+    resumen["revision_max"] = (
+        resumen["t_max_final"] - resumen["t_max_inicial"]
+    )
+    resumen["revision_min"] = (
+        resumen["t_min_final"] - resumen["t_min_inicial"]
+    )
+    resumen["max_salto"] = salto.groupby(
+        [datos["ciudad"], datos["fecha"]], observed=True
+    ).max().astype(np.float32)
+    return resumen.sort_index()
+
+
+def ultimas(historial):
+    """
+    Última captura de cada ciudad y fecha pronosticada.
+
+    Args:
+        historial (pd.DataFrame): Historial compacto.
+
+    Returns:
+        pd.DataFrame: Filas del historial, una por ciudad y fecha.
+    """
+    datos = historial.dropna(subset=["fecha"])
+    orden = datos.sort_values(["ciudad", "fecha", "scraped_at"], kind="stable")
+    return orden.drop_duplicates(["ciudad", "fecha"], keep="last")
+
+
+def resumen_ciudades(historial):
+    """
+    Estadísticas por ciudad con el pronóstico vigente de cada fecha.
+
+    Args:
+        historial (pd.DataFrame): Historial compacto.
+
+    Returns:
+        pd.DataFrame: Por ciudad: fechas, capturas, media, mínimo y máximo
+        de t_max y t_min, amplitud térmica media, viento medio y máximo, y
+        revisión media absoluta de t_max.
+    """
+    vigentes = ultimas(historial)
+    resumen = vigentes.groupby("ciudad", observed=True).agg(
+        fechas=("fecha", "nunique"),
+        t_max_media=("t_max", "mean"),
+        t_max_maxima=("t_max", "max"),
+        t_min_media=("t_min", "mean"),
+        t_min_minima=("t_min", "min"),
+        viento_medio=("viento_kmh", "mean"),
+        viento_maximo=("viento_kmh", "max"),
+    )
+    amplitud = (vigentes["t_max"] - vigentes["t_min"]).groupby(
+        vigentes["ciudad"], observed=True
+    ).mean()
+    resumen.insert(5, "amplitud_media", amplitud)
+    resumen.insert(
+        1, "capturas",
+        historial.groupby("ciudad", observed=True)["scraped_at"].nunique(),
+    )
+    cambios = revisiones(historial)["revision_max"].abs()
+    resumen["revision_media"] = cambios.groupby(
+        level="ciudad", observed=True
+    ).mean()
+    return resumen
+
+
+def anomalias(historial, z=3.5, max_revision=5.0):
+    """
+    Marca pronósticos atípicos y errores de datos.
+
+    El valor atípico se mide con un z-score robusto (mediana y MAD) de
+    t_max y t_min dentro de cada ciudad, de modo que un clima extremo pero
+    habitual de la ciudad no se marca.
+
+    Args:
+        historial (pd.DataFrame): Historial compacto.
+        z (float): Umbral del z-score robusto.
+        max_revision (float): Cambio de t_max entre capturas seguidas de
+            una misma fecha, en grados, considerado brusco.
+
+    Returns:
+        pd.DataFrame: El historial con las columnas booleanas
+        atipica_max, atipica_min, revision_brusca, invertida (t_min mayor
+        que t_max), sin_datos (temperatura ilegible) y anomala (cualquiera
+        de las anteriores).
+    """
+    datos = historial.sort_values(
+        ["ciudad", "fecha", "scraped_at"], kind="stable"
+    ).copy()
+    grupos = datos.groupby("ciudad", observed=True)
+    for columna, marca in (("t_max", "atipica_max"), ("t_min", "atipica_min")):
+        mediana = grupos[columna].transform("median")
+        desvio = (datos[columna] - mediana).abs()
+        mad = desvio.groupby(datos["ciudad"], observed=True).transform(
+            "median"
+        ) * 1.4826
+        puntaje = desvio / mad.where(mad > 0)
+        datos[marca] = (puntaje > z).fillna(False).astype(bool)
+
+    salto = datos.groupby(
+        ["ciudad", "fecha"], observed=True, sort=False
+    )["t_max"].diff().abs()
+    datos["revision_brusca"] = (salto > max_revision).to_numpy()
+    datos["invertida"] = (datos["t_min"] > datos["t_max"]).to_numpy()
+    datos["sin_datos"] = datos["t_max"].isna() | datos["t_min"].isna()
+    datos["anomala"] = datos[[
+        "atipica_max", "atipica_min", "revision_brusca", "invertida",
+        "sin_datos",
+    ]].any(axis=1)
+    return datos
+
+
+def main():
+    """Muestra un resumen del historial desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dir", default=config.OUTPUT_DIR,
+                        help="Directorio de salida del scraper.")
+    parser.add_argument(
+        "--include-results", action="store_true",
+        help="Agrega los resultados_<ciudad>.csv como capturas.",
+    )
+    parser.add_argument("--z", type=float, default=3.5)
+    args = parser.parse_args()
+
+    historial = cargar_historial(
+        args.dir, incluir_resultados=args.include_results
+    )
+    if historial.empty:
+        print(f"No hay historial en {args.dir}.")
+        return
+
+    memoria = historial.memory_usage(deep=True).sum() / 1e6
+    print("="*70)
+    print(f"HISTORIAL: {len(historial):,} filas, "
+          f"{historial['ciudad'].nunique()} ciudades, {memoria:.1f} MB")
+    print("="*70)
+    with pd.option_context("display.float_format", "{:.1f}".format,
+                           "display.width", 120):
+        print(resumen_ciudades(historial).to_string())
+        marcadas = anomalias(historial, z=args.z)
+        marcadas = marcadas[marcadas["anomala"]]
+        print("="*70)
+        print(f"Anomalías: {len(marcadas)}")
+        if len(marcadas):
+            print(marcadas[[
+                "ciudad", "scraped_at", "fecha", "t_max", "t_min",
+                "atipica_max", "atipica_min", "revision_brusca", "invertida",
+            ]].head(20).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""
+Motor asíncrono de scraping basado en Playwright.
+
+``AsyncWeatherScraper`` recorre el mismo flujo que ``WeatherScraper``
+(página de búsqueda, cuadro ``search_pc``, bloque ``dias_w``), pero las
+esperas de navegación y de elementos son awaitables: un solo bucle de
+eventos y un solo navegador mantienen muchas ciudades en curso a la vez,
+cada una en su propio contexto aislado (equivalente a una ventana de
+incógnito), limitadas por un semáforo.
+
+En lugar de la pausa fija ``config.PAGE_LOAD_WAIT``, cada ciudad espera a
+que aparezca el bloque del pronóstico. El texto se procesa con la misma
+función que el scraper síncrono (:func:`parsear_pronostico`) y se guarda
+de forma atómica con :func:`guardar_pronostico`.
+
+Requiere Playwright, que es opcional:
+
+    pip install playwright
+    playwright install chromium
+
+Uso:
+    python -m weather_scraper.async_scraper Santiago Valparaíso --concurrency 20
+
+    async with AsyncWeatherScraper(max_concurrencia=20) as scraper:
+        resultados = await scraper.run_many(["Santiago", "Valparaíso"])
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import os
+import time
+
+from . import config
+from .cities import deduplicar
+from .scraper import guardar_pronostico, parsear_pronostico
+
+
+# Tipos de recurso que el perfil ligero no descarga
+RECURSOS_BLOQUEADOS = {"image", "font", "media"}
+
+
+def _importar_playwright():
+    """Importa Playwright o explica cómo instalarlo."""
+    try:
+        from playwright.async_api import async_playwright
+    except ImportError as e:
+        raise ImportError(
+            "El motor asíncrono requiere Playwright. Instálalo con:\n"
+            "    pip install playwright\n"
+            "    playwright install chromium"
+        ) from e
+    return async_playwright
+
+
+class AsyncWeatherScraper:
+    """
+    Scraper asíncrono que procesa muchas ciudades con un solo navegador.
+
+    Atributos:
+        output_dir (str): Directorio donde se guardan los archivos.
+        perfil (str): Perfil del navegador definido en ``config.PERFILES``.
+        max_concurrencia (int): Ciudades en curso al mismo tiempo.
+        guardar (bool): Si guarda los archivos CSV y Excel de cada ciudad.
+        limitador (RateLimiter): Limitador de tasa, o None.
+        tiempos (dict): Duración en segundos de cada etapa por ciudad
+            ('contexto', 'busqueda', 'espera', 'guardado' y 'total').
+        errores (dict): Último error de cada ciudad que falló.
+    """
+
+    def __init__(self, output_dir=None, perfil=None, max_concurrencia=10,
+                 guardar=True, limitador=None):
+        """
+        Inicializa el scraper (el navegador se abre con ``start``).
+
+        Args:
+            output_dir (str, optional): Directorio para guardar archivos.
+                Si es None, usa el definido en config.
+            perfil (str, optional): Perfil del navegador ('completo' o
+                'ligero'). Si es None, usa ``config.PERFIL``.
+            max_concurrencia (int): Máximo de ciudades en curso.
+            guardar (bool): Si guarda los resultados en archivos.
+            limitador (RateLimiter, optional): Limitador de tasa; las
+                ciudades esperan su turno sin bloquear el bucle.
+
+        Raises:
+            ValueError: Si el perfil no existe o la concurrencia es menor
+                que 1.
+        """
+        self.output_dir = output_dir or config.OUTPUT_DIR
+        self.perfil = perfil or config.PERFIL
+        if self.perfil not in config.PERFILES:
+            raise ValueError(
+                f"Perfil de navegador inválido: {self.perfil}. "
+                f"Usa uno de {', '.join(config.PERFILES)}."
+            )
+        if max_concurrencia < 1:
+            raise ValueError("max_concurrencia debe ser al menos 1.")
+        self.max_concurrencia = max_concurrencia
+        self.guardar = guardar
+        self.limitador = limitador
+        self.tiempos = {}
+        self.errores = {}
+        self._playwright = None
+        self._browser = None
+        self._semaforo = None
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def start(self):
+        """Inicia Playwright y abre el navegador Chromium."""
+        if self._browser is not None:
+            return
+        async_playwright = _importar_playwright()
+        perfil = config.PERFILES[self.perfil]
+        # Playwright controla por sí mismo el modo headless
+        argumentos = [
+            opcion for opcion in perfil["options"]
+            if not opcion.startswith("--headless")
+            and opcion != "--incognito"
+        ]
+        headless = any(
+            opcion.startswith("--headless") for opcion in perfil["options"]
+        )
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(
+            headless=headless, args=argumentos
+        )
+        self._semaforo = asyncio.Semaphore(self.max_concurrencia)
+
+    async def close(self):
+        """Cierra el navegador y detiene Playwright."""
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _bloquear(self, route):
+        """Descarta las solicitudes que el perfil no necesita."""
+        request = route.request
+        patrones = config.PERFILES[self.perfil]["blocked_urls"]
+        if request.resource_type in RECURSOS_BLOQUEADOS or any(
+            fnmatch.fnmatch(request.url, patron) for patron in patrones
+        ):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def scrape(self, ciudad):
+        """
+        Extrae y guarda el pronóstico de una ciudad.
+
+        Espera un lugar en el semáforo, abre un contexto nuevo del
+        navegador, busca la ciudad y espera el bloque ``dias_w``.
+
+        Args:
+            ciudad (str): Ciudad a buscar.
+
+        Returns:
+            pd.DataFrame: DataFrame con los datos extraídos.
+
+        Raises:
+            TimeoutError: Si la página o el pronóstico no cargan a tiempo
+                (``playwright.async_api.TimeoutError``).
+            ValueError: Si la página no contiene pronósticos.
+        """
+        if self._browser is None:
+            await self.start()
+
+        timeout_ms = config.WAIT_TIMEOUT * 1000
+        async with self._semaforo:
+            tiempos = self.tiempos[ciudad] = {}
+            inicio = etapa = time.perf_counter()
+
+            def medir(nombre):
+                nonlocal etapa
+                ahora = time.perf_counter()
+                tiempos[nombre] = ahora - etapa
+                etapa = ahora
+
+            perfil = config.PERFILES[self.perfil]
+            context = await self._browser.new_context()
+            try:
+                context.set_default_timeout(timeout_ms)
+                if perfil["blocked_urls"]:
+                    await context.route("**/*", self._bloquear)
+                page = await context.new_page()
+                medir("contexto")
+
+                if self.limitador is not None:
+                    await self.limitador.adquirir_async()
+                    etapa = time.perf_counter()
+
+                # "eager" equivale a no esperar imágenes ni hojas de estilo
+                carga = (
+                    "domcontentloaded"
+                    if perfil["page_load_strategy"] == "eager" else "load"
+                )
+                try:
+                    await page.goto(config.WEATHER_URL, wait_until=carga)
+                    cuadro = page.locator("#search_pc")
+                    await cuadro.fill(ciudad)
+                    await cuadro.press("Enter")
+                    medir("busqueda")
+
+                    bloque = page.locator(".dias_w")
+                    await bloque.wait_for(state="visible")
+                    texto = await bloque.inner_text()
+                    medir("espera")
+                except Exception as e:
+                    if self.limitador is not None:
+                        self.limitador.falla(type(e).__name__)
+                    raise
+                if self.limitador is not None:
+                    self.limitador.exito(
+                        tiempos["busqueda"] + tiempos["espera"]
+                    )
+            finally:
+                await context.close()
+
+            df = parsear_pronostico(texto.strip())
+            if df.empty:
+                raise ValueError(
+                    f"La página no contiene pronósticos para {ciudad}."
+                )
+            if self.guardar:
+                # Escribir archivos bloquea; se delega a un hilo
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(
+                    None, guardar_pronostico, df, ciudad, self.output_dir
+                )
+                medir("guardado")
+            tiempos["total"] = time.perf_counter() - inicio
+            return df
+
+    async def run(self, ciudad):
+        """
+        Ejecuta el flujo completo para una ciudad.
+
+        Args:
+            ciudad (str): Ciudad a buscar.
+
+        Returns:
+            pd.DataFrame: DataFrame con los datos extraídos, o None si hay
+            error (el error queda en ``errores``).
+        """
+        try:
+            df = await self.scrape(ciudad)
+        except Exception as e:
+            self.errores[ciudad] = f"{type(e).__name__}: {e}"
+            print(f"✗ {ciudad}: {self.errores[ciudad]}")
+            return None
+        self.errores.pop(ciudad, None)
+        print(f"✓ {ciudad}: {len(df)} días de pronóstico")
+        return df
+
+    async def run_many(self, ciudades):
+        """
+        Procesa varias ciudades de forma concurrente.
+
+        Todas las ciudades se lanzan a la vez; el semáforo deja como máximo
+        ``max_concurrencia`` páginas en curso. Los nombres repetidos (con
+        otras tildes, mayúsculas o espacios) se procesan una sola vez. Si
+        el navegador no estaba abierto, se abre y se cierra al terminar.
+
+        Args:
+            ciudades (iterable): Nombres de ciudades.
+
+        Returns:
+            dict: DataFrame de cada ciudad (None si falló), en el orden
+            recibido y con el primer nombre de cada ciudad.
+        """
+        ciudades = deduplicar(ciudades)
+        propio = self._browser is None
+        if propio:
+            await self.start()
+        try:
+            resultados = await asyncio.gather(
+                *(self.run(ciudad) for ciudad in ciudades)
+            )
+        finally:
+            if propio:
+                await self.close()
+        return dict(zip(ciudades, resultados))
+
+
+def main():
+    """Ejecuta el scraper asíncrono desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("ciudades", nargs="+", help="Ciudades a consultar.")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--perfil", help="Perfil del navegador.")
+    parser.add_argument("--output-dir", help="Directorio de salida.")
+    args = parser.parse_args()
+
+    scraper = AsyncWeatherScraper(
+        args.output_dir, args.perfil, args.concurrency
+    )
+    inicio = time.perf_counter()
+    resultados = asyncio.run(scraper.run_many(args.ciudades))
+    elapsed = time.perf_counter() - inicio
+
+    exitosas = sum(df is not None for df in resultados.values())
+    print("\n" + "="*70)
+    print(f"Ciudades exitosas: {exitosas}/{len(resultados)} "
+          f"en {elapsed:.1f} s")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""
+Trabajos de scraping por lotes con checkpoint y reanudación.
+
+``BatchJob`` guarda en una base SQLite el estado de cada ciudad del lote
+(pendiente, completada o fallida), los intentos y el último error. El
+estado se confirma después de cada ciudad, de modo que si el proceso se
+interrumpe (el navegador muere, la máquina se reinicia) basta con volver a
+ejecutar el mismo lote: las ciudades completadas se omiten y las demás
+continúan donde quedaron.
+
+Las ciudades que fallan se reintentan con espera exponencial hasta
+``max_intentos``; las salidas se escriben de forma atómica (ver
+``WeatherScraper._guardar_datos``), así que repetir una ciudad solo
+reemplaza su archivo.
+
+Uso:
+    python -m weather_scraper.batch Santiago Valparaíso Concepción
+    python -m weather_scraper.batch --file ciudades.txt --db lote.db
+    python -m weather_scraper.batch --status --db lote.db
+"""
+
+import argparse
+import os
+import sqlite3
+import time
+
+from . import config
+from .cities import CityCatalog, deduplicar, normalizar
+from .rate_limit import RateLimiter
+from .scraper import WeatherScraper
+
+
+ESTADOS = ("pendiente", "completada", "fallida")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ciudades (
+    ciudad TEXT PRIMARY KEY,
+    estado TEXT NOT NULL DEFAULT 'pendiente',
+    intentos INTEGER NOT NULL DEFAULT 0,
+    proximo_intento REAL NOT NULL DEFAULT 0,
+    ultimo_error TEXT,
+    filas INTEGER,
+    duracion REAL,
+    actualizado REAL
+);
+CREATE INDEX IF NOT EXISTS idx_ciudades_estado
+    ON ciudades (estado, proximo_intento);
+"""
+
+
+class BatchJob:
+    """
+    Lote de ciudades con estado persistente en SQLite.
+
+    Atributos:
+        db_path (str): Ruta de la base de datos del checkpoint.
+        output_dir (str): Directorio de salida de los archivos.
+        perfil (str): Perfil del navegador para cada ciudad.
+        max_intentos (int): Intentos por ciudad antes de darla por fallida.
+        backoff (float): Espera base entre reintentos, en segundos.
+        backoff_max (float): Espera máxima entre reintentos.
+        limitador (RateLimiter): Limitador de tasa, o None.
+    """
+
+    def __init__(self, db_path=None, output_dir=None, perfil=None,
+                 max_intentos=3, backoff=5.0, backoff_max=300.0,
+                 limitador=None):
+        """
+        Abre (o crea) el checkpoint del lote.
+
+        Args:
+            db_path (str, optional): Base de datos del checkpoint; por
+                defecto, ``batch.db`` en el directorio de salida.
+            output_dir (str, optional): Directorio de salida de los
+                archivos. Si es None, usa el definido en config.
+            perfil (str, optional): Perfil del navegador.
+            max_intentos (int): Intentos por ciudad (al menos 1).
+            backoff (float): Espera antes del primer reintento; se duplica
+                en cada intento siguiente.
+            backoff_max (float): Tope de la espera entre reintentos.
+            limitador (RateLimiter, optional): Limitador de tasa de las
+                búsquedas.
+        """
+        self.output_dir = output_dir or config.OUTPUT_DIR
+        self.db_path = db_path or os.path.join(self.output_dir, "batch.db")
+        self.perfil = perfil
+        self.max_intentos = max(1, int(max_intentos))
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.limitador = limitador
+
+        directorio = os.path.dirname(self.db_path)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Cierra la conexión con el checkpoint."""
+        self._conn.close()
+
+    def agregar(self, ciudades, catalogo=None):
+        """
+        Agrega ciudades al lote como pendientes.
+
+        Las ciudades que ya están en el lote conservan su estado, así que
+        agregar la misma lista al reanudar no repite trabajo. Los nombres
+        se comparan normalizados (ver ``cities.py``): 'Viña del Mar' y
+        'vina  del mar' son la misma ciudad.
+
+        Args:
+            ciudades (iterable): Nombres de ciudades.
+            catalogo (CityCatalog, optional): Catálogo para resolver los
+                nombres a su forma canónica.
+
+        Returns:
+            int: Número de ciudades nuevas.
+        """
+        existentes = {
+            normalizar(ciudad)
+            for ciudad, in self._conn.execute("SELECT ciudad FROM ciudades")
+        }
+        nombres = [
+            ciudad for ciudad in deduplicar(ciudades, catalogo)
+            if normalizar(ciudad) not in existentes
+        ]
+        with self._conn:
+            antes = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO ciudades (ciudad, actualizado) "
+                "VALUES (?, ?)",
+                [(ciudad, time.time()) for ciudad in nombres],
+            )
+            return self._conn.total_changes - antes
+
+    def reintentar_fallidas(self):
+        """
+        Vuelve a dejar como pendientes las ciudades fallidas.
+
+        Returns:
+            int: Número de ciudades reactivadas.
+        """
+        with self._conn:
+            cursor = self._conn.execute(
+                "UPDATE ciudades SET estado = 'pendiente', intentos = 0, "
+                "proximo_intento = 0 WHERE estado = 'fallida'"
+            )
+        return cursor.rowcount
+
+    def estado(self):
+        """
+        Cuenta las ciudades del lote por estado.
+
+        Returns:
+            dict: Número de ciudades por estado.
+        """
+        conteo = dict.fromkeys(ESTADOS, 0)
+        conteo.update(self._conn.execute(
+            "SELECT estado, COUNT(*) FROM ciudades GROUP BY estado"
+        ))
+        return conteo
+
+    def detalle(self, estado=None):
+        """
+        Lista las ciudades del lote con sus intentos y último error.
+
+        Args:
+            estado (str, optional): Filtra por estado.
+
+        Returns:
+            list: Diccionarios con una fila por ciudad.
+        """
+        sql = ("SELECT ciudad, estado, intentos, ultimo_error, filas, "
+               "duracion FROM ciudades")
+        params = ()
+        if estado is not None:
+            sql += " WHERE estado = ?"
+            params = (estado,)
+        cursor = self._conn.execute(sql + " ORDER BY rowid", params)
+        columnas = [c[0] for c in cursor.description]
+        return [dict(zip(columnas, fila)) for fila in cursor]
+
+    def _espera(self, intentos):
+        """Espera exponencial antes del siguiente intento."""
+        return min(self.backoff_max, self.backoff * 2 ** (intentos - 1))
+
+    def _siguiente(self):
+        """
+        Elige la próxima ciudad pendiente.
+
+        Returns:
+            tuple: (ciudad, intentos, espera). ``ciudad`` es None si no
+            quedan pendientes; ``espera`` indica cuántos segundos faltan
+            para que la próxima esté disponible.
+        """
+        fila = self._conn.execute(
+            "SELECT ciudad, intentos, proximo_intento FROM ciudades "
+            "WHERE estado = 'pendiente' "
+            "ORDER BY proximo_intento, rowid LIMIT 1"
+        ).fetchone()
+        if fila is None:
+            return None, 0, 0.0
+        ciudad, intentos, proximo = fila
+        return ciudad, intentos, max(0.0, proximo - time.time())
+
+    def _registrar(self, ciudad, intentos, error=None, filas=None,
+                   duracion=None):
+        """Confirma el resultado de un intento en el checkpoint."""
+        ahora = time.time()
+        if error is None:
+            estado, proximo = "completada", 0
+        elif intentos >= self.max_intentos:
+            estado, proximo = "fallida", 0
+        else:
+            estado, proximo = "pendiente", ahora + self._espera(intentos)
+        with self._conn:
+            self._conn.execute(
+                "UPDATE ciudades SET estado = ?, intentos = ?, "
+                "proximo_intento = ?, ultimo_error = ?, filas = ?, "
+                "duracion = ?, actualizado = ? WHERE ciudad = ?",
+                (estado, intentos, proximo, error, filas, duracion, ahora,
+                 ciudad),
+            )
+        return estado
+
+    def _scrape(self, ciudad):
+        """Extrae una ciudad; separado para poder reemplazarlo."""
+        return WeatherScraper(
+            self.output_dir, self.perfil, self.limitador
+        ).scrape(ciudad)
+
+    def run(self, ciudades=None, catalogo=None):
+        """
+        Procesa las ciudades pendientes hasta terminar el lote.
+
+        Args:
+            ciudades (iterable, optional): Ciudades a agregar antes de
+                empezar (las que ya están en el lote no se repiten).
+            catalogo (CityCatalog, optional): Catálogo para resolver los
+                nombres de ``ciudades``.
+
+        Returns:
+            dict: Número de ciudades por estado al terminar.
+        """
+        if ciudades is not None:
+            self.agregar(ciudades, catalogo)
+
+        conteo = self.estado()
+        print(f"Lote {self.db_path}: {conteo['completada']} completadas, "
+              f"{conteo['pendiente']} pendientes, "
+              f"{conteo['fallida']} fallidas")
+
+        while True:
+            ciudad, intentos, espera = self._siguiente()
+            if ciudad is None:
+                break
+            if espera > 0:
+                print(f"\nEsperando {espera:.1f} s para reintentar {ciudad}...")
+                time.sleep(espera)
+
+            intentos += 1
+            print(f"\nProcesando: {ciudad} (intento {intentos}/"
+                  f"{self.max_intentos})")
+            print("-" * 50)
+            inicio = time.perf_counter()
+            try:
+                df = self._scrape(ciudad)
+            except KeyboardInterrupt:
+                print("\nLote interrumpido; ejecuta de nuevo para reanudar.")
+                raise
+            except Exception as e:
+                estado = self._registrar(
+                    ciudad, intentos, error=f"{type(e).__name__}: {e}",
+                    duracion=time.perf_counter() - inicio,
+                )
+                marca = "✗" if estado == "fallida" else "↻"
+                print(f"{marca} {ciudad}: {e}")
+            else:
+                self._registrar(
+                    ciudad, intentos, filas=len(df),
+                    duracion=time.perf_counter() - inicio,
+                )
+                print(f"✓ {ciudad}: {len(df)} días de pronóstico")
+
+        conteo = self.estado()
+        print("\n" + "="*70)
+        print("RESUMEN DEL LOTE")
+        print("="*70)
+        print(f"Completadas: {conteo['completada']}")
+        print(f"Fallidas:    {conteo['fallida']}")
+        for fila in self.detalle("fallida"):
+            print(f"  - {fila['ciudad']}: {fila['ultimo_error']}")
+        return conteo
+
+
+def main():
+    """Ejecuta o reanuda un lote desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("ciudades", nargs="*", help="Ciudades a agregar.")
+    parser.add_argument(
+        "--file", help="Archivo de texto con una ciudad por línea."
+    )
+    parser.add_argument("--db", help="Base de datos del checkpoint.")
+    parser.add_argument("--output-dir", help="Directorio de salida.")
+    parser.add_argument("--perfil", help="Perfil del navegador.")
+    parser.add_argument("--max-intentos", type=int, default=3)
+    parser.add_argument("--backoff", type=float, default=5.0)
+    parser.add_argument(
+        "--rate", type=float,
+        help="Tasa inicial de búsquedas por segundo (activa el limitador).",
+    )
+    parser.add_argument(
+        "--resolve", action="store_true",
+        help="Resuelve los nombres con el catálogo de ciudades.",
+    )
+    parser.add_argument(
+        "--retry-failed", action="store_true",
+        help="Vuelve a intentar las ciudades que ya fallaron.",
+    )
+    parser.add_argument(
+        "--status", action="store_true",
+        help="Muestra el estado del lote sin procesarlo.",
+    )
+    args = parser.parse_args()
+
+    ciudades = list(args.ciudades)
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            ciudades += [linea.strip() for linea in f if linea.strip()]
+
+    limitador = RateLimiter(rate=args.rate) if args.rate else None
+    with BatchJob(args.db, args.output_dir, args.perfil, args.max_intentos,
+                  args.backoff, limitador=limitador) as job:
+        if args.status:
+            for estado, total in job.estado().items():
+                print(f"{estado:<12} {total}")
+            return
+        if args.retry_failed:
+            job.reintentar_fallidas()
+        job.run(ciudades, CityCatalog() if args.resolve else None)
+    if limitador is not None:
+        metricas = limitador.metricas()
+        print(f"Tasa final: {metricas['rate']:.2f} búsquedas/s "
+              f"({metricas['reducciones']} reducciones)")
+
+
+if __name__ == "__main__":
+    main()
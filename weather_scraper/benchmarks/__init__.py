@@ -0,0 +1,8 @@
+"""
+Benchmarks de rendimiento de Weather Scraper.
+
+Se ejecutan contra el sitio local (``weather_scraper.local_site``), sin
+acceso a internet, por ejemplo:
+
+    python -m weather_scraper.benchmarks.throughput
+"""
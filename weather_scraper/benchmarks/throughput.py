@@ -0,0 +1,244 @@
+"""
+Benchmark de throughput de WeatherScraper contra el sitio local.
+
+Levanta ``LocalWeatherSite`` con la latencia y tasa de fallas indicadas,
+apunta ``config.WEATHER_URL`` al sitio y ejecuta el scraper para una lista
+de ciudades en modo secuencial y concurrente (un navegador por hilo),
+con Chrome en modo headless y con los perfiles de navegador indicados
+(``config.PERFILES``). Informa ciudades por minuto, latencia por
+etapa (mediana y percentil 95) y cuántas ciudades se recuperaron con
+reintentos después de una falla.
+
+Requiere Chrome y ChromeDriver instalados; no requiere internet.
+
+Uso:
+    python -m weather_scraper.benchmarks.throughput --cities 20 --workers 4
+    python -m weather_scraper.benchmarks.throughput --failure-rate 0.2
+    python -m weather_scraper.benchmarks.throughput --profiles completo ligero
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from weather_scraper import config
+from weather_scraper.local_site import LocalWeatherSite
+from weather_scraper.scraper import WeatherScraper
+
+
+# Opciones de Chrome necesarias en servidores Linux sin pantalla
+# (contenedores que ejecutan como root y con /dev/shm pequeño)
+SERVER_OPTIONS = ['--headless=new', '--no-sandbox', '--disable-dev-shm-usage']
+
+CIUDADES = [
+    "Santiago", "Valparaíso", "Concepción", "La Serena", "Antofagasta",
+    "Temuco", "Rancagua", "Talca", "Arica", "Iquique", "Puerto Montt",
+    "Chillán", "Osorno", "Valdivia", "Calama", "Copiapó", "Punta Arenas",
+    "Coyhaique", "Curicó", "Los Ángeles",
+]
+
+ETAPAS = ["driver", "busqueda", "espera", "extraccion", "guardado", "total"]
+
+
+def _perfiles_servidor():
+    """Copia de ``config.PERFILES`` con las opciones para servidores."""
+    perfiles = {}
+    for nombre, perfil in config.PERFILES.items():
+        opciones = [
+            opcion for opcion in perfil["options"]
+            if opcion not in ('--start-maximized', '--headless')
+        ]
+        opciones += [op for op in SERVER_OPTIONS if op not in opciones]
+        perfiles[nombre] = dict(perfil, options=opciones)
+    return perfiles
+
+
+def _scrape(ciudad, output_dir, reintentos, perfil):
+    """
+    Ejecuta el scraper para una ciudad, reintentando si falla.
+
+    Returns:
+        dict: ciudad, ok, intentos y los tiempos por etapa de cada intento.
+    """
+    tiempos = []
+    for intento in range(1, reintentos + 2):
+        scraper = WeatherScraper(output_dir=output_dir, perfil=perfil)
+        df = scraper.run(ciudad)
+        tiempos.append(dict(scraper.tiempos, ok=df is not None))
+        if df is not None:
+            return {"ciudad": ciudad, "ok": True, "intentos": intento,
+                    "tiempos": tiempos}
+    return {"ciudad": ciudad, "ok": False, "intentos": reintentos + 1,
+            "tiempos": tiempos}
+
+
+def _resumir(modo, workers, resultados, elapsed):
+    """Calcula throughput, recuperación y latencia por etapa."""
+    exitosos = [r for r in resultados if r["ok"]]
+    intentos_ok = [
+        t for r in resultados for t in r["tiempos"] if t["ok"]
+    ]
+    etapas = {}
+    for etapa in ETAPAS:
+        valores = [t[etapa] for t in intentos_ok if etapa in t]
+        if valores:
+            etapas[etapa] = {
+                "p50": float(np.median(valores)),
+                "p95": float(np.percentile(valores, 95)),
+            }
+    return {
+        "mode": modo,
+        "workers": workers,
+        "cities": len(resultados),
+        "ok": len(exitosos),
+        "failed": len(resultados) - len(exitosos),
+        "recovered": sum(r["intentos"] > 1 for r in exitosos),
+        "attempts": sum(r["intentos"] for r in resultados),
+        "elapsed_s": elapsed,
+        "cities_per_minute": len(exitosos) / elapsed * 60 if elapsed else 0,
+        "stages": etapas,
+    }
+
+
+def run_mode(ciudades, workers, output_dir, reintentos, perfil):
+    """
+    Ejecuta el scraper sobre las ciudades con ``workers`` hilos.
+
+    Args:
+        ciudades (list): Ciudades a consultar.
+        workers (int): Hilos (1 para el modo secuencial).
+        output_dir (str): Directorio de salida de los archivos.
+        reintentos (int): Reintentos por ciudad después de una falla.
+        perfil (str): Perfil del navegador.
+
+    Returns:
+        dict: Resumen de la ejecución.
+    """
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if workers == 1:
+            resultados = [
+                _scrape(ciudad, output_dir, reintentos, perfil)
+                for ciudad in ciudades
+            ]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                resultados = list(executor.map(
+                    lambda ciudad: _scrape(
+                        ciudad, output_dir, reintentos, perfil
+                    ),
+                    ciudades,
+                ))
+    elapsed = time.perf_counter() - inicio
+    modo = "secuencial" if workers == 1 else "concurrente"
+    resumen = _resumir(modo, workers, resultados, elapsed)
+    resumen["profile"] = perfil
+    return resumen
+
+
+def run(n_cities=10, workers=4, latency=0.1, jitter=0.05, failure_rate=0.0,
+        reintentos=2, page_load_wait=0.0, wait_timeout=5,
+        perfiles=("ligero",)):
+    """
+    Ejecuta el benchmark en modo secuencial y concurrente.
+
+    Args:
+        n_cities (int): Ciudades a consultar por modo.
+        workers (int): Hilos del modo concurrente (0 lo omite).
+        latency (float): Latencia fija del sitio local, en segundos.
+        jitter (float): Latencia adicional aleatoria máxima.
+        failure_rate (float): Probabilidad de falla por página.
+        reintentos (int): Reintentos por ciudad.
+        page_load_wait (float): Valor de ``config.PAGE_LOAD_WAIT``.
+        wait_timeout (int): Valor de ``config.WAIT_TIMEOUT``.
+        perfiles (tuple): Perfiles del navegador a comparar; todos se
+            ejecutan en modo headless.
+
+    Returns:
+        list: Un resumen por perfil y modo.
+    """
+    ciudades = [CIUDADES[i % len(CIUDADES)] for i in range(n_cities)]
+    original = (
+        config.WEATHER_URL, config.PERFILES,
+        config.PAGE_LOAD_WAIT, config.WAIT_TIMEOUT,
+    )
+    resumenes = []
+    with LocalWeatherSite(latency=latency, jitter=jitter,
+                          failure_rate=failure_rate, seed=0) as sitio, \
+            tempfile.TemporaryDirectory() as tmp:
+        config.WEATHER_URL = sitio.url
+        config.PERFILES = _perfiles_servidor()
+        config.PAGE_LOAD_WAIT = page_load_wait
+        config.WAIT_TIMEOUT = wait_timeout
+        try:
+            modos = [1] + ([workers] if workers > 1 else [])
+            for perfil in perfiles:
+                for n in modos:
+                    antes = dict(sitio.stats)
+                    resumen = run_mode(ciudades, n, tmp, reintentos, perfil)
+                    resumen["site"] = {
+                        clave: valor - antes[clave]
+                        for clave, valor in sitio.stats.items()
+                    }
+                    resumenes.append(resumen)
+        finally:
+            (config.WEATHER_URL, config.PERFILES,
+             config.PAGE_LOAD_WAIT, config.WAIT_TIMEOUT) = original
+    return resumenes
+
+
+def main():
+    """Ejecuta el benchmark desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cities", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--retries", type=int, default=2)
+    parser.add_argument("--page-load-wait", type=float, default=0.0)
+    parser.add_argument("--wait-timeout", type=int, default=5)
+    parser.add_argument(
+        "--profiles", nargs="+", default=["ligero"],
+        help="Perfiles del navegador a comparar (completo, ligero).",
+    )
+    parser.add_argument("--output", help="Archivo JSON para los resultados.")
+    args = parser.parse_args()
+
+    resumenes = run(
+        args.cities, args.workers, args.latency, args.jitter,
+        args.failure_rate, args.retries, args.page_load_wait,
+        args.wait_timeout, tuple(args.profiles),
+    )
+
+    for resumen in resumenes:
+        print("="*70)
+        print(f"PERFIL {resumen['profile'].upper()}, MODO "
+              f"{resumen['mode'].upper()} ({resumen['workers']} hilos)")
+        print("="*70)
+        print(f"Ciudades:          {resumen['ok']}/{resumen['cities']} "
+              f"({resumen['failed']} fallidas, "
+              f"{resumen['recovered']} recuperadas con reintentos)")
+        print(f"Intentos:          {resumen['attempts']}")
+        print(f"Tiempo total:      {resumen['elapsed_s']:.2f} s")
+        print(f"Ciudades/minuto:   {resumen['cities_per_minute']:.1f}")
+        print("Latencia por etapa (p50 / p95):")
+        for etapa, valores in resumen["stages"].items():
+            print(f"  {etapa:<12} {valores['p50']:>8.3f} s "
+                  f"{valores['p95']:>8.3f} s")
+    print("="*70)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(resumenes, f, indent=2, ensure_ascii=False)
+        print(f"Resultados guardados en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
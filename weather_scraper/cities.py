@@ -0,0 +1,253 @@
+"""
+Catálogo de ciudades con nombres normalizados y búsqueda aproximada.
+
+Los nombres que ingresa el usuario varían en tildes, mayúsculas y
+espacios ("Viña del Mar", "vina del mar", "Viña  del mar"). Este módulo
+los reduce a una clave normalizada para:
+
+- deduplicar listas de ciudades antes de programar el scraping, de modo
+  que cada ciudad abra una sola sesión del navegador;
+- derivar un nombre de archivo estable (:func:`slug`);
+- resolver texto libre a un nombre canónico con un índice de trigramas
+  (:class:`CityCatalog`), tolerante a errores de tipeo.
+"""
+
+import re
+import unicodedata
+from collections import Counter, defaultdict
+
+
+# Ciudades de Chile incluidas por defecto en el catálogo
+CIUDADES_CHILE = [
+    "Arica", "Iquique", "Alto Hospicio", "Calama", "Antofagasta",
+    "Tocopilla", "Copiapó", "Vallenar", "La Serena", "Coquimbo", "Ovalle",
+    "Illapel", "Valparaíso", "Viña del Mar", "Quilpué", "Villa Alemana",
+    "San Antonio", "Quillota", "Los Andes", "San Felipe", "Santiago",
+    "Puente Alto", "Maipú", "La Florida", "Las Condes", "San Bernardo",
+    "Rancagua", "San Fernando", "Curicó", "Talca", "Linares", "Cauquenes",
+    "Chillán", "Los Ángeles", "Concepción", "Talcahuano", "Coronel",
+    "Lota", "Temuco", "Villarrica", "Pucón", "Angol", "Valdivia",
+    "Osorno", "Puerto Montt", "Puerto Varas", "Castro", "Ancud",
+    "Coyhaique", "Puerto Aysén", "Punta Arenas", "Puerto Natales",
+    "Isla de Pascua",
+]
+
+# Puntuación, espacios y guiones bajos; las letras de cualquier alfabeto
+# (cirílico, CJK, ...) se conservan
+_SEPARADORES = re.compile(r"[\W_]+")
+_SEPARADOR_ARCHIVO = re.compile(r"[\s/\\]+")
+
+
+def normalizar(nombre):
+    """
+    Normaliza un nombre de ciudad para compararlo.
+
+    Quita tildes y diacríticos, pasa a minúsculas, reemplaza la
+    puntuación por espacios y colapsa los espacios repetidos. Las letras
+    de otros alfabetos se conservan ('Москва' -> 'москва'); si el nombre
+    no tiene letras ni dígitos, la clave es el nombre en minúsculas.
+
+    Args:
+        nombre (str): Nombre tal como lo ingresó el usuario.
+
+    Returns:
+        str: Clave normalizada ('Viña  del Mar' -> 'vina del mar').
+    """
+    descompuesto = unicodedata.normalize("NFKD", nombre)
+    sin_tildes = unicodedata.normalize("NFC", "".join(
+        c for c in descompuesto if not unicodedata.combining(c)
+    ))
+    clave = _SEPARADORES.sub(" ", sin_tildes.casefold()).strip()
+    return clave or " ".join(nombre.casefold().split())
+
+
+def slug(nombre):
+    """
+    Nombre de archivo estable para una ciudad.
+
+    Args:
+        nombre (str): Nombre de la ciudad.
+
+    Returns:
+        str: Clave normalizada con guiones bajos ('vina_del_mar').
+    """
+    return _SEPARADOR_ARCHIVO.sub("_", normalizar(nombre))
+
+
+def limpiar(nombre):
+    """Quita los espacios sobrantes de un nombre conservando su forma."""
+    return " ".join(nombre.split())
+
+
+def trigramas(texto):
+    """
+    Trigramas de un texto normalizado, con bordes marcados.
+
+    Args:
+        texto (str): Texto ya normalizado.
+
+    Returns:
+        set: Trigramas de cada palabra (con dos espacios al inicio y uno
+        al final, para dar peso a los prefijos).
+    """
+    grams = set()
+    for palabra in texto.split():
+        palabra = f"  {palabra} "
+        grams.update(palabra[i:i + 3] for i in range(len(palabra) - 2))
+    return grams
+
+
+def deduplicar(ciudades, catalogo=None):
+    """
+    Elimina ciudades repetidas conservando el orden.
+
+    Dos nombres son la misma ciudad si tienen la misma clave normalizada.
+    Con un catálogo, cada nombre se resuelve primero a su forma canónica
+    (también con búsqueda aproximada); los nombres sin una coincidencia
+    clara en el catálogo se conservan tal como llegaron.
+
+    Args:
+        ciudades (iterable): Nombres de ciudades.
+        catalogo (CityCatalog, optional): Catálogo para resolver nombres.
+
+    Returns:
+        list: Un nombre por ciudad (el canónico o el primero recibido,
+        sin espacios sobrantes).
+    """
+    vistas = {}
+    for ciudad in ciudades:
+        nombre = limpiar(ciudad)
+        if not nombre:
+            continue
+        if catalogo is not None:
+            nombre = catalogo.resolver(nombre) or nombre
+        vistas.setdefault(normalizar(nombre), nombre)
+    return list(vistas.values())
+
+
+class CityCatalog:
+    """
+    Catálogo de ciudades canónicas con índice de trigramas.
+
+    Atributos:
+        nombres (list): Nombres canónicos, en orden de inserción.
+        umbral (float): Similitud mínima (coeficiente de Dice entre
+            trigramas, de 0 a 1) para aceptar una coincidencia aproximada.
+        margen (float): Ventaja mínima de la mejor coincidencia sobre la
+            segunda para aceptarla.
+    """
+
+    def __init__(self, ciudades=None, umbral=0.7, margen=0.1):
+        """
+        Crea el catálogo.
+
+        Args:
+            ciudades (iterable, optional): Nombres canónicos; por defecto,
+                ``CIUDADES_CHILE``.
+            umbral (float): Similitud mínima para :meth:`resolver`.
+            margen (float): Ventaja mínima sobre la segunda coincidencia
+                para :meth:`resolver`.
+        """
+        self.umbral = umbral
+        self.margen = margen
+        self.nombres = []
+        self._claves = {}
+        self._grams = []
+        self._indice = defaultdict(list)
+        for ciudad in CIUDADES_CHILE if ciudades is None else ciudades:
+            self.agregar(ciudad)
+
+    def __len__(self):
+        return len(self.nombres)
+
+    def __contains__(self, nombre):
+        return normalizar(nombre) in self._claves
+
+    def agregar(self, nombre, alias=()):
+        """
+        Agrega una ciudad canónica y sus nombres alternativos.
+
+        Args:
+            nombre (str): Nombre canónico.
+            alias (iterable): Otros nombres que resuelven a la ciudad
+                ('Stgo', 'Concepcion').
+
+        Returns:
+            str: El nombre canónico (el existente si ya estaba).
+        """
+        nombre = limpiar(nombre)
+        clave = normalizar(nombre)
+        if clave in self._claves:
+            return self.nombres[self._claves[clave]]
+        posicion = len(self.nombres)
+        self.nombres.append(nombre)
+        for texto in (nombre, *alias):
+            self._indexar(normalizar(texto), posicion)
+        return nombre
+
+    def _indexar(self, clave, posicion):
+        """Registra una clave y sus trigramas para una ciudad."""
+        if not clave or clave in self._claves:
+            return
+        self._claves[clave] = posicion
+        entrada = len(self._grams)
+        grams = trigramas(clave)
+        self._grams.append((posicion, len(grams)))
+        for gram in grams:
+            self._indice[gram].append(entrada)
+
+    def buscar(self, texto, limite=5):
+        """
+        Busca las ciudades más parecidas a un texto.
+
+        Solo se comparan las entradas que comparten algún trigrama con el
+        texto (listas invertidas), no el catálogo completo.
+
+        Args:
+            texto (str): Texto libre.
+            limite (int): Máximo de resultados.
+
+        Returns:
+            list: Tuplas (nombre canónico, similitud), de mayor a menor.
+        """
+        clave = normalizar(texto)
+        if clave in self._claves:
+            return [(self.nombres[self._claves[clave]], 1.0)]
+        grams = trigramas(clave)
+        if not grams:
+            return []
+        comunes = Counter(
+            entrada for gram in grams for entrada in self._indice.get(gram, ())
+        )
+        mejores = {}
+        for entrada, n in comunes.items():
+            posicion, total = self._grams[entrada]
+            puntaje = 2 * n / (len(grams) + total)
+            if puntaje > mejores.get(posicion, 0):
+                mejores[posicion] = puntaje
+        orden = sorted(mejores.items(), key=lambda item: (-item[1], item[0]))
+        return [(self.nombres[p], puntaje) for p, puntaje in orden[:limite]]
+
+    def resolver(self, texto):
+        """
+        Resuelve texto libre al nombre canónico de una ciudad.
+
+        Una coincidencia aproximada se acepta solo si alcanza ``umbral`` y
+        supera a la segunda por al menos ``margen``, para no confundir una
+        ciudad fuera del catálogo con otra de nombre parecido ('Villa
+        Alegre' no resuelve a 'Villa Alemana').
+
+        Args:
+            texto (str): Nombre ingresado por el usuario.
+
+        Returns:
+            str: Nombre canónico, o None si ninguna ciudad alcanza el
+            umbral de similitud o la mejor no es clara.
+        """
+        resultados = self.buscar(texto, limite=2)
+        if not resultados or resultados[0][1] < self.umbral:
+            return None
+        if len(resultados) > 1 and \
+                resultados[0][1] - resultados[1][1] < self.margen:
+            return None
+        return resultados[0][0]
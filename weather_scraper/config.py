@@ -11,12 +11,21 @@ import platform
 # Directorio de salida para datos
 OUTPUT_DIR = 'data/weather'
 
-# URL del sitio meteorológico
-WEATHER_URL = 'https://www.meteored.cl/'
+# URL del sitio meteorológico. La variable de entorno WEATHER_URL permite
+# apuntar el scraper a otro sitio, por ejemplo al sitio local de pruebas
+# (ver local_site.py).
+WEATHER_URL = os.environ.get('WEATHER_URL', 'https://www.meteored.cl/')
+
+# Historial de capturas dentro de OUTPUT_DIR: cada ejecución agrega sus filas
+# con la ciudad y la hora de captura (ver analytics.py). None lo desactiva.
+HISTORY_FILE = 'historial.csv'
 
 # Timeout para esperas del navegador (en segundos)
 WAIT_TIMEOUT = 10
 
+# Pausa fija después de la búsqueda, antes de extraer (en segundos)
+PAGE_LOAD_WAIT = float(os.environ.get('WEATHER_PAGE_LOAD_WAIT', 5))
+
 # Opciones del navegador Chrome
 CHROME_OPTIONS = [
     '--start-maximized',
@@ -25,6 +34,71 @@ CHROME_OPTIONS = [
     # '--headless',
 ]
 
+# Opciones del perfil ligero: sin ventana y sin funciones que el scraper no
+# necesita (solo lee el texto del bloque dias_w)
+LIGHT_CHROME_OPTIONS = [
+    '--headless=new',
+    '--incognito',
+    '--window-size=1280,800',
+    '--disable-gpu',
+    '--disable-dev-shm-usage',
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--disable-translate',
+    '--disable-notifications',
+    '--mute-audio',
+    '--no-first-run',
+    '--blink-settings=imagesEnabled=false',
+]
+
+# Preferencias de contenido del perfil ligero (2 = bloquear)
+LIGHT_CHROME_PREFS = {
+    'profile.managed_default_content_settings.images': 2,
+    'profile.default_content_setting_values.notifications': 2,
+    'profile.default_content_setting_values.geolocation': 2,
+    'profile.default_content_setting_values.media_stream': 2,
+    'profile.default_content_setting_values.popups': 2,
+}
+
+# Solicitudes que el perfil ligero bloquea en el navegador: imágenes,
+# fuentes, audio/video y scripts de publicidad y analítica de terceros
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg',
+    '*.ico', '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.mp3', '*.m3u8',
+    '*doubleclick.net*', '*googlesyndication.com*', '*googletagmanager.com*',
+    '*googletagservices.com*', '*google-analytics.com*', '*adservice.google.*',
+    '*amazon-adsystem.com*', '*facebook.net*', '*connect.facebook.*',
+    '*criteo.*', '*taboola.com*', '*outbrain.com*', '*adnxs.com*',
+    '*rubiconproject.com*', '*pubmatic.com*', '*scorecardresearch.com*',
+    '*quantserve.com*', '*hotjar.com*', '*chartbeat.*',
+]
+
+# Perfiles del navegador:
+#   completo  Chrome con ventana que descarga todos los recursos.
+#   ligero    Chrome headless que bloquea imágenes, fuentes, medios y
+#             scripts de terceros, y deja de esperar la carga completa
+#             apenas el documento está listo (page_load_strategy 'eager').
+PERFILES = {
+    'completo': {
+        'options': CHROME_OPTIONS,
+        'prefs': {},
+        'blocked_urls': [],
+        'page_load_strategy': 'normal',
+    },
+    'ligero': {
+        'options': LIGHT_CHROME_OPTIONS,
+        'prefs': LIGHT_CHROME_PREFS,
+        'blocked_urls': BLOCKED_URL_PATTERNS,
+        'page_load_strategy': 'eager',
+    },
+}
+
+# Perfil usado por defecto (o la variable de entorno WEATHER_PROFILE)
+PERFIL = os.environ.get('WEATHER_PROFILE', 'completo')
+
 
 def get_chromedriver_path():
     """
@@ -5,7 +5,7 @@ Este script muestra diferentes formas de usar la clase WeatherScraper
 para extraer datos meteorológicos.
 """
 
-from weather_scraper import WeatherScraper
+from weather_scraper import BatchJob, ForecastTable, WeatherScraper
 
 
 def ejemplo_interactivo():
@@ -92,6 +92,11 @@ def ejemplo_multiples_ciudades():
     for ciudad, df in resultados.items():
         print(f"  - {ciudad}: {len(df)} días")
 
+    # Todas las ciudades en una sola tabla compacta
+    tabla = ForecastTable.desde_resultados(resultados)
+    print(f"\n{tabla}")
+    print(tabla.to_frame().groupby("ciudad", observed=True)["t_max"].max())
+
 
 def ejemplo_directorio_personalizado():
     """
@@ -161,6 +166,13 @@ def ejemplo_analisis_datos():
     print("\nInformación del DataFrame:")
     print(df.info())
 
+    # Historial acumulado de todas las capturas
+    from weather_scraper import analytics
+
+    historial = analytics.cargar_historial(scraper.output_dir)
+    print("\nResumen del historial por ciudad:")
+    print(analytics.resumen_ciudades(historial).to_string())
+
 
 def ejemplo_manejo_errores():
     """
@@ -192,6 +204,25 @@ def ejemplo_manejo_errores():
             print(f"✗ Error: No se pudieron obtener datos")
 
 
+def ejemplo_lote_reanudable():
+    """
+    Ejemplo de lote con checkpoint.
+
+    Si el lote se interrumpe, ejecutarlo de nuevo continúa con las
+    ciudades pendientes y omite las que ya se completaron.
+    """
+    print("\n" + "="*70)
+    print("EJEMPLO 7: LOTE REANUDABLE")
+    print("="*70)
+
+    ciudades = ["Santiago", "Valparaíso", "Concepción", "La Serena"]
+
+    with BatchJob(db_path="data/weather/lote.db", max_intentos=3) as job:
+        conteo = job.run(ciudades)
+
+    print(f"\nCompletadas: {conteo['completada']}/{len(ciudades)}")
+
+
 def main():
     """
     Función principal que ejecuta todos los ejemplos.
@@ -227,6 +258,9 @@ def main():
     # Ejemplo 6: Manejo de errores
     # ejemplo_manejo_errores()
 
+    # Ejemplo 7: Lote reanudable con checkpoint
+    # ejemplo_lote_reanudable()
+
     print("\n" + "="*70)
     print("EJEMPLOS COMPLETADOS")
     print("="*70)
@@ -0,0 +1,269 @@
+"""
+Sitio local que imita las páginas de Meteored usadas por el scraper.
+
+Sirve la página de búsqueda (con el cuadro ``search_pc``) y las páginas de
+pronóstico (con el bloque ``dias_w``) a partir de las plantillas de
+``fixtures/``, con latencia y fallas configurables. Permite medir y probar
+``WeatherScraper`` sin acceso a internet:
+
+    with LocalWeatherSite(latency=0.2, failure_rate=0.1) as sitio:
+        config.WEATHER_URL = sitio.url
+        WeatherScraper().run("Santiago")
+
+También se puede iniciar desde la terminal y apuntar el scraper con la
+variable de entorno ``WEATHER_URL``:
+
+    python -m weather_scraper.local_site --port 8765
+    WEATHER_URL=http://127.0.0.1:8765/ python -m weather_scraper.scraper
+"""
+
+import argparse
+import os
+import random
+import threading
+import time
+import zlib
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from string import Template
+from urllib.parse import parse_qs, urlparse
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+DIAS = ["Lun", "Mar", "Mié", "Jue", "Vie", "Sáb", "Dom"]
+MESES = [
+    "Ene", "Feb", "Mar", "Abr", "May", "Jun",
+    "Jul", "Ago", "Sep", "Oct", "Nov", "Dic",
+]
+DIRECCIONES = ["N", "NE", "E", "SE", "S", "SO", "O", "NO"]
+
+
+def _cargar_plantilla(nombre):
+    """Lee una plantilla de ``fixtures/``."""
+    with open(os.path.join(FIXTURES_DIR, nombre), encoding="utf-8") as f:
+        return Template(f.read())
+
+
+def pronostico(ciudad, dias=7, inicio=None):
+    """
+    Genera un pronóstico determinista para una ciudad.
+
+    La misma ciudad produce siempre los mismos valores, de modo que las
+    ejecuciones del scraper contra el sitio local son reproducibles.
+
+    Args:
+        ciudad (str): Nombre de la ciudad.
+        dias (int): Días de pronóstico.
+        inicio (date, optional): Primer día; por defecto, hoy.
+
+    Returns:
+        list: Diccionarios con dia, fecha, temperatura y viento, en el
+        mismo formato de texto que la página real.
+    """
+    rng = random.Random(zlib.crc32(ciudad.strip().lower().encode("utf-8")))
+    inicio = inicio or date.today()
+    base = rng.uniform(8, 28)
+    filas = []
+    for i in range(dias):
+        dia = inicio + timedelta(days=i)
+        maxima = round(base + rng.uniform(-3, 6))
+        minima = round(maxima - rng.uniform(6, 14))
+        filas.append({
+            "dia": DIAS[dia.weekday()],
+            "fecha": f"{dia.day} {MESES[dia.month - 1]}",
+            "temperatura": f"{maxima}° / {minima}°",
+            "viento": f"{rng.randint(3, 40)} km/h {rng.choice(DIRECCIONES)}",
+        })
+    return filas
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Atiende las solicitudes del navegador con las plantillas locales."""
+
+    server_version = "LocalWeatherSite/1.0"
+
+    def log_message(self, format, *args):
+        """Silencia el registro de solicitudes en la terminal."""
+
+    def do_GET(self):
+        site = self.server.site
+        url = urlparse(self.path)
+        site._registrar("requests")
+        site._esperar()
+
+        if url.path.startswith("/static/"):
+            self._responder_archivo(url.path[len("/static/"):])
+            return
+        if site._debe_fallar():
+            site._registrar("failures")
+            self._responder(503, site.plantillas["error"].substitute())
+            return
+
+        if url.path == "/":
+            self._responder(200, site.plantillas["search"].substitute())
+        elif url.path == "/buscar":
+            ciudad = parse_qs(url.query).get("q", [""])[0].strip()
+            if not ciudad or ciudad.lower() in site.unknown_cities:
+                site._registrar("not_found")
+                self._responder(
+                    404, site.plantillas["not_found"].substitute(ciudad=ciudad)
+                )
+                return
+            site._registrar("forecasts")
+            dias = "\n".join(
+                site.plantillas["day"].substitute(fila)
+                for fila in pronostico(ciudad, site.days)
+            )
+            self._responder(
+                200,
+                site.plantillas["forecast"].substitute(
+                    ciudad=ciudad, dias=dias
+                ),
+            )
+        else:
+            self._responder(404, "")
+
+    def _responder(self, status, html, content_type="text/html"):
+        cuerpo = html.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def _responder_archivo(self, nombre):
+        ruta = os.path.join(FIXTURES_DIR, os.path.basename(nombre))
+        if not nombre.endswith(".css") or not os.path.isfile(ruta):
+            self._responder(404, "")
+            return
+        with open(ruta, encoding="utf-8") as f:
+            self._responder(200, f.read(), content_type="text/css")
+
+
+class LocalWeatherSite:
+    """
+    Servidor HTTP local que imita Meteored para pruebas y benchmarks.
+
+    Atributos:
+        url (str): URL base del sitio (disponible después de ``start``).
+        latency (float): Demora fija por solicitud, en segundos.
+        jitter (float): Demora adicional aleatoria máxima, en segundos.
+        failure_rate (float): Probabilidad de responder 503 a una página.
+        unknown_cities (set): Ciudades sin resultados (en minúsculas).
+        days (int): Días de cada pronóstico.
+        stats (dict): Solicitudes atendidas, fallas inyectadas, pronósticos
+            servidos y búsquedas sin resultados.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0,
+                 failure_rate=0.0, unknown_cities=(), days=7, seed=None):
+        """
+        Configura el sitio local (no lo inicia).
+
+        Args:
+            host (str): Dirección donde escuchar.
+            port (int): Puerto; 0 elige uno libre.
+            latency (float): Demora fija por solicitud, en segundos.
+            jitter (float): Demora adicional aleatoria máxima.
+            failure_rate (float): Probabilidad de falla (HTTP 503) por
+                página, entre 0 y 1.
+            unknown_cities (iterable): Ciudades que no tienen resultados.
+            days (int): Días de cada pronóstico.
+            seed (int, optional): Semilla para latencias y fallas.
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.unknown_cities = {ciudad.lower() for ciudad in unknown_cities}
+        self.days = days
+        self.stats = {
+            "requests": 0, "failures": 0, "forecasts": 0, "not_found": 0
+        }
+        self.plantillas = {
+            nombre: _cargar_plantilla(f"{nombre}.html")
+            for nombre in ("search", "forecast", "day", "not_found", "error")
+        }
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self.url = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _registrar(self, contador):
+        with self._lock:
+            self.stats[contador] += 1
+
+    def _esperar(self):
+        if self.latency or self.jitter:
+            with self._lock:
+                extra = self._rng.uniform(0, self.jitter)
+            time.sleep(self.latency + extra)
+
+    def _debe_fallar(self):
+        with self._lock:
+            return self._rng.random() < self.failure_rate
+
+    def start(self):
+        """
+        Inicia el servidor en un hilo de fondo.
+
+        Returns:
+            LocalWeatherSite: La misma instancia, con ``url`` definida.
+        """
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self._server.site = self
+        self.port = self._server.server_address[1]
+        self.url = f"http://{self.host}:{self.port}/"
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Detiene el servidor."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+
+def main():
+    """Inicia el sitio local desde la terminal hasta presionar Ctrl+C."""
+    parser = argparse.ArgumentParser(
+        description="Sitio local que imita Meteored para pruebas."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    site = LocalWeatherSite(
+        args.host, args.port, args.latency, args.jitter, args.failure_rate
+    ).start()
+    print(f"Sitio local en {site.url} (Ctrl+C para detener)")
+    print(f"Usa: WEATHER_URL={site.url} python -m weather_scraper.scraper")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("\nDeteniendo sitio local...")
+    finally:
+        site.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,681 @@
+"""
+Proveedores de pronóstico y consultas con cobertura (hedged requests).
+
+``WeatherScraper`` depende de un solo sitio: cuando ese sitio está lento,
+la latencia por ciudad en la cola (p99) se dispara. Este módulo define una
+interfaz común de proveedores y ``HedgedFetcher``, que consulta al
+proveedor principal y, si no respondió dentro de un percentil de su propia
+latencia reciente (p95 por defecto), lanza una consulta de respaldo al
+siguiente proveedor y usa la primera respuesta que llegue. Como solo se
+cubre la cola lenta, la carga adicional es de alrededor de un 5 %.
+
+Todos los proveedores retornan el mismo esquema que
+:func:`scraper.parsear_pronostico` (columnas ``COLUMNAS``, en texto), de
+modo que el resultado se guarda y se analiza igual venga de donde venga.
+
+- :class:`MeteoredProvider`: el sitio de ``config.WEATHER_URL``, con Selenium.
+- :class:`OpenMeteoProvider`: la API pública de Open-Meteo (sin navegador).
+- :class:`SimulatedProvider`: proveedor local con distribución de latencia
+  y tasa de fallas controlables, para pruebas y benchmarks.
+
+Uso:
+    python -m weather_scraper.providers --city Santiago
+    python -m weather_scraper.providers --simulate --requests 500
+"""
+
+import abc
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.parse
+import urllib.request
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from . import config
+from .cities import normalizar
+from .scraper import WeatherScraper, guardar_pronostico
+
+
+# Esquema normalizado de un pronóstico (el de parsear_pronostico)
+COLUMNAS = ["Día", "Fecha", "Temperatura", "Viento"]
+
+DIAS = ["Lun", "Mar", "Mié", "Jue", "Vie", "Sáb", "Dom"]
+MESES = ["Ene", "Feb", "Mar", "Abr", "May", "Jun", "Jul", "Ago", "Sep",
+         "Oct", "Nov", "Dic"]
+RUMBOS = ["N", "NE", "E", "SE", "S", "SO", "O", "NO"]
+
+OPEN_METEO_GEOCODING = "https://geocoding-api.open-meteo.com/v1/search"
+OPEN_METEO_FORECAST = "https://api.open-meteo.com/v1/forecast"
+
+
+def _redondear(valor):
+    """Valor redondeado como texto, o '--' si falta."""
+    return "--" if valor is None or pd.isna(valor) else str(round(valor))
+
+
+def formatear_pronostico(fechas, t_max, t_min, viento, direccion):
+    """
+    Construye un pronóstico con el esquema normalizado.
+
+    Args:
+        fechas (list): Fechas (``datetime.date``) pronosticadas.
+        t_max (list): Temperaturas máximas (°C).
+        t_min (list): Temperaturas mínimas (°C).
+        viento (list): Velocidad del viento (km/h).
+        direccion (list): Dirección del viento en grados (0 = norte).
+
+    Los valores faltantes (None o NaN) se escriben como '--' ("-- km/h");
+    ``parsear_temperatura`` y ``parsear_viento`` los leen como NaN.
+
+    Returns:
+        pd.DataFrame: Columnas Día, Fecha, Temperatura y Viento, con el
+        mismo formato de texto del sitio ("Lun", "18 Ene", "23° / 14°",
+        "15 km/h NE").
+    """
+    filas = []
+    for fecha, maxima, minima, kmh, grados in zip(
+            fechas, t_max, t_min, viento, direccion):
+        rumbo = "" if grados is None or pd.isna(grados) \
+            else RUMBOS[round(grados / 45) % 8]
+        filas.append({
+            "Día": DIAS[fecha.weekday()],
+            "Fecha": f"{fecha.day} {MESES[fecha.month - 1]}",
+            "Temperatura":
+                f"{_redondear(maxima)}° / {_redondear(minima)}°",
+            "Viento": f"{_redondear(kmh)} km/h {rumbo}".rstrip(),
+        })
+    return pd.DataFrame(filas, columns=COLUMNAS)
+
+
+class ForecastProvider(abc.ABC):
+    """
+    Fuente de pronósticos.
+
+    Las subclases implementan :meth:`obtener`. Deben poder llamarse desde
+    varios hilos a la vez, porque ``HedgedFetcher`` mantiene consultas en
+    curso a más de un proveedor.
+
+    Atributos:
+        nombre (str): Nombre del proveedor en métricas y resultados.
+    """
+
+    nombre = "proveedor"
+
+    @abc.abstractmethod
+    def obtener(self, ciudad):
+        """
+        Obtiene el pronóstico de una ciudad.
+
+        Args:
+            ciudad (str): Nombre de la ciudad.
+
+        Returns:
+            pd.DataFrame: Pronóstico con las columnas ``COLUMNAS``.
+
+        Raises:
+            Exception: Si el proveedor no pudo responder.
+        """
+
+    def close(self):
+        """Libera los recursos del proveedor."""
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.nombre!r})"
+
+
+class MeteoredProvider(ForecastProvider):
+    """
+    Sitio de ``config.WEATHER_URL`` a través de ``WeatherScraper``.
+
+    Cada consulta usa su propio navegador, así que admite consultas
+    simultáneas.
+
+    Atributos:
+        perfil (str): Perfil del navegador.
+        limitador (RateLimiter): Limitador de tasa del sitio, o None.
+    """
+
+    nombre = "meteored"
+
+    def __init__(self, perfil=None, limitador=None):
+        """
+        Configura el proveedor.
+
+        Args:
+            perfil (str, optional): Perfil del navegador ('completo' o
+                'ligero').
+            limitador (RateLimiter, optional): Limitador de tasa compartido.
+        """
+        self.perfil = perfil
+        self.limitador = limitador
+
+    def obtener(self, ciudad):
+        scraper = WeatherScraper(
+            perfil=self.perfil, limitador=self.limitador, guardar=False
+        )
+        return scraper.scrape(ciudad)
+
+
+class OpenMeteoProvider(ForecastProvider):
+    """
+    API pública de Open-Meteo (https://open-meteo.com), sin navegador.
+
+    La ciudad se ubica con la API de geocodificación (una vez por ciudad;
+    las coordenadas quedan en memoria) y el pronóstico diario se convierte
+    al esquema normalizado.
+
+    Atributos:
+        dias (int): Días de pronóstico.
+        timeout (float): Timeout de cada solicitud HTTP (s).
+        pais (str): Código ISO del país para desambiguar ciudades, o None.
+    """
+
+    nombre = "open-meteo"
+
+    def __init__(self, dias=7, timeout=10.0, pais="CL"):
+        """
+        Configura el proveedor.
+
+        Args:
+            dias (int): Días de pronóstico (1 a 16).
+            timeout (float): Timeout de cada solicitud HTTP (s).
+            pais (str, optional): Código ISO del país preferido.
+        """
+        self.dias = dias
+        self.timeout = timeout
+        self.pais = pais
+        self._coordenadas = {}
+        self._lock = threading.Lock()
+
+    def _consultar(self, url, parametros):
+        """Realiza un GET y retorna el JSON decodificado."""
+        consulta = f"{url}?{urllib.parse.urlencode(parametros)}"
+        with urllib.request.urlopen(consulta, timeout=self.timeout) as resp:
+            return json.loads(resp.read().decode("utf-8"))
+
+    def ubicar(self, ciudad):
+        """
+        Coordenadas de una ciudad.
+
+        Args:
+            ciudad (str): Nombre de la ciudad.
+
+        Returns:
+            tuple: (latitud, longitud).
+
+        Raises:
+            ValueError: Si la ciudad no se encuentra.
+        """
+        clave = normalizar(ciudad)
+        with self._lock:
+            if clave in self._coordenadas:
+                return self._coordenadas[clave]
+
+        datos = self._consultar(OPEN_METEO_GEOCODING, {
+            "name": ciudad, "count": 10, "language": "es", "format": "json",
+        })
+        resultados = datos.get("results") or []
+        if self.pais:
+            resultados = sorted(
+                resultados, key=lambda r: r.get("country_code") != self.pais
+            )
+        if not resultados:
+            raise ValueError(f"Open-Meteo no encontró la ciudad {ciudad}.")
+        coordenadas = (resultados[0]["latitude"], resultados[0]["longitude"])
+        with self._lock:
+            self._coordenadas[clave] = coordenadas
+        return coordenadas
+
+    def obtener(self, ciudad):
+        latitud, longitud = self.ubicar(ciudad)
+        datos = self._consultar(OPEN_METEO_FORECAST, {
+            "latitude": latitud,
+            "longitude": longitud,
+            "daily": "temperature_2m_max,temperature_2m_min,"
+                     "wind_speed_10m_max,wind_direction_10m_dominant",
+            "timezone": "auto",
+            "forecast_days": self.dias,
+        })
+        diario = datos["daily"]
+        return formatear_pronostico(
+            [date.fromisoformat(d) for d in diario["time"]],
+            diario["temperature_2m_max"],
+            diario["temperature_2m_min"],
+            diario["wind_speed_10m_max"],
+            diario["wind_direction_10m_dominant"],
+        )
+
+
+class SimulatedProvider(ForecastProvider):
+    """
+    Proveedor local con latencia y fallas controlables.
+
+    La latencia sigue una distribución log-normal de mediana ``latencia``
+    y, con probabilidad ``cola``, una demora adicional de ``latencia_cola``
+    (el sitio lento ocasional que el hedging debe cubrir). El pronóstico
+    es sintético y estable para cada ciudad.
+
+    Atributos:
+        nombre (str): Nombre del proveedor.
+        latencia (float): Mediana de la latencia (s).
+        sigma (float): Dispersión de la log-normal.
+        cola (float): Probabilidad de una respuesta lenta.
+        latencia_cola (float): Demora adicional de una respuesta lenta (s).
+        fallas (float): Probabilidad de error.
+        llamadas (int): Consultas recibidas.
+    """
+
+    def __init__(self, nombre="simulado", latencia=0.05, sigma=0.3, cola=0.0,
+                 latencia_cola=1.0, fallas=0.0, dias=7, seed=None,
+                 distribucion=None):
+        """
+        Configura el proveedor.
+
+        Args:
+            nombre (str): Nombre del proveedor.
+            latencia (float): Mediana de la latencia (s).
+            sigma (float): Dispersión de la log-normal (0 = constante).
+            cola (float): Probabilidad de una respuesta lenta.
+            latencia_cola (float): Demora adicional de esas respuestas (s).
+            fallas (float): Probabilidad de que la consulta falle.
+            dias (int): Días del pronóstico sintético.
+            seed (int, optional): Semilla para reproducir la secuencia.
+            distribucion (callable, optional): Recibe un ``random.Random``
+                y retorna la latencia en segundos; reemplaza a la
+                log-normal.
+        """
+        self.nombre = nombre
+        self.latencia = latencia
+        self.sigma = sigma
+        self.cola = cola
+        self.latencia_cola = latencia_cola
+        self.fallas = fallas
+        self.dias = dias
+        self.distribucion = distribucion
+        self.llamadas = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _sortear(self):
+        """Sortea la latencia y si la consulta falla."""
+        with self._lock:
+            self.llamadas += 1
+            if self.distribucion is not None:
+                demora = self.distribucion(self._rng)
+            else:
+                demora = self.latencia * self._rng.lognormvariate(
+                    0, self.sigma
+                )
+                if self._rng.random() < self.cola:
+                    demora += self.latencia_cola
+            return demora, self._rng.random() < self.fallas
+
+    def obtener(self, ciudad):
+        demora, falla = self._sortear()
+        time.sleep(demora)
+        if falla:
+            raise ConnectionError(f"{self.nombre}: falla simulada.")
+
+        rng = random.Random(normalizar(ciudad))
+        hoy = date.today()
+        fechas = [hoy + timedelta(days=i) for i in range(self.dias)]
+        t_max = [rng.uniform(12, 30) for _ in fechas]
+        return formatear_pronostico(
+            fechas,
+            t_max,
+            [t - rng.uniform(6, 14) for t in t_max],
+            [rng.uniform(0, 40) for _ in fechas],
+            [rng.uniform(0, 360) for _ in fechas],
+        )
+
+
+class HedgedFetcher:
+    """
+    Consulta proveedores en orden con solicitudes de respaldo (hedging).
+
+    Lanza la consulta al primer proveedor; si no respondió dentro del
+    percentil ``percentil`` de sus latencias recientes, lanza también la
+    del siguiente, y así sucesivamente. Se usa la primera respuesta
+    exitosa. Si un proveedor falla, el siguiente se lanza de inmediato.
+
+    Las consultas que pierden la carrera no se pueden interrumpir (son
+    E/S bloqueante): terminan en el pool y su latencia se registra igual,
+    para que el percentil no quede sesgado hacia las respuestas rápidas.
+
+    Atributos:
+        proveedores (list): Proveedores en orden de preferencia.
+        percentil (float): Percentil de latencia que dispara el respaldo.
+        hedging (bool): Si lanza consultas de respaldo por demora (sin
+            hedging solo se pasa al siguiente proveedor ante un error).
+        output_dir (str): Directorio de salida de :meth:`scrape`.
+    """
+
+    def __init__(self, proveedores, percentil=95, ventana=200, min_muestras=20,
+                 retraso_inicial=5.0, retraso_minimo=0.0, hedging=True,
+                 max_workers=16, output_dir=None):
+        """
+        Configura el fetcher.
+
+        Args:
+            proveedores (list): Proveedores (``ForecastProvider``) en orden
+                de preferencia; el primero es el principal.
+            percentil (float): Percentil de latencia (0 a 100) tras el cual
+                se lanza el respaldo.
+            ventana (int): Latencias recientes que se conservan por
+                proveedor.
+            min_muestras (int): Latencias necesarias para usar el
+                percentil; antes se usa ``retraso_inicial``.
+            retraso_inicial (float): Espera antes del respaldo mientras no
+                hay suficientes muestras (s).
+            retraso_minimo (float): Espera mínima antes del respaldo (s).
+            hedging (bool): Si lanza respaldos por demora.
+            max_workers (int): Hilos del pool de consultas; debe cubrir las
+                consultas en curso más las rezagadas.
+            output_dir (str, optional): Directorio de salida; por defecto,
+                el de config.
+
+        Raises:
+            ValueError: Si no hay proveedores o el percentil es inválido.
+        """
+        if not proveedores:
+            raise ValueError("Se requiere al menos un proveedor.")
+        if not 0 < percentil <= 100:
+            raise ValueError("percentil debe estar entre 0 y 100.")
+        self.proveedores = list(proveedores)
+        self.percentil = percentil
+        self.min_muestras = min_muestras
+        self.retraso_inicial = retraso_inicial
+        self.retraso_minimo = retraso_minimo
+        self.hedging = hedging
+        self.output_dir = output_dir or config.OUTPUT_DIR
+
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="proveedor"
+        )
+        self._lock = threading.Lock()
+        self._latencias = {
+            p.nombre: deque(maxlen=ventana) for p in self.proveedores
+        }
+        self._totales = deque(maxlen=ventana * 5)
+        self._contadores = {
+            "solicitudes": 0, "respaldos": 0, "fallas": 0,
+            "ganadas": {p.nombre: 0 for p in self.proveedores},
+            "errores": {p.nombre: 0 for p in self.proveedores},
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Cierra el pool (sin esperar consultas rezagadas) y los proveedores."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        for proveedor in self.proveedores:
+            proveedor.close()
+
+    def retraso(self, proveedor):
+        """
+        Espera antes de lanzar el respaldo de un proveedor.
+
+        Args:
+            proveedor (ForecastProvider): Proveedor en curso.
+
+        Returns:
+            float: Segundos; el percentil de sus latencias recientes, o
+            ``retraso_inicial`` si aún no hay suficientes.
+        """
+        with self._lock:
+            muestras = list(self._latencias[proveedor.nombre])
+        if len(muestras) < self.min_muestras:
+            return max(self.retraso_minimo, self.retraso_inicial)
+        return max(self.retraso_minimo,
+                   float(np.percentile(muestras, self.percentil)))
+
+    def _consultar(self, proveedor, ciudad):
+        """Consulta un proveedor y registra su latencia."""
+        inicio = time.perf_counter()
+        try:
+            df = proveedor.obtener(ciudad)
+        except Exception:
+            with self._lock:
+                self._contadores["errores"][proveedor.nombre] += 1
+            raise
+        latencia = time.perf_counter() - inicio
+        with self._lock:
+            self._latencias[proveedor.nombre].append(latencia)
+        return df
+
+    def obtener(self, ciudad):
+        """
+        Obtiene el pronóstico de una ciudad del proveedor más rápido.
+
+        Args:
+            ciudad (str): Nombre de la ciudad.
+
+        Returns:
+            pd.DataFrame: Pronóstico con las columnas ``COLUMNAS``; en
+            ``df.attrs`` quedan 'proveedor', 'latencia' (s) y 'respaldos'
+            (consultas de respaldo lanzadas).
+
+        Raises:
+            RuntimeError: Si todos los proveedores fallan (el último error
+                queda como causa).
+        """
+        inicio = time.perf_counter()
+        pendientes = {}
+        siguiente = 0
+        lanzado = inicio
+        respaldos = 0
+        ultimo_error = None
+
+        def lanzar():
+            nonlocal siguiente, lanzado
+            proveedor = self.proveedores[siguiente]
+            siguiente += 1
+            lanzado = time.perf_counter()
+            futuro = self._pool.submit(self._consultar, proveedor, ciudad)
+            pendientes[futuro] = proveedor
+            return proveedor
+
+        actual = lanzar()
+        try:
+            while pendientes:
+                espera = None
+                if self.hedging and siguiente < len(self.proveedores):
+                    # Plazo del último proveedor lanzado
+                    transcurrido = time.perf_counter() - lanzado
+                    espera = max(0.0, self.retraso(actual) - transcurrido)
+                listos, _ = wait(
+                    pendientes, timeout=espera, return_when=FIRST_COMPLETED
+                )
+                if not listos:
+                    # El proveedor en curso superó su percentil: respaldo
+                    actual = lanzar()
+                    respaldos += 1
+                    continue
+
+                for futuro in listos:
+                    proveedor = pendientes.pop(futuro)
+                    try:
+                        df = futuro.result()
+                    except Exception as e:
+                        ultimo_error = e
+                        continue
+                    latencia = time.perf_counter() - inicio
+                    df.attrs.update(
+                        proveedor=proveedor.nombre, latencia=latencia,
+                        respaldos=respaldos,
+                    )
+                    self._registrar(proveedor, latencia, respaldos)
+                    return df
+
+                # Todas las consultas listas fallaron: pasar al siguiente
+                if not pendientes and siguiente < len(self.proveedores):
+                    actual = lanzar()
+        finally:
+            for futuro in pendientes:
+                futuro.cancel()
+
+        self._registrar(None, time.perf_counter() - inicio, respaldos)
+        raise RuntimeError(
+            f"Ningún proveedor respondió para {ciudad}."
+        ) from ultimo_error
+
+    def _registrar(self, ganador, latencia, respaldos):
+        """Actualiza los contadores de una consulta terminada."""
+        with self._lock:
+            self._contadores["solicitudes"] += 1
+            self._contadores["respaldos"] += respaldos
+            self._totales.append(latencia)
+            if ganador is None:
+                self._contadores["fallas"] += 1
+            else:
+                self._contadores["ganadas"][ganador.nombre] += 1
+
+    def scrape(self, ciudad):
+        """
+        Obtiene y guarda el pronóstico de una ciudad.
+
+        Tiene la misma forma que ``WeatherScraper.scrape``, así que sirve
+        como ``refrescar`` de ``RefreshScheduler``.
+
+        Args:
+            ciudad (str): Nombre de la ciudad.
+
+        Returns:
+            pd.DataFrame: Pronóstico guardado.
+        """
+        df = self.obtener(ciudad)
+        guardar_pronostico(df, ciudad, self.output_dir)
+        return df
+
+    def metricas(self):
+        """
+        Retorna contadores y latencias de las consultas.
+
+        Returns:
+            dict: solicitudes, respaldos, tasa_respaldo (respaldos por
+            solicitud, la carga adicional), fallas, ganadas y errores por
+            proveedor, latencia_p50/p95/p99 (s) de extremo a extremo y el
+            retraso actual de cada proveedor.
+        """
+        with self._lock:
+            totales = np.array(self._totales)
+            metricas = {
+                **self._contadores,
+                "ganadas": dict(self._contadores["ganadas"]),
+                "errores": dict(self._contadores["errores"]),
+            }
+        metricas["tasa_respaldo"] = (
+            metricas["respaldos"] / metricas["solicitudes"]
+            if metricas["solicitudes"] else 0.0
+        )
+        for p in (50, 95, 99):
+            metricas[f"latencia_p{p}"] = (
+                float(np.percentile(totales, p)) if len(totales) else None
+            )
+        metricas["retrasos"] = {
+            p.nombre: self.retraso(p) for p in self.proveedores
+        }
+        return metricas
+
+
+def simular(solicitudes=500, concurrencia=8, percentil=95, seed=0):
+    """
+    Compara la latencia con y sin hedging sobre proveedores simulados.
+
+    El principal responde en ~50 ms pero un 3 % de las veces tarda 1 s
+    más; el respaldo es algo más lento (~80 ms) y sin cola.
+
+    Args:
+        solicitudes (int): Consultas por escenario.
+        concurrencia (int): Consultas simultáneas.
+        percentil (float): Percentil que dispara el respaldo.
+        seed (int): Semilla de los proveedores.
+
+    Returns:
+        dict: Métricas de cada escenario ('sin_hedging', 'con_hedging').
+    """
+    resultados = {}
+    for nombre, hedging in (("sin_hedging", False), ("con_hedging", True)):
+        proveedores = [
+            SimulatedProvider("principal", latencia=0.05, cola=0.03,
+                              latencia_cola=1.0, seed=seed),
+            SimulatedProvider("respaldo", latencia=0.08, seed=seed + 1),
+        ]
+        with HedgedFetcher(proveedores, percentil=percentil, hedging=hedging,
+                           retraso_inicial=0.2,
+                           max_workers=concurrencia * 4) as fetcher:
+            with ThreadPoolExecutor(max_workers=concurrencia) as clientes:
+                list(clientes.map(
+                    fetcher.obtener,
+                    (f"ciudad {i}" for i in range(solicitudes)),
+                ))
+            resultados[nombre] = fetcher.metricas()
+    return resultados
+
+
+def main():
+    """Consulta una ciudad con hedging o compara escenarios simulados."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--city", help="Ciudad a consultar.")
+    parser.add_argument(
+        "--providers", default="meteored,open-meteo",
+        help="Proveedores en orden de preferencia (meteored, open-meteo).",
+    )
+    parser.add_argument("--percentile", type=float, default=95)
+    parser.add_argument("--profile", default=None,
+                        help="Perfil del navegador para meteored.")
+    parser.add_argument("--save", action="store_true",
+                        help="Guarda el resultado como WeatherScraper.")
+    parser.add_argument("--simulate", action="store_true",
+                        help="Compara latencias con proveedores simulados.")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    if args.simulate:
+        resultados = simular(args.requests, args.concurrency, args.percentile)
+        print("="*70)
+        print(f"{'escenario':<14}{'p50 (ms)':>10}{'p95 (ms)':>10}"
+              f"{'p99 (ms)':>10}{'respaldos':>11}  ganadas")
+        print("="*70)
+        for nombre, m in resultados.items():
+            print(f"{nombre:<14}{m['latencia_p50'] * 1000:>10.0f}"
+                  f"{m['latencia_p95'] * 1000:>10.0f}"
+                  f"{m['latencia_p99'] * 1000:>10.0f}"
+                  f"{m['tasa_respaldo']:>10.1%}  {m['ganadas']}")
+        return
+
+    if not args.city:
+        parser.error("Indica --city o --simulate.")
+    disponibles = {
+        "meteored": lambda: MeteoredProvider(perfil=args.profile),
+        "open-meteo": OpenMeteoProvider,
+    }
+    proveedores = []
+    for nombre in args.providers.split(","):
+        if nombre not in disponibles:
+            parser.error(f"Proveedor desconocido: {nombre}.")
+        proveedores.append(disponibles[nombre]())
+
+    with HedgedFetcher(proveedores, percentil=args.percentile) as fetcher:
+        df = fetcher.scrape(args.city) if args.save else \
+            fetcher.obtener(args.city)
+        print(f"\nProveedor: {df.attrs['proveedor']} "
+              f"({df.attrs['latencia']:.2f} s, "
+              f"{df.attrs['respaldos']} respaldos)")
+        print(df.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
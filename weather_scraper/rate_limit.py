@@ -0,0 +1,318 @@
+"""
+Limitador de tasa adaptativo para las solicitudes al sitio meteorológico.
+
+``RateLimiter`` combina un token bucket con control AIMD (aumento aditivo,
+disminución multiplicativa): cada solicitud exitosa sube la tasa en
+``aumento`` solicitudes por segundo, y cada señal de sobrecarga (timeout,
+página de error o latencia sobre ``latencia_objetivo``) la multiplica por
+``factor``. Así la tasa converge sola cerca del máximo que tolera el sitio,
+sin ajustar pausas a mano.
+
+Una misma instancia se comparte entre todos los scrapers y workers de un
+proceso (es segura entre hilos). Con ``db_path`` el estado se guarda en
+SQLite y lo comparten también varios procesos de la misma máquina o de un
+disco compartido.
+
+Uso:
+    limitador = RateLimiter(rate=0.5, max_rate=5, latencia_objetivo=8)
+    scraper = WeatherScraper(limitador=limitador)
+    print(limitador.metricas())
+"""
+
+import contextlib
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS limitador (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    rate REAL NOT NULL,
+    tokens REAL NOT NULL,
+    ultimo REAL NOT NULL,
+    ultima_reduccion REAL NOT NULL
+)
+"""
+
+
+class RateLimiter:
+    """
+    Token bucket con tasa adaptativa AIMD.
+
+    Atributos:
+        rate (float): Tasa actual, en solicitudes por segundo.
+        burst (float): Capacidad del bucket (solicitudes seguidas sin
+            espera).
+        min_rate (float): Tasa mínima.
+        max_rate (float): Tasa máxima.
+        aumento (float): Aumento aditivo de la tasa por solicitud exitosa.
+        factor (float): Factor multiplicativo ante una señal de sobrecarga.
+        latencia_objetivo (float): Latencia (s) sobre la que una solicitud
+            exitosa cuenta como sobrecarga; None la ignora.
+        enfriamiento (float): Segundos tras una reducción en que las demás
+            señales no vuelven a reducir (vienen de la misma congestión).
+        db_path (str): Base SQLite del estado compartido entre procesos,
+            o None para un estado solo en memoria.
+    """
+
+    def __init__(self, rate=0.5, burst=1, min_rate=0.05, max_rate=10.0,
+                 aumento=0.05, factor=0.5, latencia_objetivo=None,
+                 enfriamiento=None, db_path=None, max_eventos=100):
+        """
+        Configura el limitador.
+
+        Args:
+            rate (float): Tasa inicial, en solicitudes por segundo.
+            burst (float): Capacidad del bucket (al menos 1).
+            min_rate (float): Tasa mínima (mayor que 0).
+            max_rate (float): Tasa máxima.
+            aumento (float): Aumento de la tasa por solicitud exitosa.
+            factor (float): Multiplicador de la tasa ante sobrecarga,
+                entre 0 y 1.
+            latencia_objetivo (float, optional): Latencia máxima aceptable.
+            enfriamiento (float, optional): Ventana entre reducciones; por
+                defecto, el tiempo entre dos solicitudes a la tasa actual.
+            db_path (str, optional): Base SQLite para compartir el estado
+                entre procesos. Si ya existe, se reutiliza su tasa.
+            max_eventos (int): Eventos de reducción que se conservan.
+
+        Raises:
+            ValueError: Si los parámetros están fuera de rango.
+        """
+        if not 0 < min_rate <= max_rate:
+            raise ValueError("Se requiere 0 < min_rate <= max_rate.")
+        if not 0 < factor < 1:
+            raise ValueError("factor debe estar entre 0 y 1.")
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = max(1.0, float(burst))
+        self.aumento = aumento
+        self.factor = factor
+        self.latencia_objetivo = latencia_objetivo
+        self.enfriamiento = enfriamiento
+        self.db_path = db_path
+
+        self._lock = threading.Lock()
+        self._rate = min(max(rate, min_rate), max_rate)
+        self._tokens = self.burst
+        self._ultimo = time.monotonic()
+        self._ultima_reduccion = 0.0
+        self._eventos = deque(maxlen=max_eventos)
+        self._contadores = {
+            "solicitudes": 0, "exitos": 0, "fallas": 0, "reducciones": 0,
+            "espera_total": 0.0,
+        }
+
+        if db_path:
+            directorio = os.path.dirname(db_path)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            with self._estado() as estado:
+                pass
+            self._rate = estado["rate"]
+
+    @contextlib.contextmanager
+    def _estado(self):
+        """
+        Bloquea y entrega el estado del bucket; lo guarda al salir.
+
+        En memoria usa un lock; con ``db_path``, una transacción
+        ``BEGIN IMMEDIATE`` sobre la fila del estado. Con SQLite se usa el
+        reloj de pared, que comparten todos los procesos.
+        """
+        with self._lock:
+            if not self.db_path:
+                estado = {
+                    "rate": self._rate, "tokens": self._tokens,
+                    "ultimo": self._ultimo,
+                    "ultima_reduccion": self._ultima_reduccion,
+                    "ahora": time.monotonic(),
+                }
+                yield estado
+                self._rate = estado["rate"]
+                self._tokens = estado["tokens"]
+                self._ultimo = estado["ultimo"]
+                self._ultima_reduccion = estado["ultima_reduccion"]
+                return
+
+            conn = sqlite3.connect(
+                self.db_path, timeout=60, isolation_level=None
+            )
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(_SCHEMA)
+                ahora = time.time()
+                fila = conn.execute(
+                    "SELECT rate, tokens, ultimo, ultima_reduccion "
+                    "FROM limitador WHERE id = 1"
+                ).fetchone()
+                if fila is None:
+                    fila = (self._rate, self.burst, ahora, 0.0)
+                estado = dict(
+                    zip(["rate", "tokens", "ultimo", "ultima_reduccion"],
+                        fila),
+                    ahora=ahora,
+                )
+                try:
+                    yield estado
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute(
+                    "INSERT OR REPLACE INTO limitador "
+                    "VALUES (1, ?, ?, ?, ?)",
+                    (estado["rate"], estado["tokens"], estado["ultimo"],
+                     estado["ultima_reduccion"]),
+                )
+                conn.execute("COMMIT")
+            finally:
+                conn.close()
+
+    @property
+    def rate(self):
+        """Tasa actual, en solicitudes por segundo."""
+        if self.db_path:
+            with self._estado() as estado:
+                self._rate = estado["rate"]
+        return self._rate
+
+    def _intentar(self):
+        """
+        Toma un token si hay uno disponible.
+
+        Returns:
+            float: 0 si se tomó el token; si no, los segundos que faltan
+            para el próximo a la tasa actual.
+        """
+        with self._estado() as estado:
+            transcurrido = max(0.0, estado["ahora"] - estado["ultimo"])
+            tokens = min(
+                self.burst, estado["tokens"] + transcurrido * estado["rate"]
+            )
+            estado["ultimo"] = estado["ahora"]
+            if tokens >= 1:
+                estado["tokens"] = tokens - 1
+                return 0.0
+            estado["tokens"] = tokens
+            return (1 - tokens) / estado["rate"]
+
+    def _contar(self, inicio):
+        """Suma una solicitud y su espera a los contadores."""
+        espera = time.monotonic() - inicio
+        with self._lock:
+            self._contadores["solicitudes"] += 1
+            self._contadores["espera_total"] += espera
+        return espera
+
+    def adquirir(self):
+        """
+        Espera hasta que la tasa permita enviar una solicitud.
+
+        La espera se recalcula después de cada pausa, así que un cambio de
+        tasa (propio o de otro proceso) rige también para quien ya espera.
+
+        Returns:
+            float: Segundos esperados.
+        """
+        inicio = time.monotonic()
+        while True:
+            espera = self._intentar()
+            if espera == 0:
+                return self._contar(inicio)
+            time.sleep(espera)
+
+    async def adquirir_async(self):
+        """Versión awaitable de :meth:`adquirir`."""
+        import asyncio
+
+        inicio = time.monotonic()
+        while True:
+            espera = self._intentar()
+            if espera == 0:
+                return self._contar(inicio)
+            await asyncio.sleep(espera)
+
+    def exito(self, latencia=None):
+        """
+        Registra una solicitud exitosa.
+
+        Si la latencia supera ``latencia_objetivo`` cuenta como señal de
+        sobrecarga; si no, la tasa aumenta en ``aumento``.
+
+        Args:
+            latencia (float, optional): Duración de la solicitud, en
+                segundos.
+
+        Returns:
+            float: Tasa resultante.
+        """
+        if (self.latencia_objetivo is not None and latencia is not None
+                and latencia > self.latencia_objetivo):
+            with self._lock:
+                self._contadores["exitos"] += 1
+            return self._reducir(f"latencia {latencia:.2f} s")
+        with self._estado() as estado:
+            estado["rate"] = min(self.max_rate, estado["rate"] + self.aumento)
+            rate = estado["rate"]
+        with self._lock:
+            self._contadores["exitos"] += 1
+        return rate
+
+    def falla(self, motivo="error"):
+        """
+        Registra una señal de sobrecarga (timeout o página de error).
+
+        Args:
+            motivo (str): Descripción de la señal, para las métricas.
+
+        Returns:
+            float: Tasa resultante.
+        """
+        with self._lock:
+            self._contadores["fallas"] += 1
+        return self._reducir(motivo)
+
+    def _reducir(self, motivo):
+        """Reduce la tasa salvo que ya se redujo en esta ventana."""
+        with self._estado() as estado:
+            rate = estado["rate"]
+            ventana = self.enfriamiento
+            if ventana is None:
+                ventana = 1.0 / rate
+            if estado["ahora"] - estado["ultima_reduccion"] < ventana:
+                return rate
+            estado["rate"] = max(self.min_rate, rate * self.factor)
+            estado["ultima_reduccion"] = estado["ahora"]
+            # Vaciar el bucket para que la nueva tasa rija de inmediato
+            estado["tokens"] = min(estado["tokens"], 0.0)
+            estado["ultimo"] = max(estado["ultimo"], estado["ahora"])
+            nueva = estado["rate"]
+        with self._lock:
+            self._contadores["reducciones"] += 1
+            self._eventos.append({
+                "tiempo": time.time(), "motivo": motivo,
+                "rate_anterior": rate, "rate": nueva,
+            })
+        return nueva
+
+    def metricas(self):
+        """
+        Retorna la tasa actual y los contadores del limitador.
+
+        Los contadores y eventos son los de este proceso; la tasa es la
+        compartida.
+
+        Returns:
+            dict: rate, solicitudes, exitos, fallas, reducciones,
+            espera_total (s) y los últimos eventos de reducción.
+        """
+        rate = self.rate
+        with self._lock:
+            return {
+                "rate": rate,
+                **self._contadores,
+                "eventos": list(self._eventos),
+            }
@@ -0,0 +1,460 @@
+"""
+Tabla compacta de pronósticos de muchas ciudades y capturas.
+
+``WeatherScraper.run`` retorna un DataFrame pequeño con columnas de texto
+(Día, Fecha, Temperatura, Viento), y las ejecuciones de varias ciudades
+terminan como un diccionario de DataFrames. ``ForecastTable`` reúne todas
+las capturas en formato largo con tipos numéricos:
+
+- Una tabla de capturas (ciudad como código int32, hora de captura
+  ``datetime64[s]`` y posición de sus filas).
+- Una fila por día pronosticado, contigua dentro de su captura: horizonte
+  en días (int8, la fecha es la de la captura más el horizonte), t_max,
+  t_min y viento en float16 (exactos para los enteros que muestra el
+  sitio) y la dirección del viento como código int8. Son 8 bytes por fila.
+
+Las columnas son arreglos de numpy con capacidad reservada que se duplica
+al llenarse, así que agregar una captura escribe en su lugar en vez de
+repetir ``pd.concat``. Un año de capturas horarias de 1.000 ciudades
+(~61 millones de filas) ocupa unos 0,7 GB; al duplicarse la capacidad se
+necesita temporalmente el doble, lo que se evita reservando ``capacidad``
+desde el inicio.
+
+Uso:
+    tabla = ForecastTable()
+    tabla.agregar(df, "Santiago")
+    tabla.ciudad("santiago")          # DataFrame de una ciudad
+    tabla.to_frame()                  # todas las filas, ciudad categórica
+"""
+
+import re
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from .analytics import (
+    MESES,
+    PATRON_FECHA,
+    PATRON_TEMPERATURA,
+    PATRON_VIENTO,
+    cargar_historial,
+)
+from .cities import limpiar, normalizar
+
+
+_TEMPERATURA = re.compile(PATRON_TEMPERATURA)
+_VIENTO = re.compile(PATRON_VIENTO)
+_FECHA = re.compile(PATRON_FECHA)
+
+
+def _numero(texto):
+    """Número con coma o punto decimal."""
+    return float(texto.replace(",", "."))
+
+
+def _horizonte(texto, capturado):
+    """
+    Días entre la captura y una fecha como "18 Ene"; -1 si no se reconoce.
+
+    Sigue la regla de ``analytics._fechas_pronostico``: la fecha toma el
+    año de la captura, o el siguiente si queda más de 31 días antes.
+    """
+    partes = _FECHA.search(texto)
+    if partes is None:
+        return -1
+    mes = MESES.get(partes[2].lower(), 0)
+    try:
+        fecha = date(capturado.year, mes, int(partes[1]))
+    except ValueError:
+        return -1
+    if (capturado - fecha).days > 31:
+        fecha = (pd.Timestamp(fecha) + pd.DateOffset(years=1)).date()
+    dias = (fecha - capturado).days
+    return dias if 0 <= dias <= np.iinfo(np.int8).max else -1
+
+
+class _Categorias:
+    """Diccionario de valores de texto a códigos enteros."""
+
+    def __init__(self, normalizar_clave=None):
+        self.valores = []
+        self._codigos = {}
+        self._clave = normalizar_clave or (lambda valor: valor)
+
+    def __len__(self):
+        return len(self.valores)
+
+    def codigo(self, valor, crear=True):
+        """Código de un valor; -1 si no existe y ``crear`` es False."""
+        clave = self._clave(valor)
+        codigo = self._codigos.get(clave)
+        if codigo is None:
+            if not crear:
+                return -1
+            codigo = self._codigos[clave] = len(self.valores)
+            self.valores.append(valor)
+        return codigo
+
+    def mapear(self, categorias):
+        """Códigos de un arreglo de categorías (para los códigos de pandas)."""
+        return np.array(
+            [self.codigo(c) for c in categorias], dtype=np.int32
+        )
+
+
+class ForecastTable:
+    """
+    Pronósticos de muchas ciudades y capturas en columnas numéricas.
+
+    Atributos:
+        capturas (int): Capturas (ciudad y hora) almacenadas.
+        filas (int): Días pronosticados almacenados.
+    """
+
+    # Columnas por fila y por captura, con su tipo
+    _CAMPOS_FILA = {
+        "horizonte": np.int8, "t_max": np.float16, "t_min": np.float16,
+        "viento_kmh": np.float16, "viento_dir": np.int8,
+    }
+    _CAMPOS_CAPTURA = {
+        "ciudad": np.int32, "scraped_at": "datetime64[s]",
+        "inicio": np.int64, "largo": np.uint8,
+    }
+
+    def __init__(self, capacidad=1024):
+        """
+        Crea una tabla vacía.
+
+        Args:
+            capacidad (int): Filas reservadas inicialmente (las capturas
+                reservan una séptima parte); crece sola.
+        """
+        self.capturas = 0
+        self.filas = 0
+        self._ciudades = _Categorias(normalizar)
+        self._direcciones = _Categorias()
+        self._fila = {
+            campo: np.zeros(capacidad, dtype=tipo)
+            for campo, tipo in self._CAMPOS_FILA.items()
+        }
+        capacidad_capturas = max(16, capacidad // 7)
+        self._captura = {
+            campo: np.zeros(capacidad_capturas, dtype=tipo)
+            for campo, tipo in self._CAMPOS_CAPTURA.items()
+        }
+
+    def __len__(self):
+        return self.filas
+
+    def __repr__(self):
+        return (
+            f"ForecastTable({len(self._ciudades)} ciudades, "
+            f"{self.capturas} capturas, {self.filas} filas, "
+            f"{self.nbytes / 1e6:.1f} MB)"
+        )
+
+    @property
+    def ciudades(self):
+        """Nombres de las ciudades, en orden de llegada."""
+        return list(self._ciudades.valores)
+
+    @property
+    def nbytes(self):
+        """Bytes ocupados por las filas y capturas usadas."""
+        filas = sum(a.itemsize for a in self._fila.values()) * self.filas
+        capturas = sum(
+            a.itemsize for a in self._captura.values()
+        ) * self.capturas
+        return filas + capturas
+
+    @staticmethod
+    def _reservar(columnas, usados, n):
+        """Duplica la capacidad de las columnas si no caben ``n`` más."""
+        necesarios = usados + n
+        actual = len(next(iter(columnas.values())))
+        if necesarios <= actual:
+            return
+        capacidad = max(2 * actual, necesarios)
+        for campo, arreglo in columnas.items():
+            nuevo = np.zeros(capacidad, dtype=arreglo.dtype)
+            nuevo[:usados] = arreglo[:usados]
+            columnas[campo] = nuevo
+
+    def extender(self, historial):
+        """
+        Agrega muchas capturas ya compactadas, de una sola vez.
+
+        Args:
+            historial (pd.DataFrame): Historial compacto (ver
+                ``analytics.compactar`` o ``analytics.cargar_historial``).
+
+        Returns:
+            int: Capturas agregadas.
+        """
+        if historial.empty:
+            return 0
+        datos = historial.sort_values(
+            ["scraped_at", "ciudad", "posicion"], kind="stable"
+        )
+        ciudad = datos["ciudad"].cat
+        ciudades = self._ciudades.mapear(ciudad.categories)[
+            ciudad.codes.to_numpy()
+        ]
+        scraped = datos["scraped_at"].to_numpy().astype("datetime64[s]")
+
+        # Una captura por cada cambio de ciudad u hora de captura
+        nueva = np.ones(len(datos), dtype=bool)
+        nueva[1:] = (ciudades[1:] != ciudades[:-1]) \
+            | (scraped[1:] != scraped[:-1])
+        inicios = np.flatnonzero(nueva)
+        largos = np.diff(np.append(inicios, len(datos)))
+        if largos.max() > np.iinfo(np.uint8).max:
+            raise ValueError("Una captura no puede tener más de 255 días.")
+
+        direccion = datos["viento_dir"].cat
+        codigos = np.append(
+            self._direcciones.mapear(direccion.categories), -1
+        ).astype(np.int8)
+        # Los nulos (código -1 de pandas) toman el último elemento: -1
+        direcciones = codigos[direccion.codes.to_numpy()]
+
+        n = len(datos)
+        self._reservar(self._fila, self.filas, n)
+        fin = self.filas + n
+        # Horizontes fuera de int8 solo vienen de fechas mal leídas
+        horizonte = datos["horizonte"].to_numpy()
+        self._fila["horizonte"][self.filas:fin] = np.where(
+            (horizonte >= 0) & (horizonte <= np.iinfo(np.int8).max),
+            horizonte, -1,
+        )
+        for campo in ("t_max", "t_min", "viento_kmh"):
+            self._fila[campo][self.filas:fin] = datos[campo]
+        self._fila["viento_dir"][self.filas:fin] = direcciones
+
+        k = len(inicios)
+        self._reservar(self._captura, self.capturas, k)
+        fin_capturas = self.capturas + k
+        captura = slice(self.capturas, fin_capturas)
+        self._captura["ciudad"][captura] = ciudades[inicios]
+        self._captura["scraped_at"][captura] = scraped[inicios]
+        self._captura["inicio"][captura] = self.filas + inicios
+        self._captura["largo"][captura] = largos
+
+        self.filas = fin
+        self.capturas = fin_capturas
+        return k
+
+    def agregar(self, df, ciudad, scraped_at=None):
+        """
+        Agrega el resultado de ``WeatherScraper.run`` para una ciudad.
+
+        Los textos de la captura se interpretan fila a fila y se escriben
+        directamente en las columnas reservadas, sin pasar por pandas, de
+        modo que agregar capturas una a una durante una ingesta continua
+        cuesta microsegundos. Para cargas masivas conviene
+        :meth:`extender` o :meth:`desde_historial`, que interpretan cada
+        texto distinto una sola vez.
+
+        Args:
+            df (pd.DataFrame): Columnas Día, Fecha, Temperatura y Viento.
+            ciudad (str): Nombre de la ciudad.
+            scraped_at (datetime or str, optional): Hora de la captura; por
+                defecto, ahora.
+
+        Returns:
+            int: Filas agregadas.
+
+        Raises:
+            ValueError: Si la captura tiene más de 255 días.
+        """
+        if df is None or df.empty:
+            return 0
+        n = len(df)
+        if n > np.iinfo(np.uint8).max:
+            raise ValueError("Una captura no puede tener más de 255 días.")
+        scraped = pd.Timestamp(
+            scraped_at if scraped_at is not None else pd.Timestamp.now()
+        )
+        capturado = scraped.date()
+
+        self._reservar(self._fila, self.filas, n)
+        fila = self._fila
+        for i, (fecha, temperatura, viento) in enumerate(zip(
+            df["Fecha"].tolist(), df["Temperatura"].tolist(),
+            df["Viento"].tolist(),
+        ), start=self.filas):
+            fecha = fecha if isinstance(fecha, str) else ""
+            fila["horizonte"][i] = _horizonte(fecha, capturado)
+
+            partes = _TEMPERATURA.search(
+                temperatura if isinstance(temperatura, str) else ""
+            )
+            fila["t_max"][i] = np.nan if partes is None \
+                else _numero(partes[1])
+            fila["t_min"][i] = np.nan if partes is None \
+                else _numero(partes[2])
+
+            partes = _VIENTO.search(viento if isinstance(viento, str) else "")
+            fila["viento_kmh"][i] = np.nan if partes is None \
+                else _numero(partes[1])
+            direccion = "" if partes is None else partes[2].upper()
+            fila["viento_dir"][i] = self._direcciones.codigo(direccion) \
+                if direccion else -1
+
+        self._reservar(self._captura, self.capturas, 1)
+        captura = self._captura
+        captura["ciudad"][self.capturas] = self._ciudades.codigo(
+            limpiar(ciudad)
+        )
+        captura["scraped_at"][self.capturas] = np.datetime64(
+            scraped.to_datetime64(), "s"
+        )
+        captura["inicio"][self.capturas] = self.filas
+        captura["largo"][self.capturas] = n
+
+        self.filas += n
+        self.capturas += 1
+        return n
+
+    @classmethod
+    def desde_resultados(cls, resultados, scraped_at=None):
+        """
+        Crea una tabla a partir de un diccionario ciudad -> DataFrame.
+
+        Args:
+            resultados (dict): Resultados de varias ciudades (los None se
+                omiten), como los de ``AsyncWeatherScraper.run_many``.
+            scraped_at (datetime or str, optional): Hora de las capturas.
+
+        Returns:
+            ForecastTable: Tabla con una captura por ciudad.
+        """
+        tabla = cls()
+        for ciudad, df in resultados.items():
+            tabla.agregar(df, ciudad, scraped_at)
+        return tabla
+
+    @classmethod
+    def desde_historial(cls, output_dir=None, chunksize=500_000):
+        """
+        Crea una tabla con el historial de capturas (``historial.csv``).
+
+        Args:
+            output_dir (str, optional): Directorio de salida del scraper.
+            chunksize (int): Filas por bloque de lectura.
+
+        Returns:
+            ForecastTable: Tabla con todas las capturas del historial.
+        """
+        historial = cargar_historial(output_dir, chunksize=chunksize)
+        tabla = cls(capacidad=max(len(historial), 1024))
+        tabla.extender(historial)
+        return tabla
+
+    def _filas_de(self, capturas):
+        """Índices de las filas de un conjunto de capturas."""
+        inicios = self._captura["inicio"][capturas]
+        largos = self._captura["largo"][capturas].astype(np.int64)
+        total = int(largos.sum())
+        # Desplazamiento de cada fila dentro de su captura
+        desplazamiento = np.arange(total) - np.repeat(
+            np.cumsum(largos) - largos, largos
+        )
+        return np.repeat(inicios, largos) + desplazamiento
+
+    def _frame(self, capturas, ciudad=True):
+        """DataFrame largo con las filas de las capturas indicadas."""
+        filas = self._filas_de(capturas)
+        largos = self._captura["largo"][capturas]
+        scraped = np.repeat(self._captura["scraped_at"][capturas], largos)
+        horizonte = self._fila["horizonte"][filas]
+        fecha = scraped.astype("datetime64[D]") + horizonte.astype(
+            "timedelta64[D]"
+        )
+        fecha[horizonte < 0] = np.datetime64("NaT")
+
+        columnas = {}
+        if ciudad:
+            columnas["ciudad"] = pd.Categorical.from_codes(
+                np.repeat(self._captura["ciudad"][capturas], largos),
+                self._ciudades.valores,
+            )
+        columnas.update({
+            "scraped_at": scraped,
+            "fecha": fecha,
+            "horizonte": horizonte,
+            "t_max": self._fila["t_max"][filas].astype(np.float32),
+            "t_min": self._fila["t_min"][filas].astype(np.float32),
+            "viento_kmh": self._fila["viento_kmh"][filas].astype(np.float32),
+            "viento_dir": pd.Categorical.from_codes(
+                self._fila["viento_dir"][filas], self._direcciones.valores
+            ),
+        })
+        return pd.DataFrame(columnas)
+
+    def capturas_de(self, ciudad):
+        """
+        Índices de las capturas de una ciudad, en orden de llegada.
+
+        Args:
+            ciudad (str): Nombre (se compara la clave normalizada).
+
+        Returns:
+            np.ndarray: Índices en la tabla de capturas.
+        """
+        codigo = self._ciudades.codigo(ciudad, crear=False)
+        if codigo < 0:
+            return np.array([], dtype=np.int64)
+        return np.flatnonzero(
+            self._captura["ciudad"][:self.capturas] == codigo
+        )
+
+    def ciudad(self, ciudad, desde=None, hasta=None):
+        """
+        Pronósticos de una ciudad.
+
+        Args:
+            ciudad (str): Nombre ('vina del mar' equivale a 'Viña del Mar').
+            desde (datetime or str, optional): Primera hora de captura.
+            hasta (datetime or str, optional): Última hora de captura.
+
+        Returns:
+            pd.DataFrame: scraped_at, fecha, horizonte, t_max, t_min,
+            viento_kmh y viento_dir; vacío si la ciudad no existe.
+        """
+        capturas = self.capturas_de(ciudad)
+        scraped = self._captura["scraped_at"][capturas]
+        if desde is not None:
+            capturas = capturas[scraped >= np.datetime64(pd.Timestamp(desde))]
+            scraped = self._captura["scraped_at"][capturas]
+        if hasta is not None:
+            capturas = capturas[scraped <= np.datetime64(pd.Timestamp(hasta))]
+        return self._frame(capturas, ciudad=False)
+
+    def ultima(self, ciudad):
+        """
+        Última captura de una ciudad.
+
+        Args:
+            ciudad (str): Nombre de la ciudad.
+
+        Returns:
+            pd.DataFrame: Filas de la captura más reciente (vacío si la
+            ciudad no existe).
+        """
+        capturas = self.capturas_de(ciudad)
+        if len(capturas):
+            scraped = self._captura["scraped_at"][capturas]
+            capturas = capturas[[np.argmax(scraped)]]
+        return self._frame(capturas, ciudad=False)
+
+    def to_frame(self):
+        """
+        Todas las filas en un DataFrame largo.
+
+        Returns:
+            pd.DataFrame: ciudad (categórica) más las columnas de
+            :meth:`ciudad`, con temperaturas y viento en float32.
+        """
+        return self._frame(np.arange(self.capturas))
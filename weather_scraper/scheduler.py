@@ -0,0 +1,462 @@
+"""
+Programador de actualizaciones periódicas del pronóstico por ciudad.
+
+``RefreshScheduler`` reemplaza los cron fijos por ciudad: cada ciudad tiene
+su intervalo de actualización y su prioridad, y un solo proceso de larga
+duración decide cuándo refrescarla.
+
+- Las ejecuciones se reparten con jitter (una fracción aleatoria del
+  intervalo), así que no coinciden todas en la misma hora.
+- Si el resultado guardado de una ciudad sigue fresco (por ejemplo, porque
+  otro proceso lo actualizó), se omite y se reprograma.
+- Las ciudades vencidas esperan en una cola ordenada por prioridad y se
+  entregan a un pool acotado de workers; la profundidad de esa cola y el
+  retraso (lag) respecto a la hora programada indican si faltan workers.
+
+El reloj es inyectable: con ``FakeClock`` el programador se prueba sin
+esperar tiempo real.
+
+Uso:
+    python -m weather_scraper.scheduler --config ciudades.json --workers 4
+
+    ciudades.json:
+    [{"ciudad": "Santiago", "intervalo": 1800, "prioridad": 10},
+     {"ciudad": "Arica", "intervalo": 21600}]
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from . import config
+from .cities import normalizar, slug
+from .scraper import WeatherScraper
+
+
+class SystemClock:
+    """Reloj del sistema."""
+
+    def time(self):
+        """Segundos desde la época."""
+        return time.time()
+
+    def sleep(self, segundos):
+        """Duerme ``segundos``."""
+        time.sleep(segundos)
+
+
+class FakeClock:
+    """
+    Reloj manual para pruebas: ``sleep`` avanza el tiempo sin esperar.
+
+    Atributos:
+        ahora (float): Hora actual simulada.
+    """
+
+    def __init__(self, inicio=0.0):
+        self.ahora = float(inicio)
+        self._lock = threading.Lock()
+
+    def time(self):
+        """Hora simulada."""
+        with self._lock:
+            return self.ahora
+
+    def sleep(self, segundos):
+        """Avanza la hora simulada."""
+        self.avanzar(segundos)
+
+    def avanzar(self, segundos):
+        """Avanza la hora simulada en ``segundos``."""
+        with self._lock:
+            self.ahora += max(0.0, segundos)
+
+
+class _EjecutorInmediato:
+    """Ejecutor que corre cada tarea en el mismo hilo (para pruebas)."""
+
+    def submit(self, funcion, *args):
+        funcion(*args)
+
+    def shutdown(self, wait=True):
+        pass
+
+
+class RefreshScheduler:
+    """
+    Programador de actualizaciones por ciudad con prioridades.
+
+    Atributos:
+        workers (int): Ciudades que se actualizan al mismo tiempo.
+        jitter (float): Fracción del intervalo usada para desfasar las
+            ejecuciones (0.1 = +-10 %).
+        frescura (float): Fracción del intervalo bajo la cual un resultado
+            guardado se considera fresco y la ejecución se omite.
+        reintento (float): Espera máxima antes de reintentar una ciudad
+            que falló, en segundos.
+        reloj: Objeto con ``time()`` y ``sleep()``.
+    """
+
+    def __init__(self, refrescar=None, workers=4, jitter=0.1, frescura=0.9,
+                 reintento=300.0, reloj=None, ultima_actualizacion=None,
+                 output_dir=None, perfil=None, limitador=None, seed=None,
+                 ejecutor=None):
+        """
+        Configura el programador (no lo inicia).
+
+        Args:
+            refrescar (callable, optional): Función que recibe una ciudad y
+                la actualiza, lanzando una excepción si falla. Por defecto,
+                ``WeatherScraper.scrape``.
+            workers (int): Tamaño del pool de workers.
+            jitter (float): Fracción del intervalo para el desfase
+                aleatorio, entre 0 y 1.
+            frescura (float): Fracción del intervalo bajo la cual se omite
+                una actualización.
+            reintento (float): Espera máxima tras una falla.
+            reloj (optional): Reloj con ``time()`` y ``sleep()``; por
+                defecto, el del sistema.
+            ultima_actualizacion (callable, optional): Función que recibe
+                una ciudad y retorna la hora de su último resultado guardado
+                (o None). Por defecto, la fecha de modificación del CSV en
+                ``output_dir``.
+            output_dir (str, optional): Directorio de salida.
+            perfil (str, optional): Perfil del navegador.
+            limitador (RateLimiter, optional): Limitador de tasa.
+            seed (int, optional): Semilla del jitter.
+            ejecutor (optional): Ejecutor con ``submit``; por defecto, un
+                ``ThreadPoolExecutor`` con ``workers`` hilos. Con
+                ``"inmediato"`` las tareas corren en el hilo que llama a
+                :meth:`paso`.
+
+        Raises:
+            ValueError: Si ``workers`` es menor que 1.
+        """
+        if workers < 1:
+            raise ValueError("workers debe ser al menos 1.")
+        self.output_dir = output_dir or config.OUTPUT_DIR
+        self.workers = workers
+        self.jitter = jitter
+        self.frescura = frescura
+        self.reintento = reintento
+        self.reloj = reloj or SystemClock()
+        self._refrescar = refrescar or (
+            lambda ciudad: WeatherScraper(
+                self.output_dir, perfil, limitador
+            ).scrape(ciudad)
+        )
+        self._ultima_actualizacion = (
+            ultima_actualizacion or self._mtime_resultado
+        )
+        self._rng = random.Random(seed)
+        if ejecutor == "inmediato":
+            ejecutor = _EjecutorInmediato()
+        self._ejecutor = ejecutor or ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="refresh"
+        )
+
+        self._lock = threading.Lock()
+        self._detener = threading.Event()
+        self._ciudades = {}
+        # (hora programada, orden, clave, versión)
+        self._agenda = []
+        # (-prioridad, hora programada, orden, clave, versión)
+        self._listas = []
+        self._orden = itertools.count()
+        self._en_curso = set()
+        self._lags = deque(maxlen=1000)
+        self._contadores = {
+            "ejecutadas": 0, "exitosas": 0, "fallidas": 0, "omitidas": 0,
+        }
+
+    def _mtime_resultado(self, ciudad):
+        """Hora de modificación del CSV de la ciudad, o None."""
+        ruta = os.path.join(self.output_dir, f"resultados_{slug(ciudad)}.csv")
+        try:
+            return os.path.getmtime(ruta)
+        except OSError:
+            return None
+
+    def _desfase(self, intervalo):
+        """Desfase aleatorio de +-``jitter`` del intervalo."""
+        return intervalo * self.jitter * self._rng.uniform(-1, 1)
+
+    def _agendar(self, clave, hora):
+        """Programa la próxima ejecución de una ciudad (lock tomado)."""
+        entrada = self._ciudades[clave]
+        entrada["version"] += 1
+        entrada["proximo"] = hora
+        heapq.heappush(
+            self._agenda,
+            (hora, next(self._orden), clave, entrada["version"]),
+        )
+
+    def programar(self, ciudad, intervalo, prioridad=0, inicio=None):
+        """
+        Agrega o actualiza una ciudad en el programa.
+
+        La primera ejecución se ubica en un punto aleatorio dentro de
+        ``jitter`` del intervalo (o en ``inicio``), para que las ciudades
+        agregadas juntas no se ejecuten juntas.
+
+        Args:
+            ciudad (str): Nombre de la ciudad.
+            intervalo (float): Segundos entre actualizaciones.
+            prioridad (int): Mayor prioridad se atiende primero cuando hay
+                más ciudades vencidas que workers libres.
+            inicio (float, optional): Hora de la primera ejecución.
+
+        Raises:
+            ValueError: Si el intervalo no es positivo.
+        """
+        if intervalo <= 0:
+            raise ValueError("El intervalo debe ser positivo.")
+        clave = normalizar(ciudad)
+        ahora = self.reloj.time()
+        if inicio is None:
+            inicio = ahora + abs(self._desfase(intervalo))
+        with self._lock:
+            entrada = self._ciudades.setdefault(clave, {
+                "ciudad": " ".join(ciudad.split()), "version": 0,
+                "ultimo_exito": None, "ultimo_error": None,
+            })
+            entrada["intervalo"] = float(intervalo)
+            entrada["prioridad"] = prioridad
+            if clave not in self._en_curso:
+                self._agendar(clave, inicio)
+
+    def quitar(self, ciudad):
+        """Quita una ciudad del programa (si está en curso, termina)."""
+        with self._lock:
+            self._ciudades.pop(normalizar(ciudad), None)
+
+    def _vigente(self, clave, version):
+        """Indica si una entrada de la agenda sigue siendo válida."""
+        entrada = self._ciudades.get(clave)
+        return entrada is not None and entrada["version"] == version
+
+    def _fresca(self, entrada, ahora):
+        """Hora del resultado vigente de la ciudad, o None si no hay."""
+        ultimas = [entrada["ultimo_exito"]]
+        try:
+            ultimas.append(self._ultima_actualizacion(entrada["ciudad"]))
+        except Exception:
+            pass
+        ultimas = [t for t in ultimas if t is not None]
+        if not ultimas:
+            return None
+        ultima = max(ultimas)
+        if ahora - ultima < entrada["intervalo"] * self.frescura:
+            return ultima
+        return None
+
+    def paso(self):
+        """
+        Mueve las ciudades vencidas a la cola y despacha a los workers.
+
+        Returns:
+            float: Segundos hasta la próxima ciudad programada (None si no
+            hay ninguna).
+        """
+        ahora = self.reloj.time()
+        despachar = []
+        with self._lock:
+            while self._agenda and self._agenda[0][0] <= ahora:
+                hora, orden, clave, version = heapq.heappop(self._agenda)
+                if not self._vigente(clave, version):
+                    continue
+                entrada = self._ciudades[clave]
+                ultima = self._fresca(entrada, ahora)
+                if ultima is not None:
+                    # Otro proceso (o una ejecución manual) ya la actualizó
+                    self._contadores["omitidas"] += 1
+                    self._agendar(
+                        clave,
+                        ultima + entrada["intervalo"]
+                        + self._desfase(entrada["intervalo"]),
+                    )
+                    continue
+                heapq.heappush(self._listas, (
+                    -entrada["prioridad"], hora, orden, clave, version
+                ))
+
+            while self._listas and len(self._en_curso) < self.workers:
+                _, hora, _, clave, version = heapq.heappop(self._listas)
+                if not self._vigente(clave, version):
+                    continue
+                self._en_curso.add(clave)
+                self._lags.append(ahora - hora)
+                despachar.append((clave, self._ciudades[clave]["ciudad"]))
+
+            siguiente = self._agenda[0][0] - ahora if self._agenda else None
+
+        for clave, ciudad in despachar:
+            self._ejecutor.submit(self._ejecutar, clave, ciudad)
+        return siguiente
+
+    def _ejecutar(self, clave, ciudad):
+        """Actualiza una ciudad y la reprograma según el resultado."""
+        error = None
+        try:
+            self._refrescar(ciudad)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        fin = self.reloj.time()
+        with self._lock:
+            self._en_curso.discard(clave)
+            self._contadores["ejecutadas"] += 1
+            entrada = self._ciudades.get(clave)
+            if entrada is None:
+                return
+            intervalo = entrada["intervalo"]
+            if error is None:
+                self._contadores["exitosas"] += 1
+                entrada["ultimo_exito"] = fin
+                entrada["ultimo_error"] = None
+                self._agendar(clave, fin + intervalo + self._desfase(intervalo))
+            else:
+                self._contadores["fallidas"] += 1
+                entrada["ultimo_error"] = error
+                espera = min(intervalo, self.reintento)
+                self._agendar(clave, fin + espera * self._rng.uniform(0.5, 1))
+
+    def metricas(self):
+        """
+        Estado de la cola y retraso de las ejecuciones.
+
+        Returns:
+            dict: ciudades programadas, profundidad (vencidas esperando un
+            worker), en_curso, lag_actual (segundos que lleva esperando la
+            vencida más antigua), lag_p50 y lag_p95 de los despachos
+            recientes, y los contadores de ejecutadas, exitosas, fallidas
+            y omitidas por estar frescas.
+        """
+        ahora = self.reloj.time()
+        with self._lock:
+            vencidas = [
+                ahora - hora for _, hora, _, clave, version in self._listas
+                if self._vigente(clave, version)
+            ]
+            lags = list(self._lags)
+            return {
+                "ciudades": len(self._ciudades),
+                "profundidad": len(vencidas),
+                "en_curso": len(self._en_curso),
+                "lag_actual": max(vencidas, default=0.0),
+                "lag_p50": float(np.median(lags)) if lags else 0.0,
+                "lag_p95": float(np.percentile(lags, 95)) if lags else 0.0,
+                **self._contadores,
+            }
+
+    def detalle(self):
+        """
+        Lista las ciudades con su próxima ejecución y último resultado.
+
+        Returns:
+            list: Diccionarios ordenados por próxima ejecución.
+        """
+        with self._lock:
+            filas = [
+                {
+                    "ciudad": entrada["ciudad"],
+                    "intervalo": entrada["intervalo"],
+                    "prioridad": entrada["prioridad"],
+                    "proximo": entrada["proximo"],
+                    "en_curso": clave in self._en_curso,
+                    "ultimo_exito": entrada["ultimo_exito"],
+                    "ultimo_error": entrada["ultimo_error"],
+                }
+                for clave, entrada in self._ciudades.items()
+            ]
+        return sorted(filas, key=lambda fila: fila["proximo"])
+
+    def run(self, duracion=None, max_espera=1.0):
+        """
+        Ejecuta el programa hasta ``detener`` o hasta cumplir la duración.
+
+        Args:
+            duracion (float, optional): Segundos a ejecutar; por defecto,
+                indefinidamente.
+            max_espera (float): Máximo de segundos entre revisiones (para
+                atender a tiempo a los workers que terminan).
+        """
+        fin = None if duracion is None else self.reloj.time() + duracion
+        self._detener.clear()
+        while not self._detener.is_set():
+            siguiente = self.paso()
+            ahora = self.reloj.time()
+            if fin is not None and ahora >= fin:
+                break
+            espera = max_espera if siguiente is None else min(
+                max(siguiente, 0.0), max_espera
+            )
+            if fin is not None:
+                espera = min(espera, fin - ahora)
+            self.reloj.sleep(espera)
+
+    def detener(self):
+        """Pide terminar :meth:`run` (desde otro hilo o una señal)."""
+        self._detener.set()
+
+    def close(self):
+        """Detiene el programa y espera a los workers en curso."""
+        self.detener()
+        self._ejecutor.shutdown(wait=True)
+
+
+def main():
+    """Ejecuta el programador desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--config", required=True,
+        help="JSON con ciudad, intervalo (s) y prioridad opcional.",
+    )
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--perfil", help="Perfil del navegador.")
+    parser.add_argument("--output-dir", help="Directorio de salida.")
+    parser.add_argument(
+        "--report-every", type=float, default=60.0,
+        help="Segundos entre reportes de métricas.",
+    )
+    args = parser.parse_args()
+
+    with open(args.config, encoding="utf-8") as f:
+        ciudades = json.load(f)
+
+    scheduler = RefreshScheduler(
+        workers=args.workers, jitter=args.jitter,
+        output_dir=args.output_dir, perfil=args.perfil,
+    )
+    for item in ciudades:
+        scheduler.programar(
+            item["ciudad"], item["intervalo"], item.get("prioridad", 0)
+        )
+    print(f"Programando {len(ciudades)} ciudades con {args.workers} workers "
+          f"(Ctrl+C para detener)")
+
+    try:
+        while True:
+            scheduler.run(duracion=args.report_every)
+            m = scheduler.metricas()
+            print(f"[{time.strftime('%H:%M:%S')}] cola={m['profundidad']} "
+                  f"en_curso={m['en_curso']} lag={m['lag_actual']:.0f}s "
+                  f"p95={m['lag_p95']:.0f}s ok={m['exitosas']} "
+                  f"fallas={m['fallidas']} omitidas={m['omitidas']}")
+    except KeyboardInterrupt:
+        print("\nDeteniendo programador...")
+    finally:
+        scheduler.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,10 @@ del sitio web Meteored.
 """
 
 import os
+import threading
 import time
+from datetime import datetime
+
 import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -16,6 +19,146 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 
 from . import config
+from .cities import limpiar, slug
+
+
+# Columnas del historial de capturas (ver registrar_historial)
+HISTORY_COLUMNS = [
+    "ciudad", "scraped_at", "posicion", "dia", "fecha", "temperatura",
+    "viento",
+]
+
+_historial_lock = threading.Lock()
+
+
+def parsear_pronostico(texto):
+    """
+    Convierte el texto del bloque ``dias_w`` en un DataFrame.
+
+    El bloque tiene cuatro líneas por día (día, fecha, temperatura y
+    viento); un bloque final incompleto se descarta.
+
+    Args:
+        texto (str): Texto visible del bloque de pronóstico.
+
+    Returns:
+        pd.DataFrame: Columnas Día, Fecha, Temperatura y Viento.
+    """
+    lineas = texto.split("\n")
+    dias, fechas, temperaturas, vientos = [], [], [], []
+
+    # Procesar bloques de 4 líneas
+    for i in range(0, len(lineas), 4):
+        if i + 3 < len(lineas):
+            dias.append(lineas[i])
+            fechas.append(lineas[i + 1])
+            temperaturas.append(lineas[i + 2])
+            vientos.append(lineas[i + 3])
+
+    return pd.DataFrame({
+        "Día": dias,
+        "Fecha": fechas,
+        "Temperatura": temperaturas,
+        "Viento": vientos
+    })
+
+
+def guardar_pronostico(df, ciudad, output_dir):
+    """
+    Guarda el pronóstico de una ciudad en archivos CSV y Excel.
+
+    Cada archivo se escribe primero en un temporal del mismo directorio
+    y luego se reemplaza de forma atómica, de modo que una interrupción
+    nunca deja un archivo a medio escribir y repetir la ciudad solo
+    sobrescribe el resultado anterior. La captura se agrega además al
+    historial (ver :func:`registrar_historial`).
+
+    Args:
+        df (pd.DataFrame): DataFrame con los datos a guardar.
+        ciudad (str): Nombre de la ciudad (usado para el nombre del archivo).
+        output_dir (str): Directorio de salida.
+
+    Returns:
+        list: Rutas de los archivos guardados (incluido el historial).
+    """
+    # Nombre de archivo sin tildes, mayúsculas ni espacios repetidos, para
+    # que las variantes de una misma ciudad escriban el mismo archivo
+    ciudad_limpia = slug(ciudad)
+
+    archivo_csv = os.path.join(output_dir, f"resultados_{ciudad_limpia}.csv")
+    archivo_excel = os.path.join(
+        output_dir, f"resultados_{ciudad_limpia}.xlsx"
+    )
+
+    escritores = [
+        (archivo_csv, lambda ruta: df.to_csv(
+            ruta, index=False, encoding="utf-8-sig"
+        )),
+        (archivo_excel, lambda ruta: df.to_excel(
+            ruta, index=False, engine="openpyxl"
+        )),
+    ]
+    try:
+        for archivo, escribir in escritores:
+            # El temporal conserva la extensión (to_excel la valida)
+            base, extension = os.path.splitext(archivo)
+            temporal = f"{base}.{os.getpid()}.tmp{extension}"
+            try:
+                escribir(temporal)
+                os.replace(temporal, archivo)
+            finally:
+                if os.path.exists(temporal):
+                    os.remove(temporal)
+            print(f"Datos guardados en: {archivo}")
+
+        historial = registrar_historial(df, ciudad, output_dir)
+
+    except Exception as e:
+        print(f"\nError al guardar los datos: {e}")
+        raise
+
+    return [archivo_csv, archivo_excel] + ([historial] if historial else [])
+
+
+def registrar_historial(df, ciudad, output_dir, scraped_at=None):
+    """
+    Agrega las filas de una captura al historial de ``output_dir``.
+
+    A diferencia de ``resultados_<ciudad>.csv``, que se reemplaza en cada
+    ejecución, el historial conserva todas las capturas para analizar
+    cómo cambian los pronósticos (ver ``analytics.py``). Cada captura se
+    escribe con una sola llamada en modo de agregado.
+
+    Args:
+        df (pd.DataFrame): Pronóstico con columnas Día, Fecha, Temperatura
+            y Viento.
+        ciudad (str): Nombre de la ciudad.
+        output_dir (str): Directorio de salida.
+        scraped_at (datetime, optional): Hora de la captura; por defecto,
+            ahora.
+
+    Returns:
+        str: Ruta del historial, o None si ``config.HISTORY_FILE`` es None.
+    """
+    if not config.HISTORY_FILE:
+        return None
+    ruta = os.path.join(output_dir, config.HISTORY_FILE)
+    scraped_at = (scraped_at or datetime.now()).isoformat(timespec="seconds")
+    filas = pd.DataFrame({
+        "ciudad": limpiar(ciudad),
+        "scraped_at": scraped_at,
+        "posicion": range(len(df)),
+        "dia": df["Día"].to_numpy(),
+        "fecha": df["Fecha"].to_numpy(),
+        "temperatura": df["Temperatura"].to_numpy(),
+        "viento": df["Viento"].to_numpy(),
+    }, columns=HISTORY_COLUMNS)
+    with _historial_lock:
+        nuevo = not os.path.exists(ruta)
+        texto = filas.to_csv(index=False, header=nuevo, lineterminator="\n")
+        with open(ruta, "a", encoding="utf-8", newline="") as f:
+            f.write(texto)
+    return ruta
 
 
 class WeatherScraper:
@@ -29,19 +172,45 @@ class WeatherScraper:
         driver: Instancia del WebDriver de Selenium.
         ciudad (str): Ciudad a buscar.
         output_dir (str): Directorio donde se guardan los archivos.
+        perfil (str): Perfil del navegador definido en ``config.PERFILES``.
+        limitador (RateLimiter): Limitador de tasa, o None.
+        guardar (bool): Si guarda los archivos de cada ciudad.
+        tiempos (dict): Duración en segundos de cada etapa de la última
+            ejecución ('driver', 'busqueda', 'espera', 'extraccion',
+            'guardado' y 'total'; 'limite' si hay limitador).
     """
 
-    def __init__(self, output_dir=None):
+    def __init__(self, output_dir=None, perfil=None, limitador=None,
+                 guardar=True):
         """
         Inicializa el WeatherScraper.
 
         Args:
             output_dir (str, optional): Directorio para guardar archivos.
                 Si es None, usa el definido en config.
+            perfil (str, optional): Perfil del navegador ('completo' o
+                'ligero'). Si es None, usa ``config.PERFIL``.
+            limitador (RateLimiter, optional): Limitador de tasa compartido
+                (ver ``rate_limit.py``); se consulta antes de cada búsqueda
+                y recibe el resultado de cada una.
+            guardar (bool): Si guarda los resultados en archivos (ver
+                :func:`guardar_pronostico`).
+
+        Raises:
+            ValueError: Si el perfil no existe en ``config.PERFILES``.
         """
         self.driver = None
         self.ciudad = None
         self.output_dir = output_dir or config.OUTPUT_DIR
+        self.perfil = perfil or config.PERFIL
+        if self.perfil not in config.PERFILES:
+            raise ValueError(
+                f"Perfil de navegador inválido: {self.perfil}. "
+                f"Usa uno de {', '.join(config.PERFILES)}."
+            )
+        self.limitador = limitador
+        self.guardar = guardar
+        self.tiempos = {}
         self._ensure_output_dir()
 
     def _ensure_output_dir(self):
@@ -51,7 +220,10 @@ class WeatherScraper:
 
     def _configurar_driver(self):
         """
-        Configura y retorna el WebDriver de Chrome.
+        Configura y retorna el WebDriver de Chrome según el perfil.
+
+        Con el perfil 'ligero', el navegador bloquea por CDP las
+        solicitudes de ``config.BLOCKED_URL_PATTERNS``.
 
         Returns:
             webdriver.Chrome: Instancia configurada del WebDriver.
@@ -60,10 +232,14 @@ class WeatherScraper:
             WebDriverException: Si no se puede inicializar el driver.
         """
         options = webdriver.ChromeOptions()
+        perfil = config.PERFILES[self.perfil]
 
-        # Agregar opciones desde config
-        for option in config.CHROME_OPTIONS:
+        # Agregar opciones del perfil desde config
+        for option in perfil["options"]:
             options.add_argument(option)
+        if perfil["prefs"]:
+            options.add_experimental_option("prefs", perfil["prefs"])
+        options.page_load_strategy = perfil["page_load_strategy"]
 
         try:
             # Intentar obtener la ruta del chromedriver
@@ -81,6 +257,13 @@ class WeatherScraper:
                 # Intentar sin especificar la ruta (usa PATH)
                 driver = webdriver.Chrome(options=options)
 
+            if perfil["blocked_urls"]:
+                # Bloquear recursos innecesarios antes de la primera carga
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd(
+                    "Network.setBlockedURLs", {"urls": perfil["blocked_urls"]}
+                )
+
             return driver
 
         except WebDriverException as e:
@@ -155,23 +338,7 @@ class WeatherScraper:
                 EC.presence_of_element_located((By.CLASS_NAME, "dias_w"))
             ).text
 
-            lineas = bloque_texto.split("\n")
-            dias, fechas, temperaturas, vientos = [], [], [], []
-
-            # Procesar bloques de 4 líneas
-            for i in range(0, len(lineas), 4):
-                if i + 3 < len(lineas):
-                    dias.append(lineas[i])
-                    fechas.append(lineas[i + 1])
-                    temperaturas.append(lineas[i + 2])
-                    vientos.append(lineas[i + 3])
-
-            df = pd.DataFrame({
-                "Día": dias,
-                "Fecha": fechas,
-                "Temperatura": temperaturas,
-                "Viento": vientos
-            })
+            df = parsear_pronostico(bloque_texto)
 
             print("\nDatos extraídos:")
             print(df)
@@ -189,68 +356,118 @@ class WeatherScraper:
         """
         Guarda el DataFrame en archivos CSV y Excel.
 
+        Ver :func:`guardar_pronostico`.
+
         Args:
             df (pd.DataFrame): DataFrame con los datos a guardar.
             ciudad (str): Nombre de la ciudad (usado para el nombre del archivo).
-        """
-        # Limpiar nombre de ciudad para usar en archivo
-        ciudad_limpia = ciudad.replace(" ", "_").lower()
-
-        archivo_csv = os.path.join(
-            self.output_dir,
-            f"resultados_{ciudad_limpia}.csv"
-        )
-        archivo_excel = os.path.join(
-            self.output_dir,
-            f"resultados_{ciudad_limpia}.xlsx"
-        )
 
-        try:
-            # Guardar CSV
-            df.to_csv(archivo_csv, index=False, encoding="utf-8-sig")
-            print(f"\nDatos guardados en: {archivo_csv}")
-
-            # Guardar Excel
-            df.to_excel(archivo_excel, index=False, engine="openpyxl")
-            print(f"Datos guardados en: {archivo_excel}")
+        Returns:
+            list: Rutas de los archivos guardados.
+        """
+        return guardar_pronostico(df, ciudad, self.output_dir)
 
-        except Exception as e:
-            print(f"\nError al guardar los datos: {e}")
-            raise
+    def close(self):
+        """Cierra el navegador si está abierto."""
+        if self.driver:
+            print("\nCerrando navegador...")
+            try:
+                self.driver.quit()
+            finally:
+                self.driver = None
 
-    def run(self, ciudad=None):
+    def scrape(self, ciudad):
         """
-        Ejecuta el flujo completo del scraper.
+        Extrae y guarda el pronóstico de una ciudad.
+
+        A diferencia de :meth:`run`, propaga los errores para que quien
+        llama decida si reintentar (ver ``batch.py``). El navegador se
+        cierra siempre al terminar.
 
         Args:
-            ciudad (str, optional): Ciudad a buscar. Si es None, solicita al usuario.
+            ciudad (str): Ciudad a buscar.
 
         Returns:
-            pd.DataFrame: DataFrame con los datos extraídos, o None si hay error.
+            pd.DataFrame: DataFrame con los datos extraídos.
+
+        Raises:
+            WebDriverException: Si falla el navegador.
+            TimeoutException: Si la página no carga a tiempo.
+            ValueError: Si la página no contiene pronósticos.
         """
+        self.tiempos = {}
+        inicio = time.perf_counter()
+        etapa = inicio
+
+        def medir(nombre):
+            nonlocal etapa
+            ahora = time.perf_counter()
+            self.tiempos[nombre] = ahora - etapa
+            etapa = ahora
+
+        self.ciudad = ciudad
         try:
             # Configurar driver
             print("Configurando navegador...")
             self.driver = self._configurar_driver()
+            medir("driver")
+
+            # Esperar turno según la tasa permitida por el sitio
+            if self.limitador is not None:
+                self.tiempos["limite"] = self.limitador.adquirir()
+                etapa = time.perf_counter()
+
+            try:
+                # Buscar ciudad
+                self._buscar_ciudad(ciudad)
+                medir("busqueda")
+
+                # Esperar carga de la página
+                time.sleep(config.PAGE_LOAD_WAIT)
+                medir("espera")
+
+                # Extraer información
+                df = self._extraer_informacion()
+                medir("extraccion")
+                if df.empty:
+                    raise ValueError(
+                        f"La página no contiene pronósticos para {ciudad}."
+                    )
+            except Exception as e:
+                # Timeouts y páginas sin pronóstico indican sobrecarga
+                if self.limitador is not None:
+                    self.limitador.falla(type(e).__name__)
+                raise
+            if self.limitador is not None:
+                self.limitador.exito(
+                    self.tiempos["busqueda"] + self.tiempos["extraccion"]
+                )
 
-            # Obtener ciudad si no se proporcionó
-            if ciudad is None:
-                ciudad = input("Ingresa el nombre de la ciudad a buscar: ")
-
-            self.ciudad = ciudad
-
-            # Buscar ciudad
-            self._buscar_ciudad(ciudad)
+            # Guardar datos
+            if self.guardar:
+                self._guardar_datos(df, ciudad)
+                medir("guardado")
+            return df
+        finally:
+            self.close()
+            self.tiempos["total"] = time.perf_counter() - inicio
 
-            # Esperar carga de la página
-            time.sleep(5)
+    def run(self, ciudad=None):
+        """
+        Ejecuta el flujo completo del scraper.
 
-            # Extraer información
-            df = self._extraer_informacion()
+        Args:
+            ciudad (str, optional): Ciudad a buscar. Si es None, solicita al usuario.
 
-            # Guardar datos
-            self._guardar_datos(df, ciudad)
+        Returns:
+            pd.DataFrame: DataFrame con los datos extraídos, o None si hay error.
+        """
+        # Obtener ciudad si no se proporcionó
+        if ciudad is None:
+            ciudad = input("Ingresa el nombre de la ciudad a buscar: ")
 
+        try:
+            df = self.scrape(ciudad)
             print("\nProceso completado exitosamente.")
             return df
 
@@ -263,10 +480,6 @@ class WeatherScraper:
         except Exception as e:
             print(f"\nSe produjo un error: {e}")
             return None
-        finally:
-            if self.driver:
-                print("\nCerrando navegador...")
-                self.driver.quit()
 
 
 def main():
@@ -0,0 +1,73 @@
+"""Pruebas de la normalización y el catálogo de ciudades."""
+
+import datetime
+
+import pytest
+
+from weather_scraper.cities import CityCatalog, deduplicar, normalizar, slug
+from weather_scraper.providers import formatear_pronostico
+from weather_scraper.results import ForecastTable
+
+
+def _pronostico(dias=3):
+    fechas = [datetime.date(2024, 6, 1) + datetime.timedelta(d)
+              for d in range(dias)]
+    return formatear_pronostico(
+        fechas, [15.0] * dias, [5.0] * dias, [10.0] * dias, [180.0] * dias
+    )
+
+
+@pytest.mark.parametrize("nombre, clave", [
+    ("Viña  del Mar", "vina del mar"),
+    ("Los Ángeles", "los angeles"),
+    ("Москва", "москва"),
+    ("東京", "東京"),
+    ("São_Paulo!", "sao paulo"),
+    ("!!!", "!!!"),
+])
+def test_normalizar(nombre, clave):
+    assert normalizar(nombre) == clave
+
+
+def test_nombres_no_latinos_no_se_mezclan():
+    assert deduplicar(["Москва", " москва", "東京", "Tokyo", "北京"]) == [
+        "Москва", "東京", "Tokyo", "北京"
+    ]
+    assert slug("Москва") == "москва"
+    assert slug("東京") != slug("北京")
+    assert slug("Nueva York") == "nueva_york"
+
+
+def test_forecast_table_con_nombres_no_latinos():
+    tabla = ForecastTable()
+    tabla.agregar(_pronostico(), "Москва", "2024-06-01 08:00")
+    tabla.agregar(_pronostico(), "東京", "2024-06-01 08:00")
+    tabla.agregar(_pronostico(), "москва", "2024-06-01 09:00")
+
+    assert len(tabla.ciudades) == 2
+    assert len(tabla.ciudad("МОСКВА")) == 6
+    assert len(tabla.ciudad("東京")) == 3
+
+
+def test_resolver_tolera_errores_de_tipeo():
+    catalogo = CityCatalog()
+    assert catalogo.resolver("valparaizo") == "Valparaíso"
+    assert catalogo.resolver("santigo") == "Santiago"
+    assert catalogo.resolver("CONCEPCION") == "Concepción"
+
+
+def test_resolver_rechaza_coincidencias_dudosas():
+    catalogo = CityCatalog()
+    # Ciudad fuera del catálogo con un nombre parecido a otra
+    assert catalogo.resolver("Villa Alegre") is None
+    # Empate entre varias ciudades
+    assert catalogo.resolver("Puerto") is None
+
+
+def test_deduplicar_con_catalogo_solo_une_coincidencias_claras():
+    catalogo = CityCatalog()
+    ciudades = ["Villa Alegre", "Villa Alemana", "vina del mar",
+                "Viña del Mar", "Москва"]
+    assert deduplicar(ciudades, catalogo) == [
+        "Villa Alegre", "Villa Alemana", "Viña del Mar", "Москва"
+    ]
@@ -0,0 +1,67 @@
+"""Pruebas de los proveedores de pronósticos y del hedging."""
+
+import datetime
+
+import pytest
+
+from weather_scraper.analytics import parsear_temperatura, parsear_viento
+from weather_scraper.providers import (
+    ForecastProvider,
+    HedgedFetcher,
+    SimulatedProvider,
+    formatear_pronostico,
+)
+
+
+def test_forecast_provider_is_abstract():
+    with pytest.raises(TypeError):
+        ForecastProvider()
+
+
+def test_formatear_pronostico_with_missing_values():
+    fechas = [datetime.date(2024, 1, 15), datetime.date(2024, 1, 16)]
+    df = formatear_pronostico(
+        fechas, [23.4, None], [14.0, float("nan")], [None, 15.2], [None, 45]
+    )
+
+    assert list(df["Día"]) == ["Lun", "Mar"]
+    assert list(df["Temperatura"]) == ["23° / 14°", "--° / --°"]
+    assert list(df["Viento"]) == ["-- km/h", "15 km/h NE"]
+    temperaturas = parsear_temperatura(df["Temperatura"])
+    assert temperaturas["t_max"].isna().tolist() == [False, True]
+    assert parsear_viento(df["Viento"])["viento_kmh"].isna().tolist() \
+        == [True, False]
+
+
+def test_hedged_fetcher_fails_over_on_errors():
+    caido = SimulatedProvider("caido", latencia=0.0, sigma=0, fallas=1.0)
+    sano = SimulatedProvider("sano", latencia=0.0, sigma=0)
+    with HedgedFetcher([caido, sano], retraso_inicial=5.0) as fetcher:
+        df = fetcher.obtener("Talca")
+
+    assert df.attrs["proveedor"] == "sano"
+    assert df.attrs["respaldos"] == 0
+    assert (caido.llamadas, sano.llamadas) == (1, 1)
+
+
+def test_hedged_fetcher_launches_backup_when_slow():
+    lento = SimulatedProvider("lento", latencia=1.0, sigma=0)
+    rapido = SimulatedProvider("rapido", latencia=0.0, sigma=0)
+    with HedgedFetcher([lento, rapido], retraso_inicial=0.02) as fetcher:
+        df = fetcher.obtener("Talca")
+
+    assert df.attrs["proveedor"] == "rapido"
+    assert df.attrs["respaldos"] == 1
+    assert df.attrs["latencia"] < 0.5
+
+
+def test_hedged_fetcher_raises_when_all_fail():
+    proveedores = [
+        SimulatedProvider(f"p{i}", latencia=0.0, sigma=0, fallas=1.0)
+        for i in range(2)
+    ]
+    with HedgedFetcher(proveedores) as fetcher:
+        with pytest.raises(RuntimeError) as info:
+            fetcher.obtener("Talca")
+
+    assert isinstance(info.value.__cause__, ConnectionError)
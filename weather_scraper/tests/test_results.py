@@ -0,0 +1,68 @@
+"""Pruebas de la tabla compacta de pronósticos (weather_scraper.results)."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from weather_scraper.analytics import compactar
+from weather_scraper.results import ForecastTable
+from weather_scraper.scraper import HISTORY_COLUMNS
+
+
+CAPTURA = pd.DataFrame({
+    "Día": ["Hoy", "Mañana", "Jueves", "Viernes", "Sábado"],
+    "Fecha": ["30 Dic", "31 Dic", "1 Ene", "sin fecha", None],
+    "Temperatura": ["23° / 14°", "-2,5° / -8°", "18°/9°", "--", None],
+    "Viento": ["15 km/h NE", "7,5 km/h", "20 km/h so", "calma", None],
+})
+
+
+def _por_extender(df, ciudad, scraped_at):
+    historial = df.rename(columns={
+        "Día": "dia", "Fecha": "fecha", "Temperatura": "temperatura",
+        "Viento": "viento",
+    })
+    historial["ciudad"] = ciudad
+    historial["scraped_at"] = pd.Timestamp(scraped_at)
+    historial["posicion"] = np.arange(len(historial))
+    tabla = ForecastTable()
+    tabla.extender(compactar(historial[HISTORY_COLUMNS]))
+    return tabla
+
+
+@pytest.mark.parametrize("scraped_at", [
+    "2024-12-30 08:00", "2025-01-10 23:59",
+])
+def test_agregar_equivale_a_extender(scraped_at):
+    tabla = ForecastTable()
+    assert tabla.agregar(CAPTURA, "Santiago", scraped_at) == 5
+
+    esperado = _por_extender(CAPTURA, "Santiago", scraped_at).to_frame()
+    pd.testing.assert_frame_equal(
+        tabla.to_frame(), esperado, check_categorical=False
+    )
+
+
+def test_agregar_interpreta_los_textos():
+    tabla = ForecastTable()
+    tabla.agregar(CAPTURA, "Santiago", "2024-12-30 08:00")
+
+    filas = tabla.ultima("santiago")
+    assert filas["horizonte"].tolist() == [0, 1, 2, -1, -1]
+    assert filas["fecha"].iloc[2] == pd.Timestamp("2025-01-01")
+    assert filas["t_min"].iloc[1] == -8.0
+    assert filas["viento_kmh"].iloc[1] == 7.5
+    assert filas["viento_dir"].tolist()[:3] == ["NE", np.nan, "SO"]
+    assert filas.iloc[3:][["t_max", "viento_kmh"]].isna().all().all()
+
+
+def test_agregar_crece_sobre_la_capacidad_reservada():
+    tabla = ForecastTable(capacidad=7)
+    for hora in range(10):
+        tabla.agregar(CAPTURA, f"Ciudad {hora % 3}",
+                      f"2024-12-30 {hora:02d}:00")
+
+    assert tabla.capturas == 10
+    assert len(tabla) == 50
+    assert len(tabla.ciudad("ciudad 1")) == 15
+    assert tabla.ultima("Ciudad 2")["horizonte"].tolist()[:3] == [0, 1, 2]
@@ -0,0 +1,114 @@
+"""Pruebas del programador de actualizaciones con un reloj simulado."""
+
+import pytest
+
+from weather_scraper.scheduler import FakeClock, RefreshScheduler
+
+
+class EjecutorEnEspera:
+    """Ejecutor que guarda las tareas hasta que la prueba las corre."""
+
+    def __init__(self):
+        self.tareas = []
+
+    def submit(self, funcion, *args):
+        self.tareas.append((funcion, args))
+
+    def correr(self):
+        tareas, self.tareas = self.tareas, []
+        for funcion, args in tareas:
+            funcion(*args)
+
+    def shutdown(self, wait=True):
+        pass
+
+
+def _programador(reloj, refrescar, **kwargs):
+    opciones = {"jitter": 0.0, "ejecutor": "inmediato",
+                "ultima_actualizacion": lambda ciudad: None, "seed": 0}
+    opciones.update(kwargs)
+    return RefreshScheduler(refrescar, reloj=reloj, **opciones)
+
+
+def test_ejecuta_cada_intervalo_sin_esperar():
+    reloj = FakeClock()
+    llamadas = []
+    programador = _programador(
+        reloj, lambda ciudad: llamadas.append((ciudad, reloj.time()))
+    )
+    programador.programar("Talca", 100)
+    programador.programar("Arica", 250)
+
+    programador.run(duracion=350)
+
+    assert [t for c, t in llamadas if c == "Talca"] == [0, 100, 200, 300]
+    assert [t for c, t in llamadas if c == "Arica"] == [0, 250]
+    assert reloj.time() == 350
+    assert programador.metricas()["exitosas"] == 6
+
+
+def test_jitter_reparte_las_ejecuciones():
+    reloj = FakeClock()
+    programador = _programador(reloj, lambda ciudad: None, jitter=0.1)
+    for i in range(20):
+        programador.programar(f"Ciudad {i}", 1000)
+
+    proximos = [fila["proximo"] for fila in programador.detalle()]
+    assert len(set(proximos)) == 20
+    assert all(0 <= t <= 100 for t in proximos)
+
+
+def test_prioridad_cuando_faltan_workers():
+    reloj = FakeClock()
+    ejecutor = EjecutorEnEspera()
+    orden = []
+    programador = _programador(
+        reloj, orden.append, workers=1, ejecutor=ejecutor
+    )
+    programador.programar("Arica", 60, prioridad=0, inicio=0)
+    programador.programar("Santiago", 60, prioridad=10, inicio=5)
+    reloj.avanzar(10)
+
+    programador.paso()
+    metricas = programador.metricas()
+    assert metricas["en_curso"] == 1
+    assert metricas["profundidad"] == 1
+    assert metricas["lag_actual"] == 10
+
+    ejecutor.correr()
+    programador.paso()
+    ejecutor.correr()
+    assert orden == ["Santiago", "Arica"]
+
+
+def test_omite_ciudades_frescas():
+    reloj = FakeClock(1_000)
+    llamadas = []
+    programador = _programador(
+        reloj, llamadas.append,
+        ultima_actualizacion=lambda ciudad: 980.0,
+    )
+    programador.programar("Talca", 100, inicio=1_000)
+
+    programador.paso()
+
+    assert llamadas == []
+    assert programador.metricas()["omitidas"] == 1
+    assert programador.detalle()[0]["proximo"] == pytest.approx(1_080)
+
+
+def test_reintenta_antes_del_intervalo_tras_una_falla():
+    reloj = FakeClock()
+
+    def falla(ciudad):
+        raise TimeoutError("sin respuesta")
+
+    programador = _programador(reloj, falla, reintento=30)
+    programador.programar("Talca", 3600, inicio=0)
+
+    programador.paso()
+
+    fila = programador.detalle()[0]
+    assert programador.metricas()["fallidas"] == 1
+    assert fila["ultimo_error"].startswith("TimeoutError")
+    assert 15 <= fila["proximo"] <= 30
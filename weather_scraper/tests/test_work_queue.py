@@ -0,0 +1,72 @@
+"""Pruebas de la cola de trabajo compartida (arriendos y reintentos)."""
+
+import types
+
+import pytest
+
+from weather_scraper import work_queue
+from weather_scraper.work_queue import WorkQueue
+
+
+@pytest.fixture
+def reloj(monkeypatch):
+    """Reemplaza time.time de la cola por un reloj controlado."""
+    ahora = [1_000.0]
+    monkeypatch.setattr(
+        work_queue, "time", types.SimpleNamespace(time=lambda: ahora[0])
+    )
+    return ahora
+
+
+@pytest.fixture
+def cola(tmp_path, reloj):
+    cola = WorkQueue(str(tmp_path / "cola.sqlite"), visibility_timeout=60,
+                     max_intentos=2, backoff=10)
+    cola.encolar(["Talca", "talca ", "Temuco"])
+    return cola
+
+
+def test_encolar_deduplica(cola):
+    assert cola.estado()["pendiente"] == 2
+    assert cola.encolar(["TEMUCO", "Osorno"]) == 1
+
+
+def test_arriendo_vencido_vuelve_a_la_cola(cola, reloj):
+    (lease,) = cola.tomar("w1")
+    reloj[0] += 30
+    assert cola.heartbeat(lease)
+    reloj[0] += 59
+    # El latido extendió el arriendo: solo queda la otra ciudad
+    assert [t.ciudad for t in cola.tomar("w2", n=5)] == ["Temuco"]
+
+    reloj[0] += 2
+    (retomado,) = cola.tomar("w2")
+    assert retomado.ciudad == lease.ciudad
+    assert retomado.intentos == 2
+    # El primer worker ya no puede confirmar ni extender su arriendo
+    assert not cola.heartbeat(lease)
+    assert not cola.ack(lease)
+    assert cola.ack(retomado)
+
+
+def test_arriendo_vencido_agota_los_intentos(cola, reloj):
+    cola.tomar("w1", n=2)
+    reloj[0] += 61
+    cola.tomar("w1", n=2)
+    reloj[0] += 61
+
+    assert cola.recuperar() == 2
+    assert cola.estado()["fallida"] == 2
+    assert cola.reintentar_fallidas() == 2
+
+
+def test_nack_reintenta_con_espera(cola, reloj):
+    (lease,) = cola.tomar("w1")
+    assert cola.nack(lease, "timeout") == "pendiente"
+    cola.tomar("w1")  # toma la otra ciudad
+    assert cola.tomar("w1") == []
+
+    reloj[0] += 10
+    (retomado,) = cola.tomar("w1")
+    assert retomado.ciudad == lease.ciudad
+    assert cola.nack(retomado, "timeout") == "fallida"
@@ -0,0 +1,543 @@
+"""
+Cola de trabajo compartida para repartir ciudades entre varios nodos.
+
+Las ciudades se encolan en una base SQLite (por ejemplo, en un disco
+compartido) y cada nodo ejecuta uno o más ``QueueWorker`` que toman
+tareas de la cola. Tomar una tarea la arrienda (lease) por
+``visibility_timeout`` segundos: mientras el worker la procesa envía
+latidos (heartbeat) que extienden el arriendo, y al guardar los archivos
+la confirma (ack). Si el worker muere, el arriendo vence y la tarea vuelve
+a estar disponible para otro nodo. Agregar un nodo solo requiere iniciar
+más workers contra la misma base; no hay que repartir listas a mano.
+
+Cada arriendo lleva un token propio: un worker cuyo arriendo venció y fue
+reasignado ya no puede confirmar ni extender la tarea.
+
+La base usa el modo de journal por defecto (no WAL), que funciona sobre
+sistemas de archivos en red; cada operación abre su propia conexión y
+toma el bloqueo de escritura con ``BEGIN IMMEDIATE``.
+
+Uso:
+    python -m weather_scraper.work_queue enqueue --db cola.db Santiago Talca
+    python -m weather_scraper.work_queue work --db cola.db --workers 2
+    python -m weather_scraper.work_queue status --db cola.db
+"""
+
+import argparse
+import contextlib
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections import namedtuple
+
+from . import config
+from .cities import CityCatalog, deduplicar, normalizar
+from .rate_limit import RateLimiter
+from .scraper import WeatherScraper
+
+
+ESTADOS = ("pendiente", "en_curso", "completada", "fallida")
+
+Lease = namedtuple("Lease", ["id", "ciudad", "token", "intentos"])
+Lease.__doc__ = "Tarea arrendada por un worker."
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tareas (
+    id INTEGER PRIMARY KEY,
+    ciudad TEXT NOT NULL UNIQUE,
+    estado TEXT NOT NULL DEFAULT 'pendiente',
+    intentos INTEGER NOT NULL DEFAULT 0,
+    disponible_desde REAL NOT NULL DEFAULT 0,
+    worker TEXT,
+    token TEXT,
+    lease_hasta REAL,
+    ultimo_error TEXT,
+    actualizado REAL
+);
+CREATE INDEX IF NOT EXISTS idx_tareas_estado
+    ON tareas (estado, disponible_desde);
+"""
+
+
+class WorkQueue:
+    """
+    Cola de ciudades con arriendos, latidos y confirmaciones en SQLite.
+
+    Atributos:
+        db_path (str): Ruta de la base de datos de la cola.
+        visibility_timeout (float): Duración de un arriendo, en segundos.
+        max_intentos (int): Arriendos por ciudad antes de darla por fallida.
+        backoff (float): Espera base antes de volver a ofrecer una tarea
+            que falló; se duplica en cada intento.
+    """
+
+    def __init__(self, db_path, visibility_timeout=120.0, max_intentos=5,
+                 backoff=5.0):
+        """
+        Abre (o crea) la cola.
+
+        Args:
+            db_path (str): Ruta de la base de datos compartida.
+            visibility_timeout (float): Segundos que una tarea queda
+                reservada sin latidos antes de volver a la cola.
+            max_intentos (int): Intentos por ciudad (al menos 1).
+            backoff (float): Espera antes de reintentar una tarea fallida.
+        """
+        self.db_path = db_path
+        self.visibility_timeout = visibility_timeout
+        self.max_intentos = max(1, int(max_intentos))
+        self.backoff = backoff
+
+        directorio = os.path.dirname(db_path)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        with self._transaccion() as conn:
+            # executescript confirmaría la transacción en curso
+            for sentencia in _SCHEMA.split(";"):
+                if sentencia.strip():
+                    conn.execute(sentencia)
+
+    @contextlib.contextmanager
+    def _transaccion(self):
+        """Conexión propia con bloqueo de escritura durante el bloque."""
+        conn = sqlite3.connect(
+            self.db_path, timeout=60, isolation_level=None
+        )
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def encolar(self, ciudades, catalogo=None):
+        """
+        Agrega ciudades a la cola.
+
+        Encolar una ciudad que ya está en la cola no la duplica, aunque
+        difiera en tildes, mayúsculas o espacios (ver ``cities.py``).
+
+        Args:
+            ciudades (iterable): Nombres de ciudades.
+            catalogo (CityCatalog, optional): Catálogo para resolver los
+                nombres a su forma canónica.
+
+        Returns:
+            int: Número de ciudades nuevas.
+        """
+        nombres = deduplicar(ciudades, catalogo)
+        with self._transaccion() as conn:
+            existentes = {
+                normalizar(ciudad)
+                for ciudad, in conn.execute("SELECT ciudad FROM tareas")
+            }
+            filas = [
+                (ciudad, time.time()) for ciudad in nombres
+                if normalizar(ciudad) not in existentes
+            ]
+            antes = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO tareas (ciudad, actualizado) "
+                "VALUES (?, ?)",
+                filas,
+            )
+            return conn.total_changes - antes
+
+    def tomar(self, worker, n=1):
+        """
+        Arrienda hasta ``n`` tareas disponibles.
+
+        Una tarea está disponible si está pendiente (y ya pasó su espera)
+        o si está en curso con el arriendo vencido.
+
+        Args:
+            worker (str): Identificador del worker.
+            n (int): Máximo de tareas a tomar.
+
+        Returns:
+            list: Objetos ``Lease`` tomados (vacía si no hay tareas).
+        """
+        ahora = time.time()
+        with self._transaccion() as conn:
+            self._recuperar(conn, ahora)
+            filas = conn.execute(
+                "SELECT id, ciudad, intentos FROM tareas "
+                "WHERE estado = 'pendiente' AND disponible_desde <= ? "
+                "ORDER BY disponible_desde, id LIMIT ?",
+                (ahora, n),
+            ).fetchall()
+            leases = []
+            for id_, ciudad, intentos in filas:
+                token = uuid.uuid4().hex
+                conn.execute(
+                    "UPDATE tareas SET estado = 'en_curso', "
+                    "intentos = intentos + 1, worker = ?, token = ?, "
+                    "lease_hasta = ?, actualizado = ? WHERE id = ?",
+                    (worker, token, ahora + self.visibility_timeout, ahora,
+                     id_),
+                )
+                leases.append(Lease(id_, ciudad, token, intentos + 1))
+        return leases
+
+    def heartbeat(self, lease):
+        """
+        Extiende el arriendo de una tarea en curso.
+
+        Args:
+            lease (Lease): Tarea arrendada.
+
+        Returns:
+            bool: False si el arriendo ya no pertenece al worker.
+        """
+        ahora = time.time()
+        with self._transaccion() as conn:
+            cursor = conn.execute(
+                "UPDATE tareas SET lease_hasta = ?, actualizado = ? "
+                "WHERE id = ? AND token = ? AND estado = 'en_curso'",
+                (ahora + self.visibility_timeout, ahora, lease.id,
+                 lease.token),
+            )
+        return cursor.rowcount == 1
+
+    def ack(self, lease):
+        """
+        Confirma que una tarea se completó.
+
+        Args:
+            lease (Lease): Tarea arrendada.
+
+        Returns:
+            bool: False si el arriendo ya no pertenece al worker (otro
+            worker la tomó después de vencer).
+        """
+        with self._transaccion() as conn:
+            cursor = conn.execute(
+                "UPDATE tareas SET estado = 'completada', token = NULL, "
+                "lease_hasta = NULL, ultimo_error = NULL, actualizado = ? "
+                "WHERE id = ? AND token = ? AND estado = 'en_curso'",
+                (time.time(), lease.id, lease.token),
+            )
+        return cursor.rowcount == 1
+
+    def nack(self, lease, error):
+        """
+        Devuelve una tarea que falló.
+
+        La tarea vuelve a la cola con espera exponencial, o queda como
+        fallida si alcanzó ``max_intentos``.
+
+        Args:
+            lease (Lease): Tarea arrendada.
+            error (str): Descripción del error.
+
+        Returns:
+            str: Nuevo estado de la tarea, o None si el arriendo ya no
+            pertenece al worker.
+        """
+        ahora = time.time()
+        if lease.intentos >= self.max_intentos:
+            estado, disponible = "fallida", ahora
+        else:
+            estado = "pendiente"
+            disponible = ahora + self.backoff * 2 ** (lease.intentos - 1)
+        with self._transaccion() as conn:
+            cursor = conn.execute(
+                "UPDATE tareas SET estado = ?, disponible_desde = ?, "
+                "token = NULL, lease_hasta = NULL, ultimo_error = ?, "
+                "actualizado = ? "
+                "WHERE id = ? AND token = ? AND estado = 'en_curso'",
+                (estado, disponible, error, ahora, lease.id, lease.token),
+            )
+        return estado if cursor.rowcount == 1 else None
+
+    def _recuperar(self, conn, ahora):
+        """Devuelve a la cola las tareas con el arriendo vencido."""
+        cursor = conn.execute(
+            "UPDATE tareas SET estado = CASE WHEN intentos >= ? "
+            "THEN 'fallida' ELSE 'pendiente' END, "
+            "ultimo_error = 'Arriendo vencido (worker ' || "
+            "IFNULL(worker, '?') || ')', "
+            "token = NULL, lease_hasta = NULL, disponible_desde = ?, "
+            "actualizado = ? "
+            "WHERE estado = 'en_curso' AND lease_hasta < ?",
+            (self.max_intentos, ahora, ahora, ahora),
+        )
+        return cursor.rowcount
+
+    def recuperar(self):
+        """
+        Devuelve a la cola las tareas cuyo arriendo venció.
+
+        ``tomar`` lo hace automáticamente; este método permite hacerlo
+        desde un proceso de mantenimiento.
+
+        Returns:
+            int: Número de tareas recuperadas.
+        """
+        with self._transaccion() as conn:
+            return self._recuperar(conn, time.time())
+
+    def reintentar_fallidas(self):
+        """
+        Vuelve a dejar como pendientes las tareas fallidas.
+
+        Returns:
+            int: Número de tareas reactivadas.
+        """
+        with self._transaccion() as conn:
+            cursor = conn.execute(
+                "UPDATE tareas SET estado = 'pendiente', intentos = 0, "
+                "disponible_desde = 0 WHERE estado = 'fallida'"
+            )
+        return cursor.rowcount
+
+    def estado(self):
+        """
+        Cuenta las tareas por estado.
+
+        Returns:
+            dict: Número de tareas por estado.
+        """
+        conteo = dict.fromkeys(ESTADOS, 0)
+        with self._transaccion() as conn:
+            conteo.update(conn.execute(
+                "SELECT estado, COUNT(*) FROM tareas GROUP BY estado"
+            ))
+        return conteo
+
+    def detalle(self, estado=None):
+        """
+        Lista las tareas con su worker, intentos y último error.
+
+        Args:
+            estado (str, optional): Filtra por estado.
+
+        Returns:
+            list: Diccionarios con una fila por tarea.
+        """
+        sql = ("SELECT ciudad, estado, intentos, worker, lease_hasta, "
+               "ultimo_error FROM tareas")
+        params = ()
+        if estado is not None:
+            sql += " WHERE estado = ?"
+            params = (estado,)
+        with self._transaccion() as conn:
+            cursor = conn.execute(sql + " ORDER BY id", params)
+            columnas = [c[0] for c in cursor.description]
+            return [dict(zip(columnas, fila)) for fila in cursor]
+
+
+class QueueWorker:
+    """
+    Worker que procesa ciudades de una ``WorkQueue``.
+
+    Atributos:
+        queue (WorkQueue): Cola compartida.
+        worker_id (str): Identificador del worker (host, proceso e hilo).
+        output_dir (str): Directorio de salida de los archivos.
+        perfil (str): Perfil del navegador.
+        heartbeat_interval (float): Segundos entre latidos.
+        limitador (RateLimiter): Limitador de tasa, o None.
+        procesadas (dict): Tareas completadas, fallidas y perdidas (el
+            arriendo venció antes de confirmar).
+    """
+
+    def __init__(self, queue, worker_id=None, output_dir=None, perfil=None,
+                 heartbeat_interval=None, limitador=None):
+        """
+        Configura el worker.
+
+        Args:
+            queue (WorkQueue): Cola compartida.
+            worker_id (str, optional): Identificador; por defecto, el
+                nombre del host, el PID y un sufijo aleatorio.
+            output_dir (str, optional): Directorio de salida.
+            perfil (str, optional): Perfil del navegador.
+            heartbeat_interval (float, optional): Segundos entre latidos;
+                por defecto, un tercio de ``visibility_timeout``.
+            limitador (RateLimiter, optional): Limitador de tasa; para
+                respetar un límite global, todos los workers deben usar el
+                mismo (o la misma base con ``db_path``).
+        """
+        self.queue = queue
+        self.worker_id = worker_id or (
+            f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        )
+        self.output_dir = output_dir or config.OUTPUT_DIR
+        self.perfil = perfil
+        self.heartbeat_interval = (
+            heartbeat_interval or queue.visibility_timeout / 3
+        )
+        self.limitador = limitador
+        self.procesadas = {"completadas": 0, "fallidas": 0, "perdidas": 0}
+
+    def _scrape(self, ciudad):
+        """Extrae y guarda una ciudad; separado para poder reemplazarlo."""
+        return WeatherScraper(
+            self.output_dir, self.perfil, self.limitador
+        ).scrape(ciudad)
+
+    def _latir(self, lease, detener):
+        """Envía latidos hasta que se procese la tarea o se pierda."""
+        while not detener.wait(self.heartbeat_interval):
+            if not self.queue.heartbeat(lease):
+                return
+
+    def procesar(self, lease):
+        """
+        Procesa una tarea arrendada y la confirma o devuelve.
+
+        Args:
+            lease (Lease): Tarea arrendada.
+
+        Returns:
+            bool: True si la ciudad se completó y se confirmó.
+        """
+        detener = threading.Event()
+        latidos = threading.Thread(
+            target=self._latir, args=(lease, detener), daemon=True
+        )
+        latidos.start()
+        try:
+            df = self._scrape(lease.ciudad)
+        except Exception as e:
+            detener.set()
+            latidos.join()
+            estado = self.queue.nack(lease, f"{type(e).__name__}: {e}")
+            clave = "perdidas" if estado is None else "fallidas"
+            self.procesadas[clave] += 1
+            print(f"✗ [{self.worker_id}] {lease.ciudad}: {e}")
+            return False
+
+        detener.set()
+        latidos.join()
+        if not self.queue.ack(lease):
+            # Otro worker la tomó; sus archivos reemplazan a estos
+            self.procesadas["perdidas"] += 1
+            print(f"! [{self.worker_id}] {lease.ciudad}: arriendo perdido")
+            return False
+        self.procesadas["completadas"] += 1
+        print(f"✓ [{self.worker_id}] {lease.ciudad}: {len(df)} días")
+        return True
+
+    def run(self, max_tareas=None, esperar=False, poll_interval=5.0):
+        """
+        Toma y procesa tareas hasta vaciar la cola.
+
+        Args:
+            max_tareas (int, optional): Máximo de tareas a procesar.
+            esperar (bool): Si sigue esperando nuevas tareas cuando la cola
+                está vacía (hasta Ctrl+C), en vez de terminar.
+            poll_interval (float): Segundos entre consultas a una cola
+                vacía.
+
+        Returns:
+            dict: Tareas completadas, fallidas y perdidas.
+        """
+        hechas = 0
+        while max_tareas is None or hechas < max_tareas:
+            leases = self.queue.tomar(self.worker_id)
+            if not leases:
+                conteo = self.queue.estado()
+                if not esperar and not conteo["pendiente"] \
+                        and not conteo["en_curso"]:
+                    break
+                # Quedan tareas en espera de reintento o en otros workers
+                time.sleep(poll_interval)
+                continue
+            self.procesar(leases[0])
+            hechas += 1
+        return dict(self.procesadas)
+
+
+def main():
+    """Encola ciudades, procesa la cola o muestra su estado."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "accion", choices=["enqueue", "work", "status", "reclaim", "retry"]
+    )
+    parser.add_argument("ciudades", nargs="*", help="Ciudades a encolar.")
+    parser.add_argument("--db", default=os.path.join(
+        config.OUTPUT_DIR, "cola.db"
+    ))
+    parser.add_argument(
+        "--file", help="Archivo de texto con una ciudad por línea."
+    )
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Workers (hilos) en este nodo.")
+    parser.add_argument("--visibility-timeout", type=float, default=120.0)
+    parser.add_argument("--max-intentos", type=int, default=5)
+    parser.add_argument("--perfil", help="Perfil del navegador.")
+    parser.add_argument("--output-dir", help="Directorio de salida.")
+    parser.add_argument(
+        "--rate", type=float,
+        help="Tasa inicial de búsquedas por segundo (activa el limitador).",
+    )
+    parser.add_argument(
+        "--rate-db",
+        help="Base SQLite para compartir el limitador entre procesos.",
+    )
+    parser.add_argument(
+        "--resolve", action="store_true",
+        help="Resuelve los nombres con el catálogo de ciudades al encolar.",
+    )
+    parser.add_argument(
+        "--wait", action="store_true",
+        help="Sigue esperando tareas cuando la cola está vacía.",
+    )
+    args = parser.parse_args()
+
+    queue = WorkQueue(args.db, args.visibility_timeout, args.max_intentos)
+    if args.accion == "enqueue":
+        ciudades = list(args.ciudades)
+        if args.file:
+            with open(args.file, encoding="utf-8") as f:
+                ciudades += [linea.strip() for linea in f if linea.strip()]
+        catalogo = CityCatalog() if args.resolve else None
+        nuevas = queue.encolar(ciudades, catalogo)
+        print(f"Ciudades nuevas en la cola: {nuevas}")
+    elif args.accion == "reclaim":
+        print(f"Tareas recuperadas: {queue.recuperar()}")
+    elif args.accion == "retry":
+        print(f"Tareas reactivadas: {queue.reintentar_fallidas()}")
+    elif args.accion == "work":
+        limitador = None
+        if args.rate or args.rate_db:
+            limitador = RateLimiter(
+                rate=args.rate or 0.5, db_path=args.rate_db
+            )
+        workers = [
+            QueueWorker(queue, output_dir=args.output_dir,
+                        perfil=args.perfil, limitador=limitador)
+            for _ in range(max(1, args.workers))
+        ]
+        hilos = [
+            threading.Thread(
+                target=worker.run, kwargs={"esperar": args.wait}
+            )
+            for worker in workers
+        ]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        for worker in workers:
+            print(f"{worker.worker_id}: {worker.procesadas}")
+        if limitador is not None:
+            metricas = limitador.metricas()
+            print(f"Tasa final: {metricas['rate']:.2f} búsquedas/s "
+                  f"({metricas['reducciones']} reducciones)")
+
+    for estado, total in queue.estado().items():
+        print(f"{estado:<12} {total}")
+
+
+if __name__ == "__main__":
+    main()